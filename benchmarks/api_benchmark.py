@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""wrk-style request throughput benchmark for the HTTP API.
+
+Keeps ``--connections`` requests in flight for ``--duration`` seconds and
+reports requests per second and latency percentiles per scenario. Agent
+execution is replaced by a stub, so the numbers measure the API stack
+itself: middleware (request-size limit, idempotency, CORS), routing,
+authentication, rate limiting and serialization.
+
+Scenarios:
+    health      GET /health
+    runs        POST /api/v1/runs without an idempotency key
+    runs-key    POST /api/v1/runs with a fresh Idempotency-Key per request
+    runs-replay POST /api/v1/runs repeating one Idempotency-Key (cached replays)
+
+Usage:
+    python benchmarks/api_benchmark.py --connections 32 --duration 5
+    python benchmarks/api_benchmark.py --scenario runs-key --url http://localhost:8000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+import httpx
+
+SCENARIOS = ("health", "runs", "runs-key", "runs-replay")
+RUN_BODY = {"agent": "bench-agent", "payload": {"role": "Engineer", "level": "Mid"}}
+
+
+def _stub_invoke_mag(
+    slug: str, payload: dict[str, Any], base_dir: Any = None, context: Any = None
+) -> dict[str, Any]:
+    if context is not None:
+        context["run_id"] = f"mag-bench-{uuid.uuid4().hex[:8]}"
+    return {"status": "ok", "agent": slug}
+
+
+@contextmanager
+def stub_agents() -> Iterator[None]:
+    """Replace agent execution behind POST /runs with an instant stub."""
+    from magsag.api.routes import runs_create
+
+    original = runs_create.invoke_mag
+    runs_create.invoke_mag = _stub_invoke_mag  # type: ignore[assignment]
+    try:
+        yield
+    finally:
+        runs_create.invoke_mag = original  # type: ignore[assignment]
+
+
+def build_request(scenario: str) -> Callable[[httpx.AsyncClient], Any]:
+    """Return a coroutine factory issuing one request of ``scenario``."""
+    if scenario == "health":
+        return lambda client: client.get("/health")
+    if scenario == "runs":
+        return lambda client: client.post("/api/v1/runs", json=RUN_BODY)
+    if scenario == "runs-key":
+        return lambda client: client.post(
+            "/api/v1/runs", json=RUN_BODY, headers={"Idempotency-Key": uuid.uuid4().hex}
+        )
+    if scenario == "runs-replay":
+        return lambda client: client.post(
+            "/api/v1/runs", json=RUN_BODY, headers={"Idempotency-Key": "bench-replay"}
+        )
+    raise ValueError(f"Unknown scenario: {scenario}")
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    scenario: str,
+    connections: int,
+    duration: float,
+) -> dict[str, float]:
+    """Drive ``connections`` closed-loop workers for ``duration`` seconds."""
+    request = build_request(scenario)
+    latencies: list[float] = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker() -> None:
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            response = await request(client)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(connections)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": quantiles[49] * 1000,
+        "p99_ms": quantiles[98] * 1000,
+    }
+
+
+async def benchmark(args: argparse.Namespace) -> None:
+    scenarios = SCENARIOS if args.scenario == "all" else (args.scenario,)
+    limits = httpx.Limits(max_connections=args.connections)
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, limits=limits, timeout=30)
+    else:
+        from magsag.api.server import app
+
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=30
+        )
+
+    print(
+        f"{'scenario':<12} {'req/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'requests':>9} {'errors':>7}"
+    )
+    async with client:
+        for scenario in scenarios:
+            if args.warmup > 0:
+                await run_load(client, scenario, args.connections, args.warmup)
+            stats = await run_load(client, scenario, args.connections, args.duration)
+            print(
+                f"{scenario:<12} {stats['rps']:>10.1f} {stats['p50_ms']:>8.2f} "
+                f"{stats['p99_ms']:>8.2f} {stats['requests']:>9} {stats['errors']:>7}"
+            )
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark HTTP API throughput")
+    parser.add_argument(
+        "--scenario",
+        choices=[*SCENARIOS, "all"],
+        default="all",
+        help="Request mix to drive",
+    )
+    parser.add_argument("--connections", type=int, default=32, help="Concurrent requests")
+    parser.add_argument("--duration", type=float, default=5.0, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=1.0, help="Warmup seconds")
+    parser.add_argument(
+        "--url",
+        default=None,
+        help="Benchmark a running server (agents are only stubbed in-process)",
+    )
+    args = parser.parse_args()
+
+    with stub_agents():
+        asyncio.run(benchmark(args))
+
+
+if __name__ == "__main__":
+    main()
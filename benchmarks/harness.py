@@ -1,27 +1,498 @@
-"""Minimal benchmark harness for MAGSAG agents.
+"""Benchmark harness for MAGSAG agents.
 
-This module provides a simple benchmark runner for evaluating agent performance
-across quality, cost, and latency dimensions. It supports running golden tests
-and generating reports in HTML and Markdown formats.
+Two modes:
+
+``load``
+    Drives real agent invocations (``AgentRunner.invoke_mag``,
+    ``AgentRunner.invoke_sag_async`` or ``POST /api/v1/agents/{slug}/run``)
+    with a fixed number of concurrent workers for a warmup period followed
+    by a measured period. Reports throughput, p50/p95/p99 latency, a
+    per-stage breakdown (planning, pre-eval, agent, post-eval,
+    observability I/O) and peak RSS, and writes the result as JSON so runs
+    can be compared between commits with ``--baseline``.
+
+``golden``
+    Invokes the agent named by each golden test directory and compares its
+    output with ``expected/output.json``.
+
+Everything runs in-process and offline: the API target uses an ASGI
+transport unless ``--url`` is given, and run artifacts go to a temporary
+directory.
 
 Usage:
-    python benchmarks/harness.py
+    python benchmarks/harness.py load --target mag --concurrency 8 --duration 10
+    python benchmarks/harness.py load --target api --output bench.json --baseline main.json
+    python benchmarks/harness.py golden
     make bench
 
 Exit Status:
-    0 - All tests passed
-    1 - One or more tests failed (for CI/CD integration)
+    0 - Benchmark completed (load) / all golden tests passed
+    1 - Regression beyond --max-regression (load) / a golden test failed
 """
 
 from __future__ import annotations
 
+import argparse
+import asyncio
+import functools
+import inspect
 import json
+import logging
+import os
+import platform
+import subprocess
 import sys
+import tempfile
+import threading
 import time
-from dataclasses import dataclass, field
+import uuid
+from collections import Counter
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
 
+from magsag.observability.logger import ObservabilityLogger
+from magsag.runners.agent_runner import AgentRunner, Delegation
+
+HARNESS_VERSION = "0.2.0"
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_PAYLOAD = REPO_ROOT / "examples" / "agents" / "candidate_profile.json"
+DEFAULT_AGENTS = {
+    "mag": "offer-orchestrator-mag",
+    "sag": "compensation-advisor-sag",
+    "api": "offer-orchestrator-mag",
+}
+STAGES = ("planning", "pre_eval", "agent", "post_eval", "observability_io")
+
+# (owner, attribute, stage) pairs timed by instrument_stages(). The MAG
+# "agent" stage includes the nested SAG delegations it performs.
+STAGE_HOOKS: tuple[tuple[type, str, str], ...] = (
+    (AgentRunner, "_prepare_execution", "planning"),
+    (AgentRunner, "_run_pre_evaluations", "pre_eval"),
+    (AgentRunner, "_execute_mag_async", "agent"),
+    (AgentRunner, "_execute_agent_async", "agent"),
+    (AgentRunner, "_run_post_evaluations", "post_eval"),
+    (ObservabilityLogger, "log", "observability_io"),
+    (ObservabilityLogger, "metric", "observability_io"),
+    (ObservabilityLogger, "record_cost", "observability_io"),
+    (ObservabilityLogger, "finalize", "observability_io"),
+)
+
+
+# ---------------------------------------------------------------------------
+# Statistics
+# ---------------------------------------------------------------------------
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Return the q-th percentile (0-100) of pre-sorted values.
+
+    Uses linear interpolation between closest ranks.
+
+    Args:
+        sorted_values: Values in ascending order
+        q: Percentile to compute
+
+    Returns:
+        Percentile value, or 0.0 for an empty list
+    """
+    if not sorted_values:
+        return 0.0
+    rank = (len(sorted_values) - 1) * q / 100
+    low = int(rank)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+
+def summarize_latencies(latencies_ms: list[float]) -> dict[str, float]:
+    """Summarize latency samples in milliseconds."""
+    values = sorted(latencies_ms)
+    return {
+        "mean": sum(values) / len(values) if values else 0.0,
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": values[-1] if values else 0.0,
+    }
+
+
+def peak_rss_mb() -> float | None:
+    """Peak resident set size of this process in MiB (None if unsupported)."""
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and KiB elsewhere
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return peak / divisor
+
+
+# ---------------------------------------------------------------------------
+# Stage instrumentation
+# ---------------------------------------------------------------------------
+
+
+class StageRecorder:
+    """Thread-safe collector of per-stage durations."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._samples: dict[str, list[float]] = {stage: [] for stage in STAGES}
+
+    def record(self, stage: str, duration_ms: float) -> None:
+        with self._lock:
+            self._samples.setdefault(stage, []).append(duration_ms)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples = {stage: [] for stage in STAGES}
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """Per-stage call count, total, mean and tail latency in milliseconds."""
+        with self._lock:
+            samples = {stage: list(values) for stage, values in self._samples.items()}
+        result: dict[str, dict[str, float]] = {}
+        for stage, values in samples.items():
+            stats = summarize_latencies(values)
+            result[stage] = {
+                "count": len(values),
+                "total_ms": sum(values),
+                "mean_ms": stats["mean"],
+                "p50_ms": stats["p50"],
+                "p95_ms": stats["p95"],
+            }
+        return result
+
+
+def _timed(fn: Callable[..., Any], stage: str, recorder: StageRecorder) -> Callable[..., Any]:
+    if inspect.iscoroutinefunction(fn):
+
+        @functools.wraps(fn)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                recorder.record(stage, (time.perf_counter() - start) * 1000)
+
+        return async_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            recorder.record(stage, (time.perf_counter() - start) * 1000)
+
+    return wrapper
+
+
+@contextmanager
+def instrument_stages(recorder: StageRecorder) -> Iterator[StageRecorder]:
+    """Time the runner's pipeline stages for the duration of the block.
+
+    Patches the methods listed in STAGE_HOOKS at class level, so runners
+    created inside the block (e.g. per API request) are covered too.
+    """
+    originals: list[tuple[type, str, Any]] = []
+    try:
+        for owner, attribute, stage in STAGE_HOOKS:
+            original = owner.__dict__[attribute]
+            originals.append((owner, attribute, original))
+            setattr(owner, attribute, _timed(original, stage, recorder))
+        yield recorder
+    finally:
+        for owner, attribute, original in reversed(originals):
+            setattr(owner, attribute, original)
+
+
+# ---------------------------------------------------------------------------
+# Load generation
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class LoadConfig:
+    """Load test configuration.
+
+    Attributes:
+        target: What to drive: "mag", "sag" or "api"
+        agent: Agent slug to invoke
+        payload: Agent input payload
+        concurrency: Number of concurrent workers
+        warmup_seconds: Unmeasured warmup period
+        duration_seconds: Measured period
+        url: Base URL of a running API server (api target; in-process if None)
+        api_key: Bearer token for the API target
+    """
+
+    target: str = "mag"
+    agent: str = DEFAULT_AGENTS["mag"]
+    payload: dict[str, Any] = field(default_factory=dict)
+    concurrency: int = 4
+    warmup_seconds: float = 2.0
+    duration_seconds: float = 10.0
+    url: str | None = None
+    api_key: str | None = None
+
+
+@dataclass
+class LoadResult:
+    """Measured results of one load test."""
+
+    requests: int
+    errors: dict[str, int]
+    elapsed_seconds: float
+    throughput_rps: float
+    latency_ms: dict[str, float]
+    stages: dict[str, dict[str, float]]
+    peak_rss_mb: float | None
+
+
+async def _drive(
+    call: Callable[[], Awaitable[None]],
+    concurrency: int,
+    seconds: float,
+) -> tuple[list[float], Counter[str], float]:
+    """Run ``call`` from ``concurrency`` workers until ``seconds`` elapse."""
+    latencies: list[float] = []
+    errors: Counter[str] = Counter()
+    start = time.perf_counter()
+    deadline = start + seconds
+
+    async def worker() -> None:
+        while time.perf_counter() < deadline:
+            t0 = time.perf_counter()
+            try:
+                await call()
+            except Exception as exc:
+                errors[type(exc).__name__] += 1
+            else:
+                latencies.append((time.perf_counter() - t0) * 1000)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors, time.perf_counter() - start
+
+
+@asynccontextmanager
+async def _target_call(
+    config: LoadConfig, runs_dir: Path
+) -> AsyncIterator[Callable[[], Awaitable[None]]]:
+    """Build the per-request coroutine factory for the configured target."""
+    if config.target == "mag":
+        runner = AgentRunner(base_dir=runs_dir)
+        executor = ThreadPoolExecutor(max_workers=config.concurrency)
+
+        async def call_mag() -> None:
+            # invoke_mag is blocking; the API runs it in a worker thread too
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(
+                executor, runner.invoke_mag, config.agent, config.payload, {}
+            )
+
+        try:
+            yield call_mag
+        finally:
+            executor.shutdown(wait=True)
+
+    elif config.target == "sag":
+        runner = AgentRunner(base_dir=runs_dir)
+
+        async def call_sag() -> None:
+            result = await runner.invoke_sag_async(
+                Delegation(
+                    task_id=f"bench-{uuid.uuid4().hex[:8]}",
+                    sag_id=config.agent,
+                    input=config.payload,
+                    context={},
+                )
+            )
+            if result.status != "success":
+                raise RuntimeError(result.error or "SAG invocation failed")
+
+        yield call_sag
+
+    elif config.target == "api":
+        import httpx
+
+        headers = {"Authorization": f"Bearer {config.api_key}"} if config.api_key else {}
+        if config.url:
+            client = httpx.AsyncClient(base_url=config.url, headers=headers, timeout=60.0)
+            prefix = "/api/v1"
+        else:
+            # Settings are read at import time; point run artifacts at runs_dir
+            os.environ["MAGSAG_RUNS_BASE_DIR"] = str(runs_dir)
+            from magsag.api.config import get_settings
+
+            get_settings.cache_clear()
+            from magsag.api.server import app
+
+            client = httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=app),
+                base_url="http://bench",
+                headers=headers,
+                timeout=60.0,
+            )
+            prefix = get_settings().API_PREFIX
+
+        path = f"{prefix}/agents/{config.agent}/run"
+
+        async def call_api() -> None:
+            response = await client.post(path, json={"payload": config.payload})
+            if response.status_code != 200:
+                raise RuntimeError(f"HTTP {response.status_code}")
+
+        async with client:
+            yield call_api
+
+    else:
+        raise ValueError(f"Unknown target: {config.target}")
+
+
+async def _run_load_test_async(config: LoadConfig, recorder: StageRecorder) -> LoadResult:
+    with tempfile.TemporaryDirectory(prefix="magsag-bench-") as tmp:
+        async with _target_call(config, Path(tmp)) as call:
+            if config.warmup_seconds > 0:
+                await _drive(call, config.concurrency, config.warmup_seconds)
+            recorder.reset()
+            latencies, errors, elapsed = await _drive(
+                call, config.concurrency, config.duration_seconds
+            )
+
+    return LoadResult(
+        requests=len(latencies),
+        errors=dict(errors),
+        elapsed_seconds=elapsed,
+        throughput_rps=len(latencies) / elapsed if elapsed > 0 else 0.0,
+        latency_ms=summarize_latencies(latencies),
+        stages=recorder.summary(),
+        peak_rss_mb=peak_rss_mb(),
+    )
+
+
+def run_load_test(config: LoadConfig) -> LoadResult:
+    """Run a load test and return its measurements.
+
+    Args:
+        config: Load test configuration
+
+    Returns:
+        LoadResult with throughput, latency percentiles and stage breakdown
+    """
+    recorder = StageRecorder()
+    with instrument_stages(recorder):
+        return asyncio.run(_run_load_test_async(config, recorder))
+
+
+def _git_commit() -> str | None:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip() or None
+
+
+def build_report(config: LoadConfig, result: LoadResult) -> dict[str, Any]:
+    """Assemble the JSON report for a load test."""
+    config_data = asdict(config)
+    config_data.pop("api_key", None)
+    config_data.pop("payload", None)
+    return {
+        "harness_version": HARNESS_VERSION,
+        "timestamp": datetime.now(UTC).isoformat(),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": config_data,
+        "results": asdict(result),
+    }
+
+
+def compare_reports(
+    baseline: dict[str, Any],
+    current: dict[str, Any],
+    max_regression_pct: float,
+) -> list[str]:
+    """Compare two load test reports.
+
+    Args:
+        baseline: Report from the reference commit
+        current: Report from this run
+        max_regression_pct: Allowed slowdown before a metric counts as a regression
+
+    Returns:
+        Descriptions of metrics that regressed beyond the threshold
+    """
+    regressions: list[str] = []
+    base_results = baseline["results"]
+    current_results = current["results"]
+
+    base_rps = base_results["throughput_rps"]
+    current_rps = current_results["throughput_rps"]
+    if base_rps > 0:
+        change = (current_rps - base_rps) / base_rps * 100
+        print(f"  throughput: {base_rps:,.1f} -> {current_rps:,.1f} req/s ({change:+.1f}%)")
+        if -change > max_regression_pct:
+            regressions.append(f"throughput dropped {-change:.1f}%")
+
+    for key in ("p50", "p95", "p99"):
+        base_value = base_results["latency_ms"][key]
+        current_value = current_results["latency_ms"][key]
+        if base_value <= 0:
+            continue
+        change = (current_value - base_value) / base_value * 100
+        print(f"  {key}: {base_value:.2f} -> {current_value:.2f} ms ({change:+.1f}%)")
+        if change > max_regression_pct:
+            regressions.append(f"{key} latency rose {change:.1f}%")
+
+    return regressions
+
+
+def print_load_result(config: LoadConfig, result: LoadResult) -> None:
+    """Print a human-readable load test summary."""
+    print(f"\n{'=' * 60}")
+    print(f"Load test: {config.target} -> {config.agent}")
+    print(
+        f"Concurrency: {config.concurrency} | Warmup: {config.warmup_seconds}s | "
+        f"Duration: {config.duration_seconds}s"
+    )
+    print(f"{'=' * 60}")
+    print(f"  Requests:    {result.requests:,} ({sum(result.errors.values()):,} errors)")
+    print(f"  Throughput:  {result.throughput_rps:,.1f} req/s")
+    latency = result.latency_ms
+    print(
+        f"  Latency:     p50 {latency['p50']:.2f}ms | p95 {latency['p95']:.2f}ms | "
+        f"p99 {latency['p99']:.2f}ms | max {latency['max']:.2f}ms"
+    )
+    if result.peak_rss_mb is not None:
+        print(f"  Peak RSS:    {result.peak_rss_mb:.1f} MiB")
+    print("  Stages:")
+    for stage, stats in result.stages.items():
+        print(
+            f"    {stage:<17} {int(stats['count']):>7} calls | "
+            f"mean {stats['mean_ms']:.3f}ms | p95 {stats['p95_ms']:.3f}ms"
+        )
+    if result.errors:
+        print(f"  Errors:      {result.errors}")
+    print(f"{'=' * 60}\n")
+
+
+# ---------------------------------------------------------------------------
+# Golden tests
+# ---------------------------------------------------------------------------
+
 
 def _compare_outputs(actual: Any, expected: Any) -> tuple[bool, str | None]:
     """Compare actual output with expected output.
@@ -82,7 +553,7 @@ def _compare_outputs(actual: Any, expected: Any) -> tuple[bool, str | None]:
 
 @dataclass
 class BenchResult:
-    """Result of a single benchmark run.
+    """Result of a single golden test run.
 
     Attributes:
         agent: Name of the agent being benchmarked
@@ -103,14 +574,16 @@ class BenchResult:
 
 
 class BenchRunner:
-    """Minimal benchmark runner for MAGSAG agents.
+    """Runs golden test inputs through real MAG invocations."""
 
-    This runner executes benchmark tests against agents and collects performance
-    metrics. Currently uses dummy measurements without real LLM calls.
-    """
+    def __init__(self, runner: AgentRunner | None = None, base_dir: Path | None = None) -> None:
+        """Initialize the benchmark runner.
 
-    def __init__(self) -> None:
-        """Initialize the benchmark runner."""
+        Args:
+            runner: Agent runner to use (default: one writing runs to base_dir)
+            base_dir: Directory for run artifacts
+        """
+        self.runner = runner or AgentRunner(base_dir=base_dir)
         self.results: list[BenchResult] = []
 
     def run_benchmark(
@@ -118,231 +591,66 @@ class BenchRunner:
         agent: str,
         input_data: dict[str, Any],
     ) -> BenchResult:
-        """Run a benchmark test against an agent.
+        """Invoke an agent with a golden test input.
 
         Args:
-            agent: Name of the agent to benchmark
-            input_data: Input data to provide to the agent
+            agent: Slug of the MAG to invoke
+            input_data: Golden input; its "payload" key is passed to the agent
 
         Returns:
-            BenchResult containing the benchmark metrics
+            BenchResult with the agent output and duration
         """
-        start_time = time.time()
+        payload = input_data.get("payload", input_data)
+        start_time = time.perf_counter()
 
         try:
-            # Dummy implementation - no real LLM call
-            # In a real implementation, this would invoke the agent
-            output_data = {
-                "result": f"Processed input for {agent}",
-                "agent": agent,
-                "echo": input_data,
-            }
-
-            duration_ms = (time.time() - start_time) * 1000
-
+            output_data = self.runner.invoke_mag(agent, payload)
             result = BenchResult(
                 agent=agent,
                 input_data=input_data,
                 output_data=output_data,
-                duration_ms=duration_ms,
+                duration_ms=(time.perf_counter() - start_time) * 1000,
                 success=True,
                 metadata={
                     "timestamp": time.time(),
-                    "harness_version": "0.1.0",
+                    "harness_version": HARNESS_VERSION,
                 },
             )
         except Exception as e:
-            duration_ms = (time.time() - start_time) * 1000
             result = BenchResult(
                 agent=agent,
                 input_data=input_data,
-                duration_ms=duration_ms,
+                duration_ms=(time.perf_counter() - start_time) * 1000,
                 success=False,
-                error=str(e),
+                error=f"{type(e).__name__}: {e}",
             )
 
         self.results.append(result)
         return result
 
-    def generate_report(
-        self,
-        results: list[BenchResult] | None = None,
-        format: str = "markdown",
-    ) -> str:
-        """Generate a report from benchmark results.
-
-        Args:
-            results: List of benchmark results. If None, uses all collected results.
-            format: Output format, either "markdown" or "html"
-
-        Returns:
-            Formatted report as a string
-        """
-        if results is None:
-            results = self.results
-
-        if not results:
-            return "No benchmark results available."
-
-        if format == "html":
-            return self._generate_html_report(results)
-        else:
-            return self._generate_markdown_report(results)
-
-    def _generate_markdown_report(self, results: list[BenchResult]) -> str:
-        """Generate a Markdown report.
-
-        Args:
-            results: List of benchmark results
-
-        Returns:
-            Markdown-formatted report
-        """
-        lines = [
-            "# Benchmark Report",
-            "",
-            f"Total runs: {len(results)}",
-            f"Successful: {sum(1 for r in results if r.success)}",
-            f"Failed: {sum(1 for r in results if not r.success)}",
-            "",
-            "## Results",
-            "",
-            "| Agent | Duration (ms) | Success | Error |",
-            "|-------|---------------|---------|-------|",
-        ]
-
-        for result in results:
-            error = result.error or "-"
-            lines.append(
-                f"| {result.agent} | {result.duration_ms:.2f} | "
-                f"{'✓' if result.success else '✗'} | {error} |"
-            )
 
-        lines.extend([
-            "",
-            "## Summary Statistics",
-            "",
-        ])
-
-        successful_results = [r for r in results if r.success]
-        if successful_results:
-            avg_duration = sum(r.duration_ms for r in successful_results) / len(successful_results)
-            min_duration = min(r.duration_ms for r in successful_results)
-            max_duration = max(r.duration_ms for r in successful_results)
-
-            lines.extend([
-                f"- Average duration: {avg_duration:.2f} ms",
-                f"- Min duration: {min_duration:.2f} ms",
-                f"- Max duration: {max_duration:.2f} ms",
-            ])
-
-        return "\n".join(lines)
-
-    def _generate_html_report(self, results: list[BenchResult]) -> str:
-        """Generate an HTML report.
-
-        Args:
-            results: List of benchmark results
-
-        Returns:
-            HTML-formatted report
-        """
-        successful_count = sum(1 for r in results if r.success)
-        failed_count = len(results) - successful_count
-
-        rows = []
-        for result in results:
-            success_class = "success" if result.success else "failure"
-            error_cell = result.error or "-"
-            rows.append(
-                f'  <tr class="{success_class}">'
-                f'<td>{result.agent}</td>'
-                f'<td>{result.duration_ms:.2f}</td>'
-                f'<td>{"✓" if result.success else "✗"}</td>'
-                f'<td>{error_cell}</td></tr>'
-            )
-
-        table_rows = "\n".join(rows)
-
-        successful_results = [r for r in results if r.success]
-        stats_html = ""
-        if successful_results:
-            avg_duration = sum(r.duration_ms for r in successful_results) / len(successful_results)
-            min_duration = min(r.duration_ms for r in successful_results)
-            max_duration = max(r.duration_ms for r in successful_results)
-
-            stats_html = f"""
-<h2>Summary Statistics</h2>
-<ul>
-  <li>Average duration: {avg_duration:.2f} ms</li>
-  <li>Min duration: {min_duration:.2f} ms</li>
-  <li>Max duration: {max_duration:.2f} ms</li>
-</ul>
-"""
-
-        html = f"""<!DOCTYPE html>
-<html>
-<head>
-  <title>Benchmark Report</title>
-  <style>
-    body {{ font-family: Arial, sans-serif; margin: 20px; }}
-    h1 {{ color: #333; }}
-    table {{ border-collapse: collapse; width: 100%; margin: 20px 0; }}
-    th, td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
-    th {{ background-color: #f2f2f2; }}
-    tr.success {{ background-color: #e8f5e9; }}
-    tr.failure {{ background-color: #ffebee; }}
-    .stats {{ background-color: #f5f5f5; padding: 15px; border-radius: 5px; }}
-  </style>
-</head>
-<body>
-  <h1>Benchmark Report</h1>
-  <div class="stats">
-    <p><strong>Total runs:</strong> {len(results)}</p>
-    <p><strong>Successful:</strong> {successful_count}</p>
-    <p><strong>Failed:</strong> {failed_count}</p>
-  </div>
-
-  <h2>Results</h2>
-  <table>
-    <thead>
-      <tr>
-        <th>Agent</th>
-        <th>Duration (ms)</th>
-        <th>Success</th>
-        <th>Error</th>
-      </tr>
-    </thead>
-    <tbody>
-{table_rows}
-    </tbody>
-  </table>
-
-  {stats_html}
-</body>
-</html>
-"""
-        return html
-
-
-def run_golden_tests(golden_dir: Path = Path("tests/golden")) -> list[BenchResult]:
+def run_golden_tests(
+    golden_dir: Path = Path("tests/golden"),
+    runner: BenchRunner | None = None,
+) -> list[BenchResult]:
     """Run all golden tests from the golden test directory.
 
     Args:
         golden_dir: Path to the golden tests directory
+        runner: Benchmark runner to invoke agents with
 
     Returns:
         List of benchmark results
     """
-    runner = BenchRunner()
-    results = []
+    runner = runner or BenchRunner()
+    results: list[BenchResult] = []
 
     if not golden_dir.exists():
         print(f"Warning: Golden test directory not found: {golden_dir}")
         return results
 
     # Find all test cases (directories with input.json)
-    for test_dir in golden_dir.iterdir():
+    for test_dir in sorted(golden_dir.iterdir()):
         if not test_dir.is_dir():
             continue
 
@@ -357,132 +665,168 @@ def run_golden_tests(golden_dir: Path = Path("tests/golden")) -> list[BenchResul
             with input_file.open() as f:
                 input_data = json.load(f)
         except json.JSONDecodeError as e:
-            # Create a failed result for malformed input JSON
-            result = BenchResult(
-                agent=agent_name,
-                input_data={},
-                success=False,
-                error=f"Invalid input JSON: {e.msg} at line {e.lineno} column {e.colno}",
+            results.append(
+                BenchResult(
+                    agent=agent_name,
+                    input_data={},
+                    success=False,
+                    error=f"Invalid input JSON: {e.msg} at line {e.lineno} column {e.colno}",
+                )
             )
-            results.append(result)
             print(f"✗ FAILED golden test: {agent_name} - Invalid input.json: {e.msg}")
             continue
         except Exception as e:
-            # Handle other file reading errors
-            result = BenchResult(
-                agent=agent_name,
-                input_data={},
-                success=False,
-                error=f"Error reading input.json: {str(e)}",
+            results.append(
+                BenchResult(
+                    agent=agent_name,
+                    input_data={},
+                    success=False,
+                    error=f"Error reading input.json: {e!s}",
+                )
             )
-            results.append(result)
             print(f"✗ FAILED golden test: {agent_name} - Error reading input.json: {e}")
             continue
 
-        # Run benchmark
         result = runner.run_benchmark(agent_name, input_data)
         results.append(result)
+        if not result.success:
+            print(f"✗ FAILED golden test: {agent_name} - {result.error}")
+            continue
 
-        # Compare with expected output if available
         expected_file = test_dir / "expected" / "output.json"
-        if expected_file.exists():
-            try:
-                with expected_file.open() as f:
-                    expected_output = json.load(f)
-            except json.JSONDecodeError as e:
-                # Mark test as failed due to malformed expected JSON
-                result.success = False
-                result.error = f"Invalid expected output JSON: {e.msg} at line {e.lineno} column {e.colno}"
-                result.metadata["has_expected"] = True
-                result.metadata["expected_file"] = str(expected_file)
-                print(f"✗ FAILED golden test: {agent_name} - Invalid expected/output.json: {e.msg}")
-                continue
-            except Exception as e:
-                # Handle other file reading errors
-                result.success = False
-                result.error = f"Error reading expected output: {str(e)}"
-                result.metadata["has_expected"] = True
-                result.metadata["expected_file"] = str(expected_file)
-                print(f"✗ FAILED golden test: {agent_name} - Error reading expected/output.json: {e}")
-                continue
-
-            result.metadata["has_expected"] = True
-            result.metadata["expected_file"] = str(expected_file)
-
-            # Compare actual output with expected output
-            matches, diff_message = _compare_outputs(result.output_data, expected_output)
-            if not matches:
-                result.success = False
-                result.error = f"Golden test output mismatch: {diff_message}"
-                result.metadata["output_diff"] = diff_message
-                print(f"✗ FAILED golden test: {agent_name} - {diff_message}")
-            else:
-                result.metadata["golden_match"] = True
-                print(f"✓ Ran golden test: {agent_name} ({result.duration_ms:.2f}ms)")
-        else:
+        if not expected_file.exists():
             print(f"✓ Ran golden test: {agent_name} ({result.duration_ms:.2f}ms) [no expected output]")
+            continue
+
+        result.metadata["has_expected"] = True
+        result.metadata["expected_file"] = str(expected_file)
+        try:
+            with expected_file.open() as f:
+                expected_output = json.load(f)
+        except json.JSONDecodeError as e:
+            result.success = False
+            result.error = f"Invalid expected output JSON: {e.msg} at line {e.lineno} column {e.colno}"
+            print(f"✗ FAILED golden test: {agent_name} - Invalid expected/output.json: {e.msg}")
+            continue
+        except Exception as e:
+            result.success = False
+            result.error = f"Error reading expected output: {e!s}"
+            print(f"✗ FAILED golden test: {agent_name} - Error reading expected/output.json: {e}")
+            continue
+
+        matches, diff_message = _compare_outputs(result.output_data, expected_output)
+        if not matches:
+            result.success = False
+            result.error = f"Golden test output mismatch: {diff_message}"
+            result.metadata["output_diff"] = diff_message
+            print(f"✗ FAILED golden test: {agent_name} - {diff_message}")
+        else:
+            result.metadata["golden_match"] = True
+            print(f"✓ Ran golden test: {agent_name} ({result.duration_ms:.2f}ms)")
 
     return results
 
 
-def main() -> None:
-    """Main entry point for the benchmark harness."""
-    print("MAGSAG Benchmark Harness")
-    print("=" * 50)
-    print()
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
 
-    # Example: Run a simple benchmark
-    runner = BenchRunner()
 
-    print("Running example benchmarks...")
-    runner.run_benchmark(
-        agent="example-agent",
-        input_data={"task": "sample task", "mode": "test"},
-    )
-    runner.run_benchmark(
-        agent="another-agent",
-        input_data={"query": "benchmark query"},
+def _load_payload(target: str, path: Path) -> dict[str, Any]:
+    with path.open() as f:
+        payload: dict[str, Any] = json.load(f)
+    if target == "sag" and "candidate_profile" not in payload:
+        # The SAG input wraps the candidate profile the MAG receives
+        payload = {"candidate_profile": payload}
+    return payload
+
+
+def _cmd_load(args: argparse.Namespace) -> int:
+    config = LoadConfig(
+        target=args.target,
+        agent=args.agent or DEFAULT_AGENTS[args.target],
+        payload=_load_payload(args.target, args.payload),
+        concurrency=args.concurrency,
+        warmup_seconds=args.warmup,
+        duration_seconds=args.duration,
+        url=args.url,
+        api_key=args.api_key,
     )
+    result = run_load_test(config)
+    print_load_result(config, result)
 
-    print()
-    print("Running golden tests...")
-    golden_results = run_golden_tests()
-    runner.results.extend(golden_results)
+    report = build_report(config, result)
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"Saved results to: {args.output}")
 
-    print()
-    print("=" * 50)
-    print("Markdown Report:")
-    print("=" * 50)
-    print(runner.generate_report(format="markdown"))
+    if args.baseline is None:
+        return 0
+
+    baseline = json.loads(args.baseline.read_text())
+    print(f"\nComparing with baseline {args.baseline} ({baseline.get('git_commit')}):")
+    regressions = compare_reports(baseline, report, args.max_regression)
+    if regressions:
+        print(f"❌ Regressions beyond {args.max_regression}%: {'; '.join(regressions)}")
+        return 1
+    print("✅ No regressions")
+    return 0
 
-    print()
-    print("=" * 50)
-    print("HTML Report (preview):")
-    print("=" * 50)
-    html_report = runner.generate_report(format="html")
-    print(f"Generated HTML report ({len(html_report)} bytes)")
 
-    # Optionally save HTML report
-    output_path = Path("benchmark_report.html")
-    output_path.write_text(html_report)
-    print(f"Saved HTML report to: {output_path}")
+def _cmd_golden(args: argparse.Namespace) -> int:
+    with tempfile.TemporaryDirectory(prefix="magsag-golden-") as tmp:
+        results = run_golden_tests(args.golden_dir, BenchRunner(base_dir=Path(tmp)))
 
-    # Check for failures and exit with appropriate status
-    failed_results = [r for r in runner.results if not r.success]
+    failed_results = [r for r in results if not r.success]
+    print()
+    print("=" * 50)
     if failed_results:
-        print()
-        print("=" * 50)
         print(f"❌ FAILED: {len(failed_results)} test(s) failed")
         for result in failed_results:
             print(f"  - {result.agent}: {result.error}")
         print("=" * 50)
-        sys.exit(1)
-    else:
-        print()
-        print("=" * 50)
-        print(f"✅ SUCCESS: All {len(runner.results)} test(s) passed")
-        print("=" * 50)
-        sys.exit(0)
+        return 1
+    print(f"✅ SUCCESS: All {len(results)} test(s) passed")
+    print("=" * 50)
+    return 0
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Main entry point for the benchmark harness."""
+    parser = argparse.ArgumentParser(description="MAGSAG benchmark harness")
+    subparsers = parser.add_subparsers(dest="command")
+
+    load = subparsers.add_parser("load", help="Load test agent invocations (default)")
+    load.add_argument("--target", choices=sorted(DEFAULT_AGENTS), default="mag")
+    load.add_argument("--agent", help="Agent slug (default depends on target)")
+    load.add_argument("--payload", type=Path, default=DEFAULT_PAYLOAD, help="Payload JSON file")
+    load.add_argument("--concurrency", type=int, default=4, help="Concurrent workers")
+    load.add_argument("--warmup", type=float, default=2.0, help="Warmup seconds (not measured)")
+    load.add_argument("--duration", type=float, default=10.0, help="Measured seconds")
+    load.add_argument("--url", help="Base URL of a running API server (api target)")
+    load.add_argument("--api-key", default=os.environ.get("MAGSAG_API_KEY"), help="API key")
+    load.add_argument(
+        "--output", type=Path, default=Path("benchmark_results.json"), help="JSON results file"
+    )
+    load.add_argument("--baseline", type=Path, help="Previous results JSON to compare against")
+    load.add_argument(
+        "--max-regression",
+        type=float,
+        default=10.0,
+        help="Allowed throughput/latency regression in percent",
+    )
+    load.set_defaults(handler=_cmd_load)
+
+    golden = subparsers.add_parser("golden", help="Run golden test cases")
+    golden.add_argument("--golden-dir", type=Path, default=REPO_ROOT / "tests" / "golden")
+    golden.set_defaults(handler=_cmd_golden)
+
+    args = parser.parse_args(argv)
+    if args.command is None:
+        args = parser.parse_args(["load", *(argv or [])])
+
+    logging.basicConfig(level=logging.WARNING)
+    sys.exit(args.handler(args))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""Benchmark script for tool permission evaluation.
+
+Builds a synthetic policy with a large number of context rules and
+measures compiled evaluation throughput for context-free and
+rule-dependent tools.
+"""
+
+from __future__ import annotations
+
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from magsag.governance.permission_evaluator import PermissionEvaluator
+
+
+def build_policy(num_rules: int) -> dict[str, Any]:
+    """Build a synthetic policy with num_rules context rules.
+
+    Args:
+        num_rules: Number of context rules to generate
+
+    Returns:
+        Policy dictionary in tool_permissions.yaml format
+    """
+    rules: list[dict[str, Any]] = []
+    for i in range(num_rules):
+        if i % 3 == 0:
+            condition: dict[str, Any] = {
+                "tool": f"server{i % 50}.tool_{i}",
+                "args_match": {"path": f"/data/{i}/*"},
+            }
+        elif i % 3 == 1:
+            condition = {
+                "tool_pattern": f"server{i % 50}.op_{i}_*",
+                "args_match": {"row_count": {"less_than": 10}},
+            }
+        else:
+            condition = {
+                "tool_pattern": f"svc{i}.*",
+                "context_match": {"db_user": "*_readonly"},
+            }
+        rules.append({"name": f"rule_{i}", "condition": condition, "permission": "ALWAYS"})
+
+    return {
+        "default_permission": "REQUIRE_APPROVAL",
+        "tools": {f"server{i}.read_file": {"permission": "ALWAYS"} for i in range(50)},
+        "categories": {
+            "read_only": {"permission": "ALWAYS", "tools": ["*.get_*", "*.list_*"]},
+            "destructive": {"permission": "NEVER", "tools": ["*.delete_*", "*.drop_*"]},
+        },
+        "dangerous_patterns": [{"pattern": "*.delete_all_*", "permission": "NEVER"}],
+        "context_rules": rules,
+    }
+
+
+def benchmark_permissions(
+    num_rules: int = 1_000,
+    num_evaluations: int = 100_000,
+    num_tools: int = 500,
+    seed: int = 42,
+) -> dict[str, Any]:
+    """Benchmark permission evaluation.
+
+    Args:
+        num_rules: Number of context rules in the policy
+        num_evaluations: Number of evaluate() calls
+        num_tools: Number of distinct tool names in the workload
+        seed: Random seed for the workload
+
+    Returns:
+        Dictionary with benchmark results
+    """
+    print(f"\n{'=' * 60}")
+    print("Benchmarking PermissionEvaluator")
+    print(f"Rules: {num_rules:,} | Evaluations: {num_evaluations:,} | Tools: {num_tools:,}")
+    print(f"{'=' * 60}\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        policy_path = Path(tmp) / "tool_permissions.yaml"
+        policy_path.write_text(yaml.safe_dump(build_policy(num_rules)))
+
+        compile_start = time.perf_counter()
+        evaluator = PermissionEvaluator(policy_path=policy_path, environment="benchmark")
+        compile_ms = (time.perf_counter() - compile_start) * 1000
+
+    rng = random.Random(seed)
+    tools: list[str] = []
+    for i in range(num_tools):
+        kind = i % 4
+        if kind == 0:
+            tools.append(f"server{i % 50}.get_item_{i}")
+        elif kind == 1:
+            tools.append(f"server{i % 50}.read_file")
+        elif kind == 2:
+            rule = rng.randrange(0, num_rules, 3)
+            tools.append(f"server{rule % 50}.tool_{rule}")
+        else:
+            tools.append(f"svc{rng.randrange(2, num_rules, 3)}.query")
+
+    contexts = [
+        {},
+        {"tool_args": {"path": "/data/3/file", "row_count": 4}},
+        {"db_user": "app_readonly"},
+    ]
+    workload = [(rng.choice(tools), rng.choice(contexts)) for _ in range(num_evaluations)]
+
+    print(f"Evaluating {num_evaluations:,} tool calls...")
+    eval_start = time.perf_counter()
+    for tool_name, context in workload:
+        evaluator.evaluate(tool_name, context)
+    eval_time = time.perf_counter() - eval_start
+
+    rate = num_evaluations / eval_time
+    per_call_us = eval_time / num_evaluations * 1_000_000
+    info = evaluator.cache_info()
+
+    print(f"\n{'=' * 60}")
+    print("Evaluation Performance:")
+    print(f"{'=' * 60}")
+    print(f"  Policy compile: {compile_ms:.2f}ms")
+    print(f"  Total:          {eval_time * 1000:.2f}ms")
+    print(f"  Throughput:     {rate:,.0f} evaluations/sec")
+    print(f"  Per call:       {per_call_us:.2f}us")
+    print(f"  Cache:          {info.hits:,} hits / {info.misses:,} misses")
+    print(f"{'=' * 60}\n")
+
+    return {
+        "num_rules": num_rules,
+        "num_evaluations": num_evaluations,
+        "compile_ms": compile_ms,
+        "eval_time_sec": eval_time,
+        "evaluations_per_sec": rate,
+        "per_call_us": per_call_us,
+        "cache_hits": info.hits,
+        "cache_misses": info.misses,
+    }
+
+
+def main() -> None:
+    """Run benchmark."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark permission evaluation")
+    parser.add_argument("--rules", type=int, default=1_000, help="Number of context rules")
+    parser.add_argument("--evaluations", type=int, default=100_000, help="Number of evaluations")
+    parser.add_argument("--tools", type=int, default=500, help="Distinct tool names")
+
+    args = parser.parse_args()
+    benchmark_permissions(
+        num_rules=args.rules,
+        num_evaluations=args.evaluations,
+        num_tools=args.tools,
+    )
+
+
+if __name__ == "__main__":
+    main()
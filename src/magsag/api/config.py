@@ -27,6 +27,16 @@ class Settings(BaseSettings):
         default=10 * 1024 * 1024,
         description="Maximum allowed request body size in bytes",
     )
+    API_BATCH_MAX_ITEMS: int = Field(
+        default=1000,
+        ge=1,
+        description="Maximum number of items accepted by POST /runs:batch",
+    )
+    API_BATCH_MAX_CONCURRENCY: int = Field(
+        default=8,
+        ge=1,
+        description="Upper bound on the concurrency of one POST /runs:batch request",
+    )
 
     # Authentication
     API_KEY: str | None = Field(default=None, description="API key for authentication (optional)")
@@ -71,6 +81,22 @@ class Settings(BaseSettings):
         default=None, description="Archive destination URI (e.g., s3://bucket/prefix)"
     )
 
+    # Idempotency
+    IDEMPOTENCY_BACKEND: str = Field(
+        default="memory",
+        description="Idempotency key store: 'memory' (per process) or 'storage' (shared)",
+    )
+    IDEMPOTENCY_TTL_SECONDS: int = Field(
+        default=86400, description="How long cached idempotent responses are replayed"
+    )
+    IDEMPOTENCY_MAX_ENTRIES: int = Field(
+        default=10_000, description="Maximum cached responses held by the memory store"
+    )
+    IDEMPOTENCY_MAX_BYTES: int = Field(
+        default=64 * 1024 * 1024,
+        description="Maximum response bytes held by the memory store",
+    )
+
     # Rate limiting
     RATE_LIMIT_QPS: int | None = Field(
         default=None, description="Rate limit in queries per second (optional)"
@@ -78,6 +104,21 @@ class Settings(BaseSettings):
     REDIS_URL: str | None = Field(
         default=None, description="Redis URL for distributed rate limiting (optional)"
     )
+    RATE_LIMIT_BACKEND: str | None = Field(
+        default=None,
+        description="Rate limit store: memory, sqlite or redis (default: redis if REDIS_URL set)",
+    )
+    RATE_LIMIT_DB_PATH: str = Field(
+        default=".magsag/rate_limit.db",
+        description="SQLite file shared by workers when RATE_LIMIT_BACKEND=sqlite",
+    )
+
+    # Metrics
+    METRICS_ENABLED: bool = Field(default=True, description="Expose GET /metrics")
+    METRICS_MULTIPROC_DIR: str | None = Field(
+        default=None,
+        description="Directory shared by uvicorn workers to aggregate metrics (e.g. /dev/shm/magsag)",
+    )
 
     # GitHub integration
     GITHUB_WEBHOOK_SECRET: str | None = Field(
@@ -103,6 +144,15 @@ class Settings(BaseSettings):
     MEMORY_ENABLED: bool = Field(
         default=False, description="Enable memory IR layer"
     )
+    MEMORY_EMBEDDING_DIM: int | None = Field(
+        default=None,
+        description="Embedding dimension of memory entries; enables the pgvector HNSW index",
+    )
+    MEMORY_SWEEP_INTERVAL_S: float = Field(
+        default=300.0,
+        ge=0,
+        description="Seconds between expired-memory sweeps run by the API server (0 disables)",
+    )
     APPROVAL_TTL_MIN: int = Field(
         default=30, description="Approval ticket time-to-live in minutes"
     )
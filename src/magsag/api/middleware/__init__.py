@@ -1,5 +1,20 @@
 """API middleware components."""
 
-from .idempotency import IdempotencyMiddleware
+from .idempotency import (
+    IdempotencyBackend,
+    IdempotencyMiddleware,
+    IdempotencyStore,
+    StorageIdempotencyStore,
+    create_idempotency_store,
+)
+from .request_size import RequestBodyTooLarge, RequestSizeLimitMiddleware
 
-__all__ = ["IdempotencyMiddleware"]
+__all__ = [
+    "IdempotencyBackend",
+    "IdempotencyMiddleware",
+    "IdempotencyStore",
+    "RequestBodyTooLarge",
+    "RequestSizeLimitMiddleware",
+    "StorageIdempotencyStore",
+    "create_idempotency_store",
+]
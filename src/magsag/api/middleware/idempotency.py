@@ -6,33 +6,151 @@ and prevent duplicate requests. Duplicate requests return a 409 Conflict respons
 
 import asyncio
 import hashlib
+import heapq
 import json
+import logging
 import time
-from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple, cast
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import AbstractAsyncContextManager, AsyncExitStack, asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import (
+    TYPE_CHECKING,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+
+from starlette.datastructures import URL, Headers
+from starlette.requests import ClientDisconnect
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from magsag.observability.metrics import get_metrics_registry
+
+if TYPE_CHECKING:  # pragma: no cover - typing aid
+    from magsag.api.config import Settings
+    from magsag.storage.base import StorageBackend
+
+logger = logging.getLogger(__name__)
+
+RawHeaders = List[Tuple[bytes, bytes]]
+StoredResponse = Tuple[str, bytes, int, RawHeaders]
+
+
+class _KeyLock:
+    __slots__ = ("lock", "users")
+
+    def __init__(self) -> None:
+        self.lock = asyncio.Lock()
+        self.users = 0
+
+
+class _KeyLocks:
+    """Per-key asyncio locks that are dropped once nobody holds or awaits them."""
+
+    def __init__(self) -> None:
+        self._locks: Dict[str, _KeyLock] = {}
+
+    def __len__(self) -> int:
+        return len(self._locks)
+
+    @asynccontextmanager
+    async def hold(self, key: str) -> AsyncIterator[None]:
+        entry = self._locks.get(key)
+        if entry is None:
+            entry = self._locks[key] = _KeyLock()
+        entry.users += 1
+        try:
+            async with entry.lock:
+                yield
+        finally:
+            entry.users -= 1
+            if entry.users == 0:
+                del self._locks[key]
+
+
+class IdempotencyBackend(ABC):
+    """Storage interface used by IdempotencyMiddleware.
+
+    ``lock`` serialises requests sharing a key; while it is held, ``lookup``
+    and ``save`` read and record the cached response for that key.
+    """
 
-from fastapi import Request, Response
-from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+    @abstractmethod
+    def lock(self, key: str) -> AbstractAsyncContextManager[None]:
+        """Return an async context manager granting exclusive use of ``key``."""
 
+    @abstractmethod
+    async def lookup(self, key: str) -> Optional[StoredResponse]:
+        """Return (request_hash, body, status_code, raw_headers) if cached."""
 
-class IdempotencyStore:
+    @abstractmethod
+    async def save(
+        self,
+        key: str,
+        request_hash: str,
+        response_body: bytes,
+        status_code: int,
+        raw_headers: RawHeaders,
+    ) -> None:
+        """Cache the response for ``key``."""
+
+    @abstractmethod
+    async def purge_expired(self) -> int:
+        """Remove expired entries and return how many were removed."""
+
+
+class IdempotencyStore(IdempotencyBackend):
     """In-memory store for idempotency keys and request hashes.
 
-    Stores tuples of (request_hash, response_body_bytes, status_code, raw_headers, timestamp)
-    keyed by idempotency key. Headers are stored as raw tuples to preserve multi-value headers.
+    Entries are kept in LRU order and bounded by ``max_entries`` and
+    ``max_bytes``; a heap ordered by expiry lets expired entries be dropped
+    without scanning the whole store. Headers are stored as raw tuples to
+    preserve multi-value headers.
     """
 
-    def __init__(self, ttl_seconds: int = 86400):  # 24 hours default
+    def __init__(
+        self,
+        ttl_seconds: int = 86400,  # 24 hours default
+        max_entries: int = 10_000,
+        max_bytes: int = 64 * 1024 * 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ):
         """Initialize the idempotency store.
 
         Args:
             ttl_seconds: Time-to-live for stored entries in seconds
+            max_entries: Maximum number of cached responses
+            max_bytes: Maximum total size of cached responses in bytes
+            clock: Monotonic time source (injectable for tests)
         """
-        self._store: Dict[str, Tuple[str, bytes, int, List[Tuple[bytes, bytes]], float]] = {}
+        # key -> (request_hash, body, status_code, raw_headers, expires_at, size)
+        self._store: OrderedDict[
+            str, Tuple[str, bytes, int, RawHeaders, float, int]
+        ] = OrderedDict()
+        self._expiry: List[Tuple[float, str]] = []
+        self._bytes = 0
         self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._clock = clock
+        self._locks = _KeyLocks()
 
-    def get(self, key: str) -> Optional[Tuple[str, bytes, int, List[Tuple[bytes, bytes]]]]:
+    def __len__(self) -> int:
+        return len(self._store)
+
+    @property
+    def size_bytes(self) -> int:
+        """Approximate number of bytes held by cached responses."""
+        return self._bytes
+
+    def get(self, key: str) -> Optional[StoredResponse]:
         """Get stored request hash and response metadata for a given idempotency key.
 
         Args:
@@ -43,16 +161,16 @@ class IdempotencyStore:
             if found and not expired, None otherwise. raw_headers is a list of
             (name_bytes, value_bytes) tuples.
         """
-        if key not in self._store:
+        entry = self._store.get(key)
+        if entry is None:
             return None
 
-        request_hash, response_body, status_code, raw_headers, timestamp = self._store[key]
-
-        # Check if expired
-        if time.time() - timestamp > self._ttl:
-            del self._store[key]
+        request_hash, response_body, status_code, raw_headers, expires_at, _ = entry
+        if expires_at <= self._clock():
+            self._remove(key)
             return None
 
+        self._store.move_to_end(key)
         return (request_hash, response_body, status_code, raw_headers)
 
     def set(
@@ -61,10 +179,14 @@ class IdempotencyStore:
         request_hash: str,
         response_body: bytes,
         status_code: int,
-        raw_headers: List[Tuple[bytes, bytes]],
+        raw_headers: RawHeaders,
     ) -> None:
         """Store an idempotency key with its request hash and response metadata.
 
+        Least recently used entries are evicted when the store exceeds its
+        entry or byte budget. Responses larger than the byte budget are not
+        stored.
+
         Args:
             key: The idempotency key
             request_hash: Hash of the request body
@@ -73,286 +195,434 @@ class IdempotencyStore:
             raw_headers: Raw headers as list of (name_bytes, value_bytes) tuples,
                         preserving multi-value headers like Set-Cookie
         """
-        self._store[key] = (request_hash, response_body, status_code, raw_headers, time.time())
+        size = (
+            len(key)
+            + len(request_hash)
+            + len(response_body)
+            + sum(len(name) + len(value) for name, value in raw_headers)
+        )
+        if key in self._store:
+            self._remove(key)
+        if size > self._max_bytes:
+            logger.debug("Not caching idempotent response for %s (%d bytes)", key, size)
+            return
+
+        expires_at = self._clock() + self._ttl
+        self._store[key] = (request_hash, response_body, status_code, raw_headers, expires_at, size)
+        self._bytes += size
+        heapq.heappush(self._expiry, (expires_at, key))
+
+        self.cleanup_expired()
+        while len(self._store) > self._max_entries or self._bytes > self._max_bytes:
+            oldest = next(iter(self._store))
+            self._remove(oldest)
+
+        # Heap entries for replaced or evicted keys are skipped lazily; rebuild
+        # once they dominate so the heap stays proportional to the store.
+        if len(self._expiry) > 2 * len(self._store) + 64:
+            self._expiry = [(entry[4], k) for k, entry in self._store.items()]
+            heapq.heapify(self._expiry)
+
+    def cleanup_expired(self) -> int:
+        """Remove expired entries from the store.
+
+        Returns:
+            Number of entries removed
+        """
+        now = self._clock()
+        removed = 0
+        while self._expiry and self._expiry[0][0] <= now:
+            expires_at, key = heapq.heappop(self._expiry)
+            entry = self._store.get(key)
+            if entry is not None and entry[4] == expires_at:
+                self._remove(key)
+                removed += 1
+        return removed
+
+    def _remove(self, key: str) -> None:
+        entry = self._store.pop(key)
+        self._bytes -= entry[5]
+
+    def lock(self, key: str) -> AbstractAsyncContextManager[None]:
+        return self._locks.hold(key)
+
+    async def lookup(self, key: str) -> Optional[StoredResponse]:
+        return self.get(key)
+
+    async def save(
+        self,
+        key: str,
+        request_hash: str,
+        response_body: bytes,
+        status_code: int,
+        raw_headers: RawHeaders,
+    ) -> None:
+        self.set(key, request_hash, response_body, status_code, raw_headers)
+
+    async def purge_expired(self) -> int:
+        return self.cleanup_expired()
 
-    def cleanup_expired(self) -> None:
-        """Remove expired entries from the store."""
-        current_time = time.time()
-        expired_keys = [
-            key
-            for key, (_, _, _, _, timestamp) in self._store.items()
-            if current_time - timestamp > self._ttl
-        ]
-        for key in expired_keys:
-            del self._store[key]
 
+class StorageIdempotencyStore(IdempotencyBackend):
+    """Idempotency store shared across processes through the storage backend.
+
+    Keys are claimed with an atomic upsert, so only one worker executes a
+    request for a given key; other workers poll until the response is
+    stored or the claim's lease lapses. Within a process, waiters queue on
+    a local lock instead of polling the database.
+    """
+
+    def __init__(
+        self,
+        storage: Optional["StorageBackend"] = None,
+        ttl_seconds: int = 86400,
+        lease_seconds: float = 600.0,
+        poll_interval: float = 0.05,
+        purge_every: int = 1000,
+        purge_batch: int = 1000,
+    ) -> None:
+        """Initialize the storage-backed store.
+
+        Args:
+            storage: Storage backend; defaults to the shared ``get_storage_backend()``
+            ttl_seconds: Time-to-live for cached responses in seconds
+            lease_seconds: How long an unfinished claim blocks other workers
+            poll_interval: Seconds between claim attempts while another worker runs
+            purge_every: Purge expired keys after this many saved responses
+            purge_batch: Maximum keys deleted per purge
+        """
+        self._storage = storage
+        self._ttl = ttl_seconds
+        self._lease = lease_seconds
+        self._poll_interval = poll_interval
+        self._purge_every = purge_every
+        self._purge_batch = purge_batch
+        self._saves = 0
+        self._locks = _KeyLocks()
+        self._owners: Dict[str, str] = {}
+
+    async def _get_storage(self) -> "StorageBackend":
+        if self._storage is None:
+            from magsag.storage import get_storage_backend
+
+            self._storage = await get_storage_backend()
+        if not self._storage.capabilities.idempotency:
+            raise RuntimeError("Storage backend does not support shared idempotency keys")
+        return self._storage
+
+    @asynccontextmanager
+    async def _hold(self, key: str) -> AsyncIterator[None]:
+        async with self._locks.hold(key):
+            storage = await self._get_storage()
+            owner = uuid.uuid4().hex
+            while True:
+                lease_expires_at = datetime.now(timezone.utc) + timedelta(seconds=self._lease)
+                state = await storage.claim_idempotency_key(key, owner, lease_expires_at)
+                if state == "claimed":
+                    self._owners[key] = owner
+                    break
+                if state == "completed":
+                    break
+                await asyncio.sleep(self._poll_interval)
 
-class IdempotencyMiddleware(BaseHTTPMiddleware):
-    """Middleware to handle idempotent requests.
+            try:
+                yield
+            finally:
+                # Claim still outstanding: the response was not cached, so let
+                # the next request with this key execute.
+                if self._owners.pop(key, None) == owner:
+                    await storage.release_idempotency_key(key, owner)
+
+    def lock(self, key: str) -> AbstractAsyncContextManager[None]:
+        return self._hold(key)
+
+    async def lookup(self, key: str) -> Optional[StoredResponse]:
+        storage = await self._get_storage()
+        record = await storage.get_idempotency_record(key)
+        if record is None:
+            return None
+        return (record.request_hash, record.body, record.status_code, list(record.headers))
+
+    async def save(
+        self,
+        key: str,
+        request_hash: str,
+        response_body: bytes,
+        status_code: int,
+        raw_headers: RawHeaders,
+    ) -> None:
+        from magsag.storage.models import IdempotencyRecord
+
+        owner = self._owners.pop(key, None)
+        if owner is None:
+            return
+        storage = await self._get_storage()
+        await storage.complete_idempotency_key(
+            IdempotencyRecord(
+                key=key,
+                request_hash=request_hash,
+                status_code=status_code,
+                headers=raw_headers,
+                body=response_body,
+                expires_at=datetime.now(timezone.utc) + timedelta(seconds=self._ttl),
+            ),
+            owner,
+        )
+
+        self._saves += 1
+        if self._saves % self._purge_every == 0:
+            await self.purge_expired()
+
+    async def purge_expired(self) -> int:
+        storage = await self._get_storage()
+        return await storage.purge_expired_idempotency_keys(limit=self._purge_batch)
+
+
+def create_idempotency_store(settings: "Settings") -> IdempotencyBackend:
+    """Create the idempotency store selected by settings.
+
+    Args:
+        settings: Application settings
+
+    Returns:
+        IdempotencyBackend instance
+
+    Raises:
+        ValueError: If IDEMPOTENCY_BACKEND is not recognised
+    """
+    backend = settings.IDEMPOTENCY_BACKEND.lower()
+    if backend == "memory":
+        return IdempotencyStore(
+            ttl_seconds=settings.IDEMPOTENCY_TTL_SECONDS,
+            max_entries=settings.IDEMPOTENCY_MAX_ENTRIES,
+            max_bytes=settings.IDEMPOTENCY_MAX_BYTES,
+        )
+    if backend == "storage":
+        return StorageIdempotencyStore(ttl_seconds=settings.IDEMPOTENCY_TTL_SECONDS)
+    raise ValueError(f"Unknown idempotency backend: {settings.IDEMPOTENCY_BACKEND}")
+
+
+def _read_body_key(body: bytes) -> Optional[str]:
+    """Return the ``idempotency_key`` field of a JSON body, if any."""
+    if b"idempotency_key" not in body:
+        return None
+    try:
+        body_json = json.loads(body.decode("utf-8"))
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        # Not JSON or can't decode - no idempotency key in body
+        return None
+    if isinstance(body_json, dict):
+        key = body_json.get("idempotency_key")
+        return key if isinstance(key, str) and key else None
+    return None
+
+
+async def _read_body(receive: Receive) -> bytes:
+    """Drain the request body from ``receive``."""
+    chunks: List[bytes] = []
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            raise ClientDisconnect()
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            return b"".join(chunks)
+
+
+def _replay_receive(body: bytes, receive: Receive) -> Receive:
+    """Serve an already-read body once, then defer to the original channel."""
+    consumed = False
+
+    async def wrapped() -> Message:
+        nonlocal consumed
+        if not consumed:
+            consumed = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return await receive()
+
+    return wrapped
+
+
+def _is_streaming_response(raw_headers: RawHeaders) -> bool:
+    """
+    Detect if a response is a streaming response that should not be cached.
+
+    Streaming responses are identified by:
+    - Media types like text/event-stream (Server-Sent Events) or NDJSON
+    - Lack of Content-Length header (chunked or open-ended bodies)
+
+    Args:
+        raw_headers: Headers of the ``http.response.start`` message
+
+    Returns:
+        True if the response is streaming and should not be cached
+    """
+    content_type = b""
+    has_content_length = False
+    for name, value in raw_headers:
+        lowered = name.lower()
+        if lowered == b"content-type":
+            content_type = value
+        elif lowered == b"content-length":
+            has_content_length = True
+    if b"text/event-stream" in content_type or b"application/x-ndjson" in content_type:
+        return True
+    # Without Content-Length, be conservative and treat the body as a stream
+    # to avoid buffering potentially large responses
+    return not has_content_length
+
+
+class IdempotencyMiddleware:
+    """ASGI middleware to handle idempotent requests.
 
     This middleware:
-    1. Checks for Idempotency-Key header in POST requests
+    1. Checks for an Idempotency-Key header (or JSON ``idempotency_key`` field) in POST requests
     2. Hashes the request body
     3. Compares with stored requests to detect duplicates
     4. Returns 409 Conflict for duplicate requests with different bodies
     5. Returns cached response for exact duplicate requests
+
+    Requests without a key pass straight through; only keyed requests have
+    their body buffered and their (non-streaming, 2xx) response captured.
+    Response chunks are forwarded as they are produced, never held back.
     """
 
-    def __init__(self, app: ASGIApp, store: Optional[IdempotencyStore] = None) -> None:
+    def __init__(self, app: ASGIApp, store: Optional[IdempotencyBackend] = None) -> None:
         """Initialize the idempotency middleware.
 
         Args:
-            app: The FastAPI application
+            app: The ASGI application
             store: Optional custom idempotency store, creates default if None
         """
-        super().__init__(app)
-        self._store = store or IdempotencyStore()
-        # Track locks per idempotency key to prevent concurrent execution
-        self._locks: Dict[str, asyncio.Lock] = {}
-        # Lock to synchronize access to _locks dictionary
-        self._locks_lock = asyncio.Lock()
-        # Counter for periodic lock cleanup to prevent memory leaks
-        self._request_count = 0
-        self._cleanup_interval = 1000  # Clean up locks every N requests
-
-    async def dispatch(
-        self, request: Request, call_next: Callable[[Request], Awaitable[Response]]
-    ) -> Response:
-        """Process the request and apply idempotency logic.
-
-        Args:
-            request: The incoming request
-            call_next: The next middleware or endpoint handler
-
-        Returns:
-            Response from the endpoint or cached/conflict response
-        """
-        # Periodic cleanup to prevent lock memory leaks
-        self._request_count += 1
-        if self._request_count % self._cleanup_interval == 0:
-            # Clean up expired store entries and stale locks
-            self._store.cleanup_expired()
-            await self._cleanup_locks()
-
+        self.app = app
+        self._store = store if store is not None else IdempotencyStore()
+        self._requests = get_metrics_registry().counter(
+            "magsag_idempotency_requests_total",
+            "Requests carrying an idempotency key by outcome (executed, replayed, conflict, stored)",
+            ["outcome"],
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         # Only apply to POST requests
-        if request.method != "POST":
-            return await call_next(request)
-
-        # Read and hash the request body
-        body = await request.body()
-        request_hash = hashlib.sha256(body).hexdigest()
+        if scope["type"] != "http" or scope["method"] != "POST":
+            await self.app(scope, receive, send)
+            return
 
-        # Check for Idempotency-Key in header (takes precedence) or in request body
-        idempotency_key = request.headers.get("Idempotency-Key")
+        # Idempotency-Key header takes precedence over the request body field
+        headers = Headers(scope=scope)
+        idempotency_key = headers.get("idempotency-key")
+        body: Optional[bytes] = None
 
         if not idempotency_key:
-            # Try to extract idempotency_key from JSON body
+            content_type = headers.get("content-type", "")
+            if content_type and "json" not in content_type:
+                # Only JSON bodies can carry an idempotency_key field
+                await self.app(scope, receive, send)
+                return
             try:
-                body_json = json.loads(body.decode("utf-8"))
-                if isinstance(body_json, dict):
-                    idempotency_key = body_json.get("idempotency_key")
-            except (json.JSONDecodeError, UnicodeDecodeError, AttributeError):
-                # Not JSON or can't decode - no idempotency key in body
-                pass
-
-        if not idempotency_key:
-            # No idempotency key in header or body, process normally
-            return await call_next(request)
+                body = await _read_body(receive)
+            except ClientDisconnect:
+                return  # Nobody is left to answer
+            idempotency_key = _read_body_key(body)
+            if not idempotency_key:
+                # No idempotency key in header or body, process normally
+                await self.app(scope, _replay_receive(body, receive), send)
+                return
+
+        if body is None:
+            try:
+                body = await _read_body(receive)
+            except ClientDisconnect:
+                return  # Nobody is left to answer
+        request_hash = hashlib.sha256(body).hexdigest()
 
         # Scope the idempotency key to the endpoint (method + path) to prevent collisions
         # across different endpoints. Without this, POST /runs and POST /github could
         # conflict if they use the same idempotency key.
-        scoped_key = f"{request.method}:{request.url.path}:{idempotency_key}"
-
-        # Get or create a lock for this scoped idempotency key to prevent concurrent execution
-        async with self._locks_lock:
-            if scoped_key not in self._locks:
-                self._locks[scoped_key] = asyncio.Lock()
-            key_lock = self._locks[scoped_key]
+        scoped_key = f"POST:{URL(scope=scope).path}:{idempotency_key}"
 
-        # Acquire the key-specific lock to ensure only one request with this key executes
-        async with key_lock:
+        # Acquire the key-specific lock to ensure only one request with this key executes.
+        # It is released early, once the response is stored (see _capturing_send).
+        async with AsyncExitStack() as key_lock:
+            await key_lock.enter_async_context(self._store.lock(scoped_key))
             # Double-check if the response is now in the store
             # (another request may have completed while we waited for the lock)
-            stored = self._store.get(scoped_key)
+            stored = await self._store.lookup(scoped_key)
             if stored:
                 stored_hash, stored_body, stored_status, raw_headers = stored
 
                 if stored_hash != request_hash:
                     # Same key, different body - conflict
-                    return JSONResponse(
+                    conflict = JSONResponse(
                         status_code=409,
                         content={
                             "code": "conflict",
-                            "message": "Idempotency key already used with different request body"
-                        }
+                            "message": "Idempotency key already used with different request body",
+                        },
                     )
-
-                # Exact duplicate - return cached response with original status code and headers
-                # Add X-Idempotency-Replay header to indicate this is a cached response
-                # Note: We do NOT re-run background tasks for replayed responses,
-                # as they already executed with the original request
-
-                # Extract media_type from raw headers for response reconstruction
-                media_type = None
-                for header_name, header_value in raw_headers:
-                    if header_name.lower() == b"content-type":
-                        media_type = header_value.decode("latin-1")
-                        break
-
-                # Create response without headers first
-                response = Response(
-                    content=stored_body,
-                    status_code=stored_status,
-                    media_type=media_type,
-                    # background=None by default - tasks already ran with original request
+                    self._requests.labels("conflict").inc()
+                    await conflict(scope, receive, send)
+                    return
+
+                # Exact duplicate - replay the original status code and raw headers
+                # (preserving multi-value headers like Set-Cookie) with
+                # X-Idempotency-Replay. Background tasks are not re-run; they
+                # already executed with the original request.
+                self._requests.labels("replayed").inc()
+                await send(
+                    {
+                        "type": "http.response.start",
+                        "status": stored_status,
+                        "headers": [*raw_headers, (b"x-idempotency-replay", b"true")],
+                    }
                 )
+                await send({"type": "http.response.body", "body": stored_body})
+                return
 
-                # Manually set raw_headers to preserve multi-value headers like Set-Cookie
-                # We need to reconstruct the response's internal headers structure
-                # Use Response.raw_headers property and replace it with our stored headers
-                # Add X-Idempotency-Replay header
-                response_raw_headers = list(raw_headers)  # Make a copy
-                response_raw_headers.append((b"x-idempotency-replay", b"true"))
-
-                # Replace the response's internal headers
-                # We access the private _headers attribute to set raw headers directly
-                response.raw_headers = response_raw_headers
-
-                return response
-
-            # Process the request normally
-            # We need to reconstruct the request with the body we already read
-            async def receive() -> Dict[str, object]:
-                return {
-                    "type": "http.request",
-                    "body": body,
-                    "more_body": False,  # We've already read the entire body
-                }
-
-            request._receive = receive
-
-            response = await call_next(request)
-
-            # Store successful responses (2xx status codes)
-            if 200 <= response.status_code < 300:
-                # Check if this is a streaming response
-                # Streaming responses typically lack Content-Length or have streaming media types
-                is_streaming = self._is_streaming_response(response)
-
-                if is_streaming:
-                    # Don't cache streaming responses - pass through directly
-                    # Streaming responses (SSE, websockets, large file downloads) are typically
-                    # not idempotent and should not be buffered in memory
-                    return response
-
-                # Read response body to cache it (only for non-streaming responses)
-                response_body = await self._collect_response_body(response)
-
-                # Store in idempotency cache with raw headers to preserve multi-value headers
-                # response.raw_headers is a list of (bytes, bytes) tuples that correctly
-                # preserves headers like Set-Cookie which can appear multiple times
-                # Use scoped_key to prevent collisions across different endpoints
-                self._store.set(
-                    scoped_key,
-                    request_hash,
-                    response_body,
-                    response.status_code,
-                    list(response.raw_headers),  # Store as list to allow mutations
-                )
+            self._requests.labels("executed").inc()
+            await self.app(
+                scope,
+                _replay_receive(body, receive),
+                self._capturing_send(send, scoped_key, request_hash, key_lock.aclose),
+            )
 
-                # Return response with reconstructed body and preserved background tasks
-                # Create new response and preserve raw_headers to maintain multi-value headers
-                new_response = Response(
-                    content=response_body,
-                    status_code=response.status_code,
-                    media_type=response.media_type,
-                    background=response.background,  # Preserve background tasks
+    def _capturing_send(
+        self,
+        send: Send,
+        scoped_key: str,
+        request_hash: str,
+        release: Callable[[], Awaitable[None]],
+    ) -> Send:
+        """Forward response messages, storing complete 2xx non-streaming responses."""
+        status_code = 0
+        raw_headers: RawHeaders = []
+        chunks: List[bytes] = []
+        cacheable = False
+
+        async def wrapped(message: Message) -> None:
+            nonlocal status_code, raw_headers, cacheable
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                raw_headers = [(bytes(k), bytes(v)) for k, v in message.get("headers", [])]
+                cacheable = 200 <= status_code < 300 and not _is_streaming_response(raw_headers)
+                await send(message)
+                return
+
+            await send(message)
+            if not cacheable or message["type"] != "http.response.body":
+                return
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                # Store and release the key before any background tasks run so
+                # waiting duplicates are answered as soon as the response is complete
+                await self._store.save(
+                    scoped_key, request_hash, b"".join(chunks), status_code, raw_headers
                 )
+                self._requests.labels("stored").inc()
+                await release()
 
-                # Set raw_headers directly to preserve multi-value headers like Set-Cookie
-                new_response.raw_headers = list(response.raw_headers)
-
-                return new_response
-
-            # Non-2xx responses are not cached, return as-is
-            return response
+        return wrapped
 
-    async def _collect_response_body(self, response: Response) -> bytes:
-        """Collect response body for caching."""
-        body_iterator = getattr(response, "body_iterator", None)
-        if body_iterator is not None:
-            iterator = cast(AsyncIterator[bytes], body_iterator)
-            body = bytearray()
-            async for chunk in iterator:
-                body.extend(chunk)
-            return bytes(body)
-
-        body_attr = getattr(response, "body", b"")
-        if isinstance(body_attr, (bytes, bytearray)):
-            return bytes(body_attr)
-        if isinstance(body_attr, str):
-            return body_attr.encode("utf-8")
-        return bytes(str(body_attr), "utf-8")
-
-    def _is_streaming_response(self, response: Response) -> bool:
-        """
-        Detect if a response is a streaming response that should not be cached.
-
-        Streaming responses are identified by:
-        - Lack of Content-Length header
-        - Media types like text/event-stream (Server-Sent Events)
-        - Transfer-Encoding: chunked
-
-        Args:
-            response: The response to check
-
-        Returns:
-            True if the response is streaming and should not be cached
-        """
-        # Check for SSE or other streaming media types
-        content_type = response.headers.get("content-type", "")
-        if "text/event-stream" in content_type or "application/x-ndjson" in content_type:
-            return True
-
-        # Check if Content-Length is missing (typical for streaming)
-        # Presence of Content-Length usually indicates a complete, non-streaming response
-        has_content_length = "content-length" in response.headers
-
-        # Check for chunked transfer encoding
-        transfer_encoding = response.headers.get("transfer-encoding", "")
-        is_chunked = "chunked" in transfer_encoding.lower()
-
-        # If no content-length and chunked encoding, it's likely streaming
-        if not has_content_length and is_chunked:
-            return True
-
-        # If no content-length at all, be conservative and treat as streaming
-        # to avoid buffering potentially large responses
-        if not has_content_length:
-            return True
-
-        return False
-
-    def cleanup_expired(self) -> None:
+    async def cleanup_expired(self) -> int:
         """Manually trigger cleanup of expired idempotency entries."""
-        self._store.cleanup_expired()
-
-    async def _cleanup_locks(self) -> None:
-        """Clean up locks for keys that are no longer in the store.
-
-        This prevents memory leaks by removing lock objects for idempotency keys
-        that have expired from the store. Only removes locks that are not currently
-        being held to avoid interfering with in-flight requests.
-        """
-        async with self._locks_lock:
-            # Find keys that exist in locks but not in store
-            store_keys = set(self._store._store.keys())
-            lock_keys = set(self._locks.keys())
-            stale_keys = lock_keys - store_keys
-
-            # Remove locks that are not currently held
-            for key in stale_keys:
-                lock = self._locks.get(key)
-                if lock and not lock.locked():
-                    del self._locks[key]
+        return await self._store.purge_expired()
@@ -0,0 +1,87 @@
+"""Request body size enforcement as a pure ASGI middleware.
+
+Requests are rejected from the ``Content-Length`` header when possible;
+bodies without one (chunked uploads) are counted while ``receive()`` streams
+them, so oversized payloads are refused without buffering them.
+"""
+
+from __future__ import annotations
+
+from fastapi import HTTPException
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class RequestBodyTooLarge(HTTPException):
+    """Raised from ``receive()`` once a streamed body exceeds the limit."""
+
+    def __init__(self) -> None:
+        super().__init__(
+            status_code=413,
+            detail={"code": "invalid_payload", "message": "Request body too large"},
+        )
+
+
+class RequestSizeLimitMiddleware:
+    """Reject requests whose body exceeds ``max_bytes``."""
+
+    def __init__(self, app: ASGIApp, max_bytes: int) -> None:
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        header_value = Headers(scope=scope).get("content-length")
+        if header_value is not None:
+            try:
+                content_length = int(header_value)
+            except ValueError:
+                response = JSONResponse(
+                    status_code=400,
+                    content={"code": "invalid_payload", "message": "Invalid Content-Length header"},
+                )
+                await response(scope, receive, send)
+                return
+            if content_length > self.max_bytes:
+                response = JSONResponse(
+                    status_code=413,
+                    content={"code": "invalid_payload", "message": "Request body too large"},
+                )
+                await response(scope, receive, send)
+                return
+
+        received = 0
+        response_started = False
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    raise RequestBodyTooLarge()
+            return message
+
+        async def tracking_send(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except RequestBodyTooLarge as exc:
+            # Raised outside the router (e.g. while another middleware reads
+            # the body); inside it, the app's exception handler answers.
+            if response_started:
+                raise
+            await JSONResponse(status_code=exc.status_code, content=exc.detail)(
+                scope, receive, send
+            )
+
+
+__all__ = ["RequestBodyTooLarge", "RequestSizeLimitMiddleware"]
@@ -63,6 +63,28 @@ class CreateRunRequest(BaseModel):
     )
 
 
+class BatchRunItem(BaseModel):
+    """One input of a POST /runs:batch request."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    agent: str | None = Field(
+        default=None, description="Agent slug (defaults to the batch-level agent)"
+    )
+    payload: dict[str, Any] = Field(..., description="Agent input payload conforming to contract")
+    id: str | None = Field(default=None, description="Optional caller-side item identifier")
+
+
+class BatchRunRequest(BaseModel):
+    """Request payload for executing many agent runs via POST /runs:batch."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    agent: str | None = Field(default=None, description="Default agent slug for all items")
+    items: list[BatchRunItem] = Field(..., min_length=1, description="Inputs, run in order")
+    concurrency: int = Field(default=4, ge=1, description="Concurrent agent runs")
+
+
 class CreateRunResponse(BaseModel):
     """Response from creating a new agent run."""
 
@@ -1,74 +1,244 @@
 """Rate limiting for API endpoints.
 
-Provides both in-memory and Redis-based rate limiting.
+Provides in-memory, SQLite-backed (shared across workers on one host) and
+Redis-based rate limiting. Limits are token buckets holding one second of
+burst; routes may charge more than one token per request.
 """
 
 from __future__ import annotations
 
 import logging
+import sqlite3
 import time
-from collections import defaultdict
+from functools import lru_cache, partial
+from pathlib import Path
 from threading import Lock
-from typing import Any
+from typing import Any, Awaitable, Callable
 
+from anyio import sleep, to_thread
 from fastapi import Depends, HTTPException, Request, status
 
+from magsag.observability.metrics import Counter, get_metrics_registry
+
 from .config import Settings, get_settings
+from .security import get_scopes_for_key
 
 logger = logging.getLogger(__name__)
 
+# Token cost of routes that start agent executions, relative to reads (1)
+RUN_COST = 5
+
+# Scope prefix granting a per-key quota, e.g. "rate_limit:50" or "rate_limit:unlimited"
+RATE_LIMIT_SCOPE_PREFIX = "rate_limit:"
+UNLIMITED_QPS = 0
+
+# How long a SQLite check waits for another worker's write before failing open
+SQLITE_BUSY_TIMEOUT_MS = 50
+
+
+def _rate_limit_exceeded(qps: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail={
+            "code": "rate_limit_exceeded",
+            "message": f"Rate limit exceeded. Maximum {qps} requests per second.",
+        },
+    )
+
+
+class _BucketShard:
+    """Buckets for a subset of keys, guarded by their own lock."""
+
+    __slots__ = ("lock", "buckets", "last_sweep")
+
+    def __init__(self, now: float) -> None:
+        self.lock = Lock()
+        # key -> [tokens, last_update]
+        self.buckets: dict[str, list[float]] = {}
+        self.last_sweep = now
+
 
 class InMemoryRateLimiter:
     """
-    Simple in-memory token bucket rate limiter.
+    In-memory token bucket rate limiter.
 
-    Thread-safe for single-process deployments.
-    For multi-process/distributed deployments, use RedisRateLimiter.
+    Thread-safe for single-process deployments. Keys are spread over
+    independently locked shards, and buckets idle long enough to have
+    refilled are evicted. For multi-process deployments, use
+    SQLiteRateLimiter (one host) or RedisRateLimiter.
     """
 
-    def __init__(self, qps: int):
+    def __init__(self, qps: int, shards: int = 16, idle_seconds: float = 60.0):
         """
         Initialize rate limiter.
 
         Args:
             qps: Queries per second allowed
+            shards: Number of independently locked bucket shards
+            idle_seconds: Evict buckets not touched for this long
         """
         self.qps = qps
-        self.buckets: dict[str, dict[str, float]] = defaultdict(
-            lambda: {"tokens": float(qps), "last_update": time.time()}
-        )
-        self.lock = Lock()
+        self.idle_seconds = max(idle_seconds, 1.0)  # Buckets refill fully within 1s
+        now = time.monotonic()
+        self._shards = [_BucketShard(now) for _ in range(max(shards, 1))]
 
-    def check_rate_limit(self, key: str) -> None:
+    def __len__(self) -> int:
+        return sum(len(shard.buckets) for shard in self._shards)
+
+    def check_rate_limit(self, key: str, cost: int = 1, qps: int | None = None) -> None:
         """
         Check if request is within rate limit.
 
         Args:
             key: Identifier for rate limit bucket (e.g., IP address, API key)
+            cost: Tokens consumed by this request (capped at the bucket size)
+            qps: Per-key limit overriding the default
 
         Raises:
             HTTPException: 429 if rate limit exceeded
         """
-        with self.lock:
-            now = time.time()
-            bucket = self.buckets[key]
+        limit = qps if qps is not None else self.qps
+        needed = float(min(cost, limit))
+        shard = self._shards[hash(key) % len(self._shards)]
+
+        with shard.lock:
+            now = time.monotonic()
+            if now - shard.last_sweep >= self.idle_seconds:
+                self._sweep(shard, now)
+
+            bucket = shard.buckets.get(key)
+            if bucket is None:
+                bucket = shard.buckets[key] = [float(limit), now]
 
             # Refill tokens based on time elapsed
-            elapsed = now - bucket["last_update"]
-            bucket["tokens"] = min(self.qps, bucket["tokens"] + elapsed * self.qps)
-            bucket["last_update"] = now
+            tokens = min(float(limit), bucket[0] + (now - bucket[1]) * limit)
+            bucket[1] = now
 
-            # Check if token available
-            if bucket["tokens"] >= 1:
-                bucket["tokens"] -= 1
+            # Check if enough tokens available
+            if tokens >= needed:
+                bucket[0] = tokens - needed
             else:
-                raise HTTPException(
-                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                    detail={
-                        "code": "rate_limit_exceeded",
-                        "message": f"Rate limit exceeded. Maximum {self.qps} requests per second.",
-                    },
+                bucket[0] = tokens
+                raise _rate_limit_exceeded(limit)
+
+    def _sweep(self, shard: _BucketShard, now: float) -> None:
+        """Drop idle buckets; they would be full again, so nothing is lost."""
+        cutoff = now - self.idle_seconds
+        idle = [key for key, bucket in shard.buckets.items() if bucket[1] <= cutoff]
+        for key in idle:
+            del shard.buckets[key]
+        shard.last_sweep = now
+
+
+class SQLiteRateLimiter:
+    """
+    Token bucket rate limiter shared by processes on one host.
+
+    Buckets live in a SQLite database in WAL mode, so every uvicorn worker
+    pointing at the same file enforces one limit. Each check is a single
+    conditional upsert, which SQLite applies atomically.
+    """
+
+    def __init__(
+        self,
+        qps: int,
+        db_path: str | Path = ".magsag/rate_limit.db",
+        idle_seconds: float = 60.0,
+    ):
+        """
+        Initialize SQLite rate limiter.
+
+        Args:
+            qps: Queries per second allowed
+            db_path: Path to the shared SQLite database file
+            idle_seconds: Evict buckets not touched for this long
+        """
+        self.qps = qps
+        self.db_path = Path(db_path)
+        self.idle_seconds = max(idle_seconds, 1.0)
+        self._conn: sqlite3.Connection | None = None
+        self._lock = Lock()
+        self._last_sweep = time.time()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Lazy-open the shared database."""
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            # Fail open quickly rather than stall requests on a contended file
+            conn.execute(f"PRAGMA busy_timeout = {SQLITE_BUSY_TIMEOUT_MS}")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS rate_limit_buckets (
+                    key TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_rate_limit_updated ON rate_limit_buckets(updated_at)"
+            )
+            self._conn = conn
+        return self._conn
+
+    def check_rate_limit(self, key: str, cost: int = 1, qps: int | None = None) -> None:
+        """
+        Check if request is within rate limit.
+
+        Args:
+            key: Identifier for rate limit bucket
+            cost: Tokens consumed by this request (capped at the bucket size)
+            qps: Per-key limit overriding the default
+
+        Raises:
+            HTTPException: 429 if rate limit exceeded
+        """
+        limit = qps if qps is not None else self.qps
+        needed = float(min(cost, limit))
+        now = time.time()
+
+        try:
+            with self._lock:
+                conn = self.conn
+                cursor = conn.execute(
+                    """
+                    INSERT INTO rate_limit_buckets (key, tokens, updated_at)
+                    VALUES (:key, :limit - :cost, :now)
+                    ON CONFLICT(key) DO UPDATE SET
+                        tokens = MIN(:limit, tokens + MAX(:now - updated_at, 0) * :limit) - :cost,
+                        updated_at = :now
+                    WHERE MIN(:limit, tokens + MAX(:now - updated_at, 0) * :limit) >= :cost
+                    """,
+                    {"key": key, "limit": float(limit), "cost": needed, "now": now},
                 )
+                allowed = cursor.rowcount > 0
+
+                if now - self._last_sweep >= self.idle_seconds:
+                    conn.execute(
+                        "DELETE FROM rate_limit_buckets WHERE updated_at < ?",
+                        (now - self.idle_seconds,),
+                    )
+                    self._last_sweep = now
+        except sqlite3.Error:
+            # If the database is unavailable, allow request (fail open)
+            logger.warning(
+                "SQLite rate limit check failed; falling back to allow request", exc_info=True
+            )
+            return
+
+        if not allowed:
+            raise _rate_limit_exceeded(limit)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
 
 
 class RedisRateLimiter:
@@ -104,16 +274,19 @@ class RedisRateLimiter:
                 ) from e
         return self._redis
 
-    def check_rate_limit(self, key: str) -> None:
+    def check_rate_limit(self, key: str, cost: int = 1, qps: int | None = None) -> None:
         """
         Check if request is within rate limit using Redis with atomic Lua script.
 
         Args:
             key: Identifier for rate limit bucket
+            cost: Window slots consumed by this request (capped at the limit)
+            qps: Per-key limit overriding the default
 
         Raises:
             HTTPException: 429 if rate limit exceeded
         """
+        limit = qps if qps is not None else self.qps
         redis_key = f"rate_limit:{key}"
         now = time.time()
 
@@ -123,6 +296,7 @@ class RedisRateLimiter:
         local key = KEYS[1]
         local now = tonumber(ARGV[1])
         local qps = tonumber(ARGV[2])
+        local cost = tonumber(ARGV[3])
         local window_start = now - 1
 
         -- Remove old entries (older than 1 second)
@@ -132,15 +306,16 @@ class RedisRateLimiter:
         local count = redis.call('zcard', key)
 
         -- Check if limit exceeded
-        if count >= qps then
+        if count + cost > qps then
             return -1
         end
 
-        -- Add current request with unique member to avoid collision
-        -- Use timestamp + counter to ensure uniqueness
-        local seq = redis.call('incr', key .. ':seq')
-        local member = tostring(now) .. ':' .. tostring(seq)
-        redis.call('zadd', key, now, member)
+        -- Add one member per unit of cost, unique via timestamp + counter
+        for i = 1, cost do
+            local seq = redis.call('incr', key .. ':seq')
+            local member = tostring(now) .. ':' .. tostring(seq)
+            redis.call('zadd', key, now, member)
+        end
 
         -- Set expiry (2 seconds to ensure cleanup)
         redis.call('expire', key, 2)
@@ -150,16 +325,10 @@ class RedisRateLimiter:
         """
 
         try:
-            result = self.redis.eval(lua_script, 1, redis_key, now, self.qps)
+            result = self.redis.eval(lua_script, 1, redis_key, now, limit, min(cost, limit))
 
             if result == -1:
-                raise HTTPException(
-                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                    detail={
-                        "code": "rate_limit_exceeded",
-                        "message": f"Rate limit exceeded. Maximum {self.qps} requests per second.",
-                    },
-                )
+                raise _rate_limit_exceeded(limit)
         except HTTPException:
             # Re-raise rate limit exceeded (don't swallow it)
             raise
@@ -170,14 +339,16 @@ class RedisRateLimiter:
             )
 
 
+RateLimiter = InMemoryRateLimiter | SQLiteRateLimiter | RedisRateLimiter
+
 # Global rate limiter instance
-_rate_limiter: InMemoryRateLimiter | RedisRateLimiter | None = None
+_rate_limiter: RateLimiter | None = None
 _warned_inmemory = False
 
 
 def get_rate_limiter(
     settings: Settings | None = None,
-) -> InMemoryRateLimiter | RedisRateLimiter | None:
+) -> RateLimiter | None:
     """
     Get or create rate limiter instance.
 
@@ -186,6 +357,9 @@ def get_rate_limiter(
 
     Returns:
         Rate limiter instance or None if rate limiting is disabled
+
+    Raises:
+        ValueError: If RATE_LIMIT_BACKEND is not recognised
     """
     global _rate_limiter
 
@@ -196,28 +370,178 @@ def get_rate_limiter(
         return None
 
     if _rate_limiter is None:
-        if settings.REDIS_URL:
+        backend = (settings.RATE_LIMIT_BACKEND or "").lower()
+        if not backend:
+            backend = "redis" if settings.REDIS_URL else "memory"
+
+        if backend == "redis":
+            if not settings.REDIS_URL:
+                raise ValueError("REDIS_URL is required for the redis rate limit backend")
             _rate_limiter = RedisRateLimiter(settings.RATE_LIMIT_QPS, settings.REDIS_URL)
-        else:
+        elif backend == "sqlite":
+            _rate_limiter = SQLiteRateLimiter(settings.RATE_LIMIT_QPS, settings.RATE_LIMIT_DB_PATH)
+        elif backend == "memory":
             global _warned_inmemory
             if not _warned_inmemory:
                 logger.warning(
                     "Using in-memory rate limiting. "
-                    "Configure REDIS_URL for multi-process deployments."
+                    "Set RATE_LIMIT_BACKEND=sqlite or REDIS_URL for multi-process deployments."
                 )
                 _warned_inmemory = True
             _rate_limiter = InMemoryRateLimiter(settings.RATE_LIMIT_QPS)
+        else:
+            raise ValueError(f"Unknown rate limit backend: {settings.RATE_LIMIT_BACKEND}")
 
     return _rate_limiter
 
 
+def reset_rate_limiter() -> None:
+    """Drop the global limiter and cached quotas (e.g., after settings change)."""
+    global _rate_limiter
+    if isinstance(_rate_limiter, SQLiteRateLimiter):
+        _rate_limiter.close()
+    _rate_limiter = None
+    quota_for_key.cache_clear()
+
+
+@lru_cache(maxsize=1024)
+def quota_for_key(api_key: str) -> int | None:
+    """
+    Resolve the per-key rate limit granted through API key scopes.
+
+    Args:
+        api_key: Presented API key or bearer token
+
+    Returns:
+        Queries per second for the key, UNLIMITED_QPS if exempt, or None
+        to use the default limit
+    """
+    quota: int | None = None
+    for scope in get_scopes_for_key(api_key):
+        if not scope.startswith(RATE_LIMIT_SCOPE_PREFIX):
+            continue
+        value = scope[len(RATE_LIMIT_SCOPE_PREFIX) :]
+        if value == "unlimited":
+            return UNLIMITED_QPS
+        try:
+            qps = int(value)
+        except ValueError:
+            logger.warning("Ignoring malformed rate limit scope: %s", scope)
+            continue
+        if qps > 0:
+            quota = qps if quota is None else max(quota, qps)
+    return quota
+
+
+@lru_cache(maxsize=1)
+def _requests_counter() -> Counter:
+    return get_metrics_registry().counter(
+        "magsag_rate_limit_requests_total",
+        "Rate-limited API requests by outcome (allowed, limited, unlimited)",
+        ["outcome"],
+    )
+
+
+async def _enforce_rate_limit(
+    request: Request, settings: Settings, cost: int, *, wait_seconds: float = 0.0
+) -> None:
+    limiter = get_rate_limiter(settings)
+    if limiter is None:
+        return  # Rate limiting disabled
+    requests = _requests_counter()
+
+    # Prefer API key (if present) for per-credential limiting, fallback to client IP
+    identifier = request.headers.get("x-api-key")
+    if not identifier:
+        auth_header = request.headers.get("authorization")
+        if auth_header and " " in auth_header:
+            identifier = auth_header.split(" ", 1)[1]
+
+    qps: int | None = None
+    if identifier:
+        qps = quota_for_key(identifier)
+        if qps == UNLIMITED_QPS:
+            requests.labels("unlimited").inc()
+            return
+    else:
+        identifier = request.client.host if request.client else "unknown"
+
+    check = partial(limiter.check_rate_limit, identifier, cost=cost, qps=qps)
+    deadline = time.monotonic() + wait_seconds
+    while True:
+        try:
+            if isinstance(limiter, InMemoryRateLimiter):
+                check()
+            else:
+                # SQLite and Redis checks block on I/O; keep them off the event loop
+                await to_thread.run_sync(check)
+        except HTTPException:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                requests.labels("limited").inc()
+                raise
+            # Costs are capped at the bucket size, so this much refill always suffices
+            limit = qps if qps is not None else limiter.qps
+            await sleep(min(cost / limit, remaining))
+            continue
+        requests.labels("allowed").inc()
+        return
+
+
+async def charge_rate_limit(
+    request: Request, settings: Settings, cost: int, *, wait_seconds: float = 0.0
+) -> None:
+    """
+    Charge ``cost`` tokens for work whose cost is only known in the handler.
+
+    Like ``rate_limit(cost)`` the cost is capped at the bucket size. With
+    ``wait_seconds`` the call waits for the bucket to refill instead of
+    failing straight away, which lets long-running handlers pace their work.
+
+    Args:
+        request: FastAPI request
+        settings: API settings
+        cost: Tokens consumed
+        wait_seconds: How long to wait for tokens before giving up
+
+    Raises:
+        HTTPException: 429 if the tokens are still unavailable after waiting
+    """
+    await _enforce_rate_limit(request, settings, cost, wait_seconds=wait_seconds)
+
+
+def rate_limit(cost: int = 1) -> Callable[..., Awaitable[None]]:
+    """
+    Create a rate limiting dependency charging ``cost`` tokens per request.
+
+    Args:
+        cost: Tokens consumed per request (reads cost 1, runs cost RUN_COST)
+
+    Returns:
+        FastAPI dependency function
+
+    Example:
+        @router.post("/runs", dependencies=[Depends(rate_limit(RUN_COST))])
+        async def create_run():
+            ...
+    """
+    if cost < 1:
+        raise ValueError("Rate limit cost must be a positive integer")
+
+    async def dependency(request: Request, settings: Settings = Depends(get_settings)) -> None:
+        await _enforce_rate_limit(request, settings, cost)
+
+    return dependency
+
+
 async def rate_limit_dependency(
     request: Request, settings: Settings = Depends(get_settings)
 ) -> None:
     """
     FastAPI dependency for rate limiting.
 
-    Can be used with Depends() in route definitions.
+    Can be used with Depends() in route definitions. Charges one token per
+    request; use rate_limit(cost) for heavier routes.
 
     Args:
         request: FastAPI request
@@ -231,18 +555,4 @@ async def rate_limit_dependency(
         async def my_endpoint():
             ...
     """
-    limiter = get_rate_limiter(settings)
-    if limiter is None:
-        return  # Rate limiting disabled
-
-    # Prefer API key (if present) for per-credential limiting, fallback to client IP
-    identifier = request.headers.get("x-api-key")
-    if not identifier:
-        auth_header = request.headers.get("authorization")
-        if auth_header and " " in auth_header:
-            identifier = auth_header.split(" ", 1)[1]
-
-    if not identifier:
-        identifier = request.client.host if request.client else "unknown"
-
-    limiter.check_rate_limit(identifier)
+    await _enforce_rate_limit(request, settings, 1)
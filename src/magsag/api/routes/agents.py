@@ -16,7 +16,7 @@ from magsag.runners.agent_runner import invoke_mag
 
 from ..config import Settings, get_settings
 from ..models import AgentInfo, AgentRunRequest, AgentRunResponse
-from ..rate_limit import rate_limit_dependency
+from ..rate_limit import RUN_COST, rate_limit, rate_limit_dependency
 from ..run_tracker import find_new_run_id, snapshot_runs
 from ..security import require_scope
 
@@ -86,7 +86,7 @@ async def list_agents(
 @router.post(
     "/agents/{slug}/run",
     response_model=AgentRunResponse,
-    dependencies=[Depends(rate_limit_dependency)],
+    dependencies=[Depends(rate_limit(RUN_COST))],
 )
 async def run_agent(
     slug: str,
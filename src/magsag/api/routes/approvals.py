@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import asyncio
 from typing import Any, AsyncIterator, Literal, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
@@ -19,6 +18,9 @@ from ..security import require_scope
 
 router = APIRouter(tags=["approvals"])
 
+# Seconds between keepalive comments (and storage re-checks) on idle SSE streams
+SSE_KEEPALIVE_SECONDS = 15.0
+
 
 # Request/Response Models
 class ApprovalDecisionRequest(BaseModel):
@@ -360,35 +362,39 @@ async def stream_approval_events(
         """
         import json
 
-        # Send initial state
-        current_ticket = await approval_gate.get_ticket(approval_id)
-        if current_ticket:
-            event_data = ApprovalTicketResponse.from_ticket(current_ticket).model_dump()
-            yield "event: approval.required\n".encode("utf-8")
-            yield f"data: {json.dumps(event_data)}\n\n".encode("utf-8")
-
-        # Poll for updates
-        last_status = current_ticket.status if current_ticket else None
-        poll_interval = 2.0  # seconds
-
-        while True:
-            await asyncio.sleep(poll_interval)
-
+        # Subscribe before reading the initial state so no decision is missed
+        with approval_gate.notifier.subscribe(
+            approval_id, storage=approval_gate.ticket_store
+        ) as subscription:
+            # Send initial state
             current_ticket = await approval_gate.get_ticket(approval_id)
-            if current_ticket is None:
-                # Ticket was deleted
-                break
-
-            # Check if status changed
-            if current_ticket.status != last_status:
+            if current_ticket:
                 event_data = ApprovalTicketResponse.from_ticket(current_ticket).model_dump()
-                yield "event: approval.updated\n".encode("utf-8")
+                yield "event: approval.required\n".encode("utf-8")
                 yield f"data: {json.dumps(event_data)}\n\n".encode("utf-8")
 
-                last_status = current_ticket.status
+            last_status = current_ticket.status if current_ticket else None
+
+            while last_status not in ("approved", "denied", "expired"):
+                notified = await subscription.wait(timeout=SSE_KEEPALIVE_SECONDS)
+                if notified is None:
+                    # Keep proxies from closing the idle connection
+                    yield b": keepalive\n\n"
 
-                # If resolved or expired, close stream
-                if current_ticket.status in ("approved", "denied", "expired"):
+                # Re-read storage unless the change was applied in-process
+                current_ticket = await approval_gate.get_ticket(
+                    approval_id, refresh=notified != last_status
+                )
+                if current_ticket is None:
+                    # Ticket was deleted
                     break
 
+                # Check if status changed
+                if current_ticket.status != last_status:
+                    event_data = ApprovalTicketResponse.from_ticket(current_ticket).model_dump()
+                    yield "event: approval.updated\n".encode("utf-8")
+                    yield f"data: {json.dumps(event_data)}\n\n".encode("utf-8")
+
+                    last_status = current_ticket.status
+
     return StreamingResponse(sse_stream(), media_type="text/event-stream")
@@ -0,0 +1,33 @@
+"""Metrics exposition endpoint."""
+
+from __future__ import annotations
+
+from anyio import to_thread
+from fastapi import APIRouter, Depends
+from fastapi.responses import Response
+
+from magsag.observability.metrics import CONTENT_TYPE, get_metrics_registry
+
+from ..security import require_scope
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get(
+    "/metrics",
+    include_in_schema=False,
+    dependencies=[Depends(require_scope(["metrics:read"]))],
+)
+async def metrics() -> Response:
+    """
+    Render the metrics registry (merged across workers when shared) as OpenMetrics.
+
+    **Authorization**: Requires "metrics:read" scope when an API key is configured.
+    """
+    registry = get_metrics_registry()
+    if registry.multiprocess_dir is None:
+        body = registry.render()
+    else:
+        # Merging reads one file per worker; keep it off the event loop
+        body = await to_thread.run_sync(registry.render)
+    return Response(content=body, media_type=CONTENT_TYPE)
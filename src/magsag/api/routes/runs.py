@@ -10,6 +10,8 @@ import aiofiles
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.responses import StreamingResponse
 
+from magsag.observability.log_stream import follow_log, tail_lines
+
 from ..config import Settings, get_settings
 from ..models import RunSummary
 from ..rate_limit import rate_limit_dependency
@@ -117,45 +119,28 @@ async def get_logs(
         )
 
     if follow:
-        # Server-Sent Events for real-time streaming
+        # Server-Sent Events for real-time streaming; lines logged in this
+        # process are pushed, other writers are picked up from the file
         async def sse_stream() -> AsyncIterator[bytes]:
-            async with aiofiles.open(log_path, "r", encoding="utf-8") as f:
-                # Optionally send last N lines first
-                if tail:
-                    content = await f.read()
-                    lines = content.splitlines()[-tail:]
-                    for line in lines:
-                        yield f"data: {line}\n\n".encode("utf-8")
-                    # Seek to end for new lines
-                    await f.seek(0, 2)
-                else:
-                    # Start from current end
-                    await f.seek(0, 2)
-
-                # Follow new lines
-                while True:
-                    line = await f.readline()
-                    if line:
-                        yield f"data: {line.rstrip()}\n\n".encode("utf-8")
-                    else:
-                        await asyncio.sleep(0.5)
+            async for line in follow_log(log_path, tail=tail):
+                yield f"data: {line}\n\n".encode("utf-8")
 
         return StreamingResponse(sse_stream(), media_type="text/event-stream")
     else:
         # NDJSON response (all or tail)
         async def ndjson_stream() -> AsyncIterator[bytes]:
-            async with aiofiles.open(log_path, "r", encoding="utf-8") as f:
-                if tail:
-                    content = await f.read()
-                    lines = content.splitlines()[-tail:]
-                    for line in lines:
-                        yield (line + "\n").encode("utf-8")
-                else:
-                    # Stream entire file
-                    while True:
-                        chunk = await f.read(65536)  # 64KB chunks
-                        if not chunk:
-                            break
-                        yield chunk.encode("utf-8") if isinstance(chunk, str) else chunk
+            if tail:
+                lines, _ = await asyncio.to_thread(tail_lines, log_path, tail)
+                for line in lines:
+                    yield (line + "\n").encode("utf-8")
+                return
+
+            # Stream entire file
+            async with aiofiles.open(log_path, "rb") as f:
+                while True:
+                    chunk = await f.read(65536)  # 64KB chunks
+                    if not chunk:
+                        break
+                    yield chunk
 
         return StreamingResponse(ndjson_stream(), media_type="application/x-ndjson")
@@ -1,21 +1,25 @@
 """Routes for creating and managing agent runs.
 
 This module provides the POST /runs endpoint for initiating agent executions
-with idempotency support.
+with idempotency support, and POST /runs:batch for running many inputs on one
+warm runner.
 """
 
 from __future__ import annotations
 
+import json
 import time
+from collections.abc import AsyncIterator
 from pathlib import Path
 from typing import Any
 
 from anyio import to_thread
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
 
 from ..config import Settings, get_settings
-from ..models import CreateRunRequest, CreateRunResponse
-from ..rate_limit import rate_limit_dependency
+from ..models import BatchRunRequest, CreateRunRequest, CreateRunResponse
+from ..rate_limit import RUN_COST, charge_rate_limit, rate_limit
 from ..security import require_scope
 
 # Conditional import to avoid dependency on agent_runner if not available
@@ -37,6 +41,9 @@ except ImportError:
 
 router = APIRouter(tags=["runs"])
 
+# How long a batch item waits for rate limit tokens before it is failed
+BATCH_CHARGE_WAIT_SECONDS = 30.0
+
 
 def snapshot_runs(base: Path) -> set[str]:
     """Capture existing run directories before execution.
@@ -112,7 +119,7 @@ def find_new_run_id(
 @router.post(
     "/runs",
     response_model=CreateRunResponse,
-    dependencies=[Depends(rate_limit_dependency)],
+    dependencies=[Depends(rate_limit(RUN_COST))],
     summary="Create a new agent run",
     description="Execute an agent with the specified payload. Supports idempotency via Idempotency-Key header.",
 )
@@ -206,3 +213,79 @@ async def create_run(
         run_id=run_id,
         status=run_status,
     )
+
+
+@router.post(
+    "/runs:batch",
+    summary="Run an agent over many inputs",
+    description=(
+        "Execute every item on one warm runner with bounded concurrency. Results stream "
+        "back as NDJSON in input order; failed items are reported without aborting the batch."
+    ),
+    response_class=StreamingResponse,
+)
+async def create_batch_run(
+    req: BatchRunRequest,
+    request: Request,
+    _: str = Depends(require_scope(["agents:run"])),
+    settings: Settings = Depends(get_settings),
+) -> StreamingResponse:
+    """
+    Execute a batch of agent runs and stream their results.
+
+    **Authorization**: Requires "agents:run" scope. Each item costs RUN_COST
+    rate limit tokens, charged as it starts: the first item is charged before
+    the stream opens, later items wait up to BATCH_CHARGE_WAIT_SECONDS for the
+    bucket to refill and are reported as failed if it does not.
+
+    Args:
+        req: Items with agent slug and payload, default agent and concurrency
+        request: Incoming request (for rate limiting)
+        settings: API settings
+
+    Returns:
+        NDJSON stream with one result object per item
+
+    Raises:
+        HTTPException:
+            - 400: Too many items, or an item without an agent
+            - 429: Rate limit exceeded before the first item
+    """
+    from magsag.runners.agent_runner import get_runner
+    from magsag.runners.batch import BatchItem, run_batch
+
+    if len(req.items) > settings.API_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "code": "invalid_payload",
+                "message": f"Batch exceeds {settings.API_BATCH_MAX_ITEMS} items",
+            },
+        )
+    items: list[BatchItem] = []
+    for index, item in enumerate(req.items):
+        agent = item.agent or req.agent
+        if not agent:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={"code": "invalid_payload", "message": f"Item {index} has no agent"},
+            )
+        items.append(BatchItem(index=index, agent=agent, payload=item.payload, id=item.id))
+    # Fail fast when the caller has no budget at all; later items pace the batch
+    await charge_rate_limit(request, settings, RUN_COST)
+
+    async def charge_item(item: BatchItem) -> None:
+        if item is items[0]:
+            return
+        await charge_rate_limit(request, settings, RUN_COST, wait_seconds=BATCH_CHARGE_WAIT_SECONDS)
+
+    runner = get_runner(base_dir=Path(settings.RUNS_BASE_DIR))
+    concurrency = min(req.concurrency, settings.API_BATCH_MAX_CONCURRENCY)
+
+    async def ndjson_stream() -> AsyncIterator[bytes]:
+        async for result in run_batch(
+            runner, items, concurrency=concurrency, before_item=charge_item
+        ):
+            yield (json.dumps(result.to_dict(), ensure_ascii=False) + "\n").encode("utf-8")
+
+    return StreamingResponse(ndjson_stream(), media_type="application/x-ndjson")
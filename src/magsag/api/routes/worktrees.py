@@ -3,10 +3,11 @@
 from __future__ import annotations
 
 import json
+import logging
 from typing import AsyncIterator
 
 from anyio import to_thread
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
 from fastapi.responses import Response, StreamingResponse
 
 from magsag.worktree import (
@@ -31,9 +32,18 @@ from ..models import (
 from ..rate_limit import rate_limit_dependency
 from ..security import require_scope
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(tags=["worktrees"])
 
 
+def _refill_pool(manager: WorktreeManager) -> None:
+    try:
+        manager.warm_pool()
+    except WorktreeError as exc:
+        logger.warning("Failed to refill worktree pool: %s", exc)
+
+
 def _record_to_response(record: WorktreeRecord) -> WorktreeResponse:
     meta = record.metadata
     run_id = meta.run_id if meta else record.info.run_id
@@ -120,9 +130,10 @@ async def list_worktrees(
 )
 async def create_worktree(
     req: WorktreeCreateRequest,
+    background_tasks: BackgroundTasks,
     _: str = Depends(require_scope(["worktrees:write"])),
 ) -> WorktreeResponse:
-    """Create a new managed worktree."""
+    """Create a new managed worktree (topping the pool back up afterwards)."""
     manager = WorktreeManager()
 
     def _create() -> WorktreeRecord:
@@ -141,6 +152,8 @@ async def create_worktree(
     except WorktreeError as exc:
         raise _worktree_error(exc) from exc
 
+    if manager.pool.enabled:
+        background_tasks.add_task(_refill_pool, manager)
     return _record_to_response(record)
 
 
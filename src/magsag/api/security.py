@@ -93,6 +93,7 @@ def get_scopes_for_key(api_key: str) -> list[str]:
         "worktrees:lock",
         "worktrees:unlock",
         "worktrees:maintain",
+        "metrics:read",
     ]
 
 
@@ -2,22 +2,55 @@
 
 from __future__ import annotations
 
-from typing import Awaitable, Callable
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, HTTPException as FastAPIHTTPException, Request
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, Response
+from fastapi.responses import JSONResponse
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
 from .config import Settings, get_settings
-from .middleware import IdempotencyMiddleware
-from .routes import agents, approvals, github, runs, worktrees
+from .middleware import (
+    IdempotencyMiddleware,
+    RequestSizeLimitMiddleware,
+    create_idempotency_store,
+)
+from .routes import agents, approvals, github, metrics, runs, worktrees
 from .routes import runs_create
 
+logger = logging.getLogger(__name__)
+
 # Get settings
 settings: Settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Run the expired-memory sweeper on the server's loop while it serves."""
+    from magsag.storage.factory import create_memory_store
+    from magsag.storage.memory_sweeper import MemoryExpirySweeper
+
+    current = get_settings()
+    sweeper: MemoryExpirySweeper | None = None
+    if current.MEMORY_ENABLED and current.MEMORY_SWEEP_INTERVAL_S > 0:
+        try:
+            store = await create_memory_store(current)
+        except Exception as exc:  # noqa: BLE001 - memory is optional for serving
+            logger.warning("Memory expiry sweeper disabled: %s", exc)
+        else:
+            sweeper = MemoryExpirySweeper(store, interval_s=current.MEMORY_SWEEP_INTERVAL_S)
+            sweeper.start()
+    try:
+        yield
+    finally:
+        if sweeper is not None:
+            await sweeper.stop()
+            await sweeper.store.close()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="MAGSAG API",
@@ -27,6 +60,7 @@ app = FastAPI(
     redoc_url="/redoc",
     openapi_url=f"{settings.API_PREFIX}/openapi.json",
     debug=settings.API_DEBUG,
+    lifespan=lifespan,
 )
 
 # Add CORS middleware
@@ -39,33 +73,10 @@ app.add_middleware(
 )
 
 # Add idempotency middleware
-app.add_middleware(IdempotencyMiddleware)
-
-
-@app.middleware("http")
-async def enforce_request_size(
-    request: Request,
-    call_next: Callable[[Request], Awaitable[Response]],
-) -> Response:
-    """Reject requests that exceed the configured payload limit."""
-    max_bytes = settings.API_MAX_REQUEST_BYTES
-    header_value = request.headers.get("content-length")
-    if header_value is not None:
-        try:
-            content_length = int(header_value)
-        except ValueError:
-            return JSONResponse(
-                status_code=400,
-                content={"code": "invalid_payload", "message": "Invalid Content-Length header"},
-            )
-        if content_length > max_bytes:
-            return JSONResponse(
-                status_code=413,
-                content={"code": "invalid_payload", "message": "Request body too large"},
-            )
-
-    response = await call_next(request)
-    return response
+app.add_middleware(IdempotencyMiddleware, store=create_idempotency_store(settings))
+
+# Reject oversized payloads before any other middleware reads the body
+app.add_middleware(RequestSizeLimitMiddleware, max_bytes=settings.API_MAX_REQUEST_BYTES)
 
 
 @app.exception_handler(FastAPIHTTPException)
@@ -151,6 +162,10 @@ app.include_router(github.router, prefix=settings.API_PREFIX)
 app.include_router(worktrees.router, prefix=settings.API_PREFIX)
 
 
+if settings.METRICS_ENABLED:
+    app.include_router(metrics.router)
+
+
 @app.get("/health")
 async def health_check() -> dict[str, str]:
     """Health check endpoint."""
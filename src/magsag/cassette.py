@@ -0,0 +1,290 @@
+"""
+Record-and-replay cassettes for LLM provider and MCP tool calls.
+
+A cassette stores the responses of every provider ``generate`` call and every
+MCP ``execute_tool`` call made during a run, keyed by a canonical hash of the
+request (``magsag.cache.key.hash_stable``). Replaying a run against its
+cassette serves those calls from the file without touching the network, so
+regression runs, golden tests and benchmarks become fast and free.
+
+Cassettes are gzip-compressed JSON Lines files, written next to the run's
+``summary.json`` as ``cassette.jsonl.gz``. The active cassette is held in a
+context variable so concurrent runs in one process do not share it.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import dataclasses
+import gzip
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Literal
+
+from magsag.cache.key import hash_stable
+
+if TYPE_CHECKING:
+    from magsag.providers.base import BaseLLMProvider, LLMResponse
+
+logger = logging.getLogger(__name__)
+
+CASSETTE_FILE_NAME = "cassette.jsonl.gz"
+CASSETTE_FORMAT_VERSION = 1
+
+# Interaction kinds
+LLM_GENERATE = "llm.generate"
+MCP_EXECUTE_TOOL = "mcp.execute_tool"
+MCP_STREAM_QUERY = "mcp.stream_query"
+
+CassetteMode = Literal["record", "replay"]
+
+_active_cassette: contextvars.ContextVar[Cassette | None] = contextvars.ContextVar(
+    "magsag_active_cassette", default=None
+)
+
+
+class CassetteMissError(LookupError):
+    """Raised when a replayed call has no recorded response."""
+
+
+def _to_json(data: Any) -> Any:
+    """Round-trip ``data`` through JSON so it hashes and stores stably."""
+    return json.loads(json.dumps(data, default=str))
+
+
+class Cassette:
+    """Recorded provider and tool interactions of one run.
+
+    Identical requests are answered in recording order; once their recorded
+    responses are used up, the last one is repeated.
+    """
+
+    def __init__(self, path: Path | str, mode: CassetteMode = "record") -> None:
+        """
+        Create a cassette.
+
+        Args:
+            path: Cassette file
+            mode: "record" to capture calls, "replay" to serve them from ``path``
+
+        Raises:
+            FileNotFoundError: If replaying a cassette that does not exist
+        """
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Invalid cassette mode: {mode}")
+        self.path = Path(path)
+        self.mode: CassetteMode = mode
+        self._lock = threading.Lock()
+        self._records: list[dict[str, Any]] = []
+        self._responses: dict[str, list[Any]] = defaultdict(list)
+        self._cursors: dict[str, int] = defaultdict(int)
+        if mode == "replay":
+            self._load()
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    @staticmethod
+    def request_key(kind: str, request: dict[str, Any]) -> str:
+        """Canonical key of a request (dict key order does not matter)."""
+        return hash_stable({"kind": kind, "request": _to_json(request)})
+
+    def _load(self) -> None:
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            header = json.loads(f.readline() or "{}")
+            version = header.get("version")
+            if version != CASSETTE_FORMAT_VERSION:
+                raise ValueError(f"Unsupported cassette version {version} in {self.path}")
+            for line in f:
+                record = json.loads(line)
+                self._records.append(record)
+                self._responses[record["key"]].append(record["response"])
+
+    def lookup(self, kind: str, request: dict[str, Any]) -> Any:
+        """
+        Return the recorded response for a request.
+
+        Raises:
+            CassetteMissError: If the request was never recorded
+        """
+        key = self.request_key(kind, request)
+        with self._lock:
+            responses = self._responses.get(key)
+            if not responses:
+                raise CassetteMissError(
+                    f"No recorded {kind} response for request {key[:16]} in {self.path}"
+                )
+            cursor = self._cursors[key]
+            self._cursors[key] = cursor + 1
+            return responses[min(cursor, len(responses) - 1)]
+
+    def record(self, kind: str, request: dict[str, Any], response: Any) -> None:
+        """Append an interaction (kept in memory until :meth:`save`)."""
+        key = self.request_key(kind, request)
+        record = {"key": key, "kind": kind, "response": _to_json(response)}
+        with self._lock:
+            self._records.append(record)
+            self._responses[key].append(record["response"])
+
+    def save(self) -> Path:
+        """Atomically write recorded interactions to :attr:`path`."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with self._lock:
+            records = list(self._records)
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            header = {"version": CASSETTE_FORMAT_VERSION, "created_at": time.time()}
+            f.write(json.dumps(header) + "\n")
+            for record in records:
+                f.write(json.dumps(record, separators=(",", ":")) + "\n")
+        os.replace(tmp_path, self.path)
+        logger.debug("Saved %d cassette interactions to %s", len(records), self.path)
+        return self.path
+
+
+def get_active_cassette() -> Cassette | None:
+    """Return the cassette active in the current context, if any."""
+    return _active_cassette.get()
+
+
+@contextmanager
+def use_cassette(cassette: Cassette | None) -> Iterator[Cassette | None]:
+    """
+    Activate a cassette for calls made in this context.
+
+    Threads started inside the block only see the cassette if they run in a
+    copy of the context (``contextvars.copy_context().run``).
+    """
+    token = _active_cassette.set(cassette)
+    try:
+        yield cassette
+    finally:
+        _active_cassette.reset(token)
+
+
+def find_run_cassette(replay_path: Path | str) -> Path | None:
+    """
+    Locate the cassette recorded with a run.
+
+    Args:
+        replay_path: A run directory, its ``summary.json`` or a cassette file
+
+    Returns:
+        Path of the cassette, or None if the run has none
+    """
+    path = Path(replay_path)
+    if path.name.endswith(".jsonl.gz"):
+        return path if path.exists() else None
+    run_dir = path if path.is_dir() else path.parent
+    candidate = run_dir / CASSETTE_FILE_NAME
+    return candidate if candidate.exists() else None
+
+
+class CassetteProvider:
+    """LLM provider wrapper that records or replays ``generate`` calls.
+
+    Without an active cassette calls pass straight through. While replaying,
+    the wrapped provider is never called, so it may be None, or built lazily
+    by ``factory`` on the first call that is not replayed. Replayed responses
+    are marked with ``metadata["replayed"]``.
+    """
+
+    def __init__(
+        self,
+        provider: BaseLLMProvider | None,
+        *,
+        factory: Callable[[], BaseLLMProvider] | None = None,
+    ) -> None:
+        self.provider = provider
+        self._factory = factory
+        self._factory_lock = threading.Lock()
+
+    def generate(
+        self,
+        prompt: str,
+        *,
+        model: str,
+        max_tokens: int = 1024,
+        temperature: float = 0.7,
+        tools: list[dict[str, Any]] | None = None,
+        tool_choice: str | dict[str, Any] | None = None,
+        response_format: dict[str, Any] | None = None,
+        reasoning: dict[str, Any] | None = None,
+        mcp_tools: list[dict[str, Any]] | None = None,
+        **kwargs: Any,
+    ) -> LLMResponse:
+        """Generate a completion, consulting the active cassette first."""
+        from magsag.providers.base import LLMResponse
+
+        cassette = get_active_cassette()
+        request = {
+            "prompt": prompt,
+            "model": model,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "tools": tools,
+            "tool_choice": tool_choice,
+            "response_format": response_format,
+            "reasoning": reasoning,
+            "mcp_tools": mcp_tools,
+            "kwargs": kwargs,
+        }
+        if cassette is not None and cassette.replaying:
+            recorded = cassette.lookup(LLM_GENERATE, request)
+            metadata = {**(recorded.get("metadata") or {}), "replayed": True}
+            return LLMResponse(**{**recorded, "metadata": metadata})
+
+        provider = self._resolve_provider()
+        if provider is None:
+            raise RuntimeError("CassetteProvider has no provider to record from")
+        response = provider.generate(
+            prompt,
+            model=model,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            tools=tools,
+            tool_choice=tool_choice,
+            response_format=response_format,
+            reasoning=reasoning,
+            mcp_tools=mcp_tools,
+            **kwargs,
+        )
+        if cassette is not None:
+            cassette.record(LLM_GENERATE, request, dataclasses.asdict(response))
+        return response
+
+    def _resolve_provider(self) -> BaseLLMProvider | None:
+        if self.provider is None and self._factory is not None:
+            with self._factory_lock:
+                if self.provider is None:
+                    self.provider = self._factory()
+        return self.provider
+
+    def get_cost(self, model: str, input_tokens: int, output_tokens: int) -> float:
+        """Delegate cost calculation (replayed calls without a provider are free)."""
+        if self.provider is None:
+            return 0.0
+        return self.provider.get_cost(model, input_tokens, output_tokens)
+
+
+__all__ = [
+    "CASSETTE_FILE_NAME",
+    "Cassette",
+    "CassetteMissError",
+    "CassetteMode",
+    "CassetteProvider",
+    "find_run_cassette",
+    "get_active_cassette",
+    "use_cassette",
+]
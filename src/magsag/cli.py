@@ -184,6 +184,26 @@ def worktree_repair() -> None:
     typer.echo("Worktree repair completed.")
 
 
+@wt_app.command("pool")
+def worktree_pool(
+    size: Optional[int] = typer.Option(
+        None,
+        "--size",
+        min=0,
+        help="Idle worktrees to keep (defaults to MAGSAG_WT_POOL_SIZE).",
+    ),
+) -> None:
+    """Pre-create idle worktrees so `wt new` can reuse them."""
+    manager = WorktreeManager()
+    try:
+        created = manager.warm_pool(size=size)
+        idle = len(manager.pool_records())
+    except WorktreeError as exc:
+        _handle_worktree_error(exc)
+        return
+    typer.echo(f"Worktree pool: {idle} idle ({created} created).")
+
+
 @flow_app.command("available")
 def flow_available() -> None:
     """Check if Flow Runner CLI is installed."""
@@ -311,6 +331,16 @@ def agent_run(
         "--replay",
         help="Path to replay snapshot JSON file for reproducing a previous run",
     ),
+    record: bool = typer.Option(
+        False,
+        "--record",
+        help="Record provider and MCP calls to a cassette in the run directory",
+    ),
+    cassette: Optional[pathlib.Path] = typer.Option(
+        None,
+        "--cassette",
+        help="Cassette file to record to, or to replay from (default: next to the replay file)",
+    ),
 ) -> None:
     """Execute a MAG agent with JSON input."""
     import sys
@@ -329,6 +359,12 @@ def agent_run(
     else:
         data = json.loads(json_input.read_text(encoding="utf-8"))
 
+    from magsag.cassette import find_run_cassette
+
+    if record and replay is not None:
+        typer.echo("Error: --record and --replay are mutually exclusive", err=True)
+        raise typer.Exit(1)
+
     # Prepare execution context
     context: dict[str, Any] = {}
 
@@ -348,10 +384,23 @@ def agent_run(
             else:
                 replay_snapshot = replay_data
 
-            context = create_replay_context(replay_snapshot, context)
+            # Serve provider and MCP calls from the run's cassette when it has one
+            cassette_path = cassette or find_run_cassette(replay_path)
+            if cassette_path is None or not cassette_path.exists():
+                typer.echo(
+                    "Warning: no cassette found; provider and MCP calls will run live",
+                    err=True,
+                )
+                cassette_path = None
+
+            context = create_replay_context(replay_snapshot, context, cassette_path=cassette_path)
         except Exception as e:
             typer.echo(f"Error loading replay snapshot: {e}", err=True)
             raise typer.Exit(1)
+    elif record:
+        context["cassette_mode"] = "record"
+        if cassette is not None:
+            context["cassette_path"] = str(cassette)
 
     # Handle deterministic mode
     if deterministic:
@@ -372,6 +421,64 @@ def agent_run(
         raise typer.Exit(2)
 
 
+@agent_app.command("run-batch")
+def agent_run_batch(
+    input_path: pathlib.Path = typer.Option(
+        ...,
+        "--input",
+        help="JSONL file of {'agent', 'payload', 'id'} objects ('-' reads stdin)",
+    ),
+    output_path: pathlib.Path = typer.Option(
+        pathlib.Path("-"),
+        "--output",
+        help="JSONL file for results in input order ('-' writes stdout)",
+    ),
+    concurrency: int = typer.Option(4, "--concurrency", min=1, help="Concurrent agent runs"),
+    agent: Optional[str] = typer.Option(
+        None,
+        "--agent",
+        help="Agent slug for lines without 'agent' (lines may then be bare payloads)",
+    ),
+) -> None:
+    """Execute a MAG agent for every line of a JSONL file on one warm runner."""
+    import asyncio
+    import contextlib
+    import sys
+
+    from magsag.runners.agent_runner import get_runner
+    from magsag.runners.batch import read_batch_lines, run_batch
+
+    async def _run(lines: Any, out: Any) -> tuple[int, int]:
+        completed = failed = 0
+        items = read_batch_lines(lines, default_agent=agent)
+        async for result in run_batch(get_runner(), items, concurrency=concurrency):
+            out.write(json.dumps(result.to_dict(), ensure_ascii=False) + "\n")
+            out.flush()
+            if result.status == "completed":
+                completed += 1
+            else:
+                failed += 1
+        return completed, failed
+
+    with contextlib.ExitStack() as stack:
+        if str(input_path) == "-":
+            lines = sys.stdin
+        else:
+            if not input_path.exists():
+                typer.echo(f"Error: Input file not found: {input_path}", err=True)
+                raise typer.Exit(1)
+            lines = stack.enter_context(input_path.open(encoding="utf-8"))
+        if str(output_path) == "-":
+            out = sys.stdout
+        else:
+            out = stack.enter_context(output_path.open("w", encoding="utf-8"))
+        completed, failed = asyncio.run(_run(lines, out))
+
+    typer.echo(f"Batch finished: {completed} completed, {failed} failed", err=True)
+    if failed:
+        raise typer.Exit(2)
+
+
 @data_app.command("init")
 def data_init(
     backend: str = typer.Option("sqlite", "--backend", help="Storage backend: sqlite, postgres"),
@@ -0,0 +1,174 @@
+"""
+Notification bus for approval ticket decisions.
+
+ApprovalGate publishes every status change here, and waiters (the gate's
+``wait_for_decision`` and the approvals SSE endpoint) subscribe per ticket
+instead of polling storage. Decisions made in other processes arrive
+through the storage backend's change feed (PostgreSQL LISTEN/NOTIFY or the
+SQLite change-sequence table); one watcher task per backend relays them,
+so storage load does not grow with the number of waiters.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from typing import TYPE_CHECKING, Dict, Optional, Set, Tuple
+
+if TYPE_CHECKING:  # pragma: no cover - typing aid
+    from magsag.storage.base import StorageBackend
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHANGE_POLL_INTERVAL = 0.25
+
+
+class ApprovalSubscription:
+    """Status notifications for one approval ticket, bound to an event loop."""
+
+    def __init__(self, notifier: ApprovalNotifier, ticket_id: str) -> None:
+        self._notifier = notifier
+        self.ticket_id = ticket_id
+        self._loop = asyncio.get_running_loop()
+        self._queue: asyncio.Queue[str] = asyncio.Queue()
+
+    def push(self, status: str) -> None:
+        """Deliver a status change (callable from any thread)."""
+        try:
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, status)
+        except RuntimeError:
+            # Event loop closed without unsubscribing
+            self.close()
+
+    async def wait(self, timeout: Optional[float] = None) -> Optional[str]:
+        """
+        Wait for the next status change.
+
+        Args:
+            timeout: Seconds to wait (None waits indefinitely)
+
+        Returns:
+            The newest published status, or None if the timeout elapsed
+        """
+        try:
+            status = await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        while not self._queue.empty():
+            status = self._queue.get_nowait()
+        return status
+
+    def close(self) -> None:
+        self._notifier.unsubscribe(self)
+
+    def __enter__(self) -> ApprovalSubscription:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+class ApprovalNotifier:
+    """In-process fan-out of approval status changes keyed by ticket ID."""
+
+    def __init__(self, poll_interval: float = DEFAULT_CHANGE_POLL_INTERVAL) -> None:
+        """
+        Initialize notifier.
+
+        Args:
+            poll_interval: Change feed poll interval for backends without push
+        """
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._subscribers: Dict[str, Set[ApprovalSubscription]] = {}
+        # id(storage) -> (storage, watcher task)
+        self._watchers: Dict[int, Tuple["StorageBackend", asyncio.Task[None]]] = {}
+
+    def subscribe(
+        self,
+        ticket_id: str,
+        storage: Optional["StorageBackend"] = None,
+    ) -> ApprovalSubscription:
+        """
+        Subscribe the running event loop to status changes of a ticket.
+
+        Args:
+            ticket_id: Ticket to watch
+            storage: Backend whose cross-process change feed should be relayed
+
+        Returns:
+            Subscription; close it when done
+        """
+        subscription = ApprovalSubscription(self, ticket_id)
+        with self._lock:
+            self._subscribers.setdefault(ticket_id, set()).add(subscription)
+        if storage is not None and storage.capabilities.approval_notifications:
+            self._ensure_watcher(storage)
+        return subscription
+
+    def unsubscribe(self, subscription: ApprovalSubscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.ticket_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.ticket_id]
+            idle = not self._subscribers
+            watchers = list(self._watchers.values()) if idle else []
+            if idle:
+                self._watchers.clear()
+        for _, task in watchers:
+            if task.done():
+                continue
+            try:
+                task.get_loop().call_soon_threadsafe(task.cancel)
+            except RuntimeError:
+                # Loop already closed; the task died with it
+                pass
+
+    def publish(self, ticket_id: str, status: str) -> None:
+        """Notify subscribers that a ticket changed status."""
+        if ticket_id not in self._subscribers:
+            return
+        with self._lock:
+            subscribers = list(self._subscribers.get(ticket_id, ()))
+        for subscription in subscribers:
+            subscription.push(status)
+
+    def _ensure_watcher(self, storage: "StorageBackend") -> None:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            current = self._watchers.get(id(storage))
+            if current is not None and not current[1].done() and current[1].get_loop() is loop:
+                return
+            task = loop.create_task(self._watch(storage))
+            self._watchers[id(storage)] = (storage, task)
+
+    async def _watch(self, storage: "StorageBackend") -> None:
+        """Relay the backend's change feed, restarting after errors."""
+        while True:
+            try:
+                async for ticket_id, status in storage.watch_approval_changes(
+                    poll_interval=self.poll_interval
+                ):
+                    self.publish(ticket_id, status)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # pragma: no cover - defensive logging
+                logger.warning("Approval change feed failed, retrying: %s", exc)
+            await asyncio.sleep(max(self.poll_interval, 1.0))
+
+
+_notifier: Optional[ApprovalNotifier] = None
+_notifier_lock = threading.Lock()
+
+
+def get_approval_notifier() -> ApprovalNotifier:
+    """Get or create the global approval notifier."""
+    global _notifier
+    if _notifier is None:
+        with _notifier_lock:
+            if _notifier is None:
+                _notifier = ApprovalNotifier()
+    return _notifier
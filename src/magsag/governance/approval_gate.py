@@ -21,6 +21,8 @@ from magsag.core.permissions import (
     compute_args_hash,
     mask_tool_args,
 )
+from magsag.governance.approval_events import ApprovalNotifier, get_approval_notifier
+from magsag.observability.metrics import get_metrics_registry
 from magsag.storage.models import ApprovalTicketRecord
 from magsag.storage.serialization import json_safe
 
@@ -68,6 +70,7 @@ class ApprovalGate:
         permission_evaluator: PermissionEvaluatorProtocol,
         ticket_store: Optional["StorageBackend"] = None,  # Storage backend for tickets
         default_timeout_minutes: int = 30,
+        notifier: Optional[ApprovalNotifier] = None,
     ):
         """
         Initialize approval gate.
@@ -76,10 +79,12 @@ class ApprovalGate:
             permission_evaluator: Permission evaluator instance
             ticket_store: Storage backend for approval tickets (optional)
             default_timeout_minutes: Default approval timeout
+            notifier: Bus for decision notifications (default: process-wide)
         """
         self.permission_evaluator = permission_evaluator
         self.ticket_store = ticket_store
         self.default_timeout_minutes = default_timeout_minutes
+        self.notifier = notifier or get_approval_notifier()
 
         # In-memory ticket storage (fallback if no ticket_store provided)
         self._tickets: Dict[str, ApprovalTicket] = {}
@@ -87,6 +92,16 @@ class ApprovalGate:
         self._initialized_runs: set[str] = set()
         self._run_init_lock = asyncio.Lock()
 
+        registry = get_metrics_registry()
+        self._ticket_counter = registry.counter(
+            "magsag_approval_tickets_total",
+            "Approval tickets by status (pending on creation, then the decision)",
+            ["status"],
+        )
+        self._pending_gauge = registry.gauge(
+            "magsag_approval_tickets_pending", "Approval tickets awaiting a decision"
+        )
+
     def evaluate(
         self,
         tool_name: str,
@@ -175,6 +190,8 @@ class ApprovalGate:
 
         async with self._lock:
             self._tickets[ticket.ticket_id] = ticket
+        self._ticket_counter.labels("pending").inc()
+        self._pending_gauge.inc()
 
         if self.ticket_store:
             await self._ensure_run_record(
@@ -275,14 +292,16 @@ class ApprovalGate:
         poll_interval_seconds: float = 5.0,
     ) -> ApprovalTicket:
         """
-        Wait for approval decision (polling implementation).
+        Wait for approval decision.
 
-        This is a polling-based implementation. For production, consider
-        using SSE (Server-Sent Events) or WebSocket for real-time updates.
+        Subscribes to the approval notifier, so decisions made in this
+        process, or in another process sharing the storage backend, resume
+        the waiter immediately. Storage is re-read only when a notification
+        reports a change or after ``poll_interval_seconds`` without one.
 
         Args:
             ticket: Approval ticket
-            poll_interval_seconds: Polling interval
+            poll_interval_seconds: Maximum time between storage re-checks
 
         Returns:
             Updated ApprovalTicket with decision
@@ -293,58 +312,67 @@ class ApprovalGate:
         """
         logger.info(f"Waiting for approval decision on ticket {ticket.ticket_id}")
 
-        while True:
-            current_ticket = await self.get_ticket(ticket.ticket_id)
-            if current_ticket is None:
-                raise ApprovalGateError(
-                    f"Approval ticket {ticket.ticket_id} not found"
-                )
-
-            # Check if ticket has expired
-            if datetime.now(UTC) >= current_ticket.expires_at:
-                logger.warning(f"Approval ticket {ticket.ticket_id} expired")
-                await self._expire_ticket(current_ticket)
-                raise ApprovalTimeoutError(
-                    f"Approval request timed out for {ticket.tool_name}"
-                )
-
-            # Check if decision has been made
-            if current_ticket.status == "approved":
-                logger.info(
-                    f"Approval ticket {ticket.ticket_id} approved "
-                    f"by {current_ticket.resolved_by}"
-                )
-                # Restore original tool args when available (runtime execution needs them)
-                if not current_ticket.tool_args or current_ticket.tool_args == current_ticket.masked_args:
-                    current_ticket.tool_args = ticket.tool_args
-                return current_ticket
-
-            elif current_ticket.status == "denied":
-                logger.warning(
-                    f"Approval ticket {ticket.ticket_id} denied "
-                    f"by {current_ticket.resolved_by}"
-                )
-                raise ApprovalDeniedError(
-                    f"Approval denied for {ticket.tool_name}"
-                )
-
-            # Still pending - wait and poll again
-            await asyncio.sleep(poll_interval_seconds)
-
-    async def get_ticket(self, ticket_id: str) -> Optional[ApprovalTicket]:
+        with self.notifier.subscribe(ticket.ticket_id, storage=self.ticket_store) as subscription:
+            refresh = False
+            while True:
+                current_ticket = await self.get_ticket(ticket.ticket_id, refresh=refresh)
+                if current_ticket is None:
+                    raise ApprovalGateError(
+                        f"Approval ticket {ticket.ticket_id} not found"
+                    )
+
+                # Check if ticket has expired
+                now = datetime.now(UTC)
+                if current_ticket.status == "expired" or now >= current_ticket.expires_at:
+                    logger.warning(f"Approval ticket {ticket.ticket_id} expired")
+                    await self._expire_ticket(current_ticket)
+                    raise ApprovalTimeoutError(
+                        f"Approval request timed out for {ticket.tool_name}"
+                    )
+
+                # Check if decision has been made
+                if current_ticket.status == "approved":
+                    logger.info(
+                        f"Approval ticket {ticket.ticket_id} approved "
+                        f"by {current_ticket.resolved_by}"
+                    )
+                    # Restore original tool args when available (runtime execution needs them)
+                    if not current_ticket.tool_args or current_ticket.tool_args == current_ticket.masked_args:
+                        current_ticket.tool_args = ticket.tool_args
+                    return current_ticket
+
+                elif current_ticket.status == "denied":
+                    logger.warning(
+                        f"Approval ticket {ticket.ticket_id} denied "
+                        f"by {current_ticket.resolved_by}"
+                    )
+                    raise ApprovalDeniedError(
+                        f"Approval denied for {ticket.tool_name}"
+                    )
+
+                # Still pending - wait for a notification, expiry or the fallback re-check
+                remaining = (current_ticket.expires_at - now).total_seconds()
+                status = await subscription.wait(timeout=min(poll_interval_seconds, remaining))
+                # Local decisions update the cached ticket in place; anything
+                # else (remote decision, missed notification) needs storage.
+                refresh = status != current_ticket.status
+
+    async def get_ticket(self, ticket_id: str, refresh: bool = False) -> Optional[ApprovalTicket]:
         """
         Get an approval ticket by ID.
 
         Args:
             ticket_id: Ticket identifier
+            refresh: Re-read the ticket from storage even if cached (picks up
+                decisions made by other processes)
 
         Returns:
             ApprovalTicket or None if not found
         """
         async with self._lock:
-            ticket = self._tickets.get(ticket_id)
-            if ticket is not None:
-                return ticket
+            cached = self._tickets.get(ticket_id)
+        if cached is not None and (not refresh or not self.ticket_store):
+            return cached
 
         if not self.ticket_store:
             return None
@@ -360,13 +388,20 @@ class ApprovalGate:
             return None
 
         if record is None:
-            return None
+            return cached
 
         ticket = self._ticket_from_record(record)
         async with self._lock:
-            self._tickets.setdefault(ticket.ticket_id, ticket)
-
-        return ticket
+            if cached is None:
+                return self._tickets.setdefault(ticket.ticket_id, ticket)
+            if cached.status == "pending" and ticket.status != "pending":
+                # Decided elsewhere: adopt the decision, keep unmasked args
+                cached.status = ticket.status
+                cached.resolved_at = ticket.resolved_at
+                cached.resolved_by = ticket.resolved_by
+                cached.decision_reason = ticket.decision_reason
+                cached.response = ticket.response
+            return cached
 
     async def approve_ticket(
         self,
@@ -573,6 +608,9 @@ class ApprovalGate:
         response: Optional[Dict[str, Any]],
     ) -> ApprovalTicket:
         """Update ticket state and persist changes."""
+        if ticket.status == "pending":
+            self._pending_gauge.dec()
+        self._ticket_counter.labels(status).inc()
         ticket.status = status
         ticket.resolved_at = datetime.now(UTC)
         ticket.resolved_by = resolved_by
@@ -600,6 +638,8 @@ class ApprovalGate:
                     extras={"resolved_by": resolved_by},
                 )
 
+        self.notifier.publish(ticket.ticket_id, status)
+
         return ticket
 
     async def _emit_event(
@@ -4,6 +4,12 @@ Permission evaluator for tool execution governance.
 Evaluates tool permissions based on policies defined in
 catalog/policies/tool_permissions.yaml. Supports context-based
 rules, environment overrides, and pattern matching.
+
+The policy is compiled once at load time: glob patterns become precompiled
+regular expressions indexed by a literal-prefix trie, categories are
+flattened into an ordered lookup table, and the context-free part of every
+decision is memoised per tool name in an LRU cache. Only context rules that
+can match a given tool are evaluated against the execution context.
 """
 
 from __future__ import annotations
@@ -11,8 +17,11 @@ from __future__ import annotations
 import fnmatch
 import logging
 import os
+import re
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Generic, Iterator, List, Optional, Tuple, TypeVar
 
 import yaml
 
@@ -20,6 +29,14 @@ from magsag.core.permissions import ToolPermission
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_PLAN_CACHE_SIZE = 4096
+
+_WILDCARD_CHARS = frozenset("*?[")
+_TERMINAL = ""  # Trie key holding entry indices; never collides with a character
+
+T = TypeVar("T")
+_Matcher = Tuple[str, Callable[[Any], bool]]
+
 
 class PermissionEvaluatorError(Exception):
     """Base exception for permission evaluator errors."""
@@ -27,6 +44,291 @@ class PermissionEvaluatorError(Exception):
     pass
 
 
+def _parse_permission(value: Any) -> ToolPermission:
+    """Parse a permission level from its policy spelling (e.g. ``ALWAYS``)."""
+    try:
+        return ToolPermission(str(value).lower())
+    except ValueError as e:
+        raise PermissionEvaluatorError(f"Invalid permission level in policy: {value!r}") from e
+
+
+def _literal_prefix(pattern: str) -> str:
+    """Return the part of a glob pattern before its first wildcard."""
+    for index, char in enumerate(pattern):
+        if char in _WILDCARD_CHARS:
+            return pattern[:index]
+    return pattern
+
+
+def _compile_glob(pattern: str) -> re.Pattern[str]:
+    """Compile a glob pattern into an anchored regular expression."""
+    return re.compile(fnmatch.translate(pattern))
+
+
+class _GlobTable(Generic[T]):
+    """
+    Ordered table of glob (or literal) patterns indexed by a prefix trie.
+
+    Lookups only test entries whose literal prefix is a prefix of the
+    queried name, and yield matches in insertion order so first-match
+    semantics of the YAML policy are preserved.
+    """
+
+    __slots__ = ("_entries", "_trie")
+
+    def __init__(self) -> None:
+        self._entries: List[Tuple[Optional[re.Pattern[str]], str, T]] = []
+        self._trie: Dict[str, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, pattern: str, value: T, literal: bool = False) -> None:
+        """Add an entry; literal entries match by equality only."""
+        regex = None if literal else _compile_glob(pattern)
+        prefix = pattern if literal else _literal_prefix(pattern)
+        if regex is not None and prefix == pattern:
+            # Glob without wildcards is an exact match
+            regex = None
+
+        node = self._trie
+        for char in prefix:
+            node = node.setdefault(char, {})
+        node.setdefault(_TERMINAL, []).append(len(self._entries))
+        self._entries.append((regex, pattern, value))
+
+    def _candidates(self, name: str) -> List[int]:
+        node = self._trie
+        found: List[int] = list(node.get(_TERMINAL, ()))
+        for char in name:
+            child = node.get(char)
+            if child is None:
+                break
+            node = child
+            found.extend(node.get(_TERMINAL, ()))
+        found.sort()
+        return found
+
+    def matches(self, name: str) -> Iterator[T]:
+        """Yield values of all entries matching name, in insertion order."""
+        for index in self._candidates(name):
+            regex, pattern, value = self._entries[index]
+            if regex is None:
+                if pattern == name:
+                    yield value
+            elif regex.match(name) is not None:
+                yield value
+
+    def first(self, name: str) -> Optional[T]:
+        """Return the value of the first entry matching name."""
+        return next(self.matches(name), None)
+
+
+def _compile_value_matcher(pattern: Any, comparisons: bool) -> Callable[[Any], bool]:
+    """Compile a single args_match/context_match value pattern."""
+    if comparisons and isinstance(pattern, dict):
+        less_than: Any = pattern.get("less_than")
+        greater_than: Any = pattern.get("greater_than")
+        has_less = "less_than" in pattern
+        has_greater = "greater_than" in pattern
+
+        def compare(value: Any) -> bool:
+            if has_less and not (isinstance(value, (int, float)) and value < less_than):
+                return False
+            if has_greater and not (isinstance(value, (int, float)) and value > greater_than):
+                return False
+            return True
+
+        return compare
+
+    if isinstance(pattern, str):
+        regex = _compile_glob(pattern)
+
+        def glob(value: Any) -> bool:
+            if isinstance(value, str):
+                return regex.match(value) is not None
+            return bool(value == pattern)
+
+        return glob
+
+    def equals(value: Any) -> bool:
+        return bool(value == pattern)
+
+    return equals
+
+
+def _compile_matchers(patterns: Dict[str, Any], comparisons: bool) -> Tuple[_Matcher, ...]:
+    return tuple(
+        (key, _compile_value_matcher(pattern, comparisons)) for key, pattern in patterns.items()
+    )
+
+
+def _all_match(data: Dict[str, Any], matchers: Tuple[_Matcher, ...]) -> bool:
+    for key, matcher in matchers:
+        if key not in data or not matcher(data[key]):
+            return False
+    return True
+
+
+@dataclass(frozen=True, slots=True)
+class _CompiledRule:
+    """Context rule with precompiled tool and argument matchers."""
+
+    name: Optional[str]
+    permission: ToolPermission
+    tool_regex: Optional[re.Pattern[str]]
+    args_matchers: Tuple[_Matcher, ...]
+    context_matchers: Tuple[_Matcher, ...]
+
+    @property
+    def context_free(self) -> bool:
+        return not self.args_matchers and not self.context_matchers
+
+    def matches_context(self, context: Dict[str, Any]) -> bool:
+        if self.args_matchers and not _all_match(
+            context.get("tool_args", {}), self.args_matchers
+        ):
+            return False
+        if self.context_matchers and not _all_match(context, self.context_matchers):
+            return False
+        return True
+
+
+@dataclass(frozen=True, slots=True)
+class _ToolPlan:
+    """
+    Memoised decision for one tool name.
+
+    ``rules`` holds the context rules that can still match the tool; when it
+    is empty the decision is context-free and ``permission`` is returned as is.
+    Otherwise ``permission`` is the fallback used when no rule matches.
+    """
+
+    permission: ToolPermission
+    source: str
+    rules: Tuple[_CompiledRule, ...] = ()
+
+
+class _CompiledPolicy:
+    """Policy compiled into lookup tables for a single environment."""
+
+    def __init__(self, policy: Dict[str, Any], environment: str) -> None:
+        env_config = (policy.get("environments") or {}).get(environment)
+        self.has_environment = env_config is not None
+        self.env_overrides: Dict[str, ToolPermission] = {}
+        self.env_patterns: _GlobTable[ToolPermission] = _GlobTable()
+        self.env_default: Optional[ToolPermission] = None
+        if env_config is not None:
+            for pattern, permission_str in (env_config.get("overrides") or {}).items():
+                permission = _parse_permission(permission_str)
+                self.env_overrides[pattern] = permission
+                self.env_patterns.add(pattern, permission)
+            env_default = env_config.get("default_permission")
+            if env_default:
+                self.env_default = _parse_permission(env_default)
+
+        self.tools: Dict[str, ToolPermission] = {}
+        for tool_name, tool_config in (policy.get("tools") or {}).items():
+            permission_str = (tool_config or {}).get("permission")
+            if permission_str is not None:
+                self.tools[tool_name] = _parse_permission(permission_str)
+
+        self.rules: _GlobTable[_CompiledRule] = _GlobTable()
+        for rule in policy.get("context_rules") or []:
+            self._add_rule(rule)
+
+        self.dangerous: _GlobTable[Tuple[str, ToolPermission]] = _GlobTable()
+        for pattern_config in policy.get("dangerous_patterns") or []:
+            pattern = pattern_config.get("pattern")
+            permission_str = pattern_config.get("permission")
+            if pattern and permission_str:
+                self.dangerous.add(pattern, (pattern, _parse_permission(permission_str)))
+
+        # Categories flattened into one ordered pattern -> permission table
+        self.categories: _GlobTable[ToolPermission] = _GlobTable()
+        for category_config in (policy.get("categories") or {}).values():
+            permission_str = category_config.get("permission")
+            if not permission_str:
+                continue
+            permission = _parse_permission(permission_str)
+            for pattern in category_config.get("tools", []):
+                self.categories.add(pattern, permission)
+
+        self.default_permission = _parse_permission(
+            policy.get("default_permission", "REQUIRE_APPROVAL")
+        )
+
+    def _add_rule(self, rule: Dict[str, Any]) -> None:
+        permission_str = rule.get("permission")
+        if not permission_str:
+            return
+
+        condition = rule.get("condition", {})
+        tool_pattern = condition.get("tool_pattern")
+        compiled = _CompiledRule(
+            name=rule.get("name"),
+            permission=_parse_permission(permission_str),
+            tool_regex=_compile_glob(tool_pattern) if "tool_pattern" in condition else None,
+            args_matchers=_compile_matchers(condition.get("args_match", {}), True),
+            context_matchers=_compile_matchers(condition.get("context_match", {}), False),
+        )
+
+        if "tool" in condition:
+            self.rules.add(condition["tool"], compiled, literal=True)
+        elif tool_pattern is not None:
+            self.rules.add(tool_pattern, compiled)
+        else:
+            self.rules.add("*", compiled)
+
+    def build_plan(self, tool_name: str) -> _ToolPlan:
+        """Resolve everything about a tool decision that is context-free."""
+        # 1. Environment-specific overrides (highest priority)
+        if self.has_environment:
+            permission = self.env_overrides.get(tool_name)
+            if permission is None:
+                permission = self.env_patterns.first(tool_name)
+            if permission is None:
+                permission = self.env_default
+            if permission is not None:
+                return _ToolPlan(permission, "environment override")
+
+        # 2. Tool-specific permissions
+        permission = self.tools.get(tool_name)
+        if permission is not None:
+            return _ToolPlan(permission, "explicit permission")
+
+        # 3. Context rules that can match this tool; an unconditional rule
+        # ends the list because later rules are unreachable behind it
+        candidates: List[_CompiledRule] = []
+        for rule in self.rules.matches(tool_name):
+            if rule.tool_regex is not None and rule.tool_regex.match(tool_name) is None:
+                continue
+            if rule.context_free:
+                if not candidates:
+                    return _ToolPlan(rule.permission, f"context rule {rule.name}")
+                return _ToolPlan(rule.permission, f"context rule {rule.name}", tuple(candidates))
+            candidates.append(rule)
+
+        fallback = self._build_fallback(tool_name)
+        return _ToolPlan(fallback.permission, fallback.source, tuple(candidates))
+
+    def _build_fallback(self, tool_name: str) -> _ToolPlan:
+        # 4. Dangerous patterns
+        dangerous = self.dangerous.first(tool_name)
+        if dangerous is not None:
+            pattern, permission = dangerous
+            logger.warning(f"Tool {tool_name} matched dangerous pattern: {pattern}")
+            return _ToolPlan(permission, "dangerous pattern")
+
+        # 5. Category-based defaults
+        category_permission = self.categories.first(tool_name)
+        if category_permission is not None:
+            return _ToolPlan(category_permission, "category")
+
+        # 6. Global default permission
+        return _ToolPlan(self.default_permission, "global default")
+
+
 class PermissionEvaluator:
     """
     Permission evaluator for tool execution.
@@ -37,12 +339,16 @@ class PermissionEvaluator:
     - Context-based rules
     - Environment overrides
     - Pattern matching
+
+    The policy is compiled when loaded. Code that mutates ``policy`` in place
+    must call ``compile_policy()`` afterwards for the change to take effect.
     """
 
     def __init__(
         self,
         policy_path: Optional[Path] = None,
         environment: Optional[str] = None,
+        cache_size: int = DEFAULT_PLAN_CACHE_SIZE,
     ):
         """
         Initialize permission evaluator.
@@ -50,25 +356,42 @@ class PermissionEvaluator:
         Args:
             policy_path: Path to policy YAML (default: catalog/policies/tool_permissions.yaml)
             environment: Environment name (development, staging, production)
+            cache_size: Maximum number of tool names with memoised decisions
         """
         self.policy_path = policy_path or Path("catalog/policies/tool_permissions.yaml")
-        self.environment = environment or os.getenv("MAGSAG_ENVIRONMENT", "production")
+        self.cache_size = cache_size
+        self._compiled: Optional[_CompiledPolicy] = None
+        self._plan_for: Callable[[str], _ToolPlan] = self._build_plan
+        self._environment: str = environment or os.getenv("MAGSAG_ENVIRONMENT") or "production"
 
         self.policy: Dict[str, Any] = {}
         self.load_policy()
 
+    @property
+    def environment(self) -> str:
+        """Environment whose overrides apply."""
+        return self._environment
+
+    @environment.setter
+    def environment(self, value: str) -> None:
+        self._environment = value
+        if self._compiled is not None:
+            self.compile_policy()
+
     def load_policy(self) -> None:
-        """Load policy from YAML file."""
+        """Load policy from YAML file and compile it."""
         if not self.policy_path.exists():
             logger.warning(
                 f"Policy file not found: {self.policy_path}, using defaults"
             )
             self.policy = self._get_default_policy()
+            self.compile_policy()
             return
 
         try:
             with open(self.policy_path) as f:
                 self.policy = yaml.safe_load(f) or {}
+            self.compile_policy()
 
             logger.info(
                 f"Loaded tool permissions policy from {self.policy_path} "
@@ -78,6 +401,17 @@ class PermissionEvaluator:
         except Exception as e:
             logger.error(f"Failed to load policy from {self.policy_path}: {e}")
             self.policy = self._get_default_policy()
+            self.compile_policy()
+
+    def compile_policy(self) -> None:
+        """
+        Compile ``policy`` into lookup tables and reset memoised decisions.
+
+        Raises:
+            PermissionEvaluatorError: If the policy contains an invalid permission level
+        """
+        self._compiled = _CompiledPolicy(self.policy, self._environment)
+        self._plan_for = lru_cache(maxsize=self.cache_size)(self._build_plan)
 
     def _get_default_policy(self) -> Dict[str, Any]:
         """Get default policy (fallback if YAML not found)."""
@@ -87,6 +421,15 @@ class PermissionEvaluator:
             "environments": {},
         }
 
+    def _build_plan(self, tool_name: str) -> _ToolPlan:
+        assert self._compiled is not None
+        plan = self._compiled.build_plan(tool_name)
+        logger.debug(
+            f"Tool {tool_name} compiled to {plan.permission.value} ({plan.source}, "
+            f"{len(plan.rules)} context rules)"
+        )
+        return plan
+
     def evaluate(
         self,
         tool_name: str,
@@ -95,6 +438,9 @@ class PermissionEvaluator:
         """
         Evaluate permission for a tool execution.
 
+        Precedence: environment overrides, tool-specific permissions, context
+        rules, dangerous patterns, categories, then the global default.
+
         Args:
             tool_name: Tool name (e.g., "filesystem.write_file")
             context: Execution context (agent_slug, run_id, args, etc.)
@@ -102,234 +448,17 @@ class PermissionEvaluator:
         Returns:
             ToolPermission level (ALWAYS, REQUIRE_APPROVAL, NEVER)
         """
-        # 1. Check environment-specific overrides first (highest priority)
-        # This allows environment settings to override tool-specific policies
-        env_permission = self._check_environment_override(tool_name)
-        if env_permission is not None:
-            logger.debug(
-                f"Tool {tool_name} has environment override: {env_permission.value}"
-            )
-            return env_permission
-
-        # 2. Check tool-specific permissions
-        tool_permission = self._check_tool_permission(tool_name)
-        if tool_permission is not None:
-            logger.debug(
-                f"Tool {tool_name} has explicit permission: {tool_permission.value}"
-            )
-            return tool_permission
-
-        # 3. Check context-based rules
-        context_permission = self._check_context_rules(tool_name, context)
-        if context_permission is not None:
-            logger.debug(
-                f"Tool {tool_name} matched context rule: {context_permission.value}"
-            )
-            return context_permission
-
-        # 4. Check dangerous patterns
-        pattern_permission = self._check_dangerous_patterns(tool_name)
-        if pattern_permission is not None:
-            logger.debug(
-                f"Tool {tool_name} matched dangerous pattern: {pattern_permission.value}"
-            )
-            return pattern_permission
-
-        # 5. Check category-based defaults
-        category_permission = self._check_category_permission(tool_name)
-        if category_permission is not None:
-            logger.debug(
-                f"Tool {tool_name} in category with permission: {category_permission.value}"
-            )
-            return category_permission
-
-        # 6. Fall back to global default permission
-        default_permission = self.policy.get("default_permission", "REQUIRE_APPROVAL")
-        logger.debug(
-            f"Tool {tool_name} using global default permission: {default_permission}"
-        )
-
-        return ToolPermission(default_permission.lower())
-
-    def _check_tool_permission(self, tool_name: str) -> Optional[ToolPermission]:
-        """Check tool-specific permissions."""
-        tools = self.policy.get("tools", {})
-        tool_config = tools.get(tool_name)
-
-        if tool_config is None:
-            return None
-
-        permission_str = tool_config.get("permission")
-        if permission_str is None:
-            return None
-
-        return ToolPermission(permission_str.lower())
-
-    def _check_category_permission(self, tool_name: str) -> Optional[ToolPermission]:
-        """Check category-based permissions."""
-        categories = self.policy.get("categories", {})
-
-        for category_name, category_config in categories.items():
-            tool_patterns = category_config.get("tools", [])
-
-            for pattern in tool_patterns:
-                if fnmatch.fnmatch(tool_name, pattern):
-                    permission_str = category_config.get("permission")
-                    if permission_str:
-                        return ToolPermission(permission_str.lower())
-
-        return None
-
-    def _check_context_rules(
-        self,
-        tool_name: str,
-        context: Dict[str, Any],
-    ) -> Optional[ToolPermission]:
-        """Check context-based rules."""
-        context_rules = self.policy.get("context_rules", [])
-
-        for rule in context_rules:
-            if self._matches_context_rule(tool_name, context, rule):
-                permission_str = rule.get("permission")
-                if permission_str:
-                    logger.info(
-                        f"Tool {tool_name} matched context rule: {rule.get('name')}"
-                    )
-                    return ToolPermission(permission_str.lower())
-
-        return None
-
-    def _matches_context_rule(
-        self,
-        tool_name: str,
-        context: Dict[str, Any],
-        rule: Dict[str, Any],
-    ) -> bool:
-        """Check if a tool matches a context rule."""
-        condition = rule.get("condition", {})
-
-        # Check exact tool match
-        if "tool" in condition:
-            if condition["tool"] != tool_name:
-                return False
-
-        # Check tool pattern match
-        if "tool_pattern" in condition:
-            if not fnmatch.fnmatch(tool_name, condition["tool_pattern"]):
-                return False
-
-        # Check args match
-        if "args_match" in condition:
-            tool_args = context.get("tool_args", {})
-            if not self._matches_args(tool_args, condition["args_match"]):
-                return False
-
-        # Check context match
-        if "context_match" in condition:
-            if not self._matches_dict(context, condition["context_match"]):
-                return False
-
-        return True
-
-    def _matches_args(
-        self,
-        args: Dict[str, Any],
-        patterns: Dict[str, Any],
-    ) -> bool:
-        """Check if arguments match patterns."""
-        for key, pattern in patterns.items():
-            if key not in args:
-                return False
-
-            value = args[key]
-
-            # Handle special comparisons
-            if isinstance(pattern, dict):
-                if "less_than" in pattern:
-                    if not (isinstance(value, (int, float)) and value < pattern["less_than"]):
-                        return False
-                if "greater_than" in pattern:
-                    if not (isinstance(value, (int, float)) and value > pattern["greater_than"]):
-                        return False
-                continue
-
-            # Handle wildcard pattern matching for strings
-            if isinstance(pattern, str) and isinstance(value, str):
-                if not fnmatch.fnmatch(value, pattern):
-                    return False
-            else:
-                # Exact match
-                if value != pattern:
-                    return False
-
-        return True
-
-    def _matches_dict(
-        self,
-        data: Dict[str, Any],
-        patterns: Dict[str, Any],
-    ) -> bool:
-        """Check if dictionary matches patterns."""
-        for key, pattern in patterns.items():
-            if key not in data:
-                return False
-
-            value = data[key]
-
-            # Handle wildcard pattern matching for strings
-            if isinstance(pattern, str) and isinstance(value, str):
-                if not fnmatch.fnmatch(value, pattern):
-                    return False
-            else:
-                # Exact match
-                if value != pattern:
-                    return False
-
-        return True
-
-    def _check_dangerous_patterns(self, tool_name: str) -> Optional[ToolPermission]:
-        """Check dangerous operation patterns."""
-        dangerous_patterns = self.policy.get("dangerous_patterns", [])
-
-        for pattern_config in dangerous_patterns:
-            pattern = pattern_config.get("pattern")
-            if pattern and fnmatch.fnmatch(tool_name, pattern):
-                permission_str = pattern_config.get("permission")
-                if permission_str:
-                    logger.warning(
-                        f"Tool {tool_name} matched dangerous pattern: {pattern}"
-                    )
-                    return ToolPermission(permission_str.lower())
-
-        return None
-
-    def _check_environment_override(self, tool_name: str) -> Optional[ToolPermission]:
-        """Check environment-specific overrides."""
-        environments = self.policy.get("environments", {})
-        env_config = environments.get(self.environment)
-
-        if env_config is None:
-            return None
-
-        # Check environment-specific tool overrides
-        overrides = env_config.get("overrides", {})
-
-        # First check exact match
-        if tool_name in overrides:
-            permission_str = overrides[tool_name]
-            return ToolPermission(permission_str.lower())
-
-        # Then check pattern match
-        for pattern, permission_str in overrides.items():
-            if fnmatch.fnmatch(tool_name, pattern):
-                return ToolPermission(permission_str.lower())
-
-        # Finally check environment default
-        env_default = env_config.get("default_permission")
-        if env_default:
-            return ToolPermission(env_default.lower())
-
-        return None
+        plan = self._plan_for(tool_name)
+        for rule in plan.rules:
+            if rule.matches_context(context):
+                logger.info(f"Tool {tool_name} matched context rule: {rule.name}")
+                return rule.permission
+        return plan.permission
+
+    def cache_info(self) -> Any:
+        """Return hit/miss statistics of the memoised decision cache."""
+        cache_info = getattr(self._plan_for, "cache_info", None)
+        return cache_info() if cache_info is not None else None
 
     def get_tool_metadata(self, tool_name: str) -> Dict[str, Any]:
         """
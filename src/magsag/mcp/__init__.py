@@ -35,7 +35,14 @@ Usage:
     await registry.stop_all_servers()
 """
 
-from magsag.mcp.config import MCPLimits, MCPServerConfig, PostgresConnection
+from magsag.mcp.cache import MCPToolCache, get_mcp_tool_cache
+from magsag.mcp.config import (
+    MCPLimits,
+    MCPServerConfig,
+    MCPToolCachePolicy,
+    PostgresConnection,
+    PostgresResultCache,
+)
 from magsag.mcp.registry import MCPRegistry, MCPRegistryError
 from magsag.mcp.runtime import MCPRuntime, MCPRuntimeError
 from magsag.mcp.server import MCPServer, MCPServerError
@@ -61,6 +68,11 @@ __all__ = [
     "MCPServerConfig",
     "MCPLimits",
     "PostgresConnection",
+    "PostgresResultCache",
+    "MCPToolCachePolicy",
+    # Tool-result cache
+    "MCPToolCache",
+    "get_mcp_tool_cache",
     # Server management
     "MCPServer",
     "MCPServerError",
@@ -0,0 +1,171 @@
+"""Shared result cache for MCP tool calls.
+
+Servers declare which of their tools are cacheable, and for how long, under
+``tool_cache`` in their ``.mcp/servers/*.yaml`` config. ``MCPRegistry`` and
+``AsyncMCPClient`` consult the process-wide ``MCPToolCache`` before calling
+such tools. Entries are keyed canonically by server, tool and arguments, the
+cache is bounded with LRU eviction, and concurrent misses for the same key
+share one in-flight call (single flight).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Mapping
+from typing import Any, TypeVar
+
+from magsag.cache.key import compute_key, hash_stable
+from magsag.observability.metrics import cache_request_counters
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_MAX_ENTRIES = 1024
+
+
+class MCPToolCache:
+    """LRU cache of tool results with per-entry TTL and single-flight misses."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum cached results (least recently used evicted first)
+        """
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future[Any]] = {}
+        self._hits, self._misses, self._coalesced = cache_request_counters(
+            "mcp_tool", ("hit", "miss", "coalesced")
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key(namespace: str, server_id: str, tool: str, arguments: Mapping[str, Any]) -> str:
+        """Canonical key of a tool call.
+
+        Arguments are hashed with their dict keys sorted but list order kept
+        (positional query parameters are not interchangeable).
+
+        Raises:
+            TypeError: If the arguments are not JSON-serializable
+        """
+        return compute_key(
+            f"{namespace}:{server_id}",
+            [{"tool": tool}],
+            {},
+            {"arguments": hash_stable(arguments)},
+        )
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        """Return ``(True, value)`` for a live entry, else ``(False, None)``."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+            return True, entry[1]
+
+    def put(self, key: str, value: Any, ttl_s: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl_s, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    async def get_or_call(
+        self,
+        key: str,
+        ttl_s: float,
+        call: Callable[[], Awaitable[T]],
+        *,
+        cacheable: Callable[[T], bool] = lambda _: True,
+    ) -> tuple[T, bool]:
+        """Return the cached value for ``key`` or compute it with ``call``.
+
+        Concurrent callers missing on the same key in one event loop wait for
+        the first caller's result (or exception) instead of calling the tool
+        again. Only values accepted by ``cacheable`` are stored. Callers get
+        their own copy of cached and shared values.
+
+        Returns:
+            The value and whether it was served without calling ``call``
+        """
+        found, value = self.get(key)
+        if found:
+            self._hits.inc()
+            return copy.deepcopy(value), True
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            pending = self._inflight.get(key)
+            if pending is None or pending.get_loop() is not loop:
+                pending = None
+                future: asyncio.Future[Any] = loop.create_future()
+                self._inflight[key] = future
+        if pending is not None:
+            self._coalesced.inc()
+            try:
+                return copy.deepcopy(await asyncio.shield(pending)), True
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+            # The first caller was cancelled; call the tool ourselves
+            return await call(), False
+
+        self._misses.inc()
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            future.exception()  # Mark retrieved when nobody is waiting
+            raise
+        else:
+            if cacheable(result):
+                self.put(key, copy.deepcopy(result), ttl_s)
+            future.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                if self._inflight.get(key) is future:
+                    del self._inflight[key]
+
+
+_tool_cache: MCPToolCache | None = None
+_tool_cache_lock = threading.Lock()
+
+
+def get_mcp_tool_cache() -> MCPToolCache:
+    """Return the process-wide MCP tool-result cache."""
+    global _tool_cache
+    if _tool_cache is None:
+        with _tool_cache_lock:
+            if _tool_cache is None:
+                _tool_cache = MCPToolCache()
+    return _tool_cache
+
+
+__all__ = ["MCPToolCache", "get_mcp_tool_cache"]
@@ -17,6 +17,7 @@ import logging
 import random
 import uuid
 import os
+from collections.abc import Mapping
 from dataclasses import dataclass
 from datetime import UTC, datetime
 from enum import Enum
@@ -25,6 +26,10 @@ from typing import Any, Dict, Optional
 import httpx
 import websockets
 
+from magsag.mcp.cache import MCPToolCache, get_mcp_tool_cache
+from magsag.mcp.config import MCPToolCachePolicy
+from magsag.observability.metrics import get_metrics_registry
+
 logger = logging.getLogger(__name__)
 
 
@@ -65,6 +70,13 @@ class RetryConfig:
     jitter: bool = True
 
 
+_CIRCUIT_STATE_VALUES = {
+    CircuitState.CLOSED: 0,
+    CircuitState.HALF_OPEN: 1,
+    CircuitState.OPEN: 2,
+}
+
+
 class CircuitBreaker:
     """
     Circuit breaker for fault tolerance.
@@ -73,14 +85,38 @@ class CircuitBreaker:
     to a failing service.
     """
 
-    def __init__(self, config: CircuitBreakerConfig):
+    def __init__(self, config: CircuitBreakerConfig, name: str = "default"):
         """Initialize circuit breaker."""
         self.config = config
+        self.name = name
         self.state = CircuitState.CLOSED
         self.failure_count = 0
         self.success_count = 0
         self.last_failure_time: Optional[datetime] = None
         self.half_open_calls = 0
+        registry = get_metrics_registry()
+        self._state_gauge = registry.gauge(
+            "magsag_mcp_circuit_state",
+            "MCP circuit breaker state (0=closed, 1=half_open, 2=open)",
+            ["server"],
+            multiprocess_mode="max",
+        ).labels(name)
+        self._transitions = registry.counter(
+            "magsag_mcp_circuit_transitions_total",
+            "MCP circuit breaker state transitions",
+            ["server", "state"],
+        )
+        self._rejections = registry.counter(
+            "magsag_mcp_circuit_rejections_total",
+            "MCP requests rejected by an open circuit breaker",
+            ["server"],
+        ).labels(name)
+        self._state_gauge.set(0)
+
+    def _set_state(self, state: CircuitState) -> None:
+        self.state = state
+        self._state_gauge.set(_CIRCUIT_STATE_VALUES[state])
+        self._transitions.labels(self.name, state.value).inc()
 
     def can_attempt(self) -> bool:
         """Check if a request can be attempted."""
@@ -93,9 +129,10 @@ class CircuitBreaker:
                 elapsed = datetime.now(UTC) - self.last_failure_time
                 if elapsed.total_seconds() >= self.config.timeout_seconds:
                     logger.info("Circuit breaker transitioning to HALF_OPEN")
-                    self.state = CircuitState.HALF_OPEN
+                    self._set_state(CircuitState.HALF_OPEN)
                     self.half_open_calls = 0
                     return True
+            self._rejections.inc()
             return False
 
         if self.state == CircuitState.HALF_OPEN:
@@ -103,6 +140,7 @@ class CircuitBreaker:
             if self.half_open_calls < self.config.half_open_max_calls:
                 self.half_open_calls += 1
                 return True
+            self._rejections.inc()
             return False
 
         return False
@@ -113,7 +151,7 @@ class CircuitBreaker:
             self.success_count += 1
             if self.success_count >= self.config.success_threshold:
                 logger.info("Circuit breaker closing after successful recovery")
-                self.state = CircuitState.CLOSED
+                self._set_state(CircuitState.CLOSED)
                 self.failure_count = 0
                 self.success_count = 0
         elif self.state == CircuitState.CLOSED:
@@ -126,7 +164,7 @@ class CircuitBreaker:
 
         if self.state == CircuitState.HALF_OPEN:
             logger.warning("Circuit breaker reopening after failure in HALF_OPEN")
-            self.state = CircuitState.OPEN
+            self._set_state(CircuitState.OPEN)
             self.success_count = 0
         elif self.state == CircuitState.CLOSED:
             self.failure_count += 1
@@ -134,7 +172,7 @@ class CircuitBreaker:
                 logger.warning(
                     f"Circuit breaker opening after {self.failure_count} failures"
                 )
-                self.state = CircuitState.OPEN
+                self._set_state(CircuitState.OPEN)
 
 
 class MCPClientError(Exception):
@@ -176,6 +214,8 @@ class AsyncMCPClient:
         config: Dict[str, Any],
         retry_config: Optional[RetryConfig] = None,
         circuit_breaker_config: Optional[CircuitBreakerConfig] = None,
+        tool_cache: Mapping[str, MCPToolCachePolicy] | None = None,
+        result_cache: MCPToolCache | None = None,
     ):
         """
         Initialize MCP client.
@@ -186,13 +226,17 @@ class AsyncMCPClient:
             config: Transport-specific configuration
             retry_config: Retry configuration (optional)
             circuit_breaker_config: Circuit breaker configuration (optional)
+            tool_cache: Cacheable tools by name (optional, nothing cached by default)
+            result_cache: Cache for tool results (default: process-wide cache)
         """
         self.server_name = server_name
         self.transport = transport
         self.config = config
         self.retry_config = retry_config or RetryConfig()
+        self.tool_cache = dict(tool_cache or {})
+        self._result_cache = result_cache or get_mcp_tool_cache()
         self.circuit_breaker = CircuitBreaker(
-            circuit_breaker_config or CircuitBreakerConfig()
+            circuit_breaker_config or CircuitBreakerConfig(), name=server_name
         )
         self._initialized = False
         self._init_lock = asyncio.Lock()
@@ -371,6 +415,10 @@ class AsyncMCPClient:
         """
         Invoke a tool on the MCP server with retry and circuit breaker.
 
+        Results of tools listed in ``tool_cache`` are served from the shared
+        tool-result cache while fresh, and concurrent identical calls share
+        one invocation.
+
         Args:
             tool: Tool name to invoke
             args: Tool arguments
@@ -387,6 +435,25 @@ class AsyncMCPClient:
         if not self._initialized:
             await self.initialize()
 
+        policy = self.tool_cache.get(tool)
+        if policy is not None:
+            try:
+                key = self._result_cache.key("mcp.client", self.server_name, tool, args)
+            except TypeError:
+                logger.debug(f"Arguments of {self.server_name}.{tool} are not cacheable")
+            else:
+                result, _ = await self._result_cache.get_or_call(
+                    key, policy.ttl_s, lambda: self._invoke_with_retry(tool, args, timeout)
+                )
+                return result
+        return await self._invoke_with_retry(tool, args, timeout)
+
+    async def _invoke_with_retry(
+        self,
+        tool: str,
+        args: dict[str, Any],
+        timeout: float | None,
+    ) -> dict[str, Any]:
         # Check circuit breaker
         if not self.circuit_breaker.can_attempt():
             raise MCPCircuitOpenError(
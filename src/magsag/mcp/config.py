@@ -26,12 +26,65 @@ class MCPLimits(BaseModel):
     )
 
 
+class PostgresResultCache(BaseModel):
+    """Read-through cache of PostgreSQL query results."""
+
+    ttl_s: float = Field(
+        default=60,
+        description="Seconds a cached result is served before re-querying",
+        gt=0,
+    )
+    max_entries: int = Field(
+        default=256,
+        description="Maximum cached results (least recently used evicted first)",
+        gt=0,
+    )
+
+
+class MCPToolCachePolicy(BaseModel):
+    """Cacheability of one tool's results."""
+
+    ttl_s: float = Field(
+        description="Seconds a cached result is served before calling the tool again",
+        gt=0,
+    )
+
+
 class PostgresConnection(BaseModel):
     """PostgreSQL connection configuration."""
 
     url_env: str = Field(
         description="Environment variable name containing connection URL",
     )
+    min_size: int = Field(
+        default=1,
+        description="Minimum number of pooled connections",
+        ge=0,
+    )
+    max_size: int = Field(
+        default=5,
+        description="Maximum number of pooled connections",
+        gt=0,
+    )
+    statement_cache_size: int = Field(
+        default=100,
+        description="Prepared statements kept per pooled connection (0 disables reuse)",
+        ge=0,
+    )
+    max_rows: int = Field(
+        default=1000,
+        description="Maximum rows returned by the query tool",
+        gt=0,
+    )
+    fetch_batch_size: int = Field(
+        default=500,
+        description="Rows fetched per cursor round trip",
+        gt=0,
+    )
+    result_cache: PostgresResultCache | None = Field(
+        default=None,
+        description="Cache query results by (sql, params); disabled when omitted",
+    )
 
 
 class MCPServerConfig(BaseModel):
@@ -87,6 +140,12 @@ class MCPServerConfig(BaseModel):
         description="PostgreSQL connection configuration",
     )
 
+    # Tool-result caching (any type)
+    tool_cache: dict[str, MCPToolCachePolicy] = Field(
+        default_factory=dict,
+        description="Cacheable tools by name; results of other tools are never cached",
+    )
+
     def validate_type_fields(self) -> None:
         """Validate that required fields are present based on server type."""
         if self.type == "mcp":
@@ -100,6 +159,8 @@ class MCPServerConfig(BaseModel):
         elif self.type == "postgres":
             if not self.conn:
                 raise ValueError("PostgreSQL servers must specify 'conn' field")
+            if self.conn.min_size > self.conn.max_size:
+                raise ValueError("PostgreSQL 'min_size' must not exceed 'max_size'")
 
     def get_permission_name(self) -> str:
         """Get the permission name for this MCP server.
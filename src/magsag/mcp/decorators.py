@@ -23,6 +23,7 @@ from magsag.api.config import get_settings
 from magsag.core.permissions import ToolPermission, mask_tool_args
 from magsag.governance.approval_gate import ApprovalGate
 from magsag.governance.permission_evaluator import PermissionEvaluator
+from magsag.mcp.cache import get_mcp_tool_cache
 from magsag.mcp.client import (
     AsyncMCPClient,
     MCPClientError,
@@ -132,6 +133,7 @@ async def _get_mcp_client(server_id: str, retry_attempts: Optional[int]) -> Asyn
                 transport=TransportType.STDIO,
                 config=client_config,
                 retry_config=retry_config,
+                tool_cache=config.tool_cache,
             )
         elif transport_name == "http":
             client_config = {
@@ -144,6 +146,7 @@ async def _get_mcp_client(server_id: str, retry_attempts: Optional[int]) -> Asyn
                 transport=TransportType.HTTP,
                 config=client_config,
                 retry_config=retry_config,
+                tool_cache=config.tool_cache,
             )
         elif transport_name == "websocket":
             client_config = {
@@ -156,6 +159,7 @@ async def _get_mcp_client(server_id: str, retry_attempts: Optional[int]) -> Asyn
                 transport=TransportType.WEBSOCKET,
                 config=client_config,
                 retry_config=retry_config,
+                tool_cache=config.tool_cache,
             )
         else:
             raise MCPTransportError(f"Unsupported transport '{transport_name}' for server '{server_id}'")
@@ -494,7 +498,9 @@ def mcp_cached(
     Decorator for caching MCP tool results.
 
     This decorator caches the results of MCP tool invocations
-    to reduce redundant calls and improve performance.
+    to reduce redundant calls and improve performance. Results live in
+    the shared, size-bounded MCP tool-result cache, and concurrent calls
+    with the same key share one invocation.
 
     Args:
         ttl_seconds: Cache TTL in seconds (default: 1 hour)
@@ -511,40 +517,28 @@ def mcp_cached(
     """
 
     def decorator(func: F) -> F:
-        cache: Dict[str, tuple[Any, datetime]] = {}
+        cache = get_mcp_tool_cache()
+        namespace = func.__module__
 
         @functools.wraps(func)
         async def wrapper(*args: Any, **kwargs: Any) -> Any:
             # Generate cache key
             if key_fn:
-                cache_key = key_fn(*args, **kwargs)
+                arguments: Dict[str, Any] = {"key": key_fn(*args, **kwargs)}
             else:
-                # Default: use function name and str representation of args/kwargs
-                cache_key = f"{func.__name__}:{args}:{kwargs}"
-
-            # Check cache
-            if cache_key in cache:
-                result, cached_at = cache[cache_key]
-                age_seconds = (datetime.now(UTC) - cached_at).total_seconds()
-
-                if age_seconds < ttl_seconds:
-                    logger.debug(
-                        f"Cache hit for {func.__name__} (age: {age_seconds:.1f}s)"
-                    )
-                    return result
-                else:
-                    logger.debug(
-                        f"Cache expired for {func.__name__} (age: {age_seconds:.1f}s)"
-                    )
-                    del cache[cache_key]
-
-            # Cache miss - invoke function
-            logger.debug(f"Cache miss for {func.__name__}, invoking...")
-            result = await func(*args, **kwargs)
-
-            # Store in cache
-            cache[cache_key] = (result, datetime.now(UTC))
+                arguments = {"args": list(args), "kwargs": kwargs}
+            try:
+                cache_key = cache.key("decorator", namespace, func.__qualname__, arguments)
+            except TypeError:
+                # Arguments are not JSON-serializable; fall back to their repr
+                cache_key = cache.key(
+                    "decorator", namespace, func.__qualname__, {"repr": repr(arguments)}
+                )
 
+            result, cached = await cache.get_or_call(
+                cache_key, ttl_seconds, lambda: func(*args, **kwargs)
+            )
+            logger.debug(f"Cache {'hit' if cached else 'miss'} for {func.__name__}")
             return result
 
         return wrapper  # type: ignore
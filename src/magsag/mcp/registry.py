@@ -7,14 +7,17 @@ including auto-discovery from .mcp/servers/*.yaml files.
 from __future__ import annotations
 
 import logging
+from collections.abc import AsyncIterator
 from pathlib import Path
 from typing import Any
 
 import yaml
 
+from magsag.mcp.cache import MCPToolCache, get_mcp_tool_cache
 from magsag.mcp.config import MCPServerConfig
 from magsag.mcp.server import MCPServer
 from magsag.mcp.tool import MCPTool, MCPToolResult
+from magsag.observability.stages import stage
 
 logger = logging.getLogger(__name__)
 
@@ -35,16 +38,23 @@ class MCPRegistry:
     - Tool discovery and routing
     """
 
-    def __init__(self, servers_dir: Path | None = None) -> None:
+    def __init__(
+        self,
+        servers_dir: Path | None = None,
+        tool_cache: MCPToolCache | None = None,
+    ) -> None:
         """Initialize MCP registry.
 
         Args:
             servers_dir: Directory containing server YAML configs.
                         Defaults to .mcp/servers/ in project root.
+            tool_cache: Cache for results of tools declared cacheable in
+                        server configs. Defaults to the process-wide cache.
         """
         self._servers: dict[str, MCPServer] = {}
         self._configs: dict[str, MCPServerConfig] = {}
         self._servers_dir = servers_dir or Path.cwd() / ".mcp" / "servers"
+        self._tool_cache = tool_cache or get_mcp_tool_cache()
 
     def discover_servers(self) -> None:
         """Discover and load all MCP server configurations.
@@ -248,7 +258,8 @@ class MCPRegistry:
             required_permissions: Optional list of required permissions to validate
 
         Returns:
-            Tool execution result
+            Tool execution result (served from the active cassette when replaying,
+            or from the tool-result cache for tools the server declares cacheable)
         """
         # Validate permissions if provided
         if required_permissions:
@@ -260,6 +271,112 @@ class MCPRegistry:
                     error=f"Missing required permissions: {', '.join(missing)}",
                 )
 
+        from magsag.cassette import MCP_EXECUTE_TOOL, get_active_cassette
+
+        cassette = get_active_cassette()
+        request = {"server_id": server_id, "tool_name": tool_name, "arguments": arguments}
+        with stage("mcp.tool", {"mcp.server": server_id, "mcp.tool": tool_name}) as span:
+            if cassette is not None and cassette.replaying:
+                span.set_attribute("mcp.replayed", True)
+                return MCPToolResult(**cassette.lookup(MCP_EXECUTE_TOOL, request))
+
+            result = await self._execute_cached(server_id, tool_name, arguments)
+            span.set_attribute("mcp.success", result.success)
+            if result.metadata.get("cached"):
+                span.set_attribute("mcp.cached", True)
+        if cassette is not None:
+            cassette.record(MCP_EXECUTE_TOOL, request, result.model_dump(mode="json"))
+        return result
+
+    async def stream_query(
+        self,
+        server_id: str,
+        sql: str,
+        params: list[Any] | None = None,
+        batch_size: int | None = None,
+        required_permissions: list[str] | None = None,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """Stream a PostgreSQL query's rows in batches with permission validation.
+
+        Streams are recorded to the active cassette once fully consumed, and
+        served from it when replaying without starting the server.
+
+        Args:
+            server_id: ID of the PostgreSQL server
+            sql: SQL SELECT query
+            params: Optional query parameters
+            batch_size: Rows per batch (default: the server's ``fetch_batch_size``)
+            required_permissions: Optional list of required permissions to validate
+
+        Yields:
+            Lists of rows as dicts
+
+        Raises:
+            MCPRegistryError: If permissions are missing or the server cannot start
+            MCPServerError: If the server cannot run the query
+        """
+        if required_permissions:
+            validation = self.validate_permissions(required_permissions)
+            missing = [p for p, valid in validation.items() if not valid]
+            if missing:
+                raise MCPRegistryError(f"Missing required permissions: {', '.join(missing)}")
+
+        from magsag.cassette import MCP_STREAM_QUERY, get_active_cassette
+
+        cassette = get_active_cassette()
+        request = {
+            "server_id": server_id,
+            "sql": sql,
+            "params": params,
+            "batch_size": batch_size,
+        }
+        if cassette is not None and cassette.replaying:
+            for batch in cassette.lookup(MCP_STREAM_QUERY, request):
+                yield batch
+            return
+
+        if server_id not in self._servers:
+            await self.start_server(server_id)
+        recorded: list[list[dict[str, Any]]] | None = [] if cassette is not None else None
+        async for batch in self._servers[server_id].stream_query(sql, params, batch_size):
+            if recorded is not None:
+                recorded.append(batch)
+            yield batch
+        if cassette is not None and recorded is not None:
+            cassette.record(MCP_STREAM_QUERY, request, recorded)
+
+    async def _execute_cached(
+        self,
+        server_id: str,
+        tool_name: str,
+        arguments: dict[str, Any],
+    ) -> MCPToolResult:
+        config = self._configs.get(server_id)
+        policy = config.tool_cache.get(tool_name) if config is not None else None
+        if policy is None:
+            return await self._execute_tool(server_id, tool_name, arguments)
+        try:
+            key = self._tool_cache.key("mcp.registry", server_id, tool_name, arguments)
+        except TypeError:
+            logger.debug(f"Arguments of {server_id}/{tool_name} are not cacheable")
+            return await self._execute_tool(server_id, tool_name, arguments)
+
+        result, cached = await self._tool_cache.get_or_call(
+            key,
+            policy.ttl_s,
+            lambda: self._execute_tool(server_id, tool_name, arguments),
+            cacheable=lambda r: r.success,
+        )
+        if cached:
+            result.metadata["cached"] = True
+        return result
+
+    async def _execute_tool(
+        self,
+        server_id: str,
+        tool_name: str,
+        arguments: dict[str, Any],
+    ) -> MCPToolResult:
         # Ensure server is started
         if server_id not in self._servers:
             try:
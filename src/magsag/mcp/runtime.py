@@ -7,9 +7,11 @@ MCP tools with proper permission enforcement.
 from __future__ import annotations
 
 import logging
+from collections.abc import AsyncIterator
 from typing import Any
 
-from magsag.mcp.registry import MCPRegistry
+from magsag.mcp.registry import MCPRegistry, MCPRegistryError
+from magsag.mcp.server import MCPServerError
 from magsag.mcp.tool import MCPTool, MCPToolResult
 
 logger = logging.getLogger(__name__)
@@ -172,6 +174,78 @@ class MCPRuntime:
             arguments=arguments,
         )
 
+    async def query_postgres_many(
+        self,
+        server_id: str,
+        sql: str,
+        param_sets: list[list[Any]],
+        max_rows: int | None = None,
+    ) -> MCPToolResult:
+        """Run one PostgreSQL query for many parameter sets in a single round trip.
+
+        Args:
+            server_id: ID of the PostgreSQL server
+            sql: SQL SELECT query with $1..$n placeholders
+            param_sets: One parameter list per execution
+            max_rows: Optional row limit per parameter set
+
+        Returns:
+            Query result whose ``output["results"][i]`` holds the rows for
+            ``param_sets[i]``
+        """
+        arguments: dict[str, Any] = {"sql": sql, "param_sets": param_sets}
+        if max_rows is not None:
+            arguments["max_rows"] = max_rows
+
+        return await self.execute_tool(
+            server_id=server_id,
+            tool_name="query_many",
+            arguments=arguments,
+        )
+
+    async def stream_postgres(
+        self,
+        server_id: str,
+        sql: str,
+        params: list[Any] | None = None,
+        batch_size: int | None = None,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """Stream a large PostgreSQL result in batches through a cursor.
+
+        Unlike ``query_postgres``, rows are not capped by the server's
+        ``max_rows`` and never pass through the result cache. Streams are
+        recorded to and replayed from the active cassette like tool calls.
+
+        Args:
+            server_id: ID of the PostgreSQL server
+            sql: SQL SELECT query
+            params: Optional query parameters
+            batch_size: Rows per batch (default: the server's ``fetch_batch_size``)
+
+        Yields:
+            Lists of rows as dicts
+
+        Raises:
+            MCPRuntimeError: If permission is denied or the query cannot run
+        """
+        if not self.check_permission(server_id):
+            raise MCPRuntimeError(
+                f"Permission denied: skill does not have access to server '{server_id}'. "
+                f"Required permission: mcp:{server_id}"
+            )
+
+        try:
+            async for batch in self._registry.stream_query(
+                server_id,
+                sql,
+                params,
+                batch_size=batch_size,
+                required_permissions=[f"mcp:{server_id}"],
+            ):
+                yield batch
+        except (MCPRegistryError, MCPServerError) as exc:
+            raise MCPRuntimeError(str(exc)) from exc
+
     async def list_postgres_tables(
         self,
         server_id: str,
@@ -13,10 +13,14 @@ import logging
 import os
 import time
 from asyncio.subprocess import PIPE, Process
+from collections import OrderedDict
+from collections.abc import AsyncIterator
 from typing import Any, cast
 
-from magsag.mcp.config import MCPServerConfig
+from magsag.cache.key import hash_stable
+from magsag.mcp.config import MCPServerConfig, PostgresResultCache
 from magsag.mcp.tool import MCPTool, MCPToolResult, MCPToolSchema
+from magsag.observability.metrics import cache_request_counters
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +40,45 @@ class MCPServerError(Exception):
     pass
 
 
+# Column tagging each row of a batched query with its parameter set
+_SET_INDEX_COLUMN = "__magsag_set"
+
+
+class _QueryResultCache:
+    """LRU cache of query results with a TTL, keyed by SQL and parameters."""
+
+    def __init__(self, config: PostgresResultCache) -> None:
+        self.ttl_s = config.ttl_s
+        self.max_entries = config.max_entries
+        self._entries: OrderedDict[str, tuple[float, list[dict[str, Any]], bool]] = OrderedDict()
+        self._hits, self._misses = cache_request_counters("postgres_result")
+
+    @staticmethod
+    def key(sql: str, params: list[Any], max_rows: int) -> str:
+        return hash_stable({"sql": sql, "params": params, "max_rows": max_rows})
+
+    def get(self, key: str) -> tuple[list[dict[str, Any]], bool] | None:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self._misses.inc()
+            return None
+        self._entries.move_to_end(key)
+        self._hits.inc()
+        # Copy rows so callers cannot mutate the cached result
+        return [dict(row) for row in entry[1]], entry[2]
+
+    def put(self, key: str, rows: list[dict[str, Any]], truncated: bool) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl_s, rows, truncated)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
 class MCPServer:
     """Manages connection to a single MCP server.
 
@@ -57,6 +100,11 @@ class MCPServer:
         self._stderr: asyncio.StreamReader | None = None
         self._tools: dict[str, MCPTool] = {}
         self._pg_pool: Any = None  # asyncpg.Pool[Any] | None (if asyncpg is installed)
+        self._pg_cache: _QueryResultCache | None = (
+            _QueryResultCache(config.conn.result_cache)
+            if config.conn is not None and config.conn.result_cache is not None
+            else None
+        )
         self._started: bool = False
         self._rpc_counter: int = 0
         self._io_lock = asyncio.Lock()
@@ -115,6 +163,8 @@ class MCPServer:
         if self._pg_pool:
             await self._pg_pool.close()
             self._pg_pool = None
+        if self._pg_cache is not None:
+            self._pg_cache.clear()
 
         self._started = False
         self._tools.clear()
@@ -208,11 +258,15 @@ class MCPServer:
                 f"Environment variable {url_env} not set for PostgreSQL server {self.server_id}"
             )
 
+        conn = self.config.conn
         try:
+            # asyncpg keeps an LRU of prepared statements on each pooled
+            # connection, so repeated queries skip the parse/plan round trip
             self._pg_pool = await asyncpg.create_pool(
                 conn_url,
-                min_size=1,
-                max_size=5,
+                min_size=conn.min_size,
+                max_size=conn.max_size,
+                statement_cache_size=conn.statement_cache_size,
                 timeout=self.config.limits.timeout_s,
             )
 
@@ -241,11 +295,42 @@ class MCPServer:
                             "description": "Query parameters for parameterized queries",
                             "items": {"type": "string"},
                         },
+                        "max_rows": {
+                            "type": "integer",
+                            "description": "Maximum rows to return (capped by the server limit)",
+                        },
                     },
                     required=["sql"],
                 ),
                 server_id=self.server_id,
             ),
+            "query_many": MCPTool(
+                name="query_many",
+                description=(
+                    "Execute one SELECT query for many parameter sets in a single "
+                    "round trip; results are aligned with the parameter sets"
+                ),
+                input_schema=MCPToolSchema(
+                    type="object",
+                    properties={
+                        "sql": {
+                            "type": "string",
+                            "description": "SQL SELECT query with $1..$n placeholders",
+                        },
+                        "param_sets": {
+                            "type": "array",
+                            "description": "One parameter list per execution",
+                            "items": {"type": "array"},
+                        },
+                        "max_rows": {
+                            "type": "integer",
+                            "description": "Maximum rows per parameter set (capped by the server limit)",
+                        },
+                    },
+                    required=["sql", "param_sets"],
+                ),
+                server_id=self.server_id,
+            ),
             "list_tables": MCPTool(
                 name="list_tables",
                 description="List all tables in the database",
@@ -530,51 +615,233 @@ class MCPServer:
                 error="PostgreSQL connection pool not initialized",
             )
 
+        # Cache hits are answered before a pooled connection is acquired
         try:
-            async with self._pg_pool.acquire() as conn:
-                if tool_name == "query":
-                    sql = arguments.get("sql", "")
-                    params = arguments.get("params", [])
+            if tool_name == "query":
+                sql = arguments.get("sql", "")
+                params = arguments.get("params") or []
+
+                # Validate that query is read-only (SELECT only)
+                if not sql.strip().upper().startswith("SELECT"):
+                    return MCPToolResult(
+                        success=False,
+                        error="Only SELECT queries are allowed in read-only mode",
+                    )
 
-                    # Validate that query is read-only (SELECT only)
-                    if not sql.strip().upper().startswith("SELECT"):
+                max_rows = self._pg_max_rows(arguments.get("max_rows"))
+                cache_key = None
+                if self._pg_cache is not None:
+                    cache_key = self._pg_cache.key(sql, params, max_rows)
+                    cached = self._pg_cache.get(cache_key)
+                    if cached is not None:
+                        rows, truncated = cached
                         return MCPToolResult(
-                            success=False,
-                            error="Only SELECT queries are allowed in read-only mode",
+                            success=True,
+                            output={"rows": rows, "count": len(rows), "truncated": truncated},
+                            metadata={"cached": True},
                         )
 
-                    rows = await conn.fetch(sql, *params)
-                    result_data = [dict(row) for row in rows]
+                async with self._pg_pool.acquire() as conn:
+                    rows, truncated = await self._fetch_rows(conn, sql, params, max_rows)
+                if cache_key is not None and self._pg_cache is not None:
+                    self._pg_cache.put(cache_key, rows, truncated)
+                    rows = [dict(row) for row in rows]
 
-                    return MCPToolResult(
-                        success=True,
-                        output={"rows": result_data, "count": len(result_data)},
-                    )
+                return MCPToolResult(
+                    success=True,
+                    output={"rows": rows, "count": len(rows), "truncated": truncated},
+                )
 
-                elif tool_name == "list_tables":
-                    schema = arguments.get("schema", "public")
-                    sql = """
-                        SELECT table_name
-                        FROM information_schema.tables
-                        WHERE table_schema = $1
-                        ORDER BY table_name
-                    """
-                    rows = await conn.fetch(sql, schema)
-                    tables = [row["table_name"] for row in rows]
+            elif tool_name == "query_many":
+                sql = arguments.get("sql", "")
+                param_sets = arguments.get("param_sets") or []
 
+                if not sql.strip().upper().startswith("SELECT"):
                     return MCPToolResult(
-                        success=True,
-                        output={"tables": tables, "count": len(tables)},
+                        success=False,
+                        error="Only SELECT queries are allowed in read-only mode",
                     )
-
-                else:
+                if not isinstance(param_sets, list) or not all(
+                    isinstance(params, list) for params in param_sets
+                ):
                     return MCPToolResult(
                         success=False,
-                        error=f"Unknown PostgreSQL tool: {tool_name}",
+                        error="'param_sets' must be a list of parameter lists",
                     )
 
+                max_rows = self._pg_max_rows(arguments.get("max_rows"))
+                results: list[dict[str, Any] | None] = [None] * len(param_sets)
+                pending: list[int] = []
+                cache_keys: list[str] = []
+                for index, params in enumerate(param_sets):
+                    if self._pg_cache is not None:
+                        key = self._pg_cache.key(sql, params, max_rows)
+                        cache_keys.append(key)
+                        cached = self._pg_cache.get(key)
+                        if cached is not None:
+                            rows, truncated = cached
+                            results[index] = {
+                                "rows": rows,
+                                "count": len(rows),
+                                "truncated": truncated,
+                            }
+                            continue
+                    pending.append(index)
+
+                fetched: list[tuple[list[dict[str, Any]], bool]] = []
+                if pending:
+                    async with self._pg_pool.acquire() as conn:
+                        fetched = await self._fetch_many(
+                            conn, sql, [param_sets[index] for index in pending], max_rows
+                        )
+                for index, (rows, truncated) in zip(pending, fetched):
+                    if self._pg_cache is not None:
+                        self._pg_cache.put(cache_keys[index], rows, truncated)
+                        rows = [dict(row) for row in rows]
+                    results[index] = {"rows": rows, "count": len(rows), "truncated": truncated}
+
+                return MCPToolResult(
+                    success=True,
+                    output={"results": results, "count": len(results)},
+                    metadata={"cached_sets": len(param_sets) - len(pending)},
+                )
+
+            elif tool_name == "list_tables":
+                schema = arguments.get("schema", "public")
+                sql = """
+                    SELECT table_name
+                    FROM information_schema.tables
+                    WHERE table_schema = $1
+                    ORDER BY table_name
+                """
+                async with self._pg_pool.acquire() as conn:
+                    table_rows = await conn.fetch(sql, schema)
+                tables = [row["table_name"] for row in table_rows]
+
+                return MCPToolResult(
+                    success=True,
+                    output={"tables": tables, "count": len(tables)},
+                )
+
+            else:
+                return MCPToolResult(
+                    success=False,
+                    error=f"Unknown PostgreSQL tool: {tool_name}",
+                )
+
         except Exception as e:
             return MCPToolResult(
                 success=False,
                 error=f"PostgreSQL execution error: {str(e)}",
             )
+
+    def _pg_max_rows(self, requested: Any) -> int:
+        """Row limit for a query: the caller's ``max_rows`` capped by the server's."""
+        limit = self.config.conn.max_rows if self.config.conn else 1000
+        if requested is None:
+            return limit
+        return max(1, min(int(requested), limit))
+
+    async def _fetch_rows(
+        self,
+        conn: Any,
+        sql: str,
+        params: list[Any],
+        max_rows: int,
+    ) -> tuple[list[dict[str, Any]], bool]:
+        """Read at most ``max_rows`` rows through a server-side cursor.
+
+        Returns:
+            The rows and whether the result was truncated at ``max_rows``
+        """
+        batch_size = self.config.conn.fetch_batch_size if self.config.conn else 500
+        rows: list[dict[str, Any]] = []
+        # Cursors need a transaction; a read-only one also rejects writes
+        # hidden behind a SELECT (e.g. data-modifying CTEs)
+        async with conn.transaction(readonly=True):
+            cursor = await conn.cursor(sql, *params)
+            while len(rows) <= max_rows:
+                batch = await cursor.fetch(min(batch_size, max_rows + 1 - len(rows)))
+                if not batch:
+                    break
+                rows.extend(dict(record) for record in batch)
+        truncated = len(rows) > max_rows
+        return rows[:max_rows], truncated
+
+    async def _fetch_many(
+        self,
+        conn: Any,
+        sql: str,
+        param_sets: list[list[Any]],
+        max_rows: int,
+    ) -> list[tuple[list[dict[str, Any]], bool]]:
+        """Run ``sql`` once per parameter set, pipelined in one round trip.
+
+        The query is wrapped so every row carries the index of its parameter
+        set and at most ``max_rows + 1`` rows are returned per set; asyncpg's
+        ``fetchmany`` then sends all executions before reading any result.
+
+        Returns:
+            ``(rows, truncated)`` per parameter set, in input order
+        """
+        if not param_sets:
+            return []
+        width = len(param_sets[0])
+        if any(len(params) != width for params in param_sets):
+            raise ValueError("All parameter sets must have the same length")
+
+        body = sql.strip().rstrip(";")
+        index_arg, limit_arg = width + 1, width + 2
+        wrapped = (
+            f"SELECT ${index_arg}::int AS {_SET_INDEX_COLUMN}, q.* "
+            f"FROM ({body}) AS q LIMIT ${limit_arg}::int"
+        )
+        args = [[*params, index, max_rows + 1] for index, params in enumerate(param_sets)]
+
+        grouped: list[list[dict[str, Any]]] = [[] for _ in param_sets]
+        async with conn.transaction(readonly=True):
+            if hasattr(conn, "fetchmany"):
+                records = await conn.fetchmany(wrapped, args)
+            else:  # asyncpg < 0.30: one prepared statement, one round trip per set
+                statement = await conn.prepare(wrapped)
+                records = [
+                    record for row_args in args for record in await statement.fetch(*row_args)
+                ]
+        for record in records:
+            row = dict(record)
+            grouped[row.pop(_SET_INDEX_COLUMN)].append(row)
+        return [(rows[:max_rows], len(rows) > max_rows) for rows in grouped]
+
+    async def stream_query(
+        self,
+        sql: str,
+        params: list[Any] | None = None,
+        batch_size: int | None = None,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """Stream a SELECT query's rows in batches without the ``max_rows`` cap.
+
+        Args:
+            sql: SQL SELECT query
+            params: Optional query parameters
+            batch_size: Rows per batch (default: the server's ``fetch_batch_size``)
+
+        Yields:
+            Lists of rows as dicts
+
+        Raises:
+            MCPServerError: If this is not a started PostgreSQL server or the
+                query is not a SELECT
+        """
+        if self.config.type != "postgres" or not self._pg_pool:
+            raise MCPServerError(f"Server {self.server_id} is not a started PostgreSQL server")
+        if not sql.strip().upper().startswith("SELECT"):
+            raise MCPServerError("Only SELECT queries are allowed in read-only mode")
+
+        size = batch_size or (self.config.conn.fetch_batch_size if self.config.conn else 500)
+        async with self._pg_pool.acquire() as conn, conn.transaction(readonly=True):
+            cursor = await conn.cursor(sql, *(params or []))
+            while True:
+                batch = await cursor.fetch(size)
+                if not batch:
+                    return
+                yield [dict(record) for record in batch]
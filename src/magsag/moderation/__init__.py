@@ -1,5 +1,6 @@
 """Content moderation using OpenAI omni-moderation API."""
 
+from magsag.moderation.batcher import ModerationBatcher, ModerationCache
 from magsag.moderation.moderation import (
     ModerationCategory,
     ModerationConfig,
@@ -11,6 +12,8 @@ from magsag.moderation.moderation import (
 )
 
 __all__ = [
+    "ModerationBatcher",
+    "ModerationCache",
     "ModerationCategory",
     "ModerationConfig",
     "ModerationError",
@@ -0,0 +1,207 @@
+"""
+Moderation result caching and request coalescing.
+
+``ModerationCache`` keeps recent results keyed by a hash of the model and the
+content, so templated prompts and retried attempts are not moderated twice.
+``ModerationBatcher`` collects concurrent moderation requests from any thread
+or event loop and sends them to the moderation API as one batch once the
+batch is full or a short window has passed. Identical pending texts share a
+single request.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+from magsag.cache.key import hash_stable
+from magsag.observability.metrics import cache_request_counters
+
+if TYPE_CHECKING:
+    from magsag.moderation.moderation import ModerationResult
+
+logger = logging.getLogger(__name__)
+
+
+class ModerationCache:
+    """Thread-safe LRU cache of moderation results with a TTL."""
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, ModerationResult]] = OrderedDict()
+        self._hit_counter, self._miss_counter = cache_request_counters("moderation")
+
+    @staticmethod
+    def key(model: str, content: str) -> str:
+        """Content-hash key of a moderation request."""
+        return hash_stable({"model": model, "content": content})
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, model: str, content: str) -> ModerationResult | None:
+        """Return a copy of the cached result, or None if missing or expired."""
+        key = self.key(model, content)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                self._miss_counter.inc()
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            result = entry[1]
+        self._hit_counter.inc()
+        return dataclasses.replace(result, metadata={**result.metadata, "cached": True})
+
+    def put(self, model: str, content: str, result: ModerationResult) -> None:
+        """Store a result (API error fallbacks are never cached)."""
+        if self.max_entries <= 0 or "error" in result.metadata:
+            return
+        key = self.key(model, content)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class ModerationBatcher:
+    """
+    Coalesce concurrent moderation requests into batched API calls.
+
+    A background thread groups pending texts into batches of at most
+    ``max_batch_size``, waiting up to ``max_wait_ms`` for a batch to fill,
+    and runs up to ``max_concurrent_batches`` batch calls at once.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[list[str]], list[ModerationResult]],
+        *,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+        max_concurrent_batches: int = 4,
+    ):
+        """
+        Initialize the batcher.
+
+        Args:
+            batch_fn: Moderates a list of texts, returning one result per text
+            max_batch_size: Maximum texts per batch call
+            max_wait_ms: Longest time a request waits for its batch to fill
+            max_concurrent_batches: Batch calls allowed in flight at once
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self.batches_sent = 0
+        self._cond = threading.Condition()
+        self._pending: dict[str, Future[ModerationResult]] = {}
+        self._inflight: dict[str, Future[ModerationResult]] = {}
+        self._window_start = 0.0
+        self._closed = False
+        self._thread: threading.Thread | None = None
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrent_batches, thread_name_prefix="magsag-moderation"
+        )
+
+    def submit(self, content: str) -> Future[ModerationResult]:
+        """Queue a text for moderation, sharing any identical pending request."""
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("ModerationBatcher is closed")
+            future = self._pending.get(content) or self._inflight.get(content)
+            if future is not None:
+                return future
+            future = Future()
+            if not self._pending:
+                self._window_start = time.monotonic()
+            self._pending[content] = future
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="magsag-moderation-batcher", daemon=True
+                )
+                self._thread.start()
+            self._cond.notify()
+        return future
+
+    def moderate(self, content: str, timeout: float | None = None) -> ModerationResult:
+        """Moderate a text, blocking until its batch completes."""
+        return self.submit(content).result(timeout=timeout)
+
+    async def amoderate(self, content: str) -> ModerationResult:
+        """Moderate a text without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(content))
+
+    def close(self) -> None:
+        """Flush pending requests and stop the background thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+        self._executor.shutdown(wait=True)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                while len(self._pending) < self.max_batch_size and not self._closed:
+                    remaining = self._window_start + self.max_wait - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = dict(list(self._pending.items())[: self.max_batch_size])
+                for content in batch:
+                    del self._pending[content]
+                self._inflight.update(batch)
+                self._window_start = time.monotonic()
+                self.batches_sent += 1
+            self._executor.submit(self._dispatch, batch)
+
+    def _dispatch(self, batch: dict[str, Future[ModerationResult]]) -> None:
+        contents = list(batch)
+        try:
+            results = self.batch_fn(contents)
+            if len(results) != len(contents):
+                raise RuntimeError(
+                    f"Moderation batch returned {len(results)} results for {len(contents)} inputs"
+                )
+        except Exception as e:
+            logger.error(f"Moderation batch of {len(contents)} failed: {e}")
+            for future in batch.values():
+                future.set_exception(e)
+        else:
+            for future, result in zip(batch.values(), results):
+                future.set_result(result)
+        finally:
+            with self._cond:
+                for content in contents:
+                    self._inflight.pop(content, None)
+
+
+__all__ = ["ModerationBatcher", "ModerationCache"]
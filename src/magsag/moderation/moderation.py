@@ -11,12 +11,15 @@ from __future__ import annotations
 
 import logging
 import os
+import threading
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any, Optional
 
 from openai import OpenAI
 
+from magsag.moderation.batcher import ModerationBatcher, ModerationCache
+
 logger = logging.getLogger(__name__)
 
 
@@ -74,6 +77,11 @@ class ModerationConfig:
     block_on_flagged: bool = True
     fail_closed_on_error: bool = False  # If True, treat API errors as flagged content
     timeout: float = 10.0
+    base_url: Optional[str] = None  # Defaults to OPENAI_BASE_URL or the OpenAI API
+    cache_max_entries: int = 1024  # 0 disables the result cache
+    cache_ttl_seconds: float = 300.0
+    batch_max_size: int = 32
+    batch_max_wait_ms: float = 5.0
 
     def get_api_key(self) -> str:
         """Get API key from config or environment."""
@@ -99,6 +107,8 @@ class ModerationService:
     Content moderation service using OpenAI omni-moderation API.
 
     Provides input and output content moderation to ensure safe interactions.
+    Text results are cached by content hash, and the async API coalesces
+    concurrent requests into batched API calls.
     """
 
     def __init__(self, config: Optional[ModerationConfig] = None):
@@ -111,8 +121,35 @@ class ModerationService:
         self.config = config or ModerationConfig()
         self.client = OpenAI(
             api_key=self.config.get_api_key(),
+            base_url=self.config.base_url,
             timeout=self.config.timeout,
         )
+        self.cache = ModerationCache(
+            max_entries=self.config.cache_max_entries,
+            ttl_seconds=self.config.cache_ttl_seconds,
+        )
+        self._batcher: Optional[ModerationBatcher] = None
+        self._batcher_lock = threading.Lock()
+
+    @property
+    def batcher(self) -> ModerationBatcher:
+        """Micro-batcher feeding :meth:`batch_moderate` (created on first use)."""
+        if self._batcher is None:
+            with self._batcher_lock:
+                if self._batcher is None:
+                    self._batcher = ModerationBatcher(
+                        self.batch_moderate,
+                        max_batch_size=self.config.batch_max_size,
+                        max_wait_ms=self.config.batch_max_wait_ms,
+                    )
+        return self._batcher
+
+    def close(self) -> None:
+        """Flush pending batched requests and release the client."""
+        if self._batcher is not None:
+            self._batcher.close()
+            self._batcher = None
+        self.client.close()
 
     def moderate(
         self,
@@ -154,6 +191,9 @@ class ModerationService:
         else:
             # Text-only moderation
             input_data = content
+            cached = self.cache.get(self.config.model, content)
+            if cached is not None:
+                return cached
 
         try:
             response = self.client.moderations.create(
@@ -164,7 +204,7 @@ class ModerationService:
             # Parse first result (batch moderation returns list)
             result = response.results[0]
 
-            return ModerationResult(
+            moderation_result = ModerationResult(
                 flagged=result.flagged,
                 categories={cat: val for cat, val in result.categories.model_dump().items()},
                 category_scores={
@@ -177,6 +217,9 @@ class ModerationService:
                     "has_multimodal": bool(multimodal_input),
                 },
             )
+            if not multimodal_input:
+                self.cache.put(self.config.model, content, moderation_result)
+            return moderation_result
         except Exception as e:
             # Log the full error for debugging
             logger.error(
@@ -232,14 +275,7 @@ class ModerationService:
         if not self.config.enable_input_moderation:
             return ModerationResult(flagged=False, metadata={"skipped": True})
 
-        result = self.moderate(content)
-
-        if result.flagged and self.config.block_on_flagged:
-            flagged_cats = ", ".join(result.flagged_categories)
-            msg = f"Input content flagged for policy violations: {flagged_cats}"
-            raise ModerationError(msg, result)
-
-        return result
+        return self._enforce(self.moderate(content), "Input")
 
     def moderate_output(self, content: str) -> ModerationResult:
         """
@@ -257,11 +293,44 @@ class ModerationService:
         if not self.config.enable_output_moderation:
             return ModerationResult(flagged=False, metadata={"skipped": True})
 
-        result = self.moderate(content)
+        return self._enforce(self.moderate(content), "Output")
+
+    async def amoderate(self, content: str) -> ModerationResult:
+        """
+        Check text content without blocking the event loop.
+
+        Cache misses are queued on the shared micro-batcher, so concurrent
+        callers (from any thread or event loop) share ``batch_moderate`` calls.
+
+        Args:
+            content: Text content to moderate
 
+        Returns:
+            ModerationResult with flagged categories and scores
+        """
+        cached = self.cache.get(self.config.model, content)
+        if cached is not None:
+            return cached
+        return await self.batcher.amoderate(content)
+
+    async def amoderate_input(self, content: str) -> ModerationResult:
+        """Async variant of :meth:`moderate_input`."""
+        if not self.config.enable_input_moderation:
+            return ModerationResult(flagged=False, metadata={"skipped": True})
+
+        return self._enforce(await self.amoderate(content), "Input")
+
+    async def amoderate_output(self, content: str) -> ModerationResult:
+        """Async variant of :meth:`moderate_output`."""
+        if not self.config.enable_output_moderation:
+            return ModerationResult(flagged=False, metadata={"skipped": True})
+
+        return self._enforce(await self.amoderate(content), "Output")
+
+    def _enforce(self, result: ModerationResult, kind: str) -> ModerationResult:
         if result.flagged and self.config.block_on_flagged:
             flagged_cats = ", ".join(result.flagged_categories)
-            msg = f"Output content flagged for policy violations: {flagged_cats}"
+            msg = f"{kind} content flagged for policy violations: {flagged_cats}"
             raise ModerationError(msg, result)
 
         return result
@@ -270,6 +339,8 @@ class ModerationService:
         """
         Moderate multiple content items in a single API call.
 
+        Cached items are answered from the cache and duplicates are sent once.
+
         Args:
             contents: List of content strings to moderate
 
@@ -279,10 +350,23 @@ class ModerationService:
         if not contents:
             return []
 
+        cached: dict[str, ModerationResult] = {}
+        misses: dict[str, None] = {}  # Ordered set of texts to send
+        for content in contents:
+            if content in cached or content in misses:
+                continue
+            hit = self.cache.get(self.config.model, content)
+            if hit is not None:
+                cached[content] = hit
+            else:
+                misses[content] = None
+        if not misses:
+            return [cached[content] for content in contents]
+
         try:
             response = self.client.moderations.create(
                 model=self.config.model,
-                input=contents,
+                input=list(misses),
             )
 
             results = []
@@ -303,7 +387,10 @@ class ModerationService:
                     )
                 )
 
-            return results
+            for content, moderation_result in zip(misses, results):
+                self.cache.put(self.config.model, content, moderation_result)
+                cached[content] = moderation_result
+            return [cached[content] for content in contents]
         except Exception as e:
             # Log the full error for debugging
             logger.error(
@@ -323,7 +410,8 @@ class ModerationService:
                     f"Batch moderation API error in fail-closed mode - flagging all {len(contents)} items as unsafe"
                 )
                 return [
-                    ModerationResult(
+                    cached.get(content)
+                    or ModerationResult(
                         flagged=True,
                         categories={"moderation_error": True},
                         metadata={
@@ -333,12 +421,13 @@ class ModerationService:
                             "batch_index": i,
                         },
                     )
-                    for i in range(len(contents))
+                    for i, content in enumerate(contents)
                 ]
             else:
                 # Permissive fallback to avoid blocking legitimate content
                 return [
-                    ModerationResult(
+                    cached.get(content)
+                    or ModerationResult(
                         flagged=False,
                         metadata={
                             "error": str(e),
@@ -347,7 +436,7 @@ class ModerationService:
                             "batch_index": i,
                         },
                     )
-                    for i in range(len(contents))
+                    for i, content in enumerate(contents)
                 ]
 
 
@@ -14,6 +14,15 @@ from .cost_tracker import (
     record_llm_cost,
 )
 from .logger import ObservabilityLogger
+from .metrics import MetricsRegistry, get_metrics_registry
+from .stages import (
+    InMemorySpanExporter,
+    SpanContext,
+    StageTracer,
+    configure_stage_tracing,
+    get_stage_tracer,
+    stage,
+)
 from .summarize_runs import summarize
 from .tracing import (
     ObservabilityConfig,
@@ -40,4 +49,12 @@ __all__ = [
     "initialize_observability",
     "observe",
     "shutdown_observability",
+    "InMemorySpanExporter",
+    "SpanContext",
+    "StageTracer",
+    "configure_stage_tracing",
+    "get_stage_tracer",
+    "stage",
+    "MetricsRegistry",
+    "get_metrics_registry",
 ]
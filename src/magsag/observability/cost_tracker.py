@@ -15,9 +15,12 @@ import sqlite3
 import threading
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+from magsag.observability.metrics import Counter, get_metrics_registry
+
 
 DEFAULT_RUNS_DIR = Path(".runs")
 DEFAULT_COSTS_DIR = DEFAULT_RUNS_DIR / "costs"
@@ -460,6 +463,13 @@ def get_tracker() -> CostTracker:
     return _tracker
 
 
+@lru_cache(maxsize=1)
+def _llm_cost_counter() -> Counter:
+    return get_metrics_registry().counter(
+        "magsag_llm_cost_usd_total", "LLM spend in USD by model", ["model"]
+    )
+
+
 def record_llm_cost(
     model: str,
     input_tokens: int,
@@ -483,6 +493,7 @@ def record_llm_cost(
         agent: Agent name
         metadata: Additional metadata
     """
+    _llm_cost_counter().labels(model).inc(cost_usd)
     tracker = get_tracker()
     record = CostRecord(
         timestamp=datetime.now(timezone.utc).isoformat(),
@@ -0,0 +1,231 @@
+"""
+Push-based streaming of run log files.
+
+ObservabilityLogger publishes every line it appends to ``logs.jsonl`` on an
+in-process bus. Followers subscribe to the bus and receive lines as soon
+as they are written; lines written by other processes (or dropped because
+a follower fell behind) are recovered by reading the file from the
+follower's last byte offset.
+
+Thread-safe: publishers may run in worker threads while followers run on
+an asyncio event loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+
+# (start_offset, end_offset, line) of one appended log line
+LogLine = Tuple[int, int, str]
+
+DEFAULT_QUEUE_SIZE = 1024
+DEFAULT_POLL_INTERVAL = 0.5
+_BLOCK_SIZE = 64 * 1024
+
+
+def log_key(path: Path | str) -> str:
+    """Normalise a log file path into a bus key."""
+    return os.path.realpath(path)
+
+
+class LogSubscription:
+    """Queue of lines published for one log file, bound to an event loop."""
+
+    def __init__(self, bus: LogBus, key: str, maxsize: int = DEFAULT_QUEUE_SIZE) -> None:
+        self._bus = bus
+        self.key = key
+        self._loop = asyncio.get_running_loop()
+        self._queue: asyncio.Queue[LogLine] = asyncio.Queue(maxsize=maxsize)
+
+    def _deliver(self, item: LogLine) -> None:
+        try:
+            self._queue.put_nowait(item)
+        except asyncio.QueueFull:
+            # Follower is behind; it recovers the gap from the file
+            pass
+
+    def push(self, item: LogLine) -> None:
+        """Hand a line to the subscriber's loop (callable from any thread)."""
+        try:
+            self._loop.call_soon_threadsafe(self._deliver, item)
+        except RuntimeError:
+            # Event loop closed without unsubscribing
+            self.close()
+
+    async def get(self) -> LogLine:
+        return await self._queue.get()
+
+    def close(self) -> None:
+        self._bus.unsubscribe(self)
+
+
+class LogBus:
+    """In-process fan-out of appended log lines keyed by file path."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._subscribers: Dict[str, Set[LogSubscription]] = {}
+
+    def subscribe(self, path: Path | str, maxsize: int = DEFAULT_QUEUE_SIZE) -> LogSubscription:
+        """Subscribe the running event loop to lines appended to ``path``."""
+        subscription = LogSubscription(self, log_key(path), maxsize)
+        with self._lock:
+            self._subscribers.setdefault(subscription.key, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: LogSubscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.key)
+            if subscribers is None:
+                return
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.key]
+
+    def publish(self, key: str, start: int, end: int, line: str) -> None:
+        """Publish a line appended to the log identified by ``key``."""
+        if key not in self._subscribers:
+            return
+        with self._lock:
+            subscribers = list(self._subscribers.get(key, ()))
+        for subscription in subscribers:
+            subscription.push((start, end, line))
+
+
+_bus: Optional[LogBus] = None
+_bus_lock = threading.Lock()
+
+
+def get_log_bus() -> LogBus:
+    """Get or create the global log bus."""
+    global _bus
+    if _bus is None:
+        with _bus_lock:
+            if _bus is None:
+                _bus = LogBus()
+    return _bus
+
+
+def tail_lines(path: Path, count: int) -> Tuple[List[str], int]:
+    """
+    Read the last ``count`` complete lines of a file.
+
+    Reads fixed-size blocks backwards from the end, so memory is bounded by
+    the returned lines rather than the file size. A trailing partial line
+    (still being written) is excluded.
+
+    Args:
+        path: File to read
+        count: Number of lines to return
+
+    Returns:
+        Tuple of (lines without newlines, byte offset just past the last line)
+    """
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        end: Optional[int] = None
+        pieces: List[bytes] = []
+        newlines = 0
+
+        while position > 0:
+            size = min(_BLOCK_SIZE, position)
+            position -= size
+            f.seek(position)
+            block = f.read(size)
+            if end is None:
+                last_newline = block.rfind(b"\n")
+                if last_newline == -1:
+                    continue
+                end = position + last_newline + 1
+                block = block[: last_newline + 1]
+            pieces.append(block)
+            # The newline ending the last line does not start a new one
+            newlines += block.count(b"\n")
+            if newlines > count:
+                break
+
+    if end is None:
+        return [], 0
+    data = b"".join(reversed(pieces))
+    lines = data.decode("utf-8", errors="replace").splitlines()
+    return lines[-count:], end
+
+
+def read_lines_from(path: Path, offset: int) -> Tuple[List[str], int]:
+    """
+    Read complete lines appended after ``offset``.
+
+    Args:
+        path: File to read
+        offset: Byte offset to start from
+
+    Returns:
+        Tuple of (lines without newlines, byte offset just past the last line)
+    """
+    with open(path, "rb") as f:
+        f.seek(offset)
+        data = f.read()
+    last_newline = data.rfind(b"\n")
+    if last_newline == -1:
+        return [], offset
+    data = data[: last_newline + 1]
+    return data.decode("utf-8", errors="replace").splitlines(), offset + len(data)
+
+
+async def follow_log(
+    path: Path,
+    *,
+    tail: Optional[int] = None,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+    bus: Optional[LogBus] = None,
+) -> AsyncIterator[str]:
+    """
+    Yield lines appended to a log file until the consumer stops iterating.
+
+    Lines logged by this process are pushed through the bus immediately.
+    The file is only re-read when an offset gap shows lines were missed, or
+    when nothing was pushed for ``poll_interval`` seconds and the file grew
+    (writers in other processes).
+
+    Args:
+        path: Log file to follow
+        tail: Emit the last N existing lines first
+        poll_interval: Seconds between file size checks while idle
+        bus: Log bus to subscribe to (defaults to the global bus)
+
+    Yields:
+        Log lines without trailing newlines
+    """
+    subscription = (bus or get_log_bus()).subscribe(path)
+    try:
+        if tail:
+            lines, position = await asyncio.to_thread(tail_lines, path, tail)
+            for line in lines:
+                yield line
+        else:
+            _, position = await asyncio.to_thread(tail_lines, path, 1)
+
+        while True:
+            try:
+                start, end, line = await asyncio.wait_for(subscription.get(), poll_interval)
+            except asyncio.TimeoutError:
+                if path.stat().st_size <= position:
+                    continue
+            else:
+                if end <= position:
+                    continue  # Already emitted
+                if start == position:
+                    position = end
+                    yield line
+                    continue
+
+            lines, position = await asyncio.to_thread(read_lines_from, path, position)
+            for line in lines:
+                yield line
+    finally:
+        subscription.close()
@@ -14,6 +14,7 @@ from pathlib import Path
 from typing import Any, Dict, Mapping, Optional
 
 from magsag.observability.cost_tracker import record_llm_cost
+from magsag.observability.log_stream import get_log_bus, log_key
 from magsag.observability.tracing import initialize_observability
 from magsag.routing.router import Plan as LLMPlan
 
@@ -41,6 +42,8 @@ class ObservabilityLogger:
         self.base_dir = base_dir or Path.cwd() / ".runs" / "agents"
         self.run_dir = self.base_dir / run_id
         self.run_dir.mkdir(parents=True, exist_ok=True)
+        self._log_file = self.run_dir / "logs.jsonl"
+        self._log_key = log_key(self._log_file)
         self.logs: list[dict[str, Any]] = []
         self.metrics: dict[str, list[dict[str, Any]]] = {}
         self.span_id = span_id or f"span-{uuid.uuid4().hex[:16]}"
@@ -113,9 +116,13 @@ class ObservabilityLogger:
         if self.parent_span_id:
             entry["parent_span_id"] = self.parent_span_id
         self.logs.append(entry)
-        log_file = self.run_dir / "logs.jsonl"
-        with open(log_file, "a", encoding="utf-8") as f:
-            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        line = json.dumps(entry, ensure_ascii=False)
+        payload = (line + "\n").encode("utf-8")
+        with open(self._log_file, "ab") as f:
+            f.write(payload)
+            end = f.tell()
+        # Push to in-process followers (e.g., SSE log streams)
+        get_log_bus().publish(self._log_key, end - len(payload), end, line)
 
     def metric(self, key: str, value: Any) -> None:
         """Record a metric value."""
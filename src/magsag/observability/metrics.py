@@ -0,0 +1,582 @@
+"""
+In-process metrics registry with OpenMetrics exposition.
+
+Components update counters, gauges and histograms directly; ``GET /metrics``
+renders them in the OpenMetrics text format. Updating a bound child
+(``metric.labels(...)``) only takes a per-child lock, so instrumented hot
+paths pay well under a microsecond per update.
+
+Label cardinality is bounded per metric: once ``max_label_sets`` distinct
+label sets exist, further ones are folded into a single set whose values are
+all ``_overflow``.
+
+Under multi-worker servers, set ``MAGSAG_METRICS_MULTIPROC_DIR`` to a
+directory shared by the workers (ideally on tmpfs such as ``/dev/shm``).
+Each process writes its samples there every ``flush_interval`` seconds, and
+whichever worker answers a scrape merges all files: counters and histograms
+are summed (including those of exited workers), gauges are combined across
+live processes according to their ``multiprocess_mode``. Clear the directory
+when the server is (re)deployed.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import math
+import os
+import tempfile
+import threading
+from bisect import bisect_left
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+from typing import Any, ClassVar, Literal, TypeVar
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# Latency buckets in seconds
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+OVERFLOW_LABEL = "_overflow"
+MULTIPROC_FILE_PREFIX = "metrics-"
+
+GaugeMode = Literal["sum", "max", "min"]
+
+
+class _ValueChild:
+    """Value of one label set of a counter or gauge."""
+
+    __slots__ = ("_lock", "value")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+
+class CounterChild(_ValueChild):
+    __slots__ = ()
+
+    def inc(self, amount: float = 1.0) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only be incremented by non-negative amounts")
+        with self._lock:
+            self.value += amount
+
+
+class GaugeChild(_ValueChild):
+    __slots__ = ()
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = float(value)
+
+
+class HistogramChild:
+    """Bucket counts of one label set of a histogram."""
+
+    __slots__ = ("_bounds", "_lock", "counts", "sum")
+
+    def __init__(self, bounds: Sequence[float]) -> None:
+        self._bounds = bounds
+        self._lock = threading.Lock()
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self._bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+
+class Metric:
+    """A metric family; ``labels()`` returns the child for one label set."""
+
+    type: ClassVar[str]
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        *,
+        max_label_sets: int = 500,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.max_label_sets = max_label_sets
+        self._lock = threading.Lock()
+        self._children: dict[tuple[str, ...], Any] = {}
+        self._overflow: Any = None
+        self._default: Any = None if self.labelnames else self._child(())
+
+    def _new_child(self) -> Any:
+        raise NotImplementedError
+
+    def labels(self, *values: Any, **kwvalues: Any) -> Any:
+        """Return the child for a label set (positional or by name)."""
+        if kwvalues:
+            values = tuple(kwvalues[name] for name in self.labelnames)
+        key = tuple(map(str, values))
+        child = self._children.get(key)
+        if child is None:
+            child = self._child(key)
+        return child
+
+    def _child(self, key: tuple[str, ...]) -> Any:
+        if len(key) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {key}")
+        with self._lock:
+            child = self._children.get(key)
+            if child is not None:
+                return child
+            if len(self._children) >= self.max_label_sets:
+                if self._overflow is None:
+                    overflow_key = (OVERFLOW_LABEL,) * len(key)
+                    self._overflow = self._children.get(overflow_key) or self._new_child()
+                    self._children[overflow_key] = self._overflow
+                    logger.warning(
+                        "Metric %s exceeded %d label sets; folding new ones into %s",
+                        self.name,
+                        self.max_label_sets,
+                        OVERFLOW_LABEL,
+                    )
+                return self._overflow
+            child = self._children[key] = self._new_child()
+            return child
+
+    def _unlabelled(self) -> Any:
+        if self._default is None:
+            raise ValueError(f"{self.name} has labels {self.labelnames}; use labels()")
+        return self._default
+
+    def samples(self) -> list[tuple[tuple[str, ...], Any]]:
+        """Snapshot of every label set's value."""
+        with self._lock:
+            children = list(self._children.items())
+        return [(key, self._snapshot(child)) for key, child in children]
+
+    def _snapshot(self, child: Any) -> Any:
+        return child.value
+
+    def reset(self) -> None:
+        with self._lock:
+            self._children.clear()
+            self._overflow = None
+            if not self.labelnames:
+                self._default = self._children[()] = self._new_child()
+
+    def describe(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "type": self.type,
+            "help": self.documentation,
+            "labelnames": list(self.labelnames),
+        }
+
+
+class Counter(Metric):
+    """Monotonically increasing count."""
+
+    type = "counter"
+
+    def _new_child(self) -> CounterChild:
+        return CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._unlabelled().inc(amount)
+
+
+class Gauge(Metric):
+    """Value that can go up and down."""
+
+    type = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        *,
+        max_label_sets: int = 500,
+        multiprocess_mode: GaugeMode = "sum",
+    ):
+        self.multiprocess_mode = multiprocess_mode
+        super().__init__(name, documentation, labelnames, max_label_sets=max_label_sets)
+
+    def _new_child(self) -> GaugeChild:
+        return GaugeChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._unlabelled().inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._unlabelled().dec(amount)
+
+    def set(self, value: float) -> None:
+        self._unlabelled().set(value)
+
+    def describe(self) -> dict[str, Any]:
+        return {**super().describe(), "multiprocess_mode": self.multiprocess_mode}
+
+
+class Histogram(Metric):
+    """Distribution of observed values in fixed buckets."""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        *,
+        max_label_sets: int = 500,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.buckets = tuple(sorted(float(bound) for bound in buckets if bound != math.inf))
+        super().__init__(name, documentation, labelnames, max_label_sets=max_label_sets)
+
+    def _new_child(self) -> HistogramChild:
+        return HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._unlabelled().observe(value)
+
+    def _snapshot(self, child: HistogramChild) -> dict[str, Any]:
+        with child._lock:
+            return {"counts": list(child.counts), "sum": child.sum}
+
+    def describe(self) -> dict[str, Any]:
+        return {**super().describe(), "buckets": list(self.buckets)}
+
+
+_M = TypeVar("_M", bound=Metric)
+
+
+class MetricsRegistry:
+    """Process-wide collection of metrics, optionally shared across workers."""
+
+    def __init__(
+        self,
+        multiprocess_dir: str | Path | None = None,
+        *,
+        flush_interval: float = 1.0,
+    ):
+        """
+        Initialize the registry.
+
+        Args:
+            multiprocess_dir: Directory shared by worker processes (None for
+                single-process exposition)
+            flush_interval: Seconds between writes of this process's samples
+        """
+        self.multiprocess_dir = Path(multiprocess_dir) if multiprocess_dir else None
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._metrics: dict[str, Metric] = {}
+        self._flusher: threading.Thread | None = None
+        self._stop = threading.Event()
+        if self.multiprocess_dir is not None:
+            self.multiprocess_dir.mkdir(parents=True, exist_ok=True)
+            atexit.register(self.flush)
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (), **kwargs: Any
+    ) -> Counter:
+        """Return the counter called ``name``, creating it on first use."""
+        return self._register(Counter, name, documentation, labelnames, kwargs)
+
+    def gauge(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (), **kwargs: Any
+    ) -> Gauge:
+        """Return the gauge called ``name``, creating it on first use."""
+        return self._register(Gauge, name, documentation, labelnames, kwargs)
+
+    def histogram(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (), **kwargs: Any
+    ) -> Histogram:
+        """Return the histogram called ``name``, creating it on first use."""
+        return self._register(Histogram, name, documentation, labelnames, kwargs)
+
+    def _register(
+        self,
+        cls: type[_M],
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str],
+        kwargs: dict[str, Any],
+    ) -> _M:
+        with self._lock:
+            existing = self._metrics.get(name)
+            if existing is not None:
+                if type(existing) is not cls or existing.labelnames != tuple(labelnames):
+                    raise ValueError(f"Metric {name} is already registered differently")
+                return existing
+            metric = cls(name, documentation, labelnames, **kwargs)
+            self._metrics[name] = metric
+            if self.multiprocess_dir is not None and self._flusher is None:
+                self._start_flusher()
+        return metric
+
+    def get(self, name: str) -> Metric | None:
+        return self._metrics.get(name)
+
+    def collect(self) -> list[dict[str, Any]]:
+        """Snapshot of this process's metrics."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return [
+            {**metric.describe(), "samples": [[list(k), v] for k, v in metric.samples()]}
+            for metric in metrics
+        ]
+
+    def render(self) -> str:
+        """Render all metrics (merged across workers if shared) as OpenMetrics text."""
+        if self.multiprocess_dir is None:
+            families = self.collect()
+        else:
+            self.flush()
+            families = merge_process_snapshots(self._read_snapshots())
+        return render_openmetrics(families)
+
+    def reset(self) -> None:
+        """Zero every metric (for tests)."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            metric.reset()
+
+    # Multiprocess support -------------------------------------------------
+
+    @property
+    def process_file(self) -> Path:
+        assert self.multiprocess_dir is not None
+        return self.multiprocess_dir / f"{MULTIPROC_FILE_PREFIX}{os.getpid()}.json"
+
+    def flush(self) -> None:
+        """Write this process's samples to the shared directory."""
+        if self.multiprocess_dir is None:
+            return
+        payload = json.dumps({"pid": os.getpid(), "metrics": self.collect()})
+        try:
+            with tempfile.NamedTemporaryFile(
+                "w", dir=self.multiprocess_dir, suffix=".tmp", delete=False, encoding="utf-8"
+            ) as tmp:
+                tmp.write(payload)
+            os.replace(tmp.name, self.process_file)
+        except OSError as exc:
+            logger.warning("Failed to write metrics to %s: %s", self.multiprocess_dir, exc)
+
+    def _read_snapshots(self) -> list[dict[str, Any]]:
+        assert self.multiprocess_dir is not None
+        snapshots = []
+        for path in sorted(self.multiprocess_dir.glob(f"{MULTIPROC_FILE_PREFIX}*.json")):
+            try:
+                snapshot = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue  # Removed or being replaced
+            snapshot["alive"] = _pid_alive(int(snapshot.get("pid", 0)))
+            snapshots.append(snapshot)
+        return snapshots
+
+    def _start_flusher(self) -> None:
+        self._stop.clear()
+        self._flusher = threading.Thread(
+            target=self._flush_loop, name="magsag-metrics-flush", daemon=True
+        )
+        self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def _after_fork(self) -> None:
+        # Samples inherited from the parent belong to the parent's file
+        self._lock = threading.Lock()
+        self._flusher = None
+        self.reset()
+        if self._metrics:
+            self._start_flusher()
+
+    def close(self) -> None:
+        """Stop the flusher thread after a final flush."""
+        self._stop.set()
+        if self._flusher is not None:
+            self._flusher.join()
+            self._flusher = None
+        self.flush()
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid <= 0:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def merge_process_snapshots(snapshots: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Combine per-process snapshots into one set of metric families."""
+    families: dict[str, dict[str, Any]] = {}
+    for snapshot in snapshots:
+        alive = snapshot.get("alive", True)
+        for metric in snapshot.get("metrics", []):
+            family = families.get(metric["name"])
+            if family is None:
+                family = families[metric["name"]] = {**metric, "samples": {}}
+            if family["type"] != metric["type"]:
+                continue
+            if metric["type"] == "gauge" and not alive:
+                continue
+            merged: dict[tuple[str, ...], Any] = family["samples"]
+            for labels, value in metric["samples"]:
+                key = tuple(labels)
+                current = merged.get(key)
+                if current is None:
+                    merged[key] = (
+                        {"counts": list(value["counts"]), "sum": value["sum"]}
+                        if metric["type"] == "histogram"
+                        else value
+                    )
+                elif metric["type"] == "histogram":
+                    current["counts"] = [a + b for a, b in zip(current["counts"], value["counts"])]
+                    current["sum"] += value["sum"]
+                elif metric["type"] == "gauge" and family.get("multiprocess_mode") == "max":
+                    merged[key] = max(current, value)
+                elif metric["type"] == "gauge" and family.get("multiprocess_mode") == "min":
+                    merged[key] = min(current, value)
+                else:
+                    merged[key] = current + value
+    return [
+        {**family, "samples": [[list(k), v] for k, v in family["samples"].items()]}
+        for family in families.values()
+    ]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def render_openmetrics(families: Iterable[dict[str, Any]]) -> str:
+    """Render metric snapshots as OpenMetrics text."""
+    lines: list[str] = []
+    for family in sorted(families, key=lambda f: f["name"]):
+        name = family["name"]
+        kind = family["type"]
+        labelnames = family["labelnames"]
+        base = name[: -len("_total")] if kind == "counter" and name.endswith("_total") else name
+        lines.append(f"# TYPE {base} {kind}")
+        lines.append(f"# HELP {base} {_escape(family['help'])}")
+        for labels, value in sorted(family["samples"], key=lambda s: s[0]):
+            if kind == "counter":
+                lines.append(
+                    f"{base}_total{_format_labels(labelnames, labels)} {_format_value(value)}"
+                )
+            elif kind == "gauge":
+                lines.append(f"{base}{_format_labels(labelnames, labels)} {_format_value(value)}")
+            else:
+                cumulative = 0
+                for bound, count in zip([*family["buckets"], math.inf], value["counts"]):
+                    cumulative += count
+                    le = f'le="{_format_value(bound)}"' if bound == math.inf else f'le="{bound}"'
+                    lines.append(
+                        f"{base}_bucket{_format_labels(labelnames, labels, le)} {cumulative}"
+                    )
+                lines.append(f"{base}_count{_format_labels(labelnames, labels)} {cumulative}")
+                lines.append(
+                    f"{base}_sum{_format_labels(labelnames, labels)} {_format_value(value['sum'])}"
+                )
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+_registry: MetricsRegistry | None = None
+_registry_lock = threading.Lock()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Return the process registry, sharing ``METRICS_MULTIPROC_DIR`` if configured."""
+    global _registry
+    registry = _registry
+    if registry is None:
+        with _registry_lock:
+            if _registry is None:
+                from magsag.api.config import get_settings
+
+                _registry = MetricsRegistry(get_settings().METRICS_MULTIPROC_DIR)
+            registry = _registry
+    return registry
+
+
+def cache_request_counters(
+    cache: str, outcomes: Sequence[str] = ("hit", "miss")
+) -> tuple[CounterChild, ...]:
+    """Return the children of ``magsag_cache_requests_total`` for ``cache``, one per outcome."""
+    requests = get_metrics_registry().counter(
+        "magsag_cache_requests_total", "Cache lookups by cache and outcome", ["cache", "outcome"]
+    )
+    return tuple(requests.labels(cache, outcome) for outcome in outcomes)
+
+
+__all__ = [
+    "CONTENT_TYPE",
+    "DEFAULT_BUCKETS",
+    "Counter",
+    "CounterChild",
+    "Gauge",
+    "GaugeChild",
+    "Histogram",
+    "HistogramChild",
+    "Metric",
+    "MetricsRegistry",
+    "cache_request_counters",
+    "get_metrics_registry",
+    "merge_process_snapshots",
+    "render_openmetrics",
+]
@@ -0,0 +1,589 @@
+"""
+Stage-level spans and latency histograms for the run pipeline.
+
+``stage()`` times one stage of an agent run (planning, evaluations,
+moderation, agent execution, skills, MCP tools, provider calls, storage
+writes). Stages nest through a context variable, so a span opened inside
+another becomes its child, including across the thread and event-loop hops
+the runner makes. Runs started from a ``Delegation`` continue the caller's
+trace through the ``trace_id``/``parent_span_id``/``trace_sampled`` keys of
+``Delegation.context``.
+
+Sampling is decided once per trace at the root span (head-based) from the
+trace id, so every process sampling at the same rate keeps the same traces.
+Sampled spans go to the registered exporters and, when OpenTelemetry tracing
+is initialised, are mirrored as OTel spans. Latency histograms labelled by
+stage, agent and provider are recorded for every run when metrics are
+enabled, independent of sampling. With both disabled ``stage()`` returns a
+shared no-op after a couple of attribute lookups.
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+import zlib
+from bisect import bisect_left
+from collections import deque
+from collections.abc import Iterable, Mapping, MutableMapping, Sequence
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from types import TracebackType
+from typing import Any, Protocol, Self
+
+from magsag.observability.metrics import get_metrics_registry
+from magsag.observability.tracing import OTEL_AVAILABLE, ObservabilityConfig, ObservabilityManager
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is +Inf
+DEFAULT_BUCKETS_MS: tuple[float, ...] = (
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    25.0,
+    50.0,
+    100.0,
+    250.0,
+    500.0,
+    1000.0,
+    2500.0,
+    5000.0,
+    10000.0,
+    30000.0,
+    60000.0,
+)
+
+# Delegation.context keys carrying the trace across agent runs
+TRACE_ID_KEY = "trace_id"
+PARENT_SPAN_ID_KEY = "parent_span_id"
+TRACE_SAMPLED_KEY = "trace_sampled"
+
+_SAMPLE_SPACE = 1 << 64
+
+_current: ContextVar[StageSpan | None] = ContextVar("magsag_current_stage", default=None)
+
+
+@dataclass(frozen=True)
+class SpanContext:
+    """Identifies the remote parent of a span (e.g. from ``Delegation.context``)."""
+
+    trace_id: str
+    span_id: str | None = None
+    sampled: bool | None = None
+
+    @classmethod
+    def from_mapping(cls, context: Mapping[str, Any] | None) -> SpanContext | None:
+        """Read a trace context from ``context``, or None if it carries none."""
+        if not context or not context.get(TRACE_ID_KEY):
+            return None
+        sampled = context.get(TRACE_SAMPLED_KEY)
+        parent = context.get(PARENT_SPAN_ID_KEY)
+        return cls(
+            trace_id=str(context[TRACE_ID_KEY]),
+            span_id=str(parent) if parent else None,
+            sampled=None if sampled is None else bool(sampled),
+        )
+
+
+class SpanExporter(Protocol):
+    """Receives every finished sampled span."""
+
+    def export(self, span: StageSpan) -> None: ...
+
+
+class StageSpan:
+    """A timed pipeline stage; use via ``stage()``."""
+
+    __slots__ = (
+        "_otel_cm",
+        "_otel_span",
+        "_start",
+        "_token",
+        "agent",
+        "attributes",
+        "duration_ns",
+        "name",
+        "parent_span_id",
+        "provider",
+        "sampled",
+        "span_id",
+        "start_time_ns",
+        "status",
+        "trace_id",
+        "tracer",
+    )
+
+    trace_id: str
+    span_id: str | None
+    parent_span_id: str | None
+    sampled: bool
+    agent: str | None
+    provider: str | None
+
+    def __init__(
+        self,
+        tracer: StageTracer,
+        name: str,
+        attributes: Mapping[str, Any] | None = None,
+        *,
+        agent: str | None = None,
+        provider: str | None = None,
+        parent: SpanContext | None = None,
+    ):
+        self.tracer = tracer
+        self.name = name
+        self.attributes: dict[str, Any] = dict(attributes) if attributes else {}
+        self.parent_span_id = None
+        self.status = "ok"
+        self.start_time_ns = 0
+        self.duration_ns = 0
+        self._start = 0
+        self._token: Token[StageSpan | None] | None = None
+        self._otel_cm: Any = None
+        self._otel_span: Any = None
+
+        enclosing = _current.get()
+        if parent is not None:
+            self.trace_id = parent.trace_id
+            self.parent_span_id = parent.span_id
+            self.sampled = (
+                tracer.should_sample(parent.trace_id) if parent.sampled is None else parent.sampled
+            )
+        elif enclosing is not None:
+            self.trace_id = enclosing.trace_id
+            self.parent_span_id = enclosing.span_id
+            self.sampled = enclosing.sampled
+        else:
+            self.trace_id = f"{random.getrandbits(128):032x}" if tracer.tracing_enabled else ""
+            self.sampled = tracer.should_sample(self.trace_id)
+        self.sampled = self.sampled and tracer.tracing_enabled
+        self.span_id = f"{random.getrandbits(64):016x}" if self.sampled else None
+
+        self.agent = agent or (enclosing.agent if enclosing else None)
+        self.provider = provider or (enclosing.provider if enclosing else None)
+
+    @property
+    def duration_ms(self) -> float:
+        return self.duration_ns / 1_000_000
+
+    def set_labels(self, *, agent: str | None = None, provider: str | None = None) -> None:
+        """Set histogram labels that stages opened later inside this one inherit."""
+        if agent:
+            self.agent = agent
+        if provider:
+            self.provider = provider
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Attach an attribute (kept only on sampled spans)."""
+        if not self.sampled:
+            return
+        self.attributes[key] = value
+        if self._otel_span is not None:
+            self._otel_span.set_attribute(key, value)
+
+    def __enter__(self) -> Self:
+        self._token = _current.set(self)
+        if self.sampled and self.tracer.otel_tracer is not None:
+            self._otel_cm = self.tracer.otel_tracer.start_as_current_span(
+                self.name, attributes=self._otel_attributes()
+            )
+            self._otel_span = self._otel_cm.__enter__()
+        self.start_time_ns = time.time_ns()
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.duration_ns = time.perf_counter_ns() - self._start
+        if exc_type is not None:
+            self.status = "error"
+            self.set_attribute("error.type", exc_type.__name__)
+        if self._otel_cm is not None:
+            self._otel_cm.__exit__(exc_type, exc, tb)
+        if self._token is not None:
+            _current.reset(self._token)
+        self.tracer.finish(self)
+
+    def _otel_attributes(self) -> dict[str, Any]:
+        attributes = {key: value for key, value in self.attributes.items() if value is not None}
+        attributes["magsag.trace_id"] = self.trace_id
+        if self.agent:
+            attributes["magsag.agent"] = self.agent
+        if self.provider:
+            attributes["magsag.provider"] = self.provider
+        return attributes
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_span_id,
+            "agent": self.agent,
+            "provider": self.provider,
+            "start_time_ns": self.start_time_ns,
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "attributes": dict(self.attributes),
+        }
+
+
+class _NoopStage(StageSpan):
+    """Shared stand-in returned by ``stage()`` while tracing and metrics are off."""
+
+    __slots__ = ()
+
+    def __init__(self) -> None:
+        self.name = ""
+        self.attributes = {}
+        self.agent = None
+        self.provider = None
+        self.trace_id = ""
+        self.span_id = None
+        self.parent_span_id = None
+        self.sampled = False
+        self.status = "ok"
+        self.start_time_ns = 0
+        self.duration_ns = 0
+
+    def set_labels(self, *, agent: str | None = None, provider: str | None = None) -> None:
+        pass
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        pass
+
+
+_NOOP_STAGE = _NoopStage()
+
+
+class InMemorySpanExporter:
+    """Keeps finished spans in memory, for tests and offline inspection."""
+
+    def __init__(self, max_spans: int | None = 10_000):
+        self._lock = threading.Lock()
+        self._spans: deque[StageSpan] = deque(maxlen=max_spans)
+
+    def export(self, span: StageSpan) -> None:
+        with self._lock:
+            self._spans.append(span)
+
+    @property
+    def spans(self) -> list[StageSpan]:
+        """Finished spans in completion order."""
+        with self._lock:
+            return list(self._spans)
+
+    def find(self, name: str) -> list[StageSpan]:
+        """Return finished spans called ``name``."""
+        return [span for span in self.spans if span.name == name]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._spans.clear()
+
+
+@dataclass
+class HistogramSeries:
+    """Bucketed latencies of one (stage, agent, provider) label set."""
+
+    counts: list[int]
+    count: int = 0
+    sum_ms: float = 0.0
+
+
+@dataclass
+class StageHistogram:
+    """Thread-safe latency histograms keyed by stage, agent and provider."""
+
+    buckets: Sequence[float] = DEFAULT_BUCKETS_MS
+    _series: dict[tuple[str, str, str], HistogramSeries] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def observe(self, stage: str, agent: str, provider: str, value_ms: float) -> None:
+        index = bisect_left(self.buckets, value_ms)
+        key = (stage, agent, provider)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = HistogramSeries(counts=[0] * (len(self.buckets) + 1))
+            series.counts[index] += 1
+            series.count += 1
+            series.sum_ms += value_ms
+
+    def series(self) -> dict[tuple[str, str, str], HistogramSeries]:
+        """Copy of every series, keyed by (stage, agent, provider)."""
+        with self._lock:
+            return {
+                key: HistogramSeries(list(s.counts), s.count, s.sum_ms)
+                for key, s in self._series.items()
+            }
+
+    def quantile(
+        self,
+        q: float,
+        stage: str,
+        *,
+        agent: str | None = None,
+        provider: str | None = None,
+    ) -> float | None:
+        """
+        Estimate the ``q`` quantile (0-1) of a stage's latency in ms.
+
+        Series matching ``stage`` (and ``agent``/``provider`` when given) are
+        merged and the value is interpolated inside its bucket, as
+        Prometheus' ``histogram_quantile`` does.
+        """
+        counts = [0] * (len(self.buckets) + 1)
+        for (name, series_agent, series_provider), series in self.series().items():
+            if name != stage or agent not in (None, series_agent):
+                continue
+            if provider not in (None, series_provider):
+                continue
+            counts = [a + b for a, b in zip(counts, series.counts)]
+        total = sum(counts)
+        if total == 0:
+            return None
+        rank = q * total
+        cumulative = 0
+        for index, bucket_count in enumerate(counts):
+            if cumulative + bucket_count >= rank and bucket_count:
+                if index == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = self.buckets[index]
+                return lower + (upper - lower) * (rank - cumulative) / bucket_count
+            cumulative += bucket_count
+        return self.buckets[-1]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+class StageTracer:
+    """Sampling, export and histogram settings shared by all stages."""
+
+    def __init__(
+        self,
+        *,
+        sample_rate: float = 0.0,
+        exporters: Iterable[SpanExporter] = (),
+        metrics: bool = False,
+        buckets: Sequence[float] = DEFAULT_BUCKETS_MS,
+        otel_tracer: Any = None,
+        otel_histogram: Any = None,
+    ):
+        """
+        Initialize the tracer.
+
+        Args:
+            sample_rate: Fraction of traces (0-1) whose spans are exported
+            exporters: Span exporters receiving sampled spans
+            metrics: Record latency histograms for every stage
+            buckets: Histogram bucket upper bounds in milliseconds
+            otel_tracer: OpenTelemetry tracer mirroring sampled spans
+            otel_histogram: OpenTelemetry histogram mirroring stage latencies
+        """
+        self.sample_rate = min(max(sample_rate, 0.0), 1.0)
+        self.exporters: list[SpanExporter] = list(exporters)
+        self.metrics_enabled = metrics
+        self.histogram = StageHistogram(buckets=tuple(buckets))
+        self.stage_seconds = (
+            get_metrics_registry().histogram(
+                "magsag_stage_duration_seconds",
+                "Duration of agent pipeline stages",
+                ["stage", "agent", "provider"],
+                buckets=[bound / 1000 for bound in buckets],
+            )
+            if metrics
+            else None
+        )
+        self.otel_tracer = otel_tracer
+        self.otel_histogram = otel_histogram
+        self._threshold = int(self.sample_rate * _SAMPLE_SPACE)
+        self._refresh()
+
+    @classmethod
+    def from_config(cls, config: ObservabilityConfig) -> StageTracer:
+        """Build a tracer mirroring to OpenTelemetry when it is enabled."""
+        otel_tracer = None
+        otel_histogram = None
+        if OTEL_AVAILABLE and (config.enable_tracing or config.enable_metrics):
+            manager = ObservabilityManager.get_instance(config)
+            if config.enable_tracing:
+                otel_tracer = manager.get_tracer()
+            meter = manager.get_meter() if config.enable_metrics else None
+            if meter is not None:
+                otel_histogram = meter.create_histogram(
+                    "magsag_stage_duration_ms",
+                    unit="ms",
+                    description="Duration of agent pipeline stages",
+                )
+        return cls(
+            sample_rate=config.trace_sample_rate,
+            metrics=config.enable_metrics,
+            otel_tracer=otel_tracer,
+            otel_histogram=otel_histogram,
+        )
+
+    def add_exporter(self, exporter: SpanExporter) -> None:
+        self.exporters.append(exporter)
+        self._refresh()
+
+    def _refresh(self) -> None:
+        self.tracing_enabled = self._threshold > 0 and bool(
+            self.exporters or self.otel_tracer is not None
+        )
+        self.active = self.tracing_enabled or self.metrics_enabled
+
+    def should_sample(self, trace_id: str) -> bool:
+        """Head-sampling decision, deterministic in the trace id."""
+        if self._threshold <= 0 or not trace_id:
+            return False
+        if self._threshold >= _SAMPLE_SPACE:
+            return True
+        try:
+            value = int(trace_id[-16:], 16)
+        except ValueError:
+            value = zlib.crc32(trace_id.encode("utf-8")) << 32
+        return value < self._threshold
+
+    def finish(self, span: StageSpan) -> None:
+        if self.metrics_enabled:
+            duration_ms = span.duration_ms
+            agent = span.agent or ""
+            provider = span.provider or ""
+            self.histogram.observe(span.name, agent, provider, duration_ms)
+            if self.stage_seconds is not None:
+                self.stage_seconds.labels(span.name, agent, provider).observe(duration_ms / 1000)
+            if self.otel_histogram is not None:
+                self.otel_histogram.record(
+                    duration_ms,
+                    attributes={"stage": span.name, "agent": agent, "provider": provider},
+                )
+        if span.sampled:
+            for exporter in self.exporters:
+                exporter.export(span)
+
+
+_tracer: StageTracer | None = None
+_tracer_lock = threading.Lock()
+
+
+def get_stage_tracer() -> StageTracer:
+    """Return the process tracer, configured from the environment on first use."""
+    global _tracer
+    tracer = _tracer
+    if tracer is None:
+        with _tracer_lock:
+            if _tracer is None:
+                _tracer = StageTracer.from_config(ObservabilityConfig.from_env())
+            tracer = _tracer
+    return tracer
+
+
+def configure_stage_tracing(
+    *,
+    sample_rate: float = 1.0,
+    exporters: Iterable[SpanExporter] = (),
+    metrics: bool = True,
+    buckets: Sequence[float] = DEFAULT_BUCKETS_MS,
+) -> StageTracer:
+    """Install a process tracer with explicit settings (no OpenTelemetry mirror)."""
+    global _tracer
+    tracer = StageTracer(
+        sample_rate=sample_rate, exporters=exporters, metrics=metrics, buckets=buckets
+    )
+    with _tracer_lock:
+        _tracer = tracer
+    return tracer
+
+
+def reset_stage_tracing() -> None:
+    """Drop the process tracer; the next stage re-reads the environment."""
+    global _tracer
+    with _tracer_lock:
+        _tracer = None
+
+
+def stage(
+    name: str,
+    attributes: Mapping[str, Any] | None = None,
+    *,
+    agent: str | None = None,
+    provider: str | None = None,
+    parent: SpanContext | None = None,
+) -> StageSpan:
+    """
+    Time a pipeline stage as a child of the current stage.
+
+    Args:
+        name: Stage name (e.g. ``agent.pre_eval``)
+        attributes: Span attributes (kept only when sampled)
+        agent: Agent label, inherited from the enclosing stage when omitted
+        provider: Provider label, inherited from the enclosing stage when omitted
+        parent: Remote parent, e.g. ``SpanContext.from_mapping(delegation.context)``
+
+    Usage:
+        with stage("agent.pre_eval", {"agent.slug": slug}):
+            ...
+    """
+    tracer = _tracer or get_stage_tracer()
+    if not tracer.active:
+        return _NOOP_STAGE
+    return StageSpan(tracer, name, attributes, agent=agent, provider=provider, parent=parent)
+
+
+def current_stage() -> StageSpan | None:
+    """Return the innermost open stage, if any."""
+    return _current.get()
+
+
+def inject_trace_context(context: MutableMapping[str, Any]) -> None:
+    """
+    Record the current stage as the parent of a delegated run.
+
+    Leaves ``context`` untouched when it already carries a trace or when no
+    traced stage is open.
+    """
+    span = _current.get()
+    if span is None or not span.trace_id or TRACE_ID_KEY in context:
+        return
+    context[TRACE_ID_KEY] = span.trace_id
+    if span.span_id:
+        context[PARENT_SPAN_ID_KEY] = span.span_id
+    context[TRACE_SAMPLED_KEY] = span.sampled
+
+
+__all__ = [
+    "DEFAULT_BUCKETS_MS",
+    "HistogramSeries",
+    "InMemorySpanExporter",
+    "SpanContext",
+    "SpanExporter",
+    "StageHistogram",
+    "StageSpan",
+    "StageTracer",
+    "configure_stage_tracing",
+    "current_stage",
+    "get_stage_tracer",
+    "inject_trace_context",
+    "reset_stage_tracing",
+    "stage",
+]
@@ -73,6 +73,7 @@ class ObservabilityConfig:
         langfuse_public_key: Optional[str] = None,
         langfuse_secret_key: Optional[str] = None,
         langfuse_host: Optional[str] = None,
+        trace_sample_rate: float = 1.0,
     ):
         """
         Initialize observability configuration.
@@ -86,6 +87,7 @@ class ObservabilityConfig:
             langfuse_public_key: Langfuse public API key
             langfuse_secret_key: Langfuse secret API key
             langfuse_host: Langfuse host URL (default: https://cloud.langfuse.com)
+            trace_sample_rate: Fraction of runs whose stage spans are traced (0-1)
         """
         self.enable_tracing = enable_tracing
         self.enable_metrics = enable_metrics
@@ -95,6 +97,7 @@ class ObservabilityConfig:
         self.langfuse_public_key = langfuse_public_key
         self.langfuse_secret_key = langfuse_secret_key
         self.langfuse_host = langfuse_host or "https://cloud.langfuse.com"
+        self.trace_sample_rate = trace_sample_rate
 
     @classmethod
     def from_env(cls) -> ObservabilityConfig:
@@ -108,6 +111,7 @@ class ObservabilityConfig:
             langfuse_public_key=os.getenv("LANGFUSE_PUBLIC_KEY"),
             langfuse_secret_key=os.getenv("LANGFUSE_SECRET_KEY"),
             langfuse_host=os.getenv("LANGFUSE_HOST"),
+            trace_sample_rate=float(os.getenv("MAGSAG_TRACE_SAMPLE_RATE", "1.0")),
         )
 
 
@@ -18,18 +18,45 @@ Example:
 
 from __future__ import annotations
 
+import heapq
+import json
 import logging
+import os
+import time
 from abc import abstractmethod
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Sequence
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Protocol
+from typing import Any, Literal, Protocol
 
 import numpy as np
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from magsag.cache.policy import get_ttl
+from magsag.observability.metrics import cache_request_counters
+from magsag.optimization.cache_snapshot import (
+    CacheSnapshotStore,
+    JournalRecord,
+    SnapshotEntry,
+    SnapshotState,
+)
+
 logger = logging.getLogger(__name__)
 
+# Supported FAISS index types (see CacheConfig.faiss_index_type)
+FAISS_INDEX_TYPES = ("Flat", "IVFFlat", "IVFPQ", "IVFSQ8", "HNSW")
+
+# Training sample size per IVF list or PQ centroid (FAISS warns below 39)
+IVF_TRAINING_POINTS_PER_LIST = 64
+
+# Approximate per-entry bookkeeping (slot object, dict and eviction records)
+CACHE_ENTRY_OVERHEAD_BYTES = 256
+
+# First id used for entries a read-only snapshot reader adds locally
+READ_ONLY_LOCAL_ID_OFFSET = 1 << 62
+
 
 class CacheBackend(str, Enum):
     """Available cache backend types."""
@@ -56,8 +83,32 @@ class CacheConfig(BaseSettings):
         dimension: Embedding dimension (default: 768 for many models)
         redis_url: Redis connection URL (required for redis backend)
         redis_index_name: Redis index name (default: "magsag_cache")
-        faiss_index_type: FAISS index type - "Flat" (exact) or "IVFFlat" (approximate)
-        faiss_nlist: Number of clusters for IVFFlat index (default: 100)
+        faiss_index_type: FAISS index type - "Flat" (exact), "IVFFlat", "IVFPQ",
+            "IVFSQ8" or "HNSW" (approximate)
+        faiss_nlist: Number of clusters for IVF indexes (default: 100)
+        faiss_nprobe: IVF clusters scanned per query (default: 1)
+        faiss_pq_m: IVFPQ sub-quantizers, must divide the dimension (default: 64)
+        faiss_pq_nbits: Bits per IVFPQ sub-quantizer code (default: 8)
+        faiss_hnsw_m: HNSW neighbours per node (default: 32)
+        faiss_hnsw_ef_construction: HNSW build-time search depth (default: 40)
+        faiss_hnsw_ef_search: HNSW query-time search depth (default: 64)
+        faiss_retrain_factor: Retrain IVF indexes when the corpus grows by this factor
+            since the last training (default: 4.0, <= 1 disables)
+        max_entries: Maximum live entries before eviction (default: 0, unlimited)
+        max_bytes: Approximate memory budget before eviction (default: 0, unlimited)
+        eviction_policy: "lru" (least recently used) or "lfu" (least frequently used)
+        default_ttl_seconds: Entry TTL (default: None, use ``cache.policy.get_ttl``;
+            0 never expires)
+        compaction_ratio: Remove deleted vectors from the index once they exceed
+            this fraction of live entries (default: 0.25)
+        faiss_snapshot_dir: Directory for persistent snapshots (default: None, off)
+        faiss_snapshot_interval: Journal records between automatic snapshots
+            (default: 10000, 0 = only explicit ``save_snapshot()``)
+        faiss_snapshot_mmap: Serve snapshot indexes memory-mapped (default: True)
+        faiss_snapshot_read_only: Attach to a snapshot written by another
+            process without writing to it (default: False)
+        faiss_snapshot_refresh_seconds: How often a read-only cache checks for
+            new snapshots and journal records on search (default: 0, manual)
     """
 
     model_config = SettingsConfigDict(
@@ -85,13 +136,95 @@ class CacheConfig(BaseSettings):
     )
     faiss_index_type: str = Field(
         default="Flat",
-        description="FAISS index type: 'Flat' (exact search) or 'IVFFlat' (approximate)",
+        description="FAISS index type: 'Flat' (exact) or 'IVFFlat', 'IVFPQ', 'IVFSQ8', 'HNSW'",
     )
     faiss_nlist: int = Field(
         default=100,
         gt=0,
         description="Number of IVF clusters",
     )
+    faiss_nprobe: int = Field(
+        default=1,
+        gt=0,
+        description="IVF clusters scanned per query (higher = better recall, slower)",
+    )
+    faiss_pq_m: int = Field(
+        default=64,
+        gt=0,
+        description="IVFPQ sub-quantizers (bytes per vector at 8 bits); must divide dimension",
+    )
+    faiss_pq_nbits: int = Field(
+        default=8,
+        gt=0,
+        le=16,
+        description="Bits per IVFPQ sub-quantizer code",
+    )
+    faiss_hnsw_m: int = Field(
+        default=32,
+        gt=1,
+        description="HNSW neighbours per node (higher = better recall, more memory)",
+    )
+    faiss_hnsw_ef_construction: int = Field(
+        default=40,
+        gt=0,
+        description="HNSW search depth while inserting",
+    )
+    faiss_hnsw_ef_search: int = Field(
+        default=64,
+        gt=0,
+        description="HNSW search depth per query (higher = better recall, slower)",
+    )
+    faiss_retrain_factor: float = Field(
+        default=4.0,
+        ge=0.0,
+        description="Retrain IVF centroids when the corpus grows by this factor (<= 1 disables)",
+    )
+    max_entries: int = Field(
+        default=0,
+        ge=0,
+        description="Maximum live entries before eviction (0 = unlimited)",
+    )
+    max_bytes: int = Field(
+        default=0,
+        ge=0,
+        description="Approximate memory budget in bytes before eviction (0 = unlimited)",
+    )
+    eviction_policy: Literal["lru", "lfu"] = Field(
+        default="lru",
+        description="Eviction policy when over budget: 'lru' or 'lfu'",
+    )
+    default_ttl_seconds: int | None = Field(
+        default=None,
+        ge=0,
+        description="Entry TTL in seconds (None = cache.policy.get_ttl, 0 = never expire)",
+    )
+    compaction_ratio: float = Field(
+        default=0.25,
+        gt=0.0,
+        description="Compact the index when deleted vectors exceed this fraction of live entries",
+    )
+    faiss_snapshot_dir: str | None = Field(
+        default=None,
+        description="Directory for persistent FAISS snapshots (None disables persistence)",
+    )
+    faiss_snapshot_interval: int = Field(
+        default=10_000,
+        ge=0,
+        description="Journal records between automatic snapshots (0 = explicit only)",
+    )
+    faiss_snapshot_mmap: bool = Field(
+        default=True,
+        description="Load snapshot indexes with IO_FLAG_MMAP (shared across processes)",
+    )
+    faiss_snapshot_read_only: bool = Field(
+        default=False,
+        description="Attach to another process's snapshot without writing to it",
+    )
+    faiss_snapshot_refresh_seconds: float = Field(
+        default=0.0,
+        ge=0.0,
+        description="Seconds between automatic refreshes of a read-only cache (0 = manual)",
+    )
 
 
 class SemanticCache(Protocol):
@@ -103,6 +236,8 @@ class SemanticCache(Protocol):
         key: str,
         embedding: np.ndarray[Any, np.dtype[np.float32]],
         value: dict[str, Any],
+        ttl_seconds: float | None = None,
+        sensitivity: str = "default",
     ) -> None:
         """Store an entry in the cache.
 
@@ -110,6 +245,29 @@ class SemanticCache(Protocol):
             key: Unique identifier for the entry
             embedding: Vector embedding (must be normalized)
             value: Associated metadata/value
+            ttl_seconds: Entry lifetime (None uses the configured default or
+                ``cache.policy.get_ttl``; <= 0 never expires)
+            sensitivity: Sensitivity level passed to ``get_ttl``
+        """
+        ...
+
+    @abstractmethod
+    def set_many(
+        self,
+        keys: Sequence[str],
+        embeddings: np.ndarray[Any, np.dtype[np.float32]],
+        values: Sequence[dict[str, Any]],
+        ttl_seconds: float | None = None,
+        sensitivity: str = "default",
+    ) -> None:
+        """Store many entries at once.
+
+        Args:
+            keys: Unique identifiers, one per row of ``embeddings``
+            embeddings: Matrix of shape (len(keys), dimension)
+            values: Associated metadata/values, one per key
+            ttl_seconds: Entry lifetime applied to every key
+            sensitivity: Sensitivity level passed to ``get_ttl``
         """
         ...
 
@@ -132,6 +290,25 @@ class SemanticCache(Protocol):
         """
         ...
 
+    @abstractmethod
+    def search_many(
+        self,
+        query_embeddings: np.ndarray[Any, np.dtype[np.float32]],
+        k: int = 5,
+        threshold: float = 0.9,
+    ) -> list[list[CacheEntry]]:
+        """Search for many queries at once.
+
+        Args:
+            query_embeddings: Matrix of shape (num_queries, dimension)
+            k: Number of top results per query
+            threshold: Minimum similarity threshold (0.0-1.0)
+
+        Returns:
+            One list of matching entries per query, sorted by similarity
+        """
+        ...
+
     @abstractmethod
     def clear(self) -> None:
         """Clear all entries from the cache."""
@@ -143,21 +320,79 @@ class SemanticCache(Protocol):
         ...
 
 
+def _resolve_ttl(
+    config: CacheConfig,
+    ttl_seconds: float | None,
+    sensitivity: str,
+    value_length: int,
+) -> float | None:
+    """Resolve an entry TTL; returns None for no expiry and 0 to skip caching."""
+    if ttl_seconds is None:
+        ttl_seconds = config.default_ttl_seconds
+    if ttl_seconds is None:
+        return float(get_ttl(sensitivity, length=value_length))
+    if ttl_seconds <= 0:
+        return None
+    return float(ttl_seconds)
+
+
+class _CacheSlot:
+    """Bookkeeping for one live FAISS cache entry (its vector lives in the index)."""
+
+    __slots__ = ("expires_at", "hits", "key", "nbytes", "value")
+
+    def __init__(
+        self,
+        key: str,
+        value: dict[str, Any],
+        expires_at: float | None,
+        nbytes: int,
+    ) -> None:
+        self.key = key
+        self.value = value
+        self.expires_at = expires_at
+        self.nbytes = nbytes
+        self.hits = 0
+
+
 class FAISSCache(SemanticCache):
     """FAISS-based semantic cache implementation.
 
     Uses FAISS library for efficient approximate nearest neighbor search.
     Supports multiple index types for different scale/performance tradeoffs.
+    Batched inserts and queries (``set_many``/``search_many``) hand whole
+    matrices to FAISS; single-entry calls are batches of one.
+
+    Memory is bounded by ``max_entries``/``max_bytes`` with LRU or LFU
+    eviction, and entries expire after their TTL. Embeddings are stored once,
+    in the index (or the IVF training buffer). Replaced, evicted and expired
+    entries become tombstones that searches skip; they are removed from the
+    index in one batch once they exceed ``compaction_ratio`` of the live
+    entries, or when ``compact()`` is called.
+
+    With ``faiss_snapshot_dir`` set, the cache is restored from disk on
+    start. Changes are appended to a journal, and ``save_snapshot()`` (also
+    run every ``faiss_snapshot_interval`` journal records) writes the index
+    with ``write_index``. Snapshot indexes are loaded with ``IO_FLAG_MMAP``
+    as a read-only base shared by all processes on the host; entries added
+    afterwards go to a small in-memory delta index. Worker processes open
+    the directory with ``faiss_snapshot_read_only`` and pick up the
+    writer's snapshots and journal through ``refresh()``.
     """
 
-    def __init__(self, config: CacheConfig) -> None:
+    def __init__(
+        self,
+        config: CacheConfig,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
         """Initialize FAISS cache.
 
         Args:
             config: Cache configuration
+            clock: Time source for TTL expiry (monotonic seconds)
         """
         try:
-            import faiss
+            import faiss  # noqa: F401
         except ImportError as e:
             msg = (
                 "FAISS backend requires faiss-cpu or faiss-gpu. "
@@ -165,134 +400,622 @@ class FAISSCache(SemanticCache):
             )
             raise ImportError(msg) from e
 
+        if config.faiss_index_type not in FAISS_INDEX_TYPES:
+            msg = (
+                f"Unsupported FAISS index type: {config.faiss_index_type}. "
+                f"Supported types: 'Flat' (exact), 'IVFFlat', 'IVFPQ', 'IVFSQ8', "
+                f"'HNSW' (approximate)"
+            )
+            raise ValueError(msg)
+        if config.faiss_index_type == "IVFPQ" and config.dimension % config.faiss_pq_m:
+            msg = (
+                f"faiss_pq_m ({config.faiss_pq_m}) must divide the embedding "
+                f"dimension ({config.dimension})"
+            )
+            raise ValueError(msg)
+
         self.config = config
         self.dimension = config.dimension
-        self._metadata: dict[
-            int, tuple[str, dict[str, Any], np.ndarray[Any, np.dtype[np.float32]]] | None
-        ] = {}
+        self._clock = clock
+        self._hit_counter, self._miss_counter = cache_request_counters("semantic_faiss")
+        self._entries: dict[int, _CacheSlot] = {}
         self._key_to_id: dict[str, int] = {}  # Track key uniqueness
         self._next_id = 0
-
-        # Buffer for IVFFlat training
-        self._training_buffer: list[tuple[int, np.ndarray[Any, np.dtype[np.float32]]]] = []
+        self._bytes = 0
+
+        # Ids still present in the index whose entries were deleted
+        self._tombstones: set[int] = set()
+        # Eviction order: insertion/access order (LRU) or a lazy (hits, tick, id) heap (LFU)
+        self._recency: OrderedDict[int, None] = OrderedDict()
+        self._frequency: list[tuple[int, int, int]] = []
+        self._tick = 0
+        # Lazy (expires_at, id) heap
+        self._expiry: list[tuple[float, int]] = []
+
+        # Buffer for IVF training: row-major matrix grown by doubling
+        self._buffer_vectors: np.ndarray[Any, np.dtype[np.float32]] = np.empty(
+            (0, self.dimension), dtype=np.float32
+        )
+        self._buffer_ids: np.ndarray[Any, np.dtype[np.int64]] = np.empty(0, dtype=np.int64)
+        self._buffer_size = 0
         self._trained = False
+        self._trained_size = 0  # Live vectors at the last (re)training
+        # Unquantized vectors kept while a lossy IVF index may still be retrained;
+        # None when nothing is retained
+        self._raw_vectors: dict[int, np.ndarray[Any, np.dtype[np.float32]]] | None = None
+
+        # Memory-mapped snapshot index (read-only); ids below _base_next_id live there
+        self._base_index: Any | None = None
+        self._base_next_id = 0
+        self._base_tombstones: set[int] = set()
+
+        self._create_index()
+
+        self._store: CacheSnapshotStore | None = None
+        self._generation = 0
+        self._journal_seq = 0  # Last journal record applied
+        self._journal_length = 0  # Records written since the last snapshot
+        self._pending_deletes: list[int] = []
+        self._replaying = False
+        self._last_refresh = clock()
+        if config.faiss_snapshot_dir:
+            self._store = CacheSnapshotStore(
+                config.faiss_snapshot_dir,
+                read_only=config.faiss_snapshot_read_only,
+            )
+            if self._store.read_only:
+                # Keep local ids clear of the ids the writer journals
+                self._next_id = READ_ONLY_LOCAL_ID_OFFSET
+            self._load_latest_snapshot()
 
-        # Create FAISS index based on configuration
-        # Note: Only Flat and IVFFlat are supported for inner product (cosine similarity)
-        # HNSW only supports L2 distance natively
-        # Use IndexIDMap2 for removable vectors (prevents memory leaks on key updates)
-        if config.faiss_index_type == "Flat":
-            base_index: Any = faiss.IndexFlatIP(self.dimension)
-            self.index = faiss.IndexIDMap2(base_index)
+        logger.info(
+            "Initialized FAISS cache with %s index (dimension=%d)",
+            config.faiss_index_type,
+            self.dimension,
+        )
+
+    def _create_index(self) -> None:
+        """Create an empty FAISS index for the configured type."""
+        import faiss
+
+        # Flat and IVF indexes use inner product (cosine similarity on normalised
+        # vectors); HNSW uses L2, whose ranking matches cosine on unit vectors.
+        # IndexIDMap2 gives Flat and HNSW external ids that can be reconstructed.
+        if self.config.faiss_index_type == "Flat":
+            self.index: Any = faiss.IndexIDMap2(faiss.IndexFlatIP(self.dimension))
             self._trained = True  # Flat doesn't need training
-        elif config.faiss_index_type == "IVFFlat":
-            quantizer = faiss.IndexFlatIP(self.dimension)
-            base_index = faiss.IndexIVFFlat(
+        elif self.config.faiss_index_type == "HNSW":
+            self.index = self._new_hnsw_index()
+            self._trained = True  # HNSW builds its graph incrementally
+        else:
+            self.index = self._new_ivf_index()
+            self._trained = False
+
+    @property
+    def _is_ivf(self) -> bool:
+        return self.config.faiss_index_type.startswith("IVF")
+
+    @property
+    def _is_lossy(self) -> bool:
+        """Whether the index stores quantized codes (reconstructions are approximate)."""
+        return self.config.faiss_index_type in ("IVFPQ", "IVFSQ8")
+
+    def _new_hnsw_index(self) -> Any:
+        """Create an empty HNSW (L2) index with external ids."""
+        import faiss
+
+        hnsw = faiss.IndexHNSWFlat(self.dimension, self.config.faiss_hnsw_m)
+        hnsw.hnsw.efConstruction = self.config.faiss_hnsw_ef_construction
+        hnsw.hnsw.efSearch = self.config.faiss_hnsw_ef_search
+        return faiss.IndexIDMap2(hnsw)
+
+    def _new_ivf_index(self) -> Any:
+        """Create an untrained inner-product IVF index of the configured type."""
+        import faiss
+
+        quantizer = faiss.IndexFlatIP(self.dimension)
+        index: Any
+        if self.config.faiss_index_type == "IVFPQ":
+            index = faiss.IndexIVFPQ(
                 quantizer,
                 self.dimension,
-                config.faiss_nlist,
+                self.config.faiss_nlist,
+                self.config.faiss_pq_m,
+                self.config.faiss_pq_nbits,
+                faiss.METRIC_INNER_PRODUCT,
+            )
+        elif self.config.faiss_index_type == "IVFSQ8":
+            index = faiss.IndexIVFScalarQuantizer(
+                quantizer,
+                self.dimension,
+                self.config.faiss_nlist,
+                faiss.ScalarQuantizer.QT_8bit,
                 faiss.METRIC_INNER_PRODUCT,
             )
-            self.index = base_index  # Will wrap with IndexIDMap2 after training
         else:
-            msg = (
-                f"Unsupported FAISS index type: {config.faiss_index_type}. "
-                f"Supported types: 'Flat' (exact), 'IVFFlat' (approximate)"
+            index = faiss.IndexIVFFlat(
+                quantizer,
+                self.dimension,
+                self.config.faiss_nlist,
+                faiss.METRIC_INNER_PRODUCT,
             )
+        index.nprobe = self.config.faiss_nprobe
+        return index
+
+    def _min_training_points(self) -> int:
+        """Vectors needed before an IVF index can be trained."""
+        if self.config.faiss_index_type == "IVFPQ":
+            # Each sub-quantizer learns 2**nbits centroids
+            return max(self.config.faiss_nlist, 1 << self.config.faiss_pq_nbits)
+        return self.config.faiss_nlist
+
+    def _max_training_points(self) -> int:
+        """Training sample size beyond which more points mostly add time."""
+        return IVF_TRAINING_POINTS_PER_LIST * self._min_training_points()
+
+    def _apply_search_params(self, index: Any) -> None:
+        """Apply the configured query-time parameters to a loaded index."""
+        import faiss
+
+        if self._is_ivf:
+            faiss.extract_index_ivf(index).nprobe = self.config.faiss_nprobe
+        elif self.config.faiss_index_type == "HNSW":
+            hnsw: Any = faiss.downcast_index(index.index)
+            hnsw.hnsw.efSearch = self.config.faiss_hnsw_ef_search
+
+    def _as_matrix(
+        self,
+        embeddings: np.ndarray[Any, np.dtype[Any]],
+        label: str,
+    ) -> np.ndarray[Any, np.dtype[np.float32]]:
+        """Validate a (n, dimension) batch and L2-normalise its rows as float32."""
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        if matrix.ndim != 2 or matrix.shape[1] != self.dimension:
+            width = matrix.shape[-1] if matrix.ndim else 0
+            msg = f"{label} dimension {width} != {self.dimension}"
             raise ValueError(msg)
 
-        logger.info(
-            "Initialized FAISS cache with %s index (dimension=%d)",
-            config.faiss_index_type,
-            self.dimension,
+        # Normalise a private copy for cosine similarity; zero rows stay as-is
+        normalized = np.array(matrix, dtype=np.float32, order="C", copy=True)
+        norms = np.linalg.norm(normalized, axis=1, keepdims=True)
+        np.divide(normalized, norms, out=normalized, where=norms > 0)
+        return normalized
+
+    def _append_to_buffer(
+        self,
+        ids: np.ndarray[Any, np.dtype[np.int64]],
+        vectors: np.ndarray[Any, np.dtype[np.float32]],
+    ) -> None:
+        needed = self._buffer_size + len(ids)
+        if needed > len(self._buffer_ids):
+            capacity = max(needed, 2 * len(self._buffer_ids), 64)
+            grown_vectors = np.empty((capacity, self.dimension), dtype=np.float32)
+            grown_vectors[: self._buffer_size] = self._buffer_vectors[: self._buffer_size]
+            grown_ids = np.empty(capacity, dtype=np.int64)
+            grown_ids[: self._buffer_size] = self._buffer_ids[: self._buffer_size]
+            self._buffer_vectors = grown_vectors
+            self._buffer_ids = grown_ids
+
+        self._buffer_vectors[self._buffer_size : needed] = vectors
+        self._buffer_ids[self._buffer_size : needed] = ids
+        self._buffer_size = needed
+
+    def _reset_buffer(self) -> None:
+        self._buffer_vectors = np.empty((0, self.dimension), dtype=np.float32)
+        self._buffer_ids = np.empty(0, dtype=np.int64)
+        self._buffer_size = 0
+
+    def _live_buffer(
+        self,
+    ) -> tuple[np.ndarray[Any, np.dtype[np.int64]], np.ndarray[Any, np.dtype[np.float32]]]:
+        """Return ids and vectors of the buffered rows that are still live."""
+        ids = self._buffer_ids[: self._buffer_size]
+        live = np.fromiter(
+            (int(idx) in self._entries for idx in ids),
+            dtype=bool,
+            count=len(ids),
         )
+        return ids[live], self._buffer_vectors[: self._buffer_size][live]
+
+    def _train(
+        self,
+        ids: np.ndarray[Any, np.dtype[np.int64]],
+        vectors: np.ndarray[Any, np.dtype[np.float32]],
+    ) -> None:
+        """Train a fresh IVF index on ``vectors`` and load them into it."""
+        import faiss
+
+        index = self._new_ivf_index()
+        # k-means needs ~39 points per centroid; more mostly adds training time
+        max_training = self._max_training_points()
+        if len(vectors) > max_training:
+            rng = np.random.default_rng(0)
+            sample = rng.choice(len(vectors), size=max_training, replace=False)
+            index.train(vectors[np.sort(sample)])
+        else:
+            index.train(vectors)
+
+        # IVF indexes take external ids natively. Wrapping them in IndexIDMap2
+        # breaks after remove_ids: the id map is compacted but inverted lists
+        # keep their internal numbering, so later hits resolve to wrong keys.
+        # A hashtable direct map makes vectors reconstructible by id.
+        index.set_direct_map_type(faiss.DirectMap.Hashtable)  # type: ignore[attr-defined]
+        index.add_with_ids(vectors, ids)
+        self.index = index
+        self._trained = True
+        self._trained_size = len(ids)
+        self._tombstones.clear()  # The fresh index only holds live vectors
+
+        # Retraining a quantized index on its own reconstructions would fit the
+        # codebooks (and SQ ranges) to already quantized data, so keep the raw
+        # vectors of every live entry until the last retraining. Retraining
+        # stops at the training sample size, so this holds at most
+        # faiss_retrain_factor times that many vectors (plus one batch).
+        if (
+            self._is_lossy
+            and self.config.faiss_retrain_factor > 1.0
+            and self._trained_size < self._max_training_points()
+        ):
+            self._raw_vectors = dict(zip(ids.tolist(), vectors, strict=True))
+        else:
+            self._raw_vectors = None
 
     def _ensure_trained(self) -> None:
         """Ensure IVF index is trained if needed."""
-        import faiss
+        if not self._is_ivf or self._trained:
+            return
+        min_training = self._min_training_points()
+        if self._buffer_size < min_training:
+            return
+
+        # Only train if we have enough active embeddings (FAISS requires >= nlist)
+        if len(self._entries) < min_training:
+            return  # Keep buffering until we have enough active entries
+
+        # Filter out deleted entries
+        ids, vectors = self._live_buffer()
+        self._train(ids, vectors)
+        logger.info("Trained IVF index with %d vectors", self._trained_size)
+
+        # Clear the buffer only after successful training
+        self._reset_buffer()
 
-        if self.config.faiss_index_type != "IVFFlat":
+    def _maybe_retrain(self) -> None:
+        """Retrain the IVF index once the corpus outgrows its training set.
+
+        An index trained on the first ``faiss_nlist`` vectors has poor
+        centroids; retraining whenever the corpus grows by
+        ``faiss_retrain_factor`` keeps the total retraining cost linear.
+        Retraining stops once a full training sample was available.
+        IVFPQ and IVFSQ8 indexes are retrained on the raw vectors kept since
+        the last training, never on their lossy reconstructions.
+        """
+        if self._base_index is not None:
+            self._raw_vectors = None  # Snapshot centroids are fixed
+            return
+        factor = self.config.faiss_retrain_factor
+        if (
+            not self._is_ivf
+            or not self._trained
+            or factor <= 1.0
+            or self._trained_size >= self._max_training_points()
+            or len(self._entries) < factor * self._trained_size
+        ):
             return
 
-        if not self._trained and len(self._training_buffer) >= self.config.faiss_nlist:
-            # Extract embeddings and IDs from buffer, filtering out logically deleted entries
-            ids_to_add = []
-            embeddings_to_add = []
-            for idx, embedding in self._training_buffer:
-                # Only add if not logically deleted
-                if self._metadata.get(idx) is not None:
-                    ids_to_add.append(idx)
-                    embeddings_to_add.append(embedding)
-
-            # Only train if we have enough active embeddings (FAISS requires >= nlist)
-            if len(embeddings_to_add) >= self.config.faiss_nlist:
-                # Train the index with active embeddings
-                train_data = np.array(embeddings_to_add, dtype=np.float32)
-                self.index.train(train_data)
-
-                # Wrap with IndexIDMap2 for removable vectors
-                self.index = faiss.IndexIDMap2(self.index)
-
-                # Add all active buffered embeddings with their IDs
-                self.index.add_with_ids(
-                    train_data,
-                    np.array(ids_to_add, dtype=np.int64),
-                )
+        ids = np.fromiter(self._entries, dtype=np.int64, count=len(self._entries))
+        if self._is_lossy:
+            raw = self._raw_vectors
+            if raw is None or len(raw) < len(ids):
+                return  # Raw vectors unavailable (e.g. restored from a snapshot)
+            vectors = np.stack([raw[idx] for idx in ids.tolist()])
+        else:
+            vectors = self.index.reconstruct_batch(ids)
+        self._train(ids, vectors)
+        logger.info("Retrained IVF index with %d vectors", self._trained_size)
+
+    def _entry_bytes(self, key: str, value_length: int) -> int:
+        """Estimate the memory held by one entry (vector, id, key and value)."""
+        return self.dimension * 4 + len(key) + value_length + CACHE_ENTRY_OVERHEAD_BYTES
+
+    def _register(self, idx: int, slot: _CacheSlot) -> None:
+        """Add bookkeeping for an entry whose vector is being stored."""
+        self._entries[idx] = slot
+        self._key_to_id[slot.key] = idx
+        self._bytes += slot.nbytes
+        if slot.expires_at is not None:
+            heapq.heappush(self._expiry, (slot.expires_at, idx))
+        if self.config.eviction_policy == "lfu":
+            self._tick += 1
+            heapq.heappush(self._frequency, (slot.hits, self._tick, idx))
+        else:
+            self._recency[idx] = None
 
-                self._trained = True
-                logger.info("Trained IVF index with %d vectors", len(embeddings_to_add))
+    def _delete(self, idx: int, record: bool = True) -> None:
+        """Delete a live entry, leaving a tombstone if its vector is indexed.
 
-                # Clear the buffer only after successful training
-                self._training_buffer.clear()
-            # else: keep buffering until we have enough active entries
+        Args:
+            idx: Entry id
+            record: Append the deletion to the snapshot journal
+        """
+        slot = self._entries.pop(idx)
+        if self._raw_vectors is not None:
+            self._raw_vectors.pop(idx, None)
+        if self._key_to_id.get(slot.key) == idx:
+            del self._key_to_id[slot.key]
+        self._bytes -= slot.nbytes
+        self._recency.pop(idx, None)
+        if self._base_index is not None and idx < self._base_next_id:
+            self._base_tombstones.add(idx)  # Dropped by the next snapshot
+        elif self._trained:
+            self._tombstones.add(idx)
+        # Untrained rows stay in the buffer until training or compaction
+        if record and self._recording():
+            self._pending_deletes.append(idx)
+
+    def _touch(self, idx: int) -> None:
+        """Record an access for the eviction policy."""
+        if self.config.eviction_policy == "lfu":
+            slot = self._entries[idx]
+            slot.hits += 1
+            self._tick += 1
+            heapq.heappush(self._frequency, (slot.hits, self._tick, idx))
+        else:
+            self._recency.move_to_end(idx)
+
+    def _purge_expired(self, now: float) -> int:
+        """Delete entries whose TTL elapsed; returns the number removed."""
+        removed = 0
+        while self._expiry and self._expiry[0][0] <= now:
+            expires_at, idx = heapq.heappop(self._expiry)
+            slot = self._entries.get(idx)
+            if slot is not None and slot.expires_at == expires_at:
+                self._delete(idx, record=False)  # Replay expires entries itself
+                removed += 1
+        return removed
+
+    def _over_budget(self, incoming_entries: int = 0, incoming_bytes: int = 0) -> bool:
+        max_entries = self.config.max_entries
+        max_bytes = self.config.max_bytes
+        return bool(
+            (max_entries and len(self._entries) + incoming_entries > max_entries)
+            or (max_bytes and self._bytes + incoming_bytes > max_bytes)
+        )
+
+    def _evict_victim(self) -> int:
+        """Pick the entry to evict under the configured policy."""
+        if self.config.eviction_policy == "lfu":
+            while True:
+                hits, _, idx = heapq.heappop(self._frequency)
+                slot = self._entries.get(idx)
+                if slot is not None and slot.hits == hits:
+                    return idx
+        return next(iter(self._recency))
+
+    def _enforce_budget(self, incoming_entries: int = 0, incoming_bytes: int = 0) -> None:
+        """Evict entries until the budget has room for an incoming batch.
+
+        Making room before inserting keeps fresh entries (which have no hits
+        yet) from being the first LFU victims.
+        """
+        if not self._over_budget(incoming_entries, incoming_bytes):
+            return
+        self._purge_expired(self._clock())
+        evicted = 0
+        while self._over_budget(incoming_entries, incoming_bytes) and self._entries:
+            self._delete(self._evict_victim())
+            evicted += 1
+        if evicted:
+            logger.debug("Evicted %d cache entries", evicted)
+        if (
+            self.config.eviction_policy == "lfu"
+            and len(self._frequency) > 2 * len(self._entries) + 64
+        ):
+            # Drop stale heap records left behind by hits and deletions
+            self._frequency = [(slot.hits, self._tick, idx) for idx, slot in self._entries.items()]
+            heapq.heapify(self._frequency)
+
+    def _maybe_compact(self) -> None:
+        """Compact once deleted vectors exceed ``compaction_ratio`` of live entries."""
+        dead = len(self._tombstones) + (
+            self._buffer_size - len(self._entries) if not self._trained else 0
+        )
+        if dead > self.config.compaction_ratio * max(len(self._entries), 1):
+            self.compact()
+
+    def compact(self) -> int:
+        """Physically remove deleted vectors from the index and training buffer.
+
+        Returns:
+            Number of vectors removed
+        """
+        removed = 0
+        if self._tombstones and self.config.faiss_index_type == "HNSW":
+            # HNSW graphs do not support removal: rebuild from the live vectors
+            live = np.fromiter(
+                (
+                    idx
+                    for idx in self._entries
+                    if self._base_index is None or idx >= self._base_next_id
+                ),
+                dtype=np.int64,
+            )
+            index = self._new_hnsw_index()
+            if len(live):
+                index.add_with_ids(self.index.reconstruct_batch(live), live)
+            removed += self.index.ntotal - index.ntotal
+            self.index = index
+            self._tombstones.clear()
+        elif self._tombstones:
+            ids = np.fromiter(self._tombstones, dtype=np.int64, count=len(self._tombstones))
+            removed += int(self.index.remove_ids(ids))
+            self._tombstones.clear()
+        if self._buffer_size > len(self._entries) or not self._entries:
+            ids, vectors = self._live_buffer()
+            removed += self._buffer_size - len(ids)
+            self._reset_buffer()
+            if len(ids):
+                self._append_to_buffer(ids, vectors)
+        if len(self._expiry) > 2 * len(self._entries) + 64:
+            # Drop stale expiry records of replaced or evicted entries
+            self._expiry = [
+                (slot.expires_at, idx)
+                for idx, slot in self._entries.items()
+                if slot.expires_at is not None
+            ]
+            heapq.heapify(self._expiry)
+        if removed:
+            logger.debug("Compacted %d deleted cache vectors", removed)
+        return removed
+
+    def purge_expired(self) -> int:
+        """Delete expired entries now instead of on the next access.
+
+        Returns:
+            Number of entries removed
+        """
+        removed = self._purge_expired(self._clock())
+        self._maybe_compact()
+        return removed
 
     def set(
         self,
         key: str,
         embedding: np.ndarray[Any, np.dtype[np.float32]],
         value: dict[str, Any],
+        ttl_seconds: float | None = None,
+        sensitivity: str = "default",
     ) -> None:
         """Store an entry in the cache.
 
-        If the key already exists, the old entry is logically deleted
-        and physically removed from the FAISS index to prevent memory leaks.
+        If the key already exists, the old entry is replaced; its vector is
+        removed from the FAISS index at the next compaction.
         """
-        if embedding.shape[0] != self.dimension:
-            msg = f"Embedding dimension {embedding.shape[0]} != {self.dimension}"
+        if embedding.ndim != 1 or embedding.shape[0] != self.dimension:
+            msg = f"Embedding dimension {embedding.shape[-1]} != {self.dimension}"
             raise ValueError(msg)
+        self.set_many(
+            [key],
+            embedding.reshape(1, -1),
+            [value],
+            ttl_seconds=ttl_seconds,
+            sensitivity=sensitivity,
+        )
 
-        # Normalize embedding for cosine similarity (preserve float32 dtype)
-        norm = np.linalg.norm(embedding)
-        if norm > 0:
-            embedding = (embedding / norm).astype(np.float32, copy=False)
-
-        # Check if key already exists and remove old entry
-        if key in self._key_to_id:
-            old_id = self._key_to_id[key]
-            self._metadata[old_id] = None  # Logical deletion
-
-            # Physical deletion from FAISS index (if trained)
-            if self._trained:
-                self.index.remove_ids(np.array([old_id], dtype=np.int64))
+    def set_many(
+        self,
+        keys: Sequence[str],
+        embeddings: np.ndarray[Any, np.dtype[np.float32]],
+        values: Sequence[dict[str, Any]],
+        ttl_seconds: float | None = None,
+        sensitivity: str = "default",
+    ) -> None:
+        """Store many entries with a single FAISS insert.
 
-            logger.debug("Replacing existing cache entry for key: %s", key)
+        Args:
+            keys: Unique identifiers, one per row of ``embeddings``
+            embeddings: Matrix of shape (len(keys), dimension)
+            values: Associated values, one per key
+            ttl_seconds: Entry lifetime (None uses ``default_ttl_seconds`` or
+                ``cache.policy.get_ttl``; <= 0 never expires)
+            sensitivity: Sensitivity level passed to ``get_ttl``
+
+        Raises:
+            ValueError: If the batch shapes do not match
+        """
+        matrix = self._as_matrix(embeddings, "Embedding")
+        if not (len(keys) == len(values) == len(matrix)):
+            msg = (
+                f"set_many got {len(keys)} keys, {len(matrix)} embeddings and {len(values)} values"
+            )
+            raise ValueError(msg)
+        if not keys:
+            return
 
-        # Store metadata with embedding
-        current_id = self._next_id
-        self._metadata[current_id] = (key, value, embedding.copy())
-        self._key_to_id[key] = current_id
-        self._next_id += 1
+        now = self._clock()
+        self._purge_expired(now)
+
+        # A key repeated within the batch keeps its last row
+        last_row = {key: row for row, key in enumerate(keys)}
+        if len(last_row) != len(keys):
+            rows = sorted(last_row.values())
+            matrix = matrix[rows]
+            keys = [keys[row] for row in rows]
+            values = [values[row] for row in rows]
+
+        # Replaced keys become tombstones
+        for key in keys:
+            old_id = self._key_to_id.get(key)
+            if old_id is not None:
+                self._delete(old_id)
+
+        # Values the TTL policy refuses to cache (too long) are dropped
+        slots: list[_CacheSlot] = []
+        serialized_values: list[str] = []
+        stored_rows: list[int] = []
+        for row, (key, value) in enumerate(zip(keys, values)):
+            serialized = json.dumps(value, default=str)
+            ttl = _resolve_ttl(self.config, ttl_seconds, sensitivity, len(serialized))
+            if ttl == 0:
+                continue
+            expires_at = None if ttl is None else now + ttl
+            slots.append(
+                _CacheSlot(key, value, expires_at, self._entry_bytes(key, len(serialized)))
+            )
+            serialized_values.append(serialized)
+            stored_rows.append(row)
+        if len(stored_rows) != len(keys):
+            logger.debug("Skipped %d uncacheable entries", len(keys) - len(stored_rows))
+            matrix = matrix[stored_rows]
+
+        ids = np.arange(self._next_id, self._next_id + len(slots), dtype=np.int64)
+        self._next_id += len(slots)
+        if slots:
+            self._insert(ids, slots, matrix)
+        else:
+            self._maybe_compact()
+
+        if self._recording():
+            offset = time.time() - now
+            self._flush_journal(
+                (
+                    SnapshotEntry(
+                        idx,
+                        slot.key,
+                        serialized,
+                        None if slot.expires_at is None else slot.expires_at + offset,
+                        slot.nbytes,
+                    ),
+                    vector.tobytes(),
+                )
+                for idx, slot, serialized, vector in zip(
+                    ids.tolist(), slots, serialized_values, matrix
+                )
+            )
 
-        # For IVFFlat, buffer embeddings until we have enough to train
-        if self.config.faiss_index_type == "IVFFlat" and not self._trained:
-            self._training_buffer.append((current_id, embedding.copy()))
+    def _insert(
+        self,
+        ids: np.ndarray[Any, np.dtype[np.int64]],
+        slots: list[_CacheSlot],
+        matrix: np.ndarray[Any, np.dtype[np.float32]],
+    ) -> None:
+        """Store new entries and their normalised vectors under ``ids``."""
+        self._enforce_budget(len(slots), sum(slot.nbytes for slot in slots))
+        for idx, slot in zip(ids.tolist(), slots):
+            self._register(idx, slot)
+
+        # For IVF indexes, buffer embeddings until we have enough to train
+        if not self._trained:
+            self._append_to_buffer(ids, matrix)
+            self._enforce_budget()  # Batches larger than the budget
             self._ensure_trained()
         else:
-            # Add to FAISS index directly with ID
-            self.index.add_with_ids(
-                embedding.reshape(1, -1),
-                np.array([current_id], dtype=np.int64),
-            )
+            self.index.add_with_ids(matrix, ids)
+            if self._raw_vectors is not None:
+                self._raw_vectors.update(zip(ids.tolist(), matrix, strict=True))
+            self._enforce_budget()  # Batches larger than the budget
+            self._maybe_retrain()
+        self._maybe_compact()
 
     def search(
         self,
@@ -301,93 +1024,500 @@ class FAISSCache(SemanticCache):
         threshold: float = 0.9,
     ) -> list[CacheEntry]:
         """Search for similar entries using FAISS."""
-        if query_embedding.shape[0] != self.dimension:
-            msg = f"Query dimension {query_embedding.shape[0]} != {self.dimension}"
+        if query_embedding.ndim != 1 or query_embedding.shape[0] != self.dimension:
+            msg = f"Query dimension {query_embedding.shape[-1]} != {self.dimension}"
             raise ValueError(msg)
+        return self.search_many(query_embedding.reshape(1, -1), k=k, threshold=threshold)[0]
 
-        if self._next_id == 0:
-            return []
+    def search_many(
+        self,
+        query_embeddings: np.ndarray[Any, np.dtype[np.float32]],
+        k: int = 5,
+        threshold: float = 0.9,
+    ) -> list[list[CacheEntry]]:
+        """Search for many queries with one FAISS call.
 
-        # Normalize query (preserve float32 dtype)
-        norm = np.linalg.norm(query_embedding)
-        if norm > 0:
-            query_embedding = (query_embedding / norm).astype(np.float32, copy=False)
+        Args:
+            query_embeddings: Matrix of shape (num_queries, dimension)
+            k: Number of top results per query
+            threshold: Minimum similarity threshold (0.0-1.0)
 
-        results: list[CacheEntry] = []
+        Returns:
+            One result list per query, each sorted by similarity
+        """
+        queries = self._as_matrix(query_embeddings, "Query")
+        now = self._clock()
+        refresh_interval = self.config.faiss_snapshot_refresh_seconds
+        if (
+            refresh_interval
+            and self._store is not None
+            and self._store.read_only
+            and now - self._last_refresh >= refresh_interval
+        ):
+            self.refresh()
+        if not self._entries or len(queries) == 0 or k <= 0:
+            self._miss_counter.inc(len(queries))
+            return [[] for _ in range(len(queries))]
+        if self._purge_expired(now):
+            self._maybe_compact()
+
+        # Hits are (similarity, id, buffered vector or None)
+        hits: list[list[tuple[float, int, Any]]] = [[] for _ in range(len(queries))]
+
+        # Search buffered embeddings (for untrained IVF indexes) with one matrix product
+        if self._buffer_size:
+            buffer_vectors = self._buffer_vectors[: self._buffer_size]
+            similarities = queries @ buffer_vectors.T
+            buffer_ids = self._buffer_ids[: self._buffer_size]
+            deleted = self._buffer_size - len(self._entries)
+            for row, scores in enumerate(similarities):
+                matches = np.flatnonzero(scores >= threshold)
+                if len(matches) > k:
+                    # Keep room for deleted rows among the top scores
+                    keep = min(len(matches), k + deleted)
+                    top = np.argpartition(-scores[matches], keep - 1)[:keep]
+                    matches = matches[top]
+                hits[row].extend(
+                    (float(scores[col]), int(buffer_ids[col]), buffer_vectors[col])
+                    for col in matches
+                    if int(buffer_ids[col]) in self._entries
+                )
 
-        # Search buffered embeddings (for untrained IVFFlat)
-        if self._training_buffer:
-            for idx, emb in self._training_buffer:
-                similarity = float(np.dot(query_embedding, emb))
-                if similarity >= threshold:
-                    entry = self._metadata.get(idx)
-                    if entry is not None:  # Skip logically deleted entries
-                        key, value, stored_emb = entry
-                        results.append(
-                            CacheEntry(
-                                key=key,
-                                embedding=stored_emb,
-                                value=value,
-                                distance=1.0 - similarity,
-                            )
-                        )
-
-        # Search FAISS index if trained
-        if self._trained and self.index.ntotal > 0:
-            k_actual = min(k, self.index.ntotal)
-            distances, indices = self.index.search(query_embedding.reshape(1, -1), k_actual)
-
-            for dist, idx in zip(distances[0], indices[0]):
-                # FAISS inner product returns similarity (higher is better)
-                similarity = float(dist)
-                if similarity >= threshold:
-                    entry = self._metadata.get(int(idx))
-                    if entry is not None:  # Skip logically deleted entries
-                        key, value, emb = entry
-                        results.append(
-                            CacheEntry(
-                                key=key,
-                                embedding=emb,
-                                value=value,
-                                distance=1.0 - similarity,  # Convert to distance
-                            )
-                        )
-
-        # Sort by distance and limit to k results
-        results.sort(key=lambda x: x.distance)
-        return results[:k]
+        # Search FAISS indexes if trained
+        if self._trained:
+            self._search_index(self.index, len(self._tombstones), queries, k, threshold, hits)
+        if self._base_index is not None:
+            self._search_index(
+                self._base_index, len(self._base_tombstones), queries, k, threshold, hits
+            )
 
-    def clear(self) -> None:
-        """Clear all entries from the cache."""
-        self._metadata.clear()
+        results: list[list[CacheEntry]] = []
+        for row_hits in hits:
+            row_hits.sort(key=lambda hit: -hit[0])
+            entries: list[CacheEntry] = []
+            for similarity, idx, vector in row_hits[:k]:
+                slot = self._entries[idx]
+                self._touch(idx)
+                embedding = vector.copy() if vector is not None else self._reconstruct(idx)
+                entries.append(
+                    CacheEntry(
+                        key=slot.key,
+                        embedding=embedding,
+                        value=slot.value,
+                        distance=1.0 - similarity,  # Convert to distance
+                    )
+                )
+            results.append(entries)
+        found = sum(1 for entries in results if entries)
+        self._hit_counter.inc(found)
+        self._miss_counter.inc(len(results) - found)
+        return results
+
+    def _search_index(
+        self,
+        index: Any,
+        dead: int,
+        queries: np.ndarray[Any, np.dtype[np.float32]],
+        k: int,
+        threshold: float,
+        hits: list[list[tuple[float, int, Any]]],
+    ) -> None:
+        """Collect live hits from ``index``, over-fetching past ``dead`` tombstones."""
+        ntotal = index.ntotal
+        if ntotal == 0:
+            return
+        k_search = min(ntotal, k + min(dead, k))
+        pending = np.arange(len(queries))
+        while len(pending):
+            distances, indices = index.search(queries[pending], k_search)
+            if self.config.faiss_index_type == "HNSW":
+                # Squared L2 between unit vectors is 2 - 2 * cosine
+                distances = 1.0 - distances / 2.0
+            retry: list[int] = []
+            for row, row_dists, row_ids in zip(pending.tolist(), distances, indices):
+                # Inner product (or converted L2) is a similarity (higher is better)
+                live = [
+                    (float(dist), int(idx), None)
+                    for dist, idx in zip(row_dists, row_ids)
+                    if idx >= 0 and dist >= threshold and int(idx) in self._entries
+                ]
+                # Results were cut short by tombstones and more may qualify
+                if (
+                    len(live) < k
+                    and k_search < ntotal
+                    and row_ids[-1] >= 0
+                    and row_dists[-1] >= threshold
+                ):
+                    retry.append(row)
+                else:
+                    hits[row].extend(live)
+            pending = np.array(retry, dtype=np.int64)
+            k_search = min(ntotal, 2 * k_search)
+
+    def _reconstruct(self, idx: int) -> np.ndarray[Any, np.dtype[np.float32]]:
+        if self._base_index is not None and idx < self._base_next_id:
+            return self._base_index.reconstruct(idx)  # type: ignore[no-any-return]
+        return self.index.reconstruct(idx)  # type: ignore[no-any-return]
+
+    def _reset(self) -> None:
+        """Drop all in-memory state (the snapshot directory is untouched)."""
+        self._entries.clear()
         self._key_to_id.clear()
-        self._next_id = 0
-        self._training_buffer.clear()
+        read_only = self._store is not None and self._store.read_only
+        self._next_id = READ_ONLY_LOCAL_ID_OFFSET if read_only else 0
+        self._bytes = 0
+        self._tombstones.clear()
+        self._recency.clear()
+        self._frequency.clear()
+        self._expiry.clear()
+        self._reset_buffer()
+        self._trained_size = 0
+        self._raw_vectors = None
+        self._base_index = None
+        self._base_next_id = 0
+        self._base_tombstones.clear()
+        self._pending_deletes.clear()
+
+        # Recreate the index: a trained IVF index cannot be reset to untrained
+        self._create_index()
 
-        if self.config.faiss_index_type == "IVFFlat":
-            # Recreate untrained IVFFlat index (after training, index is wrapped with IndexIDMap2,
-            # which doesn't have train() method, so we need to recreate the base index)
-            import faiss
+    def clear(self) -> None:
+        """Clear all entries from the cache."""
+        self._reset()
+        if self._recording():
+            assert self._store is not None
+            self._journal_length += self._store.append(clear=True)
+
+    # Snapshots
+
+    def _recording(self) -> bool:
+        """Whether changes are appended to the snapshot journal."""
+        return self._store is not None and not self._store.read_only and not self._replaying
+
+    def _flush_journal(self, sets: Iterable[tuple[SnapshotEntry, bytes]] = ()) -> None:
+        """Journal new entries and pending deletions; snapshot when due."""
+        assert self._store is not None
+        self._journal_length += self._store.append(sets=sets, deletes=self._pending_deletes)
+        self._pending_deletes = []
+        interval = self.config.faiss_snapshot_interval
+        if interval and self._journal_length >= interval:
+            self.save_snapshot()
+
+    def _new_delta_index(self, base: Any) -> Any:
+        """Create an empty writable index compatible with a snapshot index."""
+        import faiss
 
-            quantizer = faiss.IndexFlatIP(self.dimension)
-            self.index = faiss.IndexIVFFlat(
+        if self.config.faiss_index_type == "Flat":
+            return faiss.IndexIDMap2(faiss.IndexFlatIP(self.dimension))
+        if self.config.faiss_index_type == "HNSW":
+            return self._new_hnsw_index()
+        ivf: Any = faiss.downcast_index(faiss.extract_index_ivf(base))
+        quantizer = faiss.clone_index(ivf.quantizer)  # Reuse the snapshot's centroids
+        index: Any
+        if self.config.faiss_index_type == "IVFPQ":
+            index = faiss.IndexIVFPQ(
                 quantizer,
                 self.dimension,
-                self.config.faiss_nlist,
+                ivf.nlist,
+                ivf.pq.M,
+                ivf.pq.nbits,
                 faiss.METRIC_INNER_PRODUCT,
             )
-            self._trained = False
+            index.pq = ivf.pq  # ... and codebooks, so distances match the base
+        elif self.config.faiss_index_type == "IVFSQ8":
+            index = faiss.IndexIVFScalarQuantizer(
+                quantizer,
+                self.dimension,
+                ivf.nlist,
+                faiss.ScalarQuantizer.QT_8bit,
+                faiss.METRIC_INNER_PRODUCT,
+            )
+            index.sq = ivf.sq
         else:
-            # Flat index can be reset (already wrapped with IndexIDMap2, no training needed)
-            self.index.reset()
+            index = faiss.IndexIVFFlat(
+                quantizer,
+                self.dimension,
+                ivf.nlist,
+                faiss.METRIC_INNER_PRODUCT,
+            )
+        index.is_trained = True
+        index.nprobe = self.config.faiss_nprobe
+        index.set_direct_map_type(faiss.DirectMap.Hashtable)  # type: ignore[attr-defined]
+        return index
+
+    def _slot_from_snapshot(self, entry: SnapshotEntry, offset: float) -> _CacheSlot:
+        """Build a slot from a persisted entry (``offset`` maps Unix to clock time)."""
+        expires_at = None if entry.expires_at is None else entry.expires_at + offset
+        slot = _CacheSlot(entry.key, json.loads(entry.value), expires_at, entry.nbytes)
+        slot.hits = entry.hits
+        return slot
+
+    def _load_latest_snapshot(self, attempts: int = 3) -> None:
+        """Load the current snapshot, re-reading the state if its files were unlinked.
+
+        The writer keeps only the current and previous generation on disk, so a
+        reader that fell two generations behind between reading the state and
+        opening the index retries with the newer state.
+        """
+        assert self._store is not None
+        for attempt in range(attempts):
+            self._journal_seq = 0
+            try:
+                self._load_snapshot(self._store.read_state())
+                return
+            except FileNotFoundError:
+                if attempt == attempts - 1:
+                    raise
+                logger.debug("Cache snapshot files replaced while loading, retrying")
+                self._reset()
+
+    def _load_snapshot(self, state: SnapshotState) -> None:
+        """Restore a snapshot into an empty cache and replay its journal."""
+        import faiss
+
+        assert self._store is not None
+        self._replaying = True
+        try:
+            if state.generation:
+                meta = state.meta
+                if (
+                    int(meta["dimension"]) != self.dimension
+                    or meta["index_type"] != self.config.faiss_index_type
+                ):
+                    msg = (
+                        f"Cache snapshot in {self._store.directory} has dimension "
+                        f"{meta['dimension']} and index type {meta['index_type']}, expected "
+                        f"{self.dimension} and {self.config.faiss_index_type}"
+                    )
+                    raise ValueError(msg)
+
+                if meta["trained"] == "1":
+                    path = self._store.index_path(state.generation)
+                    flags = faiss.IO_FLAG_MMAP if self.config.faiss_snapshot_mmap else 0
+                    try:
+                        index = faiss.read_index(str(path), flags)
+                    except RuntimeError as exc:
+                        if path.exists():
+                            raise
+                        # Unlinked by the writer since the state was read
+                        raise FileNotFoundError(str(path)) from exc
+                    self._apply_search_params(index)
+                    if self.config.faiss_snapshot_mmap:
+                        self._base_index = index
+                        self._base_next_id = int(meta["next_id"])
+                        self.index = self._new_delta_index(index)
+                    else:
+                        self.index = index
+                    self._trained = True
+                else:
+                    with np.load(self._store.buffer_path(state.generation)) as buffer:
+                        self._append_to_buffer(buffer["ids"], buffer["vectors"])
+                self._trained_size = int(meta["trained_size"])
+                if not self._store.read_only:
+                    self._next_id = int(meta["next_id"])
+
+                now = self._clock()
+                offset = now - time.time()
+                for entry in state.entries:
+                    slot = self._slot_from_snapshot(entry, offset)
+                    self._register(entry.id, slot)
+                    if slot.expires_at is not None and slot.expires_at <= now:
+                        self._delete(entry.id)
+                self._generation = state.generation
+            self._replay(state.journal)
+        finally:
+            self._replaying = False
+        self._maybe_compact()
+        logger.info(
+            "Loaded cache snapshot generation %d with %d entries",
+            self._generation,
+            len(self._entries),
+        )
+
+    def _replay(self, records: Sequence[JournalRecord]) -> None:
+        """Apply journal records, batching consecutive inserts."""
+        batch: list[JournalRecord] = []
+        for record in records:
+            if record.op == "set":
+                batch.append(record)
+            else:
+                self._replay_sets(batch)
+                batch = []
+                if record.op == "clear":
+                    self._reset()
+                elif record.id in self._entries:
+                    self._delete(record.id)
+            self._journal_seq = record.seq
+        self._replay_sets(batch)
+        self._journal_length += len(records)
+
+    def _replay_sets(self, records: list[JournalRecord]) -> None:
+        if not records:
+            return
+        now = self._clock()
+        offset = now - time.time()
+        # A key set twice keeps its last record
+        latest = {record.entry.key: record for record in records if record.entry is not None}
+        ids: list[int] = []
+        slots: list[_CacheSlot] = []
+        vectors: list[bytes] = []
+        for record in latest.values():
+            assert record.entry is not None and record.embedding is not None
+            old_id = self._key_to_id.get(record.entry.key)
+            if old_id is not None:
+                self._delete(old_id)
+            slot = self._slot_from_snapshot(record.entry, offset)
+            if slot.expires_at is not None and slot.expires_at <= now:
+                continue
+            ids.append(record.entry.id)
+            slots.append(slot)
+            vectors.append(record.embedding)
+        if not ids:
+            return
+        if not (self._store is not None and self._store.read_only):
+            self._next_id = max(self._next_id, max(ids) + 1)
+        matrix = np.frombuffer(b"".join(vectors), dtype=np.float32).reshape(-1, self.dimension)
+        self._insert(np.array(ids, dtype=np.int64), slots, matrix.copy())
+
+    def _merge_base(self) -> None:
+        """Fold the snapshot base and the delta index into one in-memory index."""
+        base = self._base_index
+        assert base is not None
+        live = np.fromiter(self._entries, dtype=np.int64, count=len(self._entries))
+        in_base = live < self._base_next_id
+        index = self._new_delta_index(base)
+        for source, ids in ((base, live[in_base]), (self.index, live[~in_base])):
+            if len(ids):
+                index.add_with_ids(source.reconstruct_batch(ids), ids)
+        self.index = index
+        self._base_index = None
+        self._base_next_id = 0
+        self._base_tombstones.clear()
+        self._tombstones.clear()
+
+    def save_snapshot(self) -> int:
+        """Write the cache to ``faiss_snapshot_dir`` and truncate the journal.
+
+        The saved index is then served memory-mapped (``faiss_snapshot_mmap``),
+        so the writer shares its pages with reader processes.
+
+        Returns:
+            The new snapshot generation
+
+        Raises:
+            RuntimeError: If no writable snapshot directory is configured
+        """
+        import faiss
+
+        store = self._store
+        if store is None or store.read_only:
+            msg = "save_snapshot() requires a writable faiss_snapshot_dir"
+            raise RuntimeError(msg)
+
+        now = self._clock()
+        self._purge_expired(now)
+        if self._base_index is not None:
+            self._merge_base()
+        self.compact()
+
+        generation = self._generation + 1
+        if self._trained:
+            path = store.index_path(generation)
+            tmp_path = path.with_name(path.name + ".tmp")
+            faiss.write_index(self.index, str(tmp_path))
+        else:
+            path = store.buffer_path(generation)
+            tmp_path = path.with_name(path.name + ".tmp")
+            ids, vectors = self._live_buffer()
+            with open(tmp_path, "wb") as f:
+                np.savez(f, ids=ids, vectors=vectors)
+        os.replace(tmp_path, path)
+
+        offset = time.time() - now
+        store.write_snapshot(
+            generation,
+            {
+                "dimension": str(self.dimension),
+                "index_type": self.config.faiss_index_type,
+                "trained": "1" if self._trained else "0",
+                "trained_size": str(self._trained_size),
+                "next_id": str(self._next_id),
+            },
+            (
+                SnapshotEntry(
+                    idx,
+                    slot.key,
+                    json.dumps(slot.value, default=str),
+                    None if slot.expires_at is None else slot.expires_at + offset,
+                    slot.nbytes,
+                    slot.hits,
+                )
+                for idx, slot in self._entries.items()
+            ),
+        )
+        self._generation = generation
+        self._journal_length = 0
+        self._pending_deletes.clear()
+
+        if self._trained and self.config.faiss_snapshot_mmap:
+            # Serve the snapshot from the page cache shared with other processes
+            self._base_index = faiss.read_index(str(path), faiss.IO_FLAG_MMAP)
+            self._apply_search_params(self._base_index)
+            self._base_next_id = self._next_id
+            self.index = self._new_delta_index(self._base_index)
+
+        logger.info(
+            "Saved cache snapshot generation %d with %d entries", generation, len(self._entries)
+        )
+        return generation
+
+    def refresh(self) -> bool:
+        """Pick up snapshots and journal records written by another process.
+
+        Only read-only caches refresh. A new snapshot generation replaces the
+        in-memory state, dropping entries that were only added locally;
+        otherwise journal records appended since the last refresh are
+        replayed.
+
+        Returns:
+            True if the cache changed
+        """
+        self._last_refresh = self._clock()
+        if self._store is None or not self._store.read_only:
+            return False
+
+        state = self._store.read_state(include_entries=False, after_seq=self._journal_seq)
+        if state.generation != self._generation:
+            self._reset()
+            self._load_latest_snapshot()
+            return True
+        if not state.journal:
+            return False
+        self._replaying = True
+        try:
+            self._replay(state.journal)
+        finally:
+            self._replaying = False
+        self._maybe_compact()
+        return True
+
+    def close(self) -> None:
+        """Close the snapshot store (pending changes are already journaled)."""
+        if self._store is not None:
+            self._store.close()
+            self._store = None
 
     def size(self) -> int:
         """Get the number of unique entries in the cache.
 
-        Returns the count of unique keys (excluding logically deleted entries).
+        Returns the count of live keys (excluding deleted entries).
         """
         return len(self._key_to_id)
 
+    def size_bytes(self) -> int:
+        """Estimate the memory held by live entries."""
+        return self._bytes
+
 
 class RedisVectorCache(SemanticCache):
     """Redis Vector Index-based semantic cache implementation.
@@ -419,6 +1549,7 @@ class RedisVectorCache(SemanticCache):
         self.config = config
         self.dimension = config.dimension
         self.index_name = config.redis_index_name
+        self._hit_counter, self._miss_counter = cache_request_counters("semantic_redis")
 
         # Connect to Redis
         self.redis: Any = Redis.from_url(config.redis_url, decode_responses=False)
@@ -457,10 +1588,10 @@ class RedisVectorCache(SemanticCache):
         key: str,
         embedding: np.ndarray[Any, np.dtype[np.float32]],
         value: dict[str, Any],
+        ttl_seconds: float | None = None,
+        sensitivity: str = "default",
     ) -> None:
-        """Store an entry in the cache."""
-        import json
-
+        """Store an entry in the cache with a Redis key expiry."""
         if embedding.shape[0] != self.dimension:
             msg = f"Embedding dimension {embedding.shape[0]} != {self.dimension}"
             raise ValueError(msg)
@@ -470,16 +1601,69 @@ class RedisVectorCache(SemanticCache):
         if norm > 0:
             embedding = (embedding / norm).astype(np.float32, copy=False)
 
-        # Store in Redis
+        serialized = json.dumps(value)
+        ttl = _resolve_ttl(self.config, ttl_seconds, sensitivity, len(serialized))
         redis_key = f"{self.index_name}:{key}"
-        self.redis.hset(
+        if ttl == 0:
+            self.redis.delete(redis_key)  # Uncacheable; drop any stale entry
+            return
+
+        # Store in Redis
+        pipeline = self.redis.pipeline(transaction=False)
+        pipeline.hset(
             redis_key,
             mapping={
                 "key": key,
                 "embedding": embedding.tobytes(),
-                "value": json.dumps(value),
+                "value": serialized,
             },
         )
+        if ttl is not None:
+            pipeline.expire(redis_key, max(1, int(ttl)))
+        pipeline.execute()
+
+    def set_many(
+        self,
+        keys: Sequence[str],
+        embeddings: np.ndarray[Any, np.dtype[np.float32]],
+        values: Sequence[dict[str, Any]],
+        ttl_seconds: float | None = None,
+        sensitivity: str = "default",
+    ) -> None:
+        """Store many entries in one pipelined round trip."""
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        if matrix.ndim != 2 or matrix.shape[1] != self.dimension:
+            msg = f"Embedding dimension {matrix.shape[-1]} != {self.dimension}"
+            raise ValueError(msg)
+        if not (len(keys) == len(values) == len(matrix)):
+            msg = (
+                f"set_many got {len(keys)} keys, {len(matrix)} embeddings and {len(values)} values"
+            )
+            raise ValueError(msg)
+
+        # Normalize rows for cosine similarity (preserve float32 dtype)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix = np.divide(matrix, norms, out=matrix.copy(), where=norms > 0)
+
+        pipeline = self.redis.pipeline(transaction=False)
+        for key, row, value in zip(keys, matrix, values):
+            serialized = json.dumps(value)
+            ttl = _resolve_ttl(self.config, ttl_seconds, sensitivity, len(serialized))
+            redis_key = f"{self.index_name}:{key}"
+            if ttl == 0:
+                pipeline.delete(redis_key)
+                continue
+            pipeline.hset(
+                redis_key,
+                mapping={
+                    "key": key,
+                    "embedding": row.tobytes(),
+                    "value": serialized,
+                },
+            )
+            if ttl is not None:
+                pipeline.expire(redis_key, max(1, int(ttl)))
+        pipeline.execute()
 
     def search(
         self,
@@ -488,8 +1672,6 @@ class RedisVectorCache(SemanticCache):
         threshold: float = 0.9,
     ) -> list[CacheEntry]:
         """Search for similar entries using Redis vector search."""
-        import json
-
         from redis.commands.search.query import Query
 
         if query_embedding.shape[0] != self.dimension:
@@ -544,8 +1726,22 @@ class RedisVectorCache(SemanticCache):
                     )
                 )
 
+        (self._hit_counter if results else self._miss_counter).inc()
         return results
 
+    def search_many(
+        self,
+        query_embeddings: np.ndarray[Any, np.dtype[np.float32]],
+        k: int = 5,
+        threshold: float = 0.9,
+    ) -> list[list[CacheEntry]]:
+        """Search for many queries (one KNN query per row)."""
+        matrix = np.asarray(query_embeddings, dtype=np.float32)
+        if matrix.ndim != 2 or matrix.shape[1] != self.dimension:
+            msg = f"Query dimension {matrix.shape[-1]} != {self.dimension}"
+            raise ValueError(msg)
+        return [self.search(row, k=k, threshold=threshold) for row in matrix]
+
     def clear(self) -> None:
         """Clear all entries from the cache."""
         # Delete all keys with the index prefix
@@ -0,0 +1,267 @@
+"""On-disk snapshots for the FAISS semantic cache.
+
+A snapshot directory holds:
+
+- ``index-<generation>.faiss``: the FAISS index, written with ``write_index``
+  and loaded with ``IO_FLAG_MMAP`` so processes on one host share its pages
+- ``buffer-<generation>.npz``: the training buffer of a not yet trained
+  IVFFlat cache (written instead of an index)
+- ``entries.sqlite``: keys, values and TTLs of the snapshot, plus an append
+  log (journal) of changes made since
+
+Writing a snapshot creates a new index file first, then replaces the entries,
+clears the journal and bumps the generation in one SQLite transaction, so a
+reader never pairs an index with entries from another generation. Files of
+the previous generation are kept, so a reader that has just read the old
+generation number can still open its index; older files are unlinked.
+Readers that already map an unlinked file keep a valid view until they
+refresh, and a reader that lost the race anyway (the writer published twice
+in between) re-reads the state and retries.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+ENTRIES_DB_NAME = "entries.sqlite"
+
+
+@dataclass(slots=True)
+class SnapshotEntry:
+    """Persisted cache entry (the vector lives in the index or journal)."""
+
+    id: int
+    key: str
+    value: str  # JSON
+    expires_at: float | None  # Unix time
+    nbytes: int
+    hits: int = 0
+
+
+@dataclass(slots=True)
+class JournalRecord:
+    """One change appended since the last snapshot."""
+
+    seq: int
+    op: str  # "set", "delete" or "clear"
+    entry: SnapshotEntry | None = None
+    embedding: bytes | None = None
+    id: int | None = None
+
+
+@dataclass(slots=True)
+class SnapshotState:
+    """Consistent view of a snapshot directory."""
+
+    generation: int
+    meta: dict[str, str]
+    entries: list[SnapshotEntry]
+    journal: list[JournalRecord]
+
+
+class CacheSnapshotStore:
+    """SQLite side store and file layout of a cache snapshot directory.
+
+    Thread-safe; intended for one writing process and any number of readers.
+    """
+
+    def __init__(self, directory: Path | str, read_only: bool = False) -> None:
+        """
+        Open (and create) a snapshot directory.
+
+        Args:
+            directory: Snapshot directory
+            read_only: Reject journal appends and snapshot writes
+        """
+        self.directory = Path(directory)
+        self.read_only = read_only
+        self._lock = threading.Lock()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            self.directory / ENTRIES_DB_NAME,
+            check_same_thread=False,
+            isolation_level=None,  # Explicit transactions
+        )
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._create_schema()
+
+    def _create_schema(self) -> None:
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS meta (
+                name TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS entries (
+                id INTEGER PRIMARY KEY,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                expires_at REAL,
+                nbytes INTEGER NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE TABLE IF NOT EXISTS journal (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                op TEXT NOT NULL,
+                id INTEGER,
+                key TEXT,
+                value TEXT,
+                expires_at REAL,
+                nbytes INTEGER,
+                embedding BLOB
+            );
+            """
+        )
+
+    def index_path(self, generation: int) -> Path:
+        return self.directory / f"index-{generation}.faiss"
+
+    def buffer_path(self, generation: int) -> Path:
+        return self.directory / f"buffer-{generation}.npz"
+
+    def read_state(self, include_entries: bool = True, after_seq: int = 0) -> SnapshotState:
+        """
+        Read metadata, entries and journal in one consistent transaction.
+
+        Args:
+            include_entries: Also load the snapshot entries
+            after_seq: Only return journal records appended after this sequence
+
+        Returns:
+            Snapshot state (generation 0 if no snapshot was written)
+        """
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                meta = dict(self._conn.execute("SELECT name, value FROM meta").fetchall())
+                entries = (
+                    [
+                        SnapshotEntry(*row)
+                        for row in self._conn.execute(
+                            "SELECT id, key, value, expires_at, nbytes, hits "
+                            "FROM entries ORDER BY id"
+                        )
+                    ]
+                    if include_entries
+                    else []
+                )
+                rows = self._conn.execute(
+                    """
+                    SELECT seq, op, id, key, value, expires_at, nbytes, embedding
+                    FROM journal WHERE seq > ? ORDER BY seq
+                    """,
+                    (after_seq,),
+                ).fetchall()
+            finally:
+                self._conn.execute("COMMIT")
+
+        journal: list[JournalRecord] = []
+        for seq, op, idx, key, value, expires_at, nbytes, embedding in rows:
+            if op == "set":
+                entry = SnapshotEntry(idx, key, value, expires_at, nbytes)
+                journal.append(JournalRecord(seq, op, entry=entry, embedding=embedding))
+            else:
+                journal.append(JournalRecord(seq, op, id=idx))
+        return SnapshotState(int(meta.pop("generation", 0)), meta, entries, journal)
+
+    def append(
+        self,
+        sets: Iterable[tuple[SnapshotEntry, bytes]] = (),
+        deletes: Iterable[int] = (),
+        clear: bool = False,
+    ) -> int:
+        """
+        Append changes to the journal in one transaction.
+
+        Args:
+            sets: New entries with their float32 embedding bytes
+            deletes: Ids of deleted entries (applied after ``sets``, so
+                entries evicted by their own batch stay deleted)
+            clear: Record that the cache was cleared (applied first)
+
+        Returns:
+            Number of journal records written
+        """
+        rows: list[tuple[Any, ...]] = []
+        if clear:
+            rows.append(("clear", None, None, None, None, None, None))
+        rows.extend(
+            ("set", e.id, e.key, e.value, e.expires_at, e.nbytes, embedding)
+            for e, embedding in sets
+        )
+        rows.extend(("delete", idx, None, None, None, None, None) for idx in deletes)
+        if not rows:
+            return 0
+        self._check_writable()
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    """
+                    INSERT INTO journal (op, id, key, value, expires_at, nbytes, embedding)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    rows,
+                )
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+        return len(rows)
+
+    def write_snapshot(
+        self,
+        generation: int,
+        meta: dict[str, str],
+        entries: Iterable[SnapshotEntry],
+    ) -> None:
+        """
+        Publish a snapshot generation whose index file is already written.
+
+        Replaces the entries, clears the journal and records ``meta`` in one
+        transaction, then removes files older than the previous generation.
+        """
+        self._check_writable()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute("DELETE FROM entries")
+                self._conn.executemany(
+                    """
+                    INSERT INTO entries (id, key, value, expires_at, nbytes, hits)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    """,
+                    ((e.id, e.key, e.value, e.expires_at, e.nbytes, e.hits) for e in entries),
+                )
+                self._conn.execute("DELETE FROM journal")
+                self._conn.execute("DELETE FROM meta")
+                self._conn.executemany(
+                    "INSERT INTO meta (name, value) VALUES (?, ?)",
+                    [*meta.items(), ("generation", str(generation))],
+                )
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+        keep = {self.index_path(kept) for kept in (generation, generation - 1)} | {
+            self.buffer_path(kept) for kept in (generation, generation - 1)
+        }
+        for path in [*self.directory.glob("index-*.faiss"), *self.directory.glob("buffer-*.npz")]:
+            if path not in keep:
+                path.unlink(missing_ok=True)
+
+    def _check_writable(self) -> None:
+        if self.read_only:
+            msg = f"Cache snapshot store {self.directory} is read-only"
+            raise RuntimeError(msg)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -9,7 +9,9 @@ from __future__ import annotations
 
 # Core protocol (used by MAG/SAG)
 from magsag.providers.base import BaseLLMProvider, LLMResponse
+from magsag.providers.factory import PROVIDER_BUILDERS, build_provider
 from magsag.providers.google import GoogleProvider
+from magsag.providers.instrumented import InstrumentedProvider
 from magsag.providers.local import LocalLLMProvider, LocalProviderConfig
 from magsag.providers.mock import MockLLMProvider
 
@@ -29,8 +31,13 @@ __all__ = [
     # Core protocol
     "BaseLLMProvider",
     "LLMResponse",
+    # Factory (cassette-aware, instrumented)
+    "PROVIDER_BUILDERS",
+    "build_provider",
     # Google provider
     "GoogleProvider",
+    # Metrics and tracing wrapper
+    "InstrumentedProvider",
     # Local provider
     "LocalLLMProvider",
     "LocalProviderConfig",
@@ -14,6 +14,8 @@ from typing import Any, AsyncIterator, Iterator, Literal, TypedDict, cast
 
 import httpx
 
+from magsag.providers.base import LLMResponse
+
 # ============================================================================
 # Type Definitions
 # ============================================================================
@@ -330,6 +332,53 @@ class AnthropicProvider:
         # Normalize response
         return self._normalize_response(data)
 
+    def generate(
+        self,
+        prompt: str,
+        *,
+        model: str,
+        max_tokens: int = 1024,
+        temperature: float = 0.7,
+        tools: list[dict[str, Any]] | None = None,
+        **_: Any,
+    ) -> LLMResponse:
+        """Generate a completion following BaseLLMProvider semantics.
+
+        Args:
+            prompt: User message
+            model: Model to use
+            max_tokens: Maximum tokens to generate
+            temperature: Sampling temperature
+            tools: Tool definitions (OpenAI format)
+
+        Returns:
+            LLMResponse with content, tool calls and token usage
+        """
+        request: CompletionRequest = {
+            "model": model,
+            "messages": [{"role": "user", "content": prompt}],
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+        }
+        if tools:
+            request["tools"] = [cast(OpenAITool, tool) for tool in tools]
+
+        response = self.complete(request)
+        usage = response.get("usage") or {}
+        tool_calls = response.get("tool_calls")
+        return LLMResponse(
+            content=response.get("content") or "",
+            model=response.get("model") or model,
+            input_tokens=int(usage.get("input_tokens", 0)),
+            output_tokens=int(usage.get("output_tokens", 0)),
+            tool_calls=[dict(call) for call in tool_calls] if tool_calls else None,
+            metadata={"id": response.get("id"), "stop_reason": response.get("stop_reason")},
+        )
+
+    def get_cost(self, model: str, input_tokens: int, output_tokens: int) -> float:
+        """Return zero; Anthropic pricing is not tracked by this provider."""
+        return 0.0
+
     def stream(
         self,
         request: CompletionRequest,
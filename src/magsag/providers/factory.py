@@ -0,0 +1,93 @@
+"""
+Provider construction by name.
+
+``build_provider`` is the single place providers are built for agent runs;
+agents get them through ``AgentRunner.get_provider``.
+Every provider it returns records or replays through the active cassette
+(``magsag.cassette.CassetteProvider``) and is counted and traced by
+``InstrumentedProvider``. The underlying provider is only constructed on the
+first call that is not replayed, so replaying a run never opens a
+connection to the real service.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any
+
+from magsag.cassette import CassetteProvider
+from magsag.providers.base import BaseLLMProvider
+from magsag.providers.instrumented import InstrumentedProvider
+
+
+def _build_local(**kwargs: Any) -> BaseLLMProvider:
+    from magsag.providers.local import LocalLLMProvider, LocalProviderConfig
+
+    return LocalLLMProvider(LocalProviderConfig(**kwargs))
+
+
+def _build_anthropic(**kwargs: Any) -> BaseLLMProvider:
+    from magsag.providers.anthropic import AnthropicProvider
+
+    return AnthropicProvider(**kwargs)
+
+
+def _build_google(**kwargs: Any) -> BaseLLMProvider:
+    from magsag.providers.google import GoogleProvider
+
+    return GoogleProvider(**kwargs)
+
+
+def _build_openai(**kwargs: Any) -> BaseLLMProvider:
+    from magsag.providers.openai import OpenAIProvider, ProviderConfig
+
+    return OpenAIProvider(ProviderConfig(**kwargs))
+
+
+def _build_mock(**kwargs: Any) -> BaseLLMProvider:
+    from magsag.providers.mock import MockLLMProvider
+
+    return MockLLMProvider(**kwargs)
+
+
+def _build_openai_compat(**kwargs: Any) -> BaseLLMProvider:
+    from magsag.providers.openai_compat import OpenAICompatProvider, OpenAICompatProviderConfig
+
+    return OpenAICompatProvider(OpenAICompatProviderConfig(**kwargs))
+
+
+# Keys match the provider names used by routing policies (``Plan.provider``)
+PROVIDER_BUILDERS: dict[str, Callable[..., BaseLLMProvider]] = {
+    "anthropic": _build_anthropic,
+    "google": _build_google,
+    "local": _build_local,
+    "mock": _build_mock,
+    "openai": _build_openai,
+    "openai-compat": _build_openai_compat,
+}
+
+
+def build_provider(name: str, **kwargs: Any) -> BaseLLMProvider:
+    """
+    Create a cassette-aware, instrumented provider.
+
+    Args:
+        name: Provider name (a key of ``PROVIDER_BUILDERS``)
+        **kwargs: Configuration passed to the provider's builder
+
+    Returns:
+        Provider wrapping the named provider
+
+    Raises:
+        ValueError: If the provider name is unknown
+    """
+    builder = PROVIDER_BUILDERS.get(name)
+    if builder is None:
+        known = ", ".join(sorted(PROVIDER_BUILDERS))
+        raise ValueError(f"Unknown provider '{name}' (known: {known})")
+    return InstrumentedProvider(
+        CassetteProvider(None, factory=lambda: builder(**kwargs)), name=name
+    )
+
+
+__all__ = ["PROVIDER_BUILDERS", "build_provider"]
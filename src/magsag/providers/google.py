@@ -122,12 +122,7 @@ class GoogleProvider:
             input_tokens = getattr(usage, "input_tokens", 0)
             output_tokens = getattr(usage, "output_tokens", 0)
 
-        # Calculate costs
-        model_costs = self.COST_PER_1M_TOKENS.get(model_name, {"input": 0.0, "output": 0.0})
-        cost_usd = (
-            input_tokens * model_costs["input"] / 1_000_000
-            + output_tokens * model_costs["output"] / 1_000_000
-        )
+        cost_usd = self.get_cost(model_name, input_tokens, output_tokens)
 
         return LLMResponse(
             content=text,
@@ -175,3 +170,11 @@ class GoogleProvider:
             model=model,
             **kwargs,
         )
+
+    def get_cost(self, model: str, input_tokens: int, output_tokens: int) -> float:
+        """Calculate the cost in USD (zero for models without known pricing)."""
+        model_costs = self.COST_PER_1M_TOKENS.get(model, {"input": 0.0, "output": 0.0})
+        return (
+            input_tokens * model_costs["input"] / 1_000_000
+            + output_tokens * model_costs["output"] / 1_000_000
+        )
@@ -0,0 +1,93 @@
+"""
+Metrics and tracing for LLM provider calls.
+
+``InstrumentedProvider`` wraps any ``BaseLLMProvider`` and records a
+``provider.generate`` stage span plus request and token counters for every
+``generate`` call. Responses marked ``metadata["replayed"]`` (served from a
+cassette) are counted with the ``replayed`` outcome and no tokens.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from magsag.observability.metrics import get_metrics_registry
+from magsag.observability.stages import stage
+from magsag.providers.base import BaseLLMProvider, LLMResponse
+
+
+class InstrumentedProvider:
+    """Provider wrapper that counts and traces ``generate`` calls."""
+
+    def __init__(self, provider: BaseLLMProvider, name: str | None = None) -> None:
+        """
+        Initialize the wrapper.
+
+        Args:
+            provider: Provider to delegate to
+            name: Provider name recorded on the span (e.g. ``openai``)
+        """
+        self.provider = provider
+        self.name = name
+        registry = get_metrics_registry()
+        self._requests = registry.counter(
+            "magsag_llm_requests_total",
+            "LLM generate calls by model and outcome (success, error, replayed)",
+            ["model", "outcome"],
+        )
+        self._tokens = registry.counter(
+            "magsag_llm_tokens_total", "LLM tokens by model and direction", ["model", "direction"]
+        )
+
+    def generate(
+        self,
+        prompt: str,
+        *,
+        model: str,
+        max_tokens: int = 1024,
+        temperature: float = 0.7,
+        tools: list[dict[str, Any]] | None = None,
+        tool_choice: str | dict[str, Any] | None = None,
+        response_format: dict[str, Any] | None = None,
+        reasoning: dict[str, Any] | None = None,
+        mcp_tools: list[dict[str, Any]] | None = None,
+        **kwargs: Any,
+    ) -> LLMResponse:
+        """Generate a completion inside a ``provider.generate`` span."""
+        attrs: dict[str, Any] = {"llm.model": model}
+        if self.name:
+            attrs["llm.provider"] = self.name
+        with stage("provider.generate", attrs) as span:
+            try:
+                response = self.provider.generate(
+                    prompt,
+                    model=model,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    tools=tools,
+                    tool_choice=tool_choice,
+                    response_format=response_format,
+                    reasoning=reasoning,
+                    mcp_tools=mcp_tools,
+                    **kwargs,
+                )
+            except Exception:
+                self._requests.labels(model, "error").inc()
+                raise
+            if response.metadata.get("replayed"):
+                span.set_attribute("llm.replayed", True)
+                self._requests.labels(model, "replayed").inc()
+                return response
+            self._requests.labels(model, "success").inc()
+            self._tokens.labels(model, "input").inc(response.input_tokens)
+            self._tokens.labels(model, "output").inc(response.output_tokens)
+            span.set_attribute("llm.input_tokens", response.input_tokens)
+            span.set_attribute("llm.output_tokens", response.output_tokens)
+        return response
+
+    def get_cost(self, model: str, input_tokens: int, output_tokens: int) -> float:
+        """Delegate cost calculation to the wrapped provider."""
+        return self.provider.get_cost(model, input_tokens, output_tokens)
+
+
+__all__ = ["InstrumentedProvider"]
@@ -18,7 +18,7 @@ from openai import NOT_GIVEN, NotGiven, OpenAI
 from openai.types.chat import ChatCompletion, ChatCompletionChunk
 from openai.types.responses import Response as OpenAIResponse
 
-from magsag.providers.base import BaseProviderConfig
+from magsag.providers.base import BaseProviderConfig, LLMResponse
 
 
 class APIEndpoint(str, Enum):
@@ -518,6 +518,47 @@ class OpenAIProvider:
             else:
                 return self._chat_completions_complete(request)
 
+    def generate(
+        self,
+        prompt: str,
+        *,
+        model: str,
+        max_tokens: int = 1024,
+        temperature: float = 0.7,
+        tools: list[dict[str, Any]] | None = None,
+        tool_choice: str | dict[str, Any] | None = None,
+        response_format: dict[str, Any] | None = None,
+        **_: Any,
+    ) -> LLMResponse:
+        """Generate a completion following BaseLLMProvider semantics."""
+        request = CompletionRequest(
+            model=model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=temperature,
+            max_tokens=max_tokens,
+            tools=tools if tools else NOT_GIVEN,
+            tool_choice=tool_choice if tool_choice is not None else NOT_GIVEN,
+            response_format=response_format if response_format is not None else NOT_GIVEN,
+        )
+        response = cast(CompletionResponse, self.complete(request))
+        return LLMResponse(
+            content=response.content or "",
+            model=response.model,
+            input_tokens=response.usage.prompt_tokens,
+            output_tokens=response.usage.completion_tokens,
+            tool_calls=response.tool_calls or None,
+            metadata={
+                "id": response.id,
+                "finish_reason": response.finish_reason,
+                "endpoint": response.endpoint_used.value,
+                "cost_usd": response.usage.total_cost_usd,
+            },
+        )
+
+    def get_cost(self, model: str, input_tokens: int, output_tokens: int) -> float:
+        """Calculate the cost in USD from the configured pricing."""
+        return self._calculate_cost(model, input_tokens, output_tokens).total_cost_usd
+
 
 def create_provider(
     api_key: Optional[str] = None,
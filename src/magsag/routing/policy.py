@@ -2,12 +2,33 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+import fnmatch
+import re
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
 import yaml
 
+# Upper bound on memoised task_type and (task_type, overrides) resolutions
+ROUTE_CACHE_SIZE = 1024
+
+_WILDCARD_CHARS = frozenset("*?[")
+
+# Route attributes accepted in overrides, with the coercion applied to each
+_ROUTE_FIELDS: dict[str, Callable[[Any], Any]] = {
+    "task_type": str,
+    "provider": str,
+    "model": str,
+    "use_batch": bool,
+    "use_cache": bool,
+    "structured_output": bool,
+    "moderation": bool,
+    "priority": int,
+    "metadata": dict,
+}
+
 
 @dataclass(frozen=True)
 class Route:
@@ -37,11 +58,63 @@ class Route:
     metadata: dict[str, Any] = field(default_factory=dict)
 
 
+@dataclass
+class _RouteTable:
+    """Routes compiled into an exact-match dict and ordered glob patterns."""
+
+    exact: dict[str, tuple[int, Route]]
+    patterns: list[tuple[int, re.Pattern[str], Route]]
+
+    @classmethod
+    def compile(cls, routes: list[Route]) -> _RouteTable:
+        exact: dict[str, tuple[int, Route]] = {}
+        patterns: list[tuple[int, re.Pattern[str], Route]] = []
+        for index, route in enumerate(routes):
+            if _WILDCARD_CHARS.isdisjoint(route.task_type):
+                exact.setdefault(route.task_type, (index, route))
+            else:
+                patterns.append((index, re.compile(fnmatch.translate(route.task_type)), route))
+        return cls(exact=exact, patterns=patterns)
+
+    def match(self, task_type: str) -> Optional[Route]:
+        """Return the first route (in priority order) matching task_type."""
+        exact = self.exact.get(task_type)
+        for index, regex, route in self.patterns:
+            if exact is not None and index >= exact[0]:
+                break
+            if route.task_type == task_type or regex.match(task_type) is not None:
+                return route
+        return exact[1] if exact is not None else None
+
+
+def _overrides_key(overrides: dict[str, Any]) -> Optional[tuple[tuple[str, Any], ...]]:
+    """Return a hashable key for overrides, or None if a value is unhashable."""
+    key = tuple(sorted(overrides.items()))
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def _apply_overrides(route: Route, overrides: dict[str, Any]) -> Route:
+    """Return a copy of route with known attributes overridden."""
+    changes = {
+        name: coerce(overrides[name]) for name, coerce in _ROUTE_FIELDS.items() if name in overrides
+    }
+    changes.setdefault("metadata", route.metadata.copy())
+    return replace(route, **changes)
+
+
 @dataclass
 class RoutingPolicy:
     """
     Routing policy containing multiple routes with fallback logic.
 
+    Routes are compiled on first lookup into an exact-match table plus an
+    ordered list of compiled patterns, and resolutions are memoised. Code that
+    mutates ``routes`` in place must call ``invalidate_cache()`` afterwards.
+
     Attributes:
         name: Policy name (e.g., "default", "cost-optimized")
         description: Policy description
@@ -51,6 +124,14 @@ class RoutingPolicy:
     name: str
     description: str
     routes: list[Route]
+    _compiled_for: Optional[list[Route]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _compiled_len: int = field(default=0, init=False, repr=False, compare=False)
+    _match: Callable[[str], Optional[Route]] = field(init=False, repr=False, compare=False)
+    _merge: Callable[[str, tuple[tuple[str, Any], ...]], Optional[Route]] = field(
+        init=False, repr=False, compare=False
+    )
 
     @classmethod
     def from_yaml(cls, yaml_path: Path) -> RoutingPolicy:
@@ -71,17 +152,38 @@ class RoutingPolicy:
             raise FileNotFoundError(f"Routing policy not found: {yaml_path}")
 
         with open(yaml_path, "r", encoding="utf-8") as f:
-            data = yaml.safe_load(f)
+            return cls.from_yaml_text(f.read(), default_name=yaml_path.stem, source=str(yaml_path))
+
+    @classmethod
+    def from_yaml_text(
+        cls, yaml_text: str, default_name: str, source: Optional[str] = None
+    ) -> RoutingPolicy:
+        """
+        Load routing policy from YAML text (e.g., a package resource).
+
+        Args:
+            yaml_text: YAML document
+            default_name: Policy name used when the document has no ``name``
+            source: Description of the document origin for error messages
+
+        Returns:
+            RoutingPolicy instance
+
+        Raises:
+            ValueError: If YAML structure is invalid
+        """
+        source = source or default_name
+        data = yaml.safe_load(yaml_text)
 
         if not isinstance(data, dict):
-            raise ValueError(f"Routing policy must be a mapping in {yaml_path}")
+            raise ValueError(f"Routing policy must be a mapping in {source}")
 
-        name = str(data.get("name", yaml_path.stem))
+        name = str(data.get("name", default_name))
         description = str(data.get("description", ""))
         routes_data = data.get("routes", [])
 
         if not isinstance(routes_data, list):
-            raise ValueError(f"'routes' must be a list in {yaml_path}")
+            raise ValueError(f"'routes' must be a list in {source}")
 
         routes: list[Route] = []
         for route_data in routes_data:
@@ -106,6 +208,22 @@ class RoutingPolicy:
 
         return cls(name=name, description=description, routes=routes)
 
+    def invalidate_cache(self) -> None:
+        """Recompile the route table and drop memoised resolutions."""
+        table = _RouteTable.compile(self.routes)
+        self._compiled_for = self.routes
+        self._compiled_len = len(self.routes)
+        self._match = lru_cache(maxsize=ROUTE_CACHE_SIZE)(table.match)
+        self._merge = lru_cache(maxsize=ROUTE_CACHE_SIZE)(self._merge_overrides)
+
+    def _merge_overrides(
+        self, task_type: str, overrides_key: tuple[tuple[str, Any], ...]
+    ) -> Optional[Route]:
+        route = self._match(task_type)
+        if route is None:
+            return None
+        return _apply_overrides(route, dict(overrides_key))
+
     def get_route(
         self, task_type: str, overrides: Optional[dict[str, Any]] = None
     ) -> Optional[Route]:
@@ -119,45 +237,15 @@ class RoutingPolicy:
         Returns:
             Matching Route or None if not found
         """
-        from fnmatch import fnmatch
+        if self._compiled_for is not self.routes or self._compiled_len != len(self.routes):
+            self.invalidate_cache()
 
-        # Find matching route (exact match first, then pattern match)
-        matched_route: Optional[Route] = None
-        for route in self.routes:
-            if route.task_type == task_type:
-                matched_route = route
-                break
-            if fnmatch(task_type, route.task_type):
-                matched_route = route
-                break
-
-        if matched_route is None:
-            return None
+        if not overrides:
+            return self._match(task_type)
 
-        # Apply overrides if provided
-        if overrides:
-            route_dict: dict[str, Any] = {
-                "task_type": matched_route.task_type,
-                "provider": matched_route.provider,
-                "model": matched_route.model,
-                "use_batch": matched_route.use_batch,
-                "use_cache": matched_route.use_cache,
-                "structured_output": matched_route.structured_output,
-                "moderation": matched_route.moderation,
-                "priority": matched_route.priority,
-                "metadata": matched_route.metadata.copy(),
-            }
-            route_dict.update(overrides)
-            return Route(
-                task_type=str(route_dict["task_type"]),
-                provider=str(route_dict["provider"]),
-                model=str(route_dict["model"]),
-                use_batch=bool(route_dict["use_batch"]),
-                use_cache=bool(route_dict["use_cache"]),
-                structured_output=bool(route_dict["structured_output"]),
-                moderation=bool(route_dict["moderation"]),
-                priority=int(route_dict["priority"]),
-                metadata=dict(route_dict.get("metadata", {})),
-            )
+        overrides_key = _overrides_key(overrides)
+        if overrides_key is None:
+            route = self._match(task_type)
+            return _apply_overrides(route, overrides) if route is not None else None
 
-        return matched_route
+        return self._merge(task_type, overrides_key)
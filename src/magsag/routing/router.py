@@ -3,8 +3,8 @@
 from __future__ import annotations
 
 import os
-import tempfile
 from dataclasses import dataclass
+from functools import lru_cache
 from importlib.resources import files
 from pathlib import Path
 from typing import Any, Optional
@@ -64,28 +64,24 @@ class Plan:
 _default_policy: Optional[RoutingPolicy] = None
 
 
+def _load_resource_policy(policy_name: str) -> RoutingPolicy:
+    """Load a routing policy straight from package resources."""
+    resource = files("magsag.assets.routing").joinpath(f"{policy_name}.yaml")
+    if not resource.is_file():
+        raise FileNotFoundError(f"Policy '{policy_name}.yaml' not found in package resources")
+    return RoutingPolicy.from_yaml_text(
+        resource.read_text(encoding="utf-8"),
+        default_name=policy_name,
+        source=f"magsag.assets.routing/{policy_name}.yaml",
+    )
+
+
 def _get_default_policy() -> RoutingPolicy:
     """Get or load default routing policy from package resources."""
     global _default_policy
     if _default_policy is None:
         try:
-            # Load from package resources (works in both dev and installed environments)
-            resource = files("magsag.assets.routing").joinpath("default.yaml")
-            if hasattr(resource, "read_text"):
-                # Python 3.9+ Traversable API
-                yaml_content = resource.read_text(encoding="utf-8")
-                # Create a temporary file for RoutingPolicy.from_yaml
-                with tempfile.NamedTemporaryFile(
-                    mode="w", suffix=".yaml", delete=False, encoding="utf-8"
-                ) as tmp:
-                    tmp.write(yaml_content)
-                    tmp_path = Path(tmp.name)
-                try:
-                    _default_policy = RoutingPolicy.from_yaml(tmp_path)
-                finally:
-                    tmp_path.unlink()
-            else:
-                raise FileNotFoundError("default.yaml not found in package resources")
+            _default_policy = _load_resource_policy("default")
         except (FileNotFoundError, ModuleNotFoundError):
             # Fallback: create empty policy if resources not available
             _default_policy = RoutingPolicy(
@@ -96,6 +92,32 @@ def _get_default_policy() -> RoutingPolicy:
     return _default_policy
 
 
+@lru_cache(maxsize=1)
+def _env_overrides() -> tuple[tuple[str, str], ...]:
+    """Read MAGSAG_PROVIDER / MAGSAG_MODEL once per process."""
+    env_overrides: list[tuple[str, str]] = []
+    provider_env = os.getenv("MAGSAG_PROVIDER")
+    if provider_env:
+        env_overrides.append(("provider", provider_env))
+
+    model_env = os.getenv("MAGSAG_MODEL")
+    if model_env:
+        env_overrides.append(("model", model_env))
+
+    return tuple(env_overrides)
+
+
+def reset_routing_cache() -> None:
+    """
+    Forget the cached default policy and environment overrides.
+
+    Call this after changing MAGSAG_PROVIDER / MAGSAG_MODEL at runtime.
+    """
+    global _default_policy
+    _default_policy = None
+    _env_overrides.cache_clear()
+
+
 def get_plan(
     task_type: str,
     overrides: Optional[dict[str, Any]] = None,
@@ -116,6 +138,9 @@ def get_plan(
         MAGSAG_PROVIDER: Override provider for all tasks (e.g., "openai", "anthropic", "google", "local")
         MAGSAG_MODEL: Override model for all tasks (optional, provider-specific)
 
+        Both are read once per process; call reset_routing_cache() after
+        changing them at runtime.
+
     Examples:
         >>> plan = get_plan("offer-orchestration")
         >>> if plan:
@@ -125,25 +150,22 @@ def get_plan(
 
         >>> # Use environment variable to switch provider globally
         >>> os.environ["MAGSAG_PROVIDER"] = "openai"
+        >>> reset_routing_cache()
         >>> plan = get_plan("offer-orchestration")  # Uses OpenAI regardless of policy
     """
     if policy is None:
         policy = _get_default_policy()
 
-    # Apply environment variable overrides if set
-    env_overrides = {}
-    provider_env = os.getenv("MAGSAG_PROVIDER")
-    if provider_env:
-        env_overrides["provider"] = provider_env
-
-    model_env = os.getenv("MAGSAG_MODEL")
-    if model_env:
-        env_overrides["model"] = model_env
-
     # Merge environment overrides with explicit overrides (explicit takes precedence)
-    merged_overrides = {**env_overrides, **(overrides or {})}
-
-    route = policy.get_route(task_type, overrides=merged_overrides if merged_overrides else None)
+    env_overrides = _env_overrides()
+    if overrides:
+        merged_overrides: Optional[dict[str, Any]] = {**dict(env_overrides), **overrides}
+    elif env_overrides:
+        merged_overrides = dict(env_overrides)
+    else:
+        merged_overrides = None
+
+    route = policy.get_route(task_type, overrides=merged_overrides)
     if route is None:
         return None
 
@@ -179,21 +201,7 @@ def load_policy(policy_name: str, base_path: Optional[Path] = None) -> RoutingPo
 
     # Load from package resources
     try:
-        resource = files("magsag.assets.routing").joinpath(f"{policy_name}.yaml")
-        if hasattr(resource, "read_text"):
-            yaml_content = resource.read_text(encoding="utf-8")
-            # Create a temporary file for RoutingPolicy.from_yaml
-            with tempfile.NamedTemporaryFile(
-                mode="w", suffix=".yaml", delete=False, encoding="utf-8"
-            ) as tmp:
-                tmp.write(yaml_content)
-                tmp_path = Path(tmp.name)
-            try:
-                return RoutingPolicy.from_yaml(tmp_path)
-            finally:
-                tmp_path.unlink()
-        else:
-            raise FileNotFoundError(f"Policy '{policy_name}.yaml' not found in package resources")
+        return _load_resource_policy(policy_name)
     except (FileNotFoundError, ModuleNotFoundError) as e:
         raise FileNotFoundError(
             f"Policy '{policy_name}' not found in package resources. "
@@ -220,6 +220,7 @@ def apply_deterministic_settings(provider_config: dict[str, Any]) -> dict[str, A
 def create_replay_context(
     replay_snapshot: dict[str, Any],
     additional_context: Optional[dict[str, Any]] = None,
+    cassette_path: Optional[str | os.PathLike[str]] = None,
 ) -> dict[str, Any]:
     """
     Create execution context from a replay snapshot.
@@ -233,6 +234,8 @@ def create_replay_context(
     Args:
         replay_snapshot: Environment snapshot from a previous run
         additional_context: Optional additional context to merge
+        cassette_path: Optional cassette recorded with the run; provider and
+            MCP calls are then served from it instead of the network
 
     Returns:
         Context dictionary ready for agent execution
@@ -255,6 +258,10 @@ def create_replay_context(
         # Clear the cached seed if snapshot was non-deterministic
         set_deterministic_seed(None)  # type: ignore[arg-type]
 
+    if cassette_path is not None:
+        context["cassette_mode"] = "replay"
+        context["cassette_path"] = os.fspath(cassette_path)
+
     # Merge additional context
     if additional_context:
         context.update(additional_context)
@@ -8,6 +8,8 @@ dependency resolution, and metrics collection.
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import contextvars
 import functools
 import inspect
 import logging
@@ -22,6 +24,7 @@ from typing import Any, Callable, Coroutine, Dict, List, Mapping, Optional, cast
 import yaml
 
 from magsag.api.config import get_settings
+from magsag.cassette import CASSETTE_FILE_NAME, Cassette, get_active_cassette, use_cassette
 from magsag.core.memory import (
     MemoryEntry,
     MemoryScope,
@@ -32,16 +35,17 @@ from magsag.evaluation.runtime import EvalRuntime
 from magsag.governance.permission_evaluator import PermissionEvaluator
 from magsag.mcp import MCPRegistry, MCPRuntime
 from magsag.observability.logger import ObservabilityLogger
+from magsag.observability.metrics import Counter, Histogram, get_metrics_registry
+from magsag.observability.stages import SpanContext, StageSpan, inject_trace_context, stage
+from magsag.providers import BaseLLMProvider, build_provider
 from magsag.runners.durable import DurableRunner
 from magsag.registry import AgentDescriptor, Registry, get_registry
 from magsag.router import ExecutionPlan, Router, get_router
 from magsag.routing.handoff_tool import HandoffTool
 from magsag.routing.router import Plan as LLMPlan, get_plan as get_llm_plan
-from magsag.storage.memory_store import (
-    AbstractMemoryStore,
-    PostgresMemoryStore,
-    SQLiteMemoryStore,
-)
+from magsag.storage.factory import create_memory_store
+from magsag.storage.memory_store import AbstractMemoryStore
+from magsag.storage.memory_writer import MemoryWriteQueue
 
 logger = logging.getLogger(__name__)
 
@@ -53,6 +57,25 @@ AgentCallable = Callable[..., Dict[str, Any]]
 SkillCallable = Callable[[Dict[str, Any]], Dict[str, Any]]
 
 
+@functools.lru_cache(maxsize=1)
+def _run_metrics() -> tuple[Counter, Histogram]:
+    registry = get_metrics_registry()
+    return (
+        registry.counter(
+            "magsag_runs_total", "Agent runs by kind, agent and status", ["kind", "agent", "status"]
+        ),
+        registry.histogram(
+            "magsag_run_duration_seconds", "End-to-end agent run duration", ["kind", "agent"]
+        ),
+    )
+
+
+def _record_run(kind: str, agent: str, status: str, duration_seconds: float) -> None:
+    runs, durations = _run_metrics()
+    runs.labels(kind, agent, status).inc()
+    durations.labels(kind, agent).observe(duration_seconds)
+
+
 def _is_async_callable(fn: Any) -> bool:
     """
     Check if a callable is async (coroutine function).
@@ -132,6 +155,9 @@ class SkillRuntime:
         self.enable_mcp = enable_mcp
         self.mcp_registry: Optional[MCPRegistry] = None
         self._mcp_started = False
+        # Incremented whenever MCP servers are started; callers only wait for
+        # subprocess cleanup when it changed during their run
+        self.mcp_start_count = 0
 
     def exists(self, skill_id: str) -> bool:
         """Check if skill exists in registry"""
@@ -155,6 +181,15 @@ class SkillRuntime:
         if self._mcp_started:
             return
 
+        cassette = get_active_cassette()
+        if cassette is not None and cassette.replaying:
+            # Tool results come from the cassette: discover servers, start none
+            if self.mcp_registry is None:
+                self.mcp_registry = MCPRegistry()
+                self.mcp_registry.discover_servers()
+            logger.info("Replaying MCP tool calls from cassette %s", cassette.path)
+            return
+
         # Allow tests or callers to inject a preconfigured registry.
         # When present we still need to ensure servers are running.
         if self.mcp_registry is not None:
@@ -162,6 +197,7 @@ class SkillRuntime:
             try:
                 await self.mcp_registry.start_all_servers()
                 self._mcp_started = True
+                self.mcp_start_count += 1
                 logger.info("MCP servers started on injected registry")
             except Exception as exc:  # pragma: no cover - defensive guard
                 logger.warning(
@@ -178,6 +214,7 @@ class SkillRuntime:
             self.mcp_registry.discover_servers()
             await self.mcp_registry.start_all_servers()
             self._mcp_started = True
+            self.mcp_start_count += 1
             logger.info(f"MCP servers started: {self.mcp_registry.list_running_servers()}")
         except Exception as e:
             logger.warning(
@@ -267,12 +304,13 @@ class SkillRuntime:
                 )
 
             # Async skill
-            if has_mcp_param:
-                logger.debug(f"Invoking async skill '{skill_id}' with MCP")
-                result = await callable_fn(payload, mcp=mcp_runtime)
-            else:
-                logger.debug(f"Invoking async skill '{skill_id}' without MCP")
-                result = await callable_fn(payload)
+            with stage("skill.invoke", {"skill.id": skill_id}):
+                if has_mcp_param:
+                    logger.debug(f"Invoking async skill '{skill_id}' with MCP")
+                    result = await callable_fn(payload, mcp=mcp_runtime)
+                else:
+                    logger.debug(f"Invoking async skill '{skill_id}' without MCP")
+                    result = await callable_fn(payload)
 
             return result  # type: ignore[no-any-return]
 
@@ -311,6 +349,7 @@ class SkillRuntime:
         except RuntimeError:
             # No event loop running, create one
             loop = None
+        mcp_starts = self.mcp_start_count
 
         if loop is not None:
             # We're in an async context, but invoke() is sync
@@ -324,15 +363,19 @@ class SkillRuntime:
             import concurrent.futures
 
             with concurrent.futures.ThreadPoolExecutor() as executor:
+                # Run in a copy of the context so the active cassette is visible
                 future = executor.submit(
-                    asyncio.run, self.invoke_async(skill_id, payload, _auto_cleanup=True)
+                    contextvars.copy_context().run,
+                    asyncio.run,
+                    self.invoke_async(skill_id, payload, _auto_cleanup=True),
                 )
                 try:
                     result = future.result()
                     return result
                 finally:
                     # Give MCP subprocess cleanup time to complete
-                    time.sleep(0.5)
+                    if self.mcp_start_count != mcp_starts:
+                        time.sleep(0.5)
         else:
             # No event loop, create one and run with auto cleanup
             try:
@@ -340,7 +383,8 @@ class SkillRuntime:
                 return result
             finally:
                 # Give MCP subprocess cleanup time to complete
-                time.sleep(0.5)
+                if self.mcp_start_count != mcp_starts:
+                    time.sleep(0.5)
 
 
 class AgentRunner:
@@ -367,6 +411,8 @@ class AgentRunner:
         self.evals = EvalRuntime(registry=self.registry)
         self.router: Router = router or get_router()
         self._task_index: dict[str, list[str]] | None = None
+        self._providers: Dict[str, BaseLLMProvider] = {}
+        self._providers_lock = threading.Lock()
 
         self.durable_enabled = settings.DURABLE_ENABLED
         self.durable_runner: Optional[DurableRunner] = (
@@ -382,6 +428,8 @@ class AgentRunner:
             memory_store if self.memory_enabled else None
         )
         self._memory_lock = asyncio.Lock()
+        # Session memory capture is write-behind; flushed when each execution ends
+        self._memory_writes: Optional[MemoryWriteQueue] = None
 
         self.approvals_enabled = settings.APPROVALS_ENABLED
         self.handoff_enabled = settings.HANDOFF_ENABLED or handoff_tool is not None
@@ -416,6 +464,20 @@ class AgentRunner:
         """Expose durable runner instance when feature flag is enabled."""
         return self.durable_runner
 
+    def get_provider(self, name: str, **kwargs: Any) -> BaseLLMProvider:
+        """
+        Return the runner's provider called ``name``, creating it on first use.
+
+        Providers come from ``magsag.providers.build_provider``, so agents
+        calling them are recorded to and replayed from the run's cassette.
+        ``kwargs`` only apply when the provider is first created.
+        """
+        with self._providers_lock:
+            provider = self._providers.get(name)
+            if provider is None:
+                provider = self._providers[name] = build_provider(name, **kwargs)
+        return provider
+
     @staticmethod
     def _sanitize_for_memory(value: Any) -> Any:
         """Convert arbitrary values into JSON-serializable structures."""
@@ -439,25 +501,8 @@ class AgentRunner:
             if self._memory_store is not None:
                 return self._memory_store
 
-            settings = get_settings()
-            backend = settings.STORAGE_BACKEND.lower()
-
             try:
-                if backend in ("postgres", "postgresql", "timescale", "timescaledb"):
-                    if not settings.STORAGE_DSN:
-                        raise ValueError("STORAGE_DSN must be configured for PostgreSQL memory store")
-                    store: AbstractMemoryStore = PostgresMemoryStore(settings.STORAGE_DSN)
-                else:
-                    db_path = Path(settings.STORAGE_DB_PATH)
-                    memory_db = db_path.parent / "memory.db"
-                    memory_db.parent.mkdir(parents=True, exist_ok=True)
-                    store = SQLiteMemoryStore(
-                        db_path=memory_db,
-                        enable_fts=settings.STORAGE_ENABLE_FTS,
-                    )
-
-                await store.initialize()
-                self._memory_store = store
+                self._memory_store = await create_memory_store(get_settings())
             except Exception as exc:  # pragma: no cover - defensive guard
                 logger.warning("Failed to initialize memory store: %s", exc)
                 self.memory_enabled = False
@@ -465,6 +510,20 @@ class AgentRunner:
 
         return self._memory_store
 
+    async def _ensure_memory_writes(self) -> Optional[MemoryWriteQueue]:
+        """Return the write-behind queue in front of the memory store."""
+        store = await self._ensure_memory_store()
+        if store is None:
+            return None
+        if self._memory_writes is None or self._memory_writes.store is not store:
+            self._memory_writes = MemoryWriteQueue(store)
+        return self._memory_writes
+
+    async def _flush_memory_writes(self) -> None:
+        """Persist buffered session memories before the execution's loop ends."""
+        if self._memory_writes is not None:
+            await self._memory_writes.flush()
+
     async def _capture_session_memory(
         self,
         *,
@@ -475,12 +534,12 @@ class AgentRunner:
         metadata: Optional[Dict[str, Any]] = None,
         tags: Optional[List[str]] = None,
     ) -> None:
-        """Record session-scoped memory entries for auditing and replay."""
+        """Buffer session-scoped memory entries for auditing and replay."""
         if not self.memory_enabled:
             return
 
-        store = await self._ensure_memory_store()
-        if store is None:
+        writes = await self._ensure_memory_writes()
+        if writes is None:
             return
 
         sanitized_value = self._sanitize_for_memory(value)
@@ -498,16 +557,7 @@ class AgentRunner:
             metadata=metadata or {},
         )
 
-        try:
-            await store.create_memory(entry)
-        except Exception as exc:  # pragma: no cover - defensive guard
-            logger.warning(
-                "Failed to persist session memory for %s (%s/%s): %s",
-                agent_slug,
-                run_id,
-                key,
-                exc,
-            )
+        await writes.put(entry)
 
     async def save_memory(
         self,
@@ -558,21 +608,53 @@ class AgentRunner:
         limit: int = 100,
         offset: int = 0,
     ) -> List[MemoryEntry]:
-        """Load memories using the configured memory store."""
+        """Load memories using the configured memory store.
+
+        Session memories still buffered for writing are included.
+        """
         store = await self._ensure_memory_store()
         if store is None:
             return []
 
-        return await store.list_memories(
+        buffered = (
+            self._memory_writes.pending(
+                scope=scope,
+                agent_slug=agent_slug,
+                run_id=run_id,
+                key=key,
+                tags=tags,
+                include_expired=include_expired,
+            )
+            if self._memory_writes is not None
+            else []
+        )
+        if not buffered:
+            return await store.list_memories(
+                scope=scope,
+                agent_slug=agent_slug,
+                run_id=run_id,
+                key=key,
+                tags=tags,
+                include_expired=include_expired,
+                limit=limit,
+                offset=offset,
+            )
+
+        # Merge the newest-first pages of both sources, then apply the window
+        stored = await store.list_memories(
             scope=scope,
             agent_slug=agent_slug,
             run_id=run_id,
             key=key,
             tags=tags,
             include_expired=include_expired,
-            limit=limit,
-            offset=offset,
+            limit=offset + limit,
+            offset=0,
         )
+        buffered_ids = {entry.memory_id for entry in buffered}
+        merged = buffered + [entry for entry in stored if entry.memory_id not in buffered_ids]
+        merged.sort(key=lambda entry: entry.created_at, reverse=True)
+        return merged[offset : offset + limit]
 
     async def search_memories(
         self,
@@ -587,6 +669,9 @@ class AgentRunner:
         if store is None:
             return []
 
+        # Full-text matching happens in the store; write buffered entries first
+        await self._flush_memory_writes()
+
         return await store.search_memories(
             query=query,
             scope=scope,
@@ -600,6 +685,11 @@ class AgentRunner:
         if store is None:
             return False
 
+        if self._memory_writes is not None:
+            if self._memory_writes.discard(memory_id):
+                return True
+            # The entry may be mid-write; let it land before deleting
+            await self._flush_memory_writes()
         return await store.delete_memory(memory_id)
 
     async def handoff(
@@ -953,13 +1043,14 @@ class AgentRunner:
 
             run_fn = self.registry.resolve_entrypoint(exec_ctx.agent.entrypoint)
             t0 = time.time()
-            output: Dict[str, Any] = await run_fn(
-                payload,
-                registry=self.registry,
-                skills=self.skills,
-                runner=self,  # Allow MAG to delegate to SAG
-                obs=exec_ctx.observer,
-            )
+            with stage("agent.execute"):
+                output: Dict[str, Any] = await run_fn(
+                    payload,
+                    registry=self.registry,
+                    skills=self.skills,
+                    runner=self,  # Allow MAG to delegate to SAG
+                    obs=exec_ctx.observer,
+                )
             duration_ms = int((time.time() - t0) * MS_PER_SECOND)
 
             if self.memory_enabled:
@@ -974,8 +1065,28 @@ class AgentRunner:
 
             return output, duration_ms
         finally:
+            await self._flush_memory_writes()
             await self._cleanup_mcp_async()
 
+    def _open_cassette(
+        self,
+        context: Dict[str, Any],
+        observer: ObservabilityLogger,
+    ) -> Optional[Cassette]:
+        """
+        Open the cassette requested via ``cassette_mode``/``cassette_path`` in context.
+
+        Recording defaults to ``cassette.jsonl.gz`` in the run directory.
+        Without a ``cassette_mode`` an enclosing run's cassette stays active.
+        """
+        mode = context.get("cassette_mode")
+        if not mode:
+            return None
+        path = context.get("cassette_path") or observer.run_dir / CASSETTE_FILE_NAME
+        cassette = Cassette(path, mode=mode)
+        observer.log("cassette", {"mode": mode, "path": str(cassette.path)})
+        return cassette
+
     def _execute_mag(
         self,
         exec_ctx: _ExecutionContext,
@@ -1111,10 +1222,37 @@ class AgentRunner:
         context = context or {}
         run_id = context.get("run_id") or f"mag-{uuid.uuid4().hex[:8]}"
         context["run_id"] = run_id
+        started = time.perf_counter()
+        status = "failure"
+        try:
+            with stage(
+                "agent.run",
+                {"agent.kind": "mag", "run_id": run_id},
+                agent=slug,
+                parent=SpanContext.from_mapping(context),
+            ) as run_span:
+                output = self._invoke_mag(slug, payload, context, run_id, run_span)
+            status = "success"
+            return output
+        finally:
+            _record_run("mag", slug, status, time.perf_counter() - started)
+
+    def _invoke_mag(
+        self,
+        slug: str,
+        payload: Dict[str, Any],
+        context: Dict[str, Any],
+        run_id: str,
+        run_span: StageSpan,
+    ) -> Dict[str, Any]:
+        """Run a MAG inside its ``agent.run`` stage (see ``invoke_mag``)."""
         exec_ctx: Optional[_ExecutionContext] = None
 
         try:
-            exec_ctx = self._prepare_execution(slug, run_id, context)
+            with stage("agent.prepare"):
+                exec_ctx = self._prepare_execution(slug, run_id, context)
+            if exec_ctx.llm_plan is not None:
+                run_span.set_labels(provider=exec_ctx.llm_plan.provider)
             obs = exec_ctx.observer
 
             resumed_state: Optional[Dict[str, Any]] = None
@@ -1152,8 +1290,14 @@ class AgentRunner:
             # Check ingress moderation (user input validation)
             _check_moderation_ingress(payload, observer=obs)
 
-            # Execute MAG
-            output, duration_ms = self._execute_mag(exec_ctx, payload)
+            # Execute MAG, recording or replaying provider and MCP calls if requested
+            cassette = self._open_cassette(context, obs)
+            try:
+                with use_cassette(cassette) if cassette is not None else contextlib.nullcontext():
+                    output, duration_ms = self._execute_mag(exec_ctx, payload)
+            finally:
+                if cassette is not None and not cassette.replaying:
+                    cassette.save()
 
             # Check model output moderation (generated content validation)
             # Extract text content from output for moderation
@@ -1173,14 +1317,15 @@ class AgentRunner:
                     "type": "mag",
                 }
                 try:
-                    self._run_async_safely(
-                        self.durable_runner.checkpoint(
-                            run_id=run_id,
-                            step_id="final",
-                            state={"result": output},
-                            metadata=metadata,
+                    with stage("storage.checkpoint"):
+                        self._run_async_safely(
+                            self.durable_runner.checkpoint(
+                                run_id=run_id,
+                                step_id="final",
+                                state={"result": output},
+                                metadata=metadata,
+                            )
                         )
-                    )
                 except Exception as exc:  # pragma: no cover - defensive logging
                     logger.warning("Durable checkpoint failed for run %s: %s", run_id, exc)
 
@@ -1389,9 +1534,10 @@ class AgentRunner:
 
             run_fn = self.registry.resolve_entrypoint(exec_ctx.agent.entrypoint)
             t0 = time.time()
-            output: Dict[str, Any] = await run_fn(
-                delegation.input, skills=self.skills, obs=exec_ctx.observer
-            )
+            with stage("agent.execute"):
+                output: Dict[str, Any] = await run_fn(
+                    delegation.input, skills=self.skills, obs=exec_ctx.observer
+                )
             duration_ms = int((time.time() - t0) * MS_PER_SECOND)
 
             if self.memory_enabled:
@@ -1410,6 +1556,7 @@ class AgentRunner:
 
             return output, duration_ms
         finally:
+            await self._flush_memory_writes()
             await self._cleanup_mcp_async()
 
     def _run_async_safely(self, coro: Coroutine[Any, Any, Any]) -> Any:
@@ -1429,6 +1576,8 @@ class AgentRunner:
         Raises:
             Any exception raised by the coroutine
         """
+        # Only wait for MCP subprocess cleanup if servers were started meanwhile
+        mcp_starts = self.skills.mcp_start_count
         try:
             asyncio.get_running_loop()
             # We're already in an event loop - run in a new thread
@@ -1445,9 +1594,11 @@ class AgentRunner:
                 finally:
                     # Give MCP subprocess cleanup time to complete before thread exits
                     # This prevents "Event loop is closed" errors in BaseSubprocessTransport.__del__
-                    time.sleep(0.5)
+                    if self.skills.mcp_start_count != mcp_starts:
+                        time.sleep(0.5)
 
-            thread = threading.Thread(target=run_in_new_loop)
+            # Run in a copy of the context so the active cassette is visible
+            thread = threading.Thread(target=contextvars.copy_context().run, args=(run_in_new_loop,))
             thread.start()
             thread.join()
 
@@ -1462,7 +1613,8 @@ class AgentRunner:
                 return result
             finally:
                 # Give MCP subprocess cleanup time to complete
-                time.sleep(0.5)
+                if self.skills.mcp_start_count != mcp_starts:
+                    time.sleep(0.5)
 
     def _execute_agent(
         self,
@@ -1593,6 +1745,24 @@ class AgentRunner:
             error=str(last_error),
         )
 
+    @staticmethod
+    def _sag_run_stage(delegation: Delegation, run_id: str) -> StageSpan:
+        """
+        Open the ``agent.run`` stage of a SAG.
+
+        The delegating stage is recorded in ``delegation.context`` first, so
+        the SAG run continues the caller's trace even when the delegation is
+        handed across threads or processes.
+        """
+        if delegation.context is not None:
+            inject_trace_context(delegation.context)
+        return stage(
+            "agent.run",
+            {"agent.kind": "sag", "run_id": run_id, "task_id": delegation.task_id},
+            agent=delegation.sag_id,
+            parent=SpanContext.from_mapping(delegation.context),
+        )
+
     async def invoke_sag_async(self, delegation: Delegation) -> Result:
         """
         Invoke a Sub-Agent (SAG) asynchronously with execution planning and cost tracking.
@@ -1611,11 +1781,28 @@ class AgentRunner:
             Exception: If execution fails (with retry logic applied)
         """
         run_id = f"sag-{uuid.uuid4().hex[:8]}"
+        started = time.perf_counter()
+        status = "failure"
+        try:
+            with self._sag_run_stage(delegation, run_id) as run_span:
+                result = await self._invoke_sag_async(delegation, run_id, run_span)
+            status = result.status
+            return result
+        finally:
+            _record_run("sag", delegation.sag_id, status, time.perf_counter() - started)
+
+    async def _invoke_sag_async(
+        self, delegation: Delegation, run_id: str, run_span: StageSpan
+    ) -> Result:
+        """Run a SAG inside its ``agent.run`` stage (see ``invoke_sag_async``)."""
         exec_ctx: Optional[_ExecutionContext] = None
         context = delegation.context or {}
 
         try:
-            exec_ctx = self._prepare_execution(delegation.sag_id, run_id, context)
+            with stage("agent.prepare"):
+                exec_ctx = self._prepare_execution(delegation.sag_id, run_id, context)
+            if exec_ctx.llm_plan is not None:
+                run_span.set_labels(provider=exec_ctx.llm_plan.provider)
             obs = exec_ctx.observer
 
             obs.log(
@@ -1639,7 +1826,8 @@ class AgentRunner:
             for attempt in range(max_attempts):
                 try:
                     # Run pre-evaluation checks
-                    self._run_pre_evaluations(exec_ctx, delegation, context)
+                    with stage("agent.pre_eval"):
+                        self._run_pre_evaluations(exec_ctx, delegation, context)
 
                     # Execute agent asynchronously in same event loop
                     output, duration_ms = await self._execute_agent_async(exec_ctx, delegation)
@@ -1650,7 +1838,8 @@ class AgentRunner:
                         _check_moderation_model_output(output_text, observer=obs)
 
                     # Run post-evaluation checks
-                    self._run_post_evaluations(exec_ctx, delegation, output, context)
+                    with stage("agent.post_eval"):
+                        self._run_post_evaluations(exec_ctx, delegation, output, context)
 
                     # Record metrics and cost
                     obs.metric("duration_ms", duration_ms)
@@ -1730,11 +1919,26 @@ class AgentRunner:
             Exception: If execution fails (with retry logic applied)
         """
         run_id = f"sag-{uuid.uuid4().hex[:8]}"
+        started = time.perf_counter()
+        status = "failure"
+        try:
+            with self._sag_run_stage(delegation, run_id) as run_span:
+                result = self._invoke_sag(delegation, run_id, run_span)
+            status = result.status
+            return result
+        finally:
+            _record_run("sag", delegation.sag_id, status, time.perf_counter() - started)
+
+    def _invoke_sag(self, delegation: Delegation, run_id: str, run_span: StageSpan) -> Result:
+        """Run a SAG inside its ``agent.run`` stage (see ``invoke_sag``)."""
         exec_ctx: Optional[_ExecutionContext] = None
         context = delegation.context or {}
 
         try:
-            exec_ctx = self._prepare_execution(delegation.sag_id, run_id, context)
+            with stage("agent.prepare"):
+                exec_ctx = self._prepare_execution(delegation.sag_id, run_id, context)
+            if exec_ctx.llm_plan is not None:
+                run_span.set_labels(provider=exec_ctx.llm_plan.provider)
             obs = exec_ctx.observer
 
             obs.log(
@@ -1758,7 +1962,8 @@ class AgentRunner:
             for attempt in range(max_attempts):
                 try:
                     # Run pre-evaluation checks
-                    self._run_pre_evaluations(exec_ctx, delegation, context)
+                    with stage("agent.pre_eval"):
+                        self._run_pre_evaluations(exec_ctx, delegation, context)
 
                     # Execute agent
                     output, duration_ms = self._execute_agent(exec_ctx, delegation)
@@ -1769,7 +1974,8 @@ class AgentRunner:
                         _check_moderation_model_output(output_text, observer=obs)
 
                     # Run post-evaluation checks
-                    self._run_post_evaluations(exec_ctx, delegation, output, context)
+                    with stage("agent.post_eval"):
+                        self._run_post_evaluations(exec_ctx, delegation, output, context)
 
                     # Record metrics and cost
                     obs.metric("duration_ms", duration_ms)
@@ -1838,9 +2044,9 @@ _runner: Optional[AgentRunner] = None
 
 
 def get_runner(base_dir: Optional[Path] = None) -> AgentRunner:
-    """Get or create the global runner instance"""
+    """Get or create the global runner instance (reused while base_dir matches)"""
     global _runner
-    if _runner is None or base_dir is not None:
+    if _runner is None or (base_dir is not None and _runner.base_dir != Path(base_dir)):
         _runner = AgentRunner(base_dir=base_dir)
     return _runner
 
@@ -1917,7 +2123,8 @@ def _check_moderation_ingress(
     try:
         from magsag.moderation import hooks
 
-        result = hooks.check_ingress(payload)
+        with stage("agent.moderation", {"moderation.hook": "ingress"}):
+            result = hooks.check_ingress(payload)
 
         # Log moderation.checked event
         if observer:
@@ -1967,7 +2174,8 @@ def _check_moderation_model_output(
     try:
         from magsag.moderation import hooks
 
-        result = hooks.check_model_output(text)
+        with stage("agent.moderation", {"moderation.hook": "model_output"}):
+            result = hooks.check_model_output(text)
 
         # Log moderation.checked event
         if observer:
@@ -2017,7 +2225,8 @@ def _check_moderation_egress(
     try:
         from magsag.moderation import hooks
 
-        result = hooks.check_egress(artifact)
+        with stage("agent.moderation", {"moderation.hook": "egress"}):
+            result = hooks.check_egress(artifact)
 
         # Log moderation.checked event
         if observer:
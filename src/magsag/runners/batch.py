@@ -0,0 +1,237 @@
+"""
+Bulk MAG execution over JSONL inputs.
+
+Runs many payloads on one warm :class:`AgentRunner` with bounded concurrency.
+Inputs are consumed lazily and results are yielded in input order as soon as
+every earlier item has finished; a failing item is reported as a failed
+result instead of aborting the batch.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import json
+import logging
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from magsag.runners.agent_runner import AgentRunner
+
+logger = logging.getLogger(__name__)
+
+# Finished results buffered per worker while an earlier item is still running
+READ_AHEAD_PER_WORKER = 4
+
+
+@dataclass(slots=True)
+class BatchItem:
+    """One input of a batch."""
+
+    index: int
+    agent: str
+    payload: dict[str, Any]
+    id: str | None = None
+
+
+@dataclass(slots=True)
+class BatchResult:
+    """Outcome of one batch item."""
+
+    index: int
+    status: str  # "completed" or "failed"
+    agent: str | None = None
+    id: str | None = None
+    run_id: str | None = None
+    output: dict[str, Any] | None = None
+    error: str | None = None
+    duration_ms: int = 0
+    context: dict[str, Any] = field(default_factory=dict, repr=False)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize for JSONL output (omits unset fields)."""
+        data: dict[str, Any] = {"index": self.index, "status": self.status}
+        for name in ("id", "agent", "run_id", "output", "error"):
+            value = getattr(self, name)
+            if value is not None:
+                data[name] = value
+        data["duration_ms"] = self.duration_ms
+        return data
+
+
+def parse_batch_line(
+    index: int,
+    line: str,
+    default_agent: str | None = None,
+) -> BatchItem | BatchResult:
+    """
+    Parse one JSONL input line.
+
+    Lines are objects with ``payload`` and optional ``agent`` and ``id``
+    fields. When ``default_agent`` is given, a line without ``payload`` is
+    taken as the payload itself.
+
+    Returns:
+        The item, or a failed result describing why the line is invalid
+    """
+    try:
+        data = json.loads(line)
+    except json.JSONDecodeError as e:
+        return BatchResult(index=index, status="failed", error=f"Invalid JSON: {e}")
+    if not isinstance(data, dict):
+        return BatchResult(index=index, status="failed", error="Input line must be a JSON object")
+
+    item_id = data.get("id") if "payload" in data else None
+    if item_id is not None:
+        item_id = str(item_id)
+    if "payload" in data:
+        payload = data["payload"]
+        agent = data.get("agent") or default_agent
+    else:
+        payload = data
+        agent = default_agent
+    if not agent:
+        return BatchResult(
+            index=index, status="failed", id=item_id, error="No agent given for input"
+        )
+    if not isinstance(payload, dict):
+        return BatchResult(
+            index=index, status="failed", id=item_id, agent=agent, error="payload must be an object"
+        )
+    return BatchItem(index=index, agent=agent, payload=payload, id=item_id)
+
+
+def read_batch_lines(
+    lines: Iterable[str],
+    default_agent: str | None = None,
+) -> Iterator[BatchItem | BatchResult]:
+    """Lazily parse JSONL lines, skipping blank ones."""
+    index = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        yield parse_batch_line(index, line, default_agent)
+        index += 1
+
+
+def _run_item(
+    runner: AgentRunner,
+    item: BatchItem,
+    base_context: dict[str, Any] | None,
+) -> BatchResult:
+    context: dict[str, Any] = dict(base_context or {})
+    started = time.perf_counter()
+    try:
+        output = runner.invoke_mag(item.agent, item.payload, context=context)
+    except Exception as e:  # noqa: BLE001 - failures are reported per item
+        logger.warning("Batch item %d (%s) failed: %s", item.index, item.agent, e)
+        return BatchResult(
+            index=item.index,
+            status="failed",
+            agent=item.agent,
+            id=item.id,
+            run_id=context.get("run_id"),
+            error=f"{type(e).__name__}: {e}",
+            duration_ms=int((time.perf_counter() - started) * 1000),
+        )
+    return BatchResult(
+        index=item.index,
+        status="completed",
+        agent=item.agent,
+        id=item.id,
+        run_id=context.get("run_id"),
+        output=output,
+        duration_ms=int((time.perf_counter() - started) * 1000),
+    )
+
+
+async def run_batch(
+    runner: AgentRunner,
+    items: Iterable[BatchItem | BatchResult],
+    concurrency: int = 4,
+    context: dict[str, Any] | None = None,
+    before_item: Callable[[BatchItem], Awaitable[None]] | None = None,
+) -> AsyncIterator[BatchResult]:
+    """
+    Run batch items on one runner and yield their results in input order.
+
+    At most ``concurrency`` items execute at once (``invoke_mag`` blocks, so
+    each runs in a worker thread). Items are pulled from ``items`` only while
+    fewer than ``concurrency * READ_AHEAD_PER_WORKER`` results are pending.
+
+    Args:
+        runner: Warm runner shared by all items
+        items: Parsed inputs (failed parse results are passed through)
+        concurrency: Maximum concurrently executing items
+        context: Base execution context copied for every item
+        before_item: Awaited once a worker is free, just before an item starts
+            (e.g. to charge a rate limit); if it raises, the item fails
+
+    Yields:
+        One result per input item, in input order
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+    window: deque[asyncio.Future[BatchResult]] = deque()
+    max_window = concurrency * READ_AHEAD_PER_WORKER
+
+    # Not a context manager: its exit waits for running items, which would block
+    # the event loop when the consumer closes the generator early
+    executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="magsag-batch")
+    closed = False
+
+    async def execute(item: BatchItem) -> BatchResult:
+        async with semaphore:
+            if closed:
+                raise asyncio.CancelledError
+            if before_item is not None:
+                try:
+                    await before_item(item)
+                except Exception as e:  # noqa: BLE001 - failures are reported per item
+                    return BatchResult(
+                        index=item.index,
+                        status="failed",
+                        agent=item.agent,
+                        id=item.id,
+                        error=f"{type(e).__name__}: {e}",
+                    )
+                if closed:
+                    raise asyncio.CancelledError
+            # Copy the context so an active cassette reaches the worker thread
+            ctx = contextvars.copy_context()
+            return await loop.run_in_executor(executor, ctx.run, _run_item, runner, item, context)
+
+    try:
+        for entry in items:
+            if isinstance(entry, BatchResult):
+                done: asyncio.Future[BatchResult] = loop.create_future()
+                done.set_result(entry)
+                window.append(done)
+            else:
+                window.append(asyncio.ensure_future(execute(entry)))
+            while window and (len(window) >= max_window or window[0].done()):
+                yield await window.popleft()
+        while window:
+            yield await window.popleft()
+    finally:
+        # Items already running finish in their threads; nothing new is started
+        closed = True
+        for pending in window:
+            pending.cancel()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+__all__ = [
+    "BatchItem",
+    "BatchResult",
+    "parse_batch_line",
+    "read_batch_lines",
+    "run_batch",
+]
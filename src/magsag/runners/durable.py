@@ -10,17 +10,35 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any, Dict, Optional, cast
 
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows has no flock
+    fcntl = None  # type: ignore[assignment]
+
 from magsag.storage.base import StorageBackend
 from magsag.storage.models import RunSnapshotRecord
 from magsag.storage.serialization import json_safe
+from magsag.storage.snapshot_codec import (
+    apply_delta,
+    decode_payload,
+    diff_state,
+    encode_payload,
+)
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_SNAPSHOTS_DIR = Path(".magsag/snapshots")
+MANIFEST_NAME = "manifest.jsonl"
+MANIFEST_LOCK_NAME = "manifest.lock"
+
 
 @dataclass
 class RunSnapshot:
@@ -61,25 +79,78 @@ class RunSnapshot:
         )
 
 
+@dataclass
+class _ManifestCache:
+    """Manifest entries of one run and how far the file has been read."""
+
+    entries: list[Dict[str, Any]] = field(default_factory=list)
+    offset: int = 0
+    mtime_ns: int = 0
+    inode: int = 0
+
+
+@contextmanager
+def _exclusive_file_lock(path: Path) -> Iterator[None]:
+    """Hold an exclusive ``flock`` on ``path`` (a no-op where flock is unavailable)."""
+    if fcntl is None:  # pragma: no cover - Windows
+        yield
+        return
+    with open(path, "a") as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
 class SnapshotStore:
     """
     Storage backend for run snapshots.
 
     Provides methods to save and retrieve snapshots with idempotent writes.
+
+    The file-based fallback stores each checkpoint as a compressed binary
+    delta against the previous one, with a full snapshot every
+    ``full_snapshot_every`` checkpoints. A per-run append-only manifest
+    (``manifest.jsonl``) lists checkpoints in order, so the latest one is
+    found without scanning the directory; a state is rebuilt from the
+    nearest full snapshot plus the deltas after it.
+
+    Several stores (or processes) may share a snapshot directory: the
+    manifest is re-read from where it was last read whenever its size or
+    mtime changes, and checkpoint numbers are allocated from the manifest
+    under an exclusive ``flock`` on ``manifest.lock``.
     """
 
-    def __init__(self, storage_backend: Optional[StorageBackend] = None):
+    def __init__(
+        self,
+        storage_backend: Optional[StorageBackend] = None,
+        snapshots_dir: Path | str = DEFAULT_SNAPSHOTS_DIR,
+        full_snapshot_every: int = 10,
+    ):
         """
         Initialize snapshot store.
 
         Args:
             storage_backend: Optional persistent storage backend
                             (uses file-based storage if None)
+            snapshots_dir: Root directory of the file-based storage
+            full_snapshot_every: Checkpoints per full snapshot in file-based
+                            storage (1 disables deltas)
         """
+        if full_snapshot_every < 1:
+            raise ValueError("full_snapshot_every must be at least 1")
         self.storage_backend = storage_backend
+        self.snapshots_dir = Path(snapshots_dir)
+        self.full_snapshot_every = full_snapshot_every
         self._snapshots: Dict[str, RunSnapshot] = {}  # In-memory cache
         self._initialized_runs: set[str] = set()
         self._run_init_lock = asyncio.Lock()
+        # File-based storage: manifest entries read so far and, per run, the
+        # (seq, checkpoints since full, state) this store last wrote
+        self._file_lock = threading.Lock()
+        self._manifests: Dict[str, _ManifestCache] = {}
+        self._file_heads: Dict[str, tuple[int, int, Dict[str, Any]]] = {}
 
     async def save_snapshot(
         self,
@@ -233,6 +304,9 @@ class SnapshotStore:
 
         for key in keys_to_delete:
             del self._snapshots[key]
+        with self._file_lock:
+            self._manifests.pop(run_id, None)
+            self._file_heads.pop(run_id, None)
 
         memory_deleted = len(keys_to_delete)
         if await self._ensure_backend():
@@ -418,62 +492,160 @@ class SnapshotStore:
 
     async def _save_to_file(self, snapshot: RunSnapshot) -> None:
         """Save snapshot to file (fallback when no backend available)."""
-        snapshots_dir = Path(".magsag/snapshots") / snapshot.run_id
-        snapshots_dir.mkdir(parents=True, exist_ok=True)
-
-        snapshot_file = snapshots_dir / f"{snapshot.step_id}.json"
-
         # Run in executor to avoid blocking
         loop = asyncio.get_event_loop()
-        await loop.run_in_executor(
-            None, self._write_snapshot_file, snapshot_file, snapshot
-        )
+        await loop.run_in_executor(None, self._write_checkpoint, snapshot)
+
+    def _write_checkpoint(self, snapshot: RunSnapshot) -> None:
+        """Blocking checkpoint write for executor: payload file, then manifest line."""
+        run_dir = self.snapshots_dir / snapshot.run_id
+        state = cast(Dict[str, Any], json_safe(snapshot.state))
+        payload = cast(Dict[str, Any], json_safe(snapshot.to_dict()))
+        del payload["state"]
+
+        run_dir.mkdir(parents=True, exist_ok=True)
+        with self._file_lock, _exclusive_file_lock(run_dir / MANIFEST_LOCK_NAME):
+            # Other writers may have appended since this store last looked
+            entries = self._manifest_locked(snapshot.run_id)
+            seq = entries[-1]["seq"] + 1 if entries else 0
+            head = self._file_heads.get(snapshot.run_id)
+            if (
+                head is not None
+                and entries
+                and head[0] == entries[-1]["seq"]
+                and head[1] < self.full_snapshot_every
+            ):
+                kind = "delta"
+                payload["delta"] = diff_state(head[2], state)
+                since_full = head[1] + 1
+            else:
+                # First checkpoint, or the latest one was written elsewhere
+                kind = "full"
+                payload["state"] = state
+                since_full = 1
+
+            entry = {"seq": seq, "step_id": snapshot.step_id, "kind": kind}
+            (run_dir / self._checkpoint_file(entry)).write_bytes(encode_payload(payload))
+            with open(run_dir / MANIFEST_NAME, "a") as f:
+                f.write(json.dumps(entry) + "\n")
 
-    def _write_snapshot_file(self, path: Path, snapshot: RunSnapshot) -> None:
-        """Blocking file write for executor."""
-        with open(path, "w") as f:
-            json.dump(snapshot.to_dict(), f, indent=2)
+            self._manifest_locked(snapshot.run_id)
+            # json_safe copied every container, so later caller mutations
+            # cannot leak into the base of the next delta
+            self._file_heads[snapshot.run_id] = (seq, since_full, state)
 
     async def _load_latest_from_file(self, run_id: str) -> Optional[RunSnapshot]:
         """Load latest snapshot from file (fallback)."""
-        snapshots_dir = Path(".magsag/snapshots") / run_id
-
-        if not snapshots_dir.exists():
-            return None
-
-        # Find all snapshot files
-        snapshot_files = list(snapshots_dir.glob("*.json"))
-        if not snapshot_files:
-            return None
-
-        # Sort by modification time (latest first)
-        latest_file = max(snapshot_files, key=lambda f: f.stat().st_mtime)
-
-        # Load snapshot
         loop = asyncio.get_event_loop()
-        snapshot_data = await loop.run_in_executor(None, self._read_snapshot_file, latest_file)
-
-        if snapshot_data:
-            return RunSnapshot.from_dict(snapshot_data)
-
-        return None
+        return await loop.run_in_executor(None, self._read_checkpoint, run_id, None)
 
     async def _load_snapshot_from_file(
         self, run_id: str, step_id: str
     ) -> Optional[RunSnapshot]:
         """Load specific snapshot from file (fallback)."""
-        snapshot_file = Path(".magsag/snapshots") / run_id / f"{step_id}.json"
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, self._read_checkpoint, run_id, step_id)
 
-        if not snapshot_file.exists():
+    def _read_checkpoint(
+        self, run_id: str, step_id: Optional[str]
+    ) -> Optional[RunSnapshot]:
+        """Blocking read for executor: latest (or last saved ``step_id``) checkpoint."""
+        run_dir = self.snapshots_dir / run_id
+        with self._file_lock:
+            entries = list(self._manifest_locked(run_id))
+
+        if not entries:
+            return self._read_legacy_snapshot(run_dir, step_id)
+
+        target = len(entries) - 1
+        if step_id is not None:
+            while target >= 0 and entries[target]["step_id"] != step_id:
+                target -= 1
+            if target < 0:
+                return None
+
+        # Rebuild from the nearest full snapshot plus the deltas after it
+        start = target
+        while start > 0 and entries[start]["kind"] != "full":
+            start -= 1
+        try:
+            payload: Dict[str, Any] = {}
+            state: Dict[str, Any] = {}
+            for entry in entries[start : target + 1]:
+                payload = decode_payload((run_dir / self._checkpoint_file(entry)).read_bytes())
+                if entry["kind"] == "full":
+                    state = payload["state"]
+                else:
+                    state = apply_delta(state, payload["delta"])
+        except (OSError, ValueError, KeyError, ImportError) as e:
+            logger.error(f"Failed to read snapshot {target} of run {run_id}: {e}")
             return None
 
-        # Load snapshot
-        loop = asyncio.get_event_loop()
-        snapshot_data = await loop.run_in_executor(None, self._read_snapshot_file, snapshot_file)
+        payload["state"] = state
+        return RunSnapshot.from_dict(payload)
 
+    def _manifest_locked(self, run_id: str) -> list[Dict[str, Any]]:
+        """
+        Manifest entries of a run (caller holds ``_file_lock``).
+
+        Only lines appended since the last call are read; the whole manifest
+        is re-read if it was replaced or rewritten in place.
+        """
+        manifest = self.snapshots_dir / run_id / MANIFEST_NAME
+        cache = self._manifests.get(run_id)
+        try:
+            stat = manifest.stat()
+        except FileNotFoundError:
+            if cache is None or cache.offset:
+                cache = self._manifests[run_id] = _ManifestCache()
+            return cache.entries
+
+        if (
+            cache is None
+            or stat.st_ino != cache.inode
+            or stat.st_size < cache.offset
+            or (stat.st_size == cache.offset and stat.st_mtime_ns != cache.mtime_ns)
+        ):
+            cache = self._manifests[run_id] = _ManifestCache(inode=stat.st_ino)
+        if stat.st_size == cache.offset:
+            return cache.entries
+
+        with open(manifest, "rb") as f:
+            f.seek(cache.offset)
+            data = f.read()
+        # A line without its newline is still being written; read it next time
+        complete = data[: data.rfind(b"\n") + 1]
+        for line in complete.splitlines():
+            try:
+                cache.entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                # Torn line of an interrupted write
+                logger.warning(f"Skipping corrupt manifest line in {manifest}")
+        cache.offset += len(complete)
+        cache.mtime_ns = stat.st_mtime_ns
+        return cache.entries
+
+    @staticmethod
+    def _checkpoint_file(entry: Dict[str, Any]) -> str:
+        return f"{entry['seq']:08d}.{entry['kind']}"
+
+    def _read_legacy_snapshot(
+        self, run_dir: Path, step_id: Optional[str]
+    ) -> Optional[RunSnapshot]:
+        """Read a ``<step_id>.json`` snapshot written before manifests existed."""
+        if step_id is not None:
+            snapshot_file = run_dir / f"{step_id}.json"
+            if not snapshot_file.exists():
+                return None
+        else:
+            snapshot_files = list(run_dir.glob("*.json")) if run_dir.exists() else []
+            if not snapshot_files:
+                return None
+            snapshot_file = max(snapshot_files, key=lambda f: f.stat().st_mtime)
+
+        snapshot_data = self._read_snapshot_file(snapshot_file)
         if snapshot_data:
             return RunSnapshot.from_dict(snapshot_data)
-
         return None
 
     def _read_snapshot_file(self, path: Path) -> Optional[Dict[str, Any]]:
@@ -10,6 +10,7 @@ from magsag.storage.base import StorageBackend, StorageCapabilities
 from magsag.storage.backends import PostgresStorageBackend, SQLiteStorageBackend
 from magsag.storage.factory import (
     close_storage_backend,
+    create_memory_store,
     create_storage_backend,
     get_storage_backend,
 )
@@ -33,6 +34,7 @@ __all__ = [
     "DelegationEvent",
     "MetricEvent",
     "ArtifactEvent",
+    "create_memory_store",
     "create_storage_backend",
     "get_storage_backend",
     "close_storage_backend",
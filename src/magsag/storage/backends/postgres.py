@@ -7,6 +7,8 @@ JSONB payloads and full-text search via PostgreSQL's tsvector functions.
 
 from __future__ import annotations
 
+import asyncio
+import json
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 from typing import (
@@ -18,11 +20,16 @@ from typing import (
     List,
     Mapping,
     Optional,
+    Tuple,
     TypeAlias,
 )
 
 from magsag.storage.base import StorageBackend, StorageCapabilities
-from magsag.storage.models import ApprovalTicketRecord, RunSnapshotRecord
+from magsag.storage.models import (
+    ApprovalTicketRecord,
+    IdempotencyRecord,
+    RunSnapshotRecord,
+)
 from magsag.storage.serialization import json_safe
 
 try:  # pragma: no cover - optional dependency
@@ -41,6 +48,8 @@ else:  # pragma: no cover - runtime fallback
 
 RunRow: TypeAlias = Record
 
+APPROVAL_CHANNEL = "magsag_approvals"
+
 
 class PostgresStorageBackend(StorageBackend):
     """PostgreSQL implementation of the MAGSAG storage backend."""
@@ -79,6 +88,8 @@ class PostgresStorageBackend(StorageBackend):
             archive_artifacts=False,
             lifecycle_policy=False,
             streaming=True,
+            idempotency=True,
+            approval_notifications=True,
         )
 
     async def initialize(self) -> None:
@@ -267,6 +278,28 @@ class PostgresStorageBackend(StorageBackend):
                 """
             )
 
+            # Idempotency keys shared by API workers
+            await conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS idempotency_keys (
+                    key TEXT PRIMARY KEY,
+                    state TEXT NOT NULL CHECK (state IN ('pending', 'completed')),
+                    owner TEXT NOT NULL,
+                    request_hash TEXT,
+                    status_code INTEGER,
+                    headers JSONB,
+                    body BYTEA,
+                    expires_at TIMESTAMPTZ NOT NULL
+                )
+                """
+            )
+            await conn.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_idempotency_expires
+                    ON idempotency_keys (expires_at)
+                """
+            )
+
     async def close(self) -> None:
         """Terminate pool connections."""
         if self._pool is not None:
@@ -581,9 +614,37 @@ class PostgresStorageBackend(StorageBackend):
             )
 
     async def update_approval_ticket(self, record: ApprovalTicketRecord) -> None:
-        """Update an existing approval ticket."""
+        """Update an existing approval ticket and notify listeners."""
         await self.create_approval_ticket(record)
 
+        payload = json.dumps({"ticket_id": record.ticket_id, "status": record.status})
+        async with self._acquire() as conn:
+            await conn.execute("SELECT pg_notify($1, $2)", APPROVAL_CHANNEL, payload)
+
+    async def watch_approval_changes(
+        self,
+        poll_interval: float = 0.25,
+    ) -> AsyncIterator[Tuple[str, str]]:
+        """Stream approval changes via LISTEN on a dedicated connection."""
+        queue: asyncio.Queue[str] = asyncio.Queue()
+
+        def _on_notify(_conn: Any, _pid: int, _channel: str, payload: str) -> None:
+            queue.put_nowait(payload)
+
+        conn = await asyncpg.connect(dsn=self.dsn)
+        try:
+            await conn.add_listener(APPROVAL_CHANNEL, _on_notify)
+            while True:
+                payload = await queue.get()
+                try:
+                    change = json.loads(payload)
+                    ticket_id, status = str(change["ticket_id"]), str(change["status"])
+                except (ValueError, KeyError, TypeError):
+                    continue
+                yield ticket_id, status
+        finally:
+            await conn.close()
+
     async def get_approval_ticket(self, ticket_id: str) -> Optional[ApprovalTicketRecord]:
         """Fetch approval ticket by ID."""
         async with self._acquire() as conn:
@@ -716,6 +777,116 @@ class PostgresStorageBackend(StorageBackend):
             )
         return len(rows)
 
+    async def claim_idempotency_key(
+        self,
+        key: str,
+        owner: str,
+        lease_expires_at: datetime,
+    ) -> str:
+        """Claim an idempotency key; expired rows are taken over atomically."""
+        async with self._acquire() as conn:
+            row = await conn.fetchrow(
+                """
+                INSERT INTO idempotency_keys (key, state, owner, expires_at)
+                VALUES ($1, 'pending', $2, $3)
+                ON CONFLICT (key) DO UPDATE SET
+                    state = 'pending',
+                    owner = EXCLUDED.owner,
+                    request_hash = NULL,
+                    status_code = NULL,
+                    headers = NULL,
+                    body = NULL,
+                    expires_at = EXCLUDED.expires_at
+                WHERE idempotency_keys.expires_at <= now()
+                RETURNING owner
+                """,
+                key,
+                owner,
+                lease_expires_at,
+            )
+            if row is not None:
+                return "claimed"
+            state = await conn.fetchval(
+                "SELECT state FROM idempotency_keys WHERE key = $1",
+                key,
+            )
+        # A missing row means it was purged between statements; caller retries
+        return str(state) if state is not None else "pending"
+
+    async def complete_idempotency_key(self, record: IdempotencyRecord, owner: str) -> None:
+        headers = [
+            [name.decode("latin-1"), value.decode("latin-1")] for name, value in record.headers
+        ]
+        async with self._acquire() as conn:
+            await conn.execute(
+                """
+                UPDATE idempotency_keys
+                SET state = 'completed',
+                    request_hash = $3,
+                    status_code = $4,
+                    headers = $5,
+                    body = $6,
+                    expires_at = $7
+                WHERE key = $1 AND owner = $2
+                """,
+                record.key,
+                owner,
+                record.request_hash,
+                record.status_code,
+                headers,
+                record.body,
+                record.expires_at,
+            )
+
+    async def release_idempotency_key(self, key: str, owner: str) -> None:
+        async with self._acquire() as conn:
+            await conn.execute(
+                """
+                DELETE FROM idempotency_keys
+                WHERE key = $1 AND owner = $2 AND state = 'pending'
+                """,
+                key,
+                owner,
+            )
+
+    async def get_idempotency_record(self, key: str) -> Optional[IdempotencyRecord]:
+        async with self._acquire() as conn:
+            row = await conn.fetchrow(
+                """
+                SELECT * FROM idempotency_keys
+                WHERE key = $1 AND state = 'completed' AND expires_at > now()
+                """,
+                key,
+            )
+        if row is None:
+            return None
+        headers = row["headers"] if isinstance(row.get("headers"), list) else []
+        return IdempotencyRecord(
+            key=row["key"],
+            request_hash=row["request_hash"],
+            status_code=row["status_code"],
+            headers=[(name.encode("latin-1"), value.encode("latin-1")) for name, value in headers],
+            body=bytes(row["body"] or b""),
+            expires_at=row["expires_at"],
+        )
+
+    async def purge_expired_idempotency_keys(self, limit: int = 1000) -> int:
+        async with self._acquire() as conn:
+            rows = await conn.fetch(
+                """
+                DELETE FROM idempotency_keys
+                WHERE key IN (
+                    SELECT key FROM idempotency_keys
+                    WHERE expires_at <= now()
+                    LIMIT $1
+                    FOR UPDATE SKIP LOCKED
+                )
+                RETURNING 1
+                """,
+                limit,
+            )
+        return len(rows)
+
     def get_events(
         self,
         run_id: str,
@@ -14,10 +14,14 @@ import json
 import sqlite3
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, AsyncIterator, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 from magsag.storage.base import StorageBackend, StorageCapabilities
-from magsag.storage.models import ApprovalTicketRecord, RunSnapshotRecord
+from magsag.storage.models import (
+    ApprovalTicketRecord,
+    IdempotencyRecord,
+    RunSnapshotRecord,
+)
 from magsag.storage.serialization import json_safe
 
 
@@ -65,6 +69,8 @@ class SQLiteStorageBackend(StorageBackend):
             archive_artifacts=False,
             lifecycle_policy=False,
             streaming=True,
+            idempotency=True,
+            approval_notifications=True,
         )
 
     async def initialize(self) -> None:
@@ -99,6 +105,7 @@ class SQLiteStorageBackend(StorageBackend):
             raise RuntimeError("SQLite connection has not been initialized")
         conn.execute("PRAGMA foreign_keys = ON")
         conn.execute("PRAGMA journal_mode = WAL")  # Write-Ahead Logging
+        conn.execute("PRAGMA busy_timeout = 5000")  # Wait on writers in other processes
 
     async def _create_schema(self) -> None:
         """Create database tables and indexes (async to avoid blocking event loop)"""
@@ -276,6 +283,18 @@ class SQLiteStorageBackend(StorageBackend):
             "CREATE INDEX IF NOT EXISTS idx_snapshots_run ON snapshots(run_id, created_at DESC)"
         )
 
+        # Change sequence for cross-process approval notifications
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS approval_changes (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                ticket_id TEXT NOT NULL,
+                status TEXT NOT NULL,
+                changed_at TEXT NOT NULL
+            )
+            """
+        )
+
         for ddl in (
             "ALTER TABLE snapshots ADD COLUMN metadata TEXT NOT NULL DEFAULT '{}'",
         ):
@@ -307,6 +326,25 @@ class SQLiteStorageBackend(StorageBackend):
             "CREATE INDEX IF NOT EXISTS idx_memory_key ON memory_entries(agent_slug, key, created_at DESC)"
         )
 
+        # Idempotency keys shared by API workers
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS idempotency_keys (
+                key TEXT PRIMARY KEY,
+                state TEXT NOT NULL CHECK (state IN ('pending', 'completed')),
+                owner TEXT NOT NULL,
+                request_hash TEXT,
+                status_code INTEGER,
+                headers TEXT,
+                body BLOB,
+                expires_at TEXT NOT NULL
+            )
+            """
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_idempotency_expires ON idempotency_keys(expires_at)"
+        )
+
         conn.commit()
 
     async def close(self) -> None:
@@ -666,9 +704,53 @@ class SQLiteStorageBackend(StorageBackend):
         )
 
     async def update_approval_ticket(self, record: ApprovalTicketRecord) -> None:
-        """Update an existing approval ticket."""
+        """Update an existing approval ticket and record the change for watchers."""
         await self.create_approval_ticket(record)
 
+        conn = self._conn
+        if conn is None:
+            raise RuntimeError("SQLite connection has not been initialized")
+        conn.execute(
+            "INSERT INTO approval_changes (ticket_id, status, changed_at) VALUES (?, ?, ?)",
+            (
+                record.ticket_id,
+                record.status,
+                datetime.now(timezone.utc).isoformat(),
+            ),
+        )
+
+    async def watch_approval_changes(
+        self,
+        poll_interval: float = 0.25,
+        retention: timedelta = timedelta(hours=1),
+    ) -> AsyncIterator[Tuple[str, str]]:
+        """Poll the approval change sequence (one indexed query per interval)."""
+        conn = self._conn
+        if conn is None:
+            raise RuntimeError("SQLite connection has not been initialized")
+
+        row = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM approval_changes").fetchone()
+        last_seq = int(row[0])
+        last_prune = datetime.now(timezone.utc)
+
+        while True:
+            await asyncio.sleep(poll_interval)
+            rows = conn.execute(
+                "SELECT seq, ticket_id, status FROM approval_changes WHERE seq > ? ORDER BY seq",
+                (last_seq,),
+            ).fetchall()
+            for change in rows:
+                last_seq = change["seq"]
+                yield change["ticket_id"], change["status"]
+
+            now = datetime.now(timezone.utc)
+            if now - last_prune >= timedelta(minutes=1):
+                conn.execute(
+                    "DELETE FROM approval_changes WHERE changed_at < ?",
+                    ((now - retention).isoformat(),),
+                )
+                last_prune = now
+
     async def get_approval_ticket(self, ticket_id: str) -> Optional[ApprovalTicketRecord]:
         """Retrieve an approval ticket by ID."""
         conn = self._conn
@@ -825,6 +907,133 @@ class SQLiteStorageBackend(StorageBackend):
         )
         return cursor.rowcount if cursor.rowcount is not None else 0
 
+    @staticmethod
+    def _idempotency_ts(value: datetime) -> str:
+        """Fixed-width UTC timestamp so expiry comparisons can use TEXT ordering."""
+        return value.astimezone(timezone.utc).isoformat(timespec="microseconds")
+
+    async def claim_idempotency_key(
+        self,
+        key: str,
+        owner: str,
+        lease_expires_at: datetime,
+    ) -> str:
+        """Claim an idempotency key; expired rows are taken over atomically."""
+        conn = self._conn
+        if conn is None:
+            raise RuntimeError("SQLite connection has not been initialized")
+
+        now = self._idempotency_ts(datetime.now(timezone.utc))
+        cursor = conn.execute(
+            """
+            INSERT INTO idempotency_keys (key, state, owner, expires_at)
+            VALUES (?, 'pending', ?, ?)
+            ON CONFLICT(key) DO UPDATE SET
+                state='pending',
+                owner=excluded.owner,
+                request_hash=NULL,
+                status_code=NULL,
+                headers=NULL,
+                body=NULL,
+                expires_at=excluded.expires_at
+            WHERE idempotency_keys.expires_at <= ?
+            """,
+            (key, owner, self._idempotency_ts(lease_expires_at), now),
+        )
+        if cursor.rowcount:
+            return "claimed"
+
+        row = conn.execute(
+            "SELECT state FROM idempotency_keys WHERE key = ?",
+            (key,),
+        ).fetchone()
+        if row is None:
+            # Purged between statements; let the caller retry the claim
+            return "pending"
+        return str(row["state"])
+
+    async def complete_idempotency_key(self, record: IdempotencyRecord, owner: str) -> None:
+        conn = self._conn
+        if conn is None:
+            raise RuntimeError("SQLite connection has not been initialized")
+
+        headers_json = json.dumps(
+            [[name.decode("latin-1"), value.decode("latin-1")] for name, value in record.headers]
+        )
+        conn.execute(
+            """
+            UPDATE idempotency_keys
+            SET state='completed',
+                request_hash=?,
+                status_code=?,
+                headers=?,
+                body=?,
+                expires_at=?
+            WHERE key = ? AND owner = ?
+            """,
+            (
+                record.request_hash,
+                record.status_code,
+                headers_json,
+                record.body,
+                self._idempotency_ts(record.expires_at),
+                record.key,
+                owner,
+            ),
+        )
+
+    async def release_idempotency_key(self, key: str, owner: str) -> None:
+        conn = self._conn
+        if conn is None:
+            raise RuntimeError("SQLite connection has not been initialized")
+
+        conn.execute(
+            "DELETE FROM idempotency_keys WHERE key = ? AND owner = ? AND state = 'pending'",
+            (key, owner),
+        )
+
+    async def get_idempotency_record(self, key: str) -> Optional[IdempotencyRecord]:
+        conn = self._conn
+        if conn is None:
+            raise RuntimeError("SQLite connection has not been initialized")
+
+        row = conn.execute(
+            """
+            SELECT * FROM idempotency_keys
+            WHERE key = ? AND state = 'completed' AND expires_at > ?
+            """,
+            (key, self._idempotency_ts(datetime.now(timezone.utc))),
+        ).fetchone()
+        if row is None:
+            return None
+        return IdempotencyRecord(
+            key=row["key"],
+            request_hash=row["request_hash"],
+            status_code=row["status_code"],
+            headers=[
+                (name.encode("latin-1"), value.encode("latin-1"))
+                for name, value in json.loads(row["headers"] or "[]")
+            ],
+            body=row["body"] or b"",
+            expires_at=datetime.fromisoformat(row["expires_at"]),
+        )
+
+    async def purge_expired_idempotency_keys(self, limit: int = 1000) -> int:
+        conn = self._conn
+        if conn is None:
+            raise RuntimeError("SQLite connection has not been initialized")
+
+        cursor = conn.execute(
+            """
+            DELETE FROM idempotency_keys
+            WHERE key IN (
+                SELECT key FROM idempotency_keys WHERE expires_at <= ? LIMIT ?
+            )
+            """,
+            (self._idempotency_ts(datetime.now(timezone.utc)), limit),
+        )
+        return cursor.rowcount if cursor.rowcount is not None else 0
+
     async def search_text(
         self,
         query: str,
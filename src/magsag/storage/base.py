@@ -11,10 +11,14 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from datetime import datetime
-from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional, Tuple
 
 if TYPE_CHECKING:  # pragma: no cover - typing aid
-    from magsag.storage.models import ApprovalTicketRecord, RunSnapshotRecord
+    from magsag.storage.models import (
+        ApprovalTicketRecord,
+        IdempotencyRecord,
+        RunSnapshotRecord,
+    )
 
 
 @dataclass
@@ -35,6 +39,8 @@ class StorageCapabilities:
     archive_artifacts: bool = False  # Can archive to object storage
     lifecycle_policy: bool = False  # Automatic data retention/archival
     streaming: bool = False  # Can stream events in real-time
+    idempotency: bool = False  # Shared idempotency key store with cross-process claims
+    approval_notifications: bool = False  # Cross-process feed of approval status changes
 
 
 class StorageBackend(ABC):
@@ -276,6 +282,95 @@ class StorageBackend(ABC):
         """Delete all snapshots for a run, returning the number removed."""
         ...
 
+    def watch_approval_changes(
+        self,
+        poll_interval: float = 0.25,
+    ) -> AsyncIterator[Tuple[str, str]]:
+        """
+        Stream approval ticket status changes from all processes (if supported).
+
+        Yields changes recorded after the feed starts; runs until cancelled.
+
+        Args:
+            poll_interval: Seconds between polls for backends without push
+
+        Yields:
+            (ticket_id, status) tuples
+
+        Raises:
+            NotImplementedError: If approval notifications not supported
+        """
+        raise NotImplementedError("Approval notifications not supported by this backend")
+
+    async def claim_idempotency_key(
+        self,
+        key: str,
+        owner: str,
+        lease_expires_at: datetime,
+    ) -> str:
+        """
+        Atomically claim an idempotency key for request execution (if supported).
+
+        A key can be claimed when it does not exist or its previous claim or
+        cached response has expired.
+
+        Args:
+            key: Scoped idempotency key
+            owner: Unique token identifying the claimant
+            lease_expires_at: When the claim lapses if never completed
+
+        Returns:
+            "claimed" if the caller now owns the key, "completed" if a cached
+            response exists, or "pending" if another owner holds the claim
+
+        Raises:
+            NotImplementedError: If idempotency storage not supported
+        """
+        raise NotImplementedError("Idempotency storage not supported by this backend")
+
+    async def complete_idempotency_key(self, record: "IdempotencyRecord", owner: str) -> None:
+        """
+        Store the response for a claimed idempotency key (if supported).
+
+        Args:
+            record: Response record to cache
+            owner: Token used when claiming the key
+
+        Raises:
+            NotImplementedError: If idempotency storage not supported
+        """
+        raise NotImplementedError("Idempotency storage not supported by this backend")
+
+    async def release_idempotency_key(self, key: str, owner: str) -> None:
+        """
+        Drop an uncompleted claim so another request can execute (if supported).
+
+        Raises:
+            NotImplementedError: If idempotency storage not supported
+        """
+        raise NotImplementedError("Idempotency storage not supported by this backend")
+
+    async def get_idempotency_record(self, key: str) -> Optional["IdempotencyRecord"]:
+        """
+        Get the unexpired cached response for an idempotency key (if supported).
+
+        Raises:
+            NotImplementedError: If idempotency storage not supported
+        """
+        raise NotImplementedError("Idempotency storage not supported by this backend")
+
+    async def purge_expired_idempotency_keys(self, limit: int = 1000) -> int:
+        """
+        Delete up to ``limit`` expired idempotency keys (if supported).
+
+        Returns:
+            Number of keys deleted
+
+        Raises:
+            NotImplementedError: If idempotency storage not supported
+        """
+        raise NotImplementedError("Idempotency storage not supported by this backend")
+
     async def search_text(
         self,
         query: str,
@@ -7,10 +7,16 @@ based on application settings.
 
 from __future__ import annotations
 
+from pathlib import Path
 from typing import TYPE_CHECKING
 
 from magsag.storage.backends.postgres import PostgresStorageBackend
 from magsag.storage.backends.sqlite import SQLiteStorageBackend
+from magsag.storage.memory_store import (
+    AbstractMemoryStore,
+    PostgresMemoryStore,
+    SQLiteMemoryStore,
+)
 
 if TYPE_CHECKING:
     from magsag.api.config import Settings
@@ -55,6 +61,44 @@ async def create_storage_backend(settings: Settings) -> StorageBackend:
     return backend
 
 
+async def create_memory_store(settings: Settings) -> AbstractMemoryStore:
+    """
+    Create and initialize the memory store configured by settings.
+
+    PostgreSQL backends keep memories in the same database; SQLite keeps
+    them in ``memory.db`` next to ``STORAGE_DB_PATH``.
+
+    Args:
+        settings: Application settings
+
+    Returns:
+        Initialized memory store
+
+    Raises:
+        ValueError: If a PostgreSQL backend has no STORAGE_DSN
+    """
+    backend_type = settings.STORAGE_BACKEND.lower()
+
+    store: AbstractMemoryStore
+    if backend_type in ("postgres", "postgresql", "timescale", "timescaledb"):
+        if not settings.STORAGE_DSN:
+            raise ValueError("STORAGE_DSN must be configured for PostgreSQL memory store")
+        store = PostgresMemoryStore(
+            settings.STORAGE_DSN,
+            embedding_dim=settings.MEMORY_EMBEDDING_DIM,
+        )
+    else:
+        memory_db = Path(settings.STORAGE_DB_PATH).parent / "memory.db"
+        memory_db.parent.mkdir(parents=True, exist_ok=True)
+        store = SQLiteMemoryStore(
+            db_path=memory_db,
+            enable_fts=settings.STORAGE_ENABLE_FTS,
+        )
+
+    await store.initialize()
+    return store
+
+
 # Global storage backend instance (singleton)
 _storage_backend: StorageBackend | None = None
 
@@ -10,13 +10,102 @@ from __future__ import annotations
 import asyncio
 import json
 import sqlite3
+import sys
 from abc import ABC, abstractmethod
+from array import array
 from datetime import UTC, datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, cast
+from typing import TYPE_CHECKING, Any, Dict, List, Literal, Optional, Tuple, cast
 
 from magsag.core.memory import MemoryEntry, MemoryScope
 
+if TYPE_CHECKING:
+    from magsag.storage.vector_index import VectorIndex
+
+# Rows removed per DELETE statement by expiry and vacuum, keeping each
+# write transaction (and the lock it holds) short
+DELETE_BATCH_SIZE = 1000
+
+
+def _encode_embedding(embedding: Optional[List[float]]) -> Optional[bytes]:
+    """Pack an embedding as a little-endian float32 BLOB."""
+    if not embedding:
+        return None
+    values = array("f", embedding)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values.tobytes()
+
+
+def _decode_embedding(raw: Any) -> Optional[List[float]]:
+    """Unpack a float32 BLOB (or a legacy JSON TEXT value) into an embedding."""
+    if not raw:
+        return None
+    if isinstance(raw, str):
+        return cast(List[float], json.loads(raw))
+    values = array("f")
+    values.frombytes(raw)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values.tolist()
+
+
+_POSTGRES_INSERT = """
+    INSERT INTO memories (
+        memory_id, scope, agent_slug, run_id, key, value,
+        created_at, updated_at, expires_at, pii_tags,
+        retention_policy, embedding, tags, metadata
+    ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14)
+"""
+
+
+def _postgres_params(entry: MemoryEntry) -> Tuple[Any, ...]:
+    """INSERT parameters for a memory entry, in _POSTGRES_INSERT column order."""
+    return (
+        entry.memory_id,
+        entry.scope.value,
+        entry.agent_slug,
+        entry.run_id,
+        entry.key,
+        json.dumps(entry.value),
+        entry.created_at,
+        entry.updated_at,
+        entry.expires_at,
+        entry.pii_tags,
+        entry.retention_policy,
+        entry.embedding,
+        entry.tags,
+        json.dumps(entry.metadata),
+    )
+
+
+def _vector_literal(embedding: List[float]) -> str:
+    """Format an embedding as pgvector text input (``[x,y,...]``)."""
+    return "[" + ",".join(repr(float(value)) for value in embedding) + "]"
+
+
+def _record_to_entry(row: Any) -> MemoryEntry:
+    """Convert an asyncpg record from the memories table to a MemoryEntry."""
+    embedding = row["embedding"]
+    if isinstance(embedding, str):
+        embedding = json.loads(embedding)
+    return MemoryEntry(
+        memory_id=row["memory_id"],
+        scope=MemoryScope(row["scope"]),
+        agent_slug=row["agent_slug"],
+        run_id=row["run_id"],
+        key=row["key"],
+        value=json.loads(row["value"]) if isinstance(row["value"], str) else row["value"],
+        created_at=row["created_at"],
+        updated_at=row["updated_at"],
+        expires_at=row["expires_at"],
+        pii_tags=list(row["pii_tags"]),
+        retention_policy=row["retention_policy"],
+        embedding=list(embedding) if embedding is not None and len(embedding) else None,
+        tags=list(row["tags"]),
+        metadata=json.loads(row["metadata"]) if isinstance(row["metadata"], str) else row["metadata"],
+    )
+
 
 class AbstractMemoryStore(ABC):
     """
@@ -49,6 +138,19 @@ class AbstractMemoryStore(ABC):
         """
         ...
 
+    async def create_memories(self, entries: List[MemoryEntry]) -> None:
+        """
+        Store several new memory entries, in one transaction where supported.
+
+        Args:
+            entries: Memory entries to store
+
+        Raises:
+            ValueError: If a memory_id already exists
+        """
+        for entry in entries:
+            await self.create_memory(entry)
+
     @abstractmethod
     async def get_memory(self, memory_id: str) -> Optional[MemoryEntry]:
         """
@@ -141,10 +243,45 @@ class AbstractMemoryStore(ABC):
         ...
 
     @abstractmethod
-    async def expire_old_memories(self) -> int:
+    async def search_memories_by_vector(
+        self,
+        embedding: List[float],
+        k: int = 10,
+        scope: Optional[MemoryScope] = None,
+        agent_slug: Optional[str] = None,
+        query: Optional[str] = None,
+        text_weight: float = 0.3,
+    ) -> List[Tuple[MemoryEntry, float]]:
+        """
+        Nearest-neighbour search over memory embeddings (cosine similarity).
+
+        Args:
+            embedding: Query embedding
+            k: Maximum results
+            scope: Filter by memory scope
+            agent_slug: Filter by agent slug
+            query: Optional text query; when given, scores blend the vector
+                similarity with the full-text rank (hybrid search)
+            text_weight: Weight of the text rank in hybrid scores (0..1)
+
+        Returns:
+            Up to k (entry, score) pairs, best first
+        """
+        ...
+
+    @abstractmethod
+    async def expire_old_memories(
+        self,
+        batch_size: int = DELETE_BATCH_SIZE,
+        max_batches: Optional[int] = None,
+    ) -> int:
         """
         Delete expired memory entries based on TTL.
 
+        Args:
+            batch_size: Rows deleted per statement
+            max_batches: Stop after this many batches (None = until done)
+
         Returns:
             Number of deleted entries
         """
@@ -178,6 +315,7 @@ class SQLiteMemoryStore(AbstractMemoryStore):
     Features:
     - Zero configuration (single file database)
     - FTS5 full-text search on memory keys and values
+    - Vector search over float32 embedding BLOBs (in-memory NumPy matrix)
     - JSON support for flexible memory values
     - TTL and PII tag support
     - Suitable for local development and small deployments
@@ -198,6 +336,10 @@ class SQLiteMemoryStore(AbstractMemoryStore):
         self.db_path = Path(db_path)
         self.enable_fts = enable_fts
         self._conn: Optional[sqlite3.Connection] = None
+        # Embedding matrices keyed by the (scope, agent_slug) filter they cover,
+        # loaded on first vector search and kept in sync by writes
+        self._vector_indexes: Dict[Tuple[Optional[str], Optional[str]], VectorIndex] = {}
+        self._vector_lock = asyncio.Lock()
 
     async def initialize(self) -> None:
         """Initialize database schema"""
@@ -223,6 +365,15 @@ class SQLiteMemoryStore(AbstractMemoryStore):
         if self._conn is None:
             raise RuntimeError("SQLite connection not initialized")
         self._conn.execute("PRAGMA foreign_keys = ON")
+        # Let deletes hand pages back with incremental_vacuum instead of a full VACUUM
+        if self._conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            self._conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            existing = self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' LIMIT 1"
+            ).fetchone()
+            if existing:
+                # Existing databases switch modes with a one-time rebuild
+                self._conn.execute("VACUUM")
         self._conn.execute("PRAGMA journal_mode = WAL")
 
     async def _create_schema(self) -> None:
@@ -252,27 +403,38 @@ class SQLiteMemoryStore(AbstractMemoryStore):
                 expires_at TEXT,
                 pii_tags TEXT NOT NULL,
                 retention_policy TEXT,
-                embedding TEXT,
+                embedding BLOB,
                 tags TEXT NOT NULL,
                 metadata TEXT NOT NULL
             )
         """)
 
-        # Indexes for efficient queries
+        # Indexes matching the query shapes: filters first, then the
+        # created_at ordering, so listing never sorts the whole table
+        for superseded in ("scope", "agent_slug", "run_id", "expires_at"):
+            self._conn.execute(f"DROP INDEX IF EXISTS idx_memories_{superseded}")
         self._conn.execute(
-            "CREATE INDEX IF NOT EXISTS idx_memories_scope ON memories(scope)"
+            "CREATE INDEX IF NOT EXISTS idx_memories_agent_scope_created "
+            "ON memories(agent_slug, scope, created_at)"
         )
         self._conn.execute(
-            "CREATE INDEX IF NOT EXISTS idx_memories_agent_slug ON memories(agent_slug)"
+            "CREATE INDEX IF NOT EXISTS idx_memories_scope_created ON memories(scope, created_at)"
         )
         self._conn.execute(
-            "CREATE INDEX IF NOT EXISTS idx_memories_run_id ON memories(run_id)"
+            "CREATE INDEX IF NOT EXISTS idx_memories_created ON memories(created_at)"
         )
+        # Partial indexes: only session memories have a run_id, only rows
+        # with a TTL are candidates for the expiry sweep
         self._conn.execute(
-            "CREATE INDEX IF NOT EXISTS idx_memories_key ON memories(key)"
+            "CREATE INDEX IF NOT EXISTS idx_memories_run_created "
+            "ON memories(run_id, created_at) WHERE run_id IS NOT NULL"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_memories_expiring "
+            "ON memories(expires_at) WHERE expires_at IS NOT NULL"
         )
         self._conn.execute(
-            "CREATE INDEX IF NOT EXISTS idx_memories_expires_at ON memories(expires_at)"
+            "CREATE INDEX IF NOT EXISTS idx_memories_key ON memories(key)"
         )
 
         # FTS5 virtual table for full-text search
@@ -330,7 +492,7 @@ class SQLiteMemoryStore(AbstractMemoryStore):
             entry.expires_at.isoformat() if entry.expires_at else None,
             json.dumps(entry.pii_tags),
             entry.retention_policy,
-            json.dumps(entry.embedding) if entry.embedding else None,
+            _encode_embedding(entry.embedding),
             json.dumps(entry.tags),
             json.dumps(entry.metadata),
         )
@@ -349,7 +511,7 @@ class SQLiteMemoryStore(AbstractMemoryStore):
             expires_at=datetime.fromisoformat(row["expires_at"]) if row["expires_at"] else None,
             pii_tags=json.loads(row["pii_tags"]),
             retention_policy=row["retention_policy"],
-            embedding=json.loads(row["embedding"]) if row["embedding"] else None,
+            embedding=_decode_embedding(row["embedding"]),
             tags=json.loads(row["tags"]),
             metadata=json.loads(row["metadata"]),
         )
@@ -379,6 +541,44 @@ class SQLiteMemoryStore(AbstractMemoryStore):
                 raise ValueError(f"Memory with ID {entry.memory_id} already exists") from e
 
         await loop.run_in_executor(None, _insert)
+        await self._sync_vector_indexes(entry)
+
+    async def create_memories(self, entries: List[MemoryEntry]) -> None:
+        """Store several memory entries in one transaction"""
+        if self._conn is None:
+            raise RuntimeError("SQLite connection not initialized")
+
+        if not entries:
+            return
+
+        loop = asyncio.get_event_loop()
+
+        def _insert_many() -> None:
+            if self._conn is None:
+                raise RuntimeError("SQLite connection not initialized")
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    """
+                    INSERT INTO memories (
+                        memory_id, scope, agent_slug, run_id, key, value,
+                        created_at, updated_at, expires_at, pii_tags,
+                        retention_policy, embedding, tags, metadata
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    [self._entry_to_row(entry) for entry in entries],
+                )
+            except sqlite3.IntegrityError as e:
+                self._conn.execute("ROLLBACK")
+                raise ValueError("A memory in the batch already exists") from e
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+        await loop.run_in_executor(None, _insert_many)
+        for entry in entries:
+            await self._sync_vector_indexes(entry)
 
     async def get_memory(self, memory_id: str) -> Optional[MemoryEntry]:
         """Retrieve a memory entry by ID"""
@@ -434,6 +634,7 @@ class SQLiteMemoryStore(AbstractMemoryStore):
                 raise ValueError(f"Memory with ID {entry.memory_id} does not exist")
 
         await loop.run_in_executor(None, _update)
+        await self._sync_vector_indexes(entry)
 
     async def delete_memory(self, memory_id: str) -> bool:
         """Delete a memory entry"""
@@ -452,6 +653,10 @@ class SQLiteMemoryStore(AbstractMemoryStore):
             return cursor.rowcount
 
         rowcount = await loop.run_in_executor(None, _delete)
+        if rowcount > 0:
+            async with self._vector_lock:
+                for index in self._vector_indexes.values():
+                    index.remove(memory_id)
         return rowcount > 0
 
     async def list_memories(
@@ -570,23 +775,209 @@ class SQLiteMemoryStore(AbstractMemoryStore):
         rows = await loop.run_in_executor(None, _search)
         return [self._row_to_entry(row) for row in rows]
 
-    async def expire_old_memories(self) -> int:
-        """Delete expired memory entries"""
+    async def search_memories_by_vector(
+        self,
+        embedding: List[float],
+        k: int = 10,
+        scope: Optional[MemoryScope] = None,
+        agent_slug: Optional[str] = None,
+        query: Optional[str] = None,
+        text_weight: float = 0.3,
+    ) -> List[Tuple[MemoryEntry, float]]:
+        """Cosine search over an in-memory embedding matrix, optionally blended with FTS5 rank"""
         if self._conn is None:
             raise RuntimeError("SQLite connection not initialized")
 
+        if query is not None and not self.enable_fts:
+            raise NotImplementedError("Full-text search is not enabled")
+
+        index = await self._vector_index(scope, agent_slug, len(embedding))
         loop = asyncio.get_event_loop()
 
-        def _delete() -> int:
+        def _text_scores() -> Dict[str, float]:
             if self._conn is None:
                 raise RuntimeError("SQLite connection not initialized")
+
+            where_clauses = ["memories_fts MATCH ?", "memories.embedding IS NOT NULL"]
+            params: List[Any] = [query]
+
+            if scope is not None:
+                where_clauses.append("memories.scope = ?")
+                params.append(scope.value)
+
+            if agent_slug is not None:
+                where_clauses.append("memories.agent_slug = ?")
+                params.append(agent_slug)
+
+            where_sql = " AND ".join(where_clauses)
             cursor = self._conn.execute(
-                "DELETE FROM memories WHERE expires_at IS NOT NULL AND expires_at <= ?",
-                (datetime.now(UTC).isoformat(),),
+                f"""
+                SELECT memories.memory_id, memories_fts.rank AS rank FROM memories
+                INNER JOIN memories_fts ON memories.rowid = memories_fts.rowid
+                WHERE {where_sql}
+                """,
+                params,
+            )
+            ranks = {row["memory_id"]: row["rank"] for row in cursor.fetchall()}
+            # bm25 ranks are negative, lower is better; scale the best match to 1
+            best = min(ranks.values(), default=0.0)
+            return {memory_id: rank / best if best else 1.0 for memory_id, rank in ranks.items()}
+
+        def _search() -> List[Tuple[str, float]]:
+            text_scores = _text_scores() if query is not None else None
+            return index.search(
+                embedding,
+                k,
+                datetime.now(UTC).timestamp(),
+                text_scores=text_scores,
+                text_weight=text_weight if query is not None else 0.0,
             )
-            return cursor.rowcount
 
-        return await loop.run_in_executor(None, _delete)
+        hits = await loop.run_in_executor(None, _search)
+        if not hits:
+            return []
+
+        def _select() -> List[sqlite3.Row]:
+            if self._conn is None:
+                raise RuntimeError("SQLite connection not initialized")
+            placeholders = ", ".join("?" for _ in hits)
+            cursor = self._conn.execute(
+                f"SELECT * FROM memories WHERE memory_id IN ({placeholders})",
+                [memory_id for memory_id, _ in hits],
+            )
+            return cursor.fetchall()
+
+        rows = {row["memory_id"]: row for row in await loop.run_in_executor(None, _select)}
+        return [
+            (self._row_to_entry(rows[memory_id]), score)
+            for memory_id, score in hits
+            if memory_id in rows
+        ]
+
+    async def _vector_index(
+        self, scope: Optional[MemoryScope], agent_slug: Optional[str], dim: int
+    ) -> VectorIndex:
+        """Return the embedding matrix for a filter, loading it on first use"""
+        from magsag.storage.vector_index import VectorIndex
+
+        index_key = (scope.value if scope else None, agent_slug)
+        async with self._vector_lock:
+            index = self._vector_indexes.get(index_key)
+            if index is not None:
+                return index
+
+            loop = asyncio.get_event_loop()
+
+            def _load() -> List[sqlite3.Row]:
+                if self._conn is None:
+                    raise RuntimeError("SQLite connection not initialized")
+
+                where_clauses = ["embedding IS NOT NULL"]
+                params: List[Any] = []
+
+                if scope is not None:
+                    where_clauses.append("scope = ?")
+                    params.append(scope.value)
+
+                if agent_slug is not None:
+                    where_clauses.append("agent_slug = ?")
+                    params.append(agent_slug)
+
+                where_sql = " AND ".join(where_clauses)
+                cursor = self._conn.execute(
+                    f"SELECT memory_id, embedding, expires_at FROM memories WHERE {where_sql}",
+                    params,
+                )
+                return cursor.fetchall()
+
+            rows = await loop.run_in_executor(None, _load)
+            index = VectorIndex(dim, capacity=max(64, len(rows)))
+            for row in rows:
+                expires_at = row["expires_at"]
+                index.upsert(
+                    row["memory_id"],
+                    _decode_embedding(row["embedding"]) or [],
+                    datetime.fromisoformat(expires_at).timestamp() if expires_at else None,
+                )
+            self._vector_indexes[index_key] = index
+            return index
+
+    async def _sync_vector_indexes(self, entry: MemoryEntry) -> None:
+        """Apply a written entry to the loaded embedding matrices"""
+        async with self._vector_lock:
+            for (scope, agent_slug), index in self._vector_indexes.items():
+                covered = scope in (None, entry.scope.value) and agent_slug in (
+                    None,
+                    entry.agent_slug,
+                )
+                if covered and entry.embedding:
+                    expires_at = entry.expires_at.timestamp() if entry.expires_at else None
+                    index.upsert(entry.memory_id, entry.embedding, expires_at)
+                else:
+                    index.remove(entry.memory_id)
+
+    async def expire_old_memories(
+        self,
+        batch_size: int = DELETE_BATCH_SIZE,
+        max_batches: Optional[int] = None,
+    ) -> int:
+        """Delete expired memory entries in bounded batches"""
+        if self._conn is None:
+            raise RuntimeError("SQLite connection not initialized")
+
+        return await self._delete_in_batches(
+            "expires_at IS NOT NULL AND expires_at <= ?",
+            [datetime.now(UTC).isoformat()],
+            batch_size,
+            max_batches,
+        )
+
+    async def _delete_in_batches(
+        self,
+        where_sql: str,
+        params: List[Any],
+        batch_size: int,
+        max_batches: Optional[int] = None,
+    ) -> int:
+        """Delete matching rows a batch per transaction, then release the freed pages"""
+        loop = asyncio.get_event_loop()
+
+        def _delete_batch() -> List[str]:
+            if self._conn is None:
+                raise RuntimeError("SQLite connection not initialized")
+            cursor = self._conn.execute(
+                f"""
+                DELETE FROM memories WHERE rowid IN (
+                    SELECT rowid FROM memories WHERE {where_sql} LIMIT ?
+                )
+                RETURNING memory_id
+                """,
+                [*params, batch_size],
+            )
+            return [row["memory_id"] for row in cursor.fetchall()]
+
+        def _release_pages() -> None:
+            if self._conn is None:
+                raise RuntimeError("SQLite connection not initialized")
+            self._conn.execute("PRAGMA incremental_vacuum")
+
+        deleted = 0
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            memory_ids = await loop.run_in_executor(None, _delete_batch)
+            batches += 1
+            deleted += len(memory_ids)
+            for index in list(self._vector_indexes.values()):
+                for memory_id in memory_ids:
+                    index.remove(memory_id)
+            if len(memory_ids) < batch_size:
+                break
+            # Let other queries in between batches
+            await asyncio.sleep(0)
+
+        if deleted:
+            await loop.run_in_executor(None, _release_pages)
+        return deleted
 
     async def vacuum(
         self,
@@ -603,41 +994,36 @@ class SQLiteMemoryStore(AbstractMemoryStore):
         cutoff = datetime.now(UTC) - timedelta(days=older_than_days)
         loop = asyncio.get_event_loop()
 
-        def _vacuum() -> Dict[str, Any]:
-            if self._conn is None:
-                raise RuntimeError("SQLite connection not initialized")
+        where_clauses = ["created_at < ?"]
+        params: List[Any] = [cutoff.isoformat()]
 
-            where_clauses = ["created_at < ?"]
-            params: List[Any] = [cutoff.isoformat()]
-
-            if scope is not None:
-                where_clauses.append("scope = ?")
-                params.append(scope.value)
+        if scope is not None:
+            where_clauses.append("scope = ?")
+            params.append(scope.value)
 
-            where_sql = " AND ".join(where_clauses)
+        where_sql = " AND ".join(where_clauses)
 
-            # Count entries to be deleted
+        def _count() -> int:
+            if self._conn is None:
+                raise RuntimeError("SQLite connection not initialized")
             cursor = self._conn.execute(
                 f"SELECT COUNT(*) as count FROM memories WHERE {where_sql}",
                 params,
             )
-            count = cursor.fetchone()["count"]
+            return cast(int, cursor.fetchone()["count"])
 
-            if not dry_run and count > 0:
-                self._conn.execute(
-                    f"DELETE FROM memories WHERE {where_sql}",
-                    params,
-                )
-
-            return {
-                "deleted_count": count if not dry_run else 0,
-                "would_delete_count": count if dry_run else 0,
-                "scope": scope.value if scope else "all",
-                "older_than_days": older_than_days,
-                "cutoff": cutoff.isoformat(),
-            }
+        if dry_run:
+            count = await loop.run_in_executor(None, _count)
+        else:
+            count = await self._delete_in_batches(where_sql, params, DELETE_BATCH_SIZE)
 
-        return await loop.run_in_executor(None, _vacuum)
+        return {
+            "deleted_count": count if not dry_run else 0,
+            "would_delete_count": count if dry_run else 0,
+            "scope": scope.value if scope else "all",
+            "older_than_days": older_than_days,
+            "cutoff": cutoff.isoformat(),
+        }
 
 
 class PostgresMemoryStore(AbstractMemoryStore):
@@ -647,18 +1033,31 @@ class PostgresMemoryStore(AbstractMemoryStore):
     Features:
     - Full ACID compliance
     - pg_trgm for fuzzy text search
-    - pgvector for semantic/vector search (if installed)
+    - pgvector for semantic/vector search (HNSW or IVFFlat index when
+      embedding_dim is set)
     - Suitable for production deployments
     """
 
-    def __init__(self, dsn: str):
+    def __init__(
+        self,
+        dsn: str,
+        embedding_dim: Optional[int] = None,
+        vector_index: Literal["hnsw", "ivfflat"] = "hnsw",
+    ):
         """
         Initialize PostgreSQL memory store.
 
         Args:
             dsn: PostgreSQL connection string
+            embedding_dim: Dimension of all stored embeddings. When set, an
+                approximate nearest-neighbour index is built on
+                ``embedding::vector(embedding_dim)``; otherwise vector
+                search scans the table.
+            vector_index: pgvector index method ("hnsw" or "ivfflat")
         """
         self.dsn = dsn
+        self.embedding_dim = embedding_dim
+        self.vector_index = vector_index
         self._pool: Optional[Any] = None  # asyncpg pool
 
     async def initialize(self) -> None:
@@ -676,6 +1075,7 @@ class PostgresMemoryStore(AbstractMemoryStore):
         async with self._pool.acquire() as conn:
             # Enable extensions
             await conn.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            await conn.execute("CREATE EXTENSION IF NOT EXISTS vector")
 
             # Main memories table
             await conn.execute("""
@@ -697,26 +1097,45 @@ class PostgresMemoryStore(AbstractMemoryStore):
                 )
             """)
 
-            # Indexes
+            # Indexes matching the query shapes (filters, then created_at ordering)
+            for superseded in ("scope", "agent_slug", "run_id", "expires_at"):
+                await conn.execute(f"DROP INDEX IF EXISTS idx_memories_{superseded}")
             await conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_memories_scope ON memories(scope)"
+                "CREATE INDEX IF NOT EXISTS idx_memories_agent_scope_created "
+                "ON memories(agent_slug, scope, created_at DESC)"
             )
             await conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_memories_agent_slug ON memories(agent_slug)"
+                "CREATE INDEX IF NOT EXISTS idx_memories_scope_created "
+                "ON memories(scope, created_at DESC)"
             )
             await conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_memories_run_id ON memories(run_id)"
+                "CREATE INDEX IF NOT EXISTS idx_memories_created ON memories(created_at DESC)"
             )
             await conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_memories_key ON memories(key)"
+                "CREATE INDEX IF NOT EXISTS idx_memories_run_created "
+                "ON memories(run_id, created_at DESC) WHERE run_id IS NOT NULL"
+            )
+            await conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_memories_expiring "
+                "ON memories(expires_at) WHERE expires_at IS NOT NULL"
             )
             await conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_memories_expires_at ON memories(expires_at)"
+                "CREATE INDEX IF NOT EXISTS idx_memories_key ON memories(key)"
             )
             await conn.execute(
                 "CREATE INDEX IF NOT EXISTS idx_memories_tags ON memories USING GIN(tags)"
             )
 
+            # ANN index on the fixed-dimension cast used by vector search
+            if self.embedding_dim is not None:
+                dim = int(self.embedding_dim)
+                options = " WITH (lists = 100)" if self.vector_index == "ivfflat" else ""
+                await conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_memories_embedding_{self.vector_index}_{dim} "
+                    f"ON memories USING {self.vector_index} "
+                    f"((embedding::vector({dim})) vector_cosine_ops){options}"
+                )
+
     async def close(self) -> None:
         """Close database connection pool"""
         if self._pool:
@@ -730,34 +1149,31 @@ class PostgresMemoryStore(AbstractMemoryStore):
 
         async with self._pool.acquire() as conn:
             try:
-                await conn.execute(
-                    """
-                    INSERT INTO memories (
-                        memory_id, scope, agent_slug, run_id, key, value,
-                        created_at, updated_at, expires_at, pii_tags,
-                        retention_policy, embedding, tags, metadata
-                    ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14)
-                    """,
-                    entry.memory_id,
-                    entry.scope.value,
-                    entry.agent_slug,
-                    entry.run_id,
-                    entry.key,
-                    json.dumps(entry.value),
-                    entry.created_at,
-                    entry.updated_at,
-                    entry.expires_at,
-                    entry.pii_tags,
-                    entry.retention_policy,
-                    entry.embedding,
-                    entry.tags,
-                    json.dumps(entry.metadata),
-                )
+                await conn.execute(_POSTGRES_INSERT, *_postgres_params(entry))
             except Exception as e:
                 if "duplicate key" in str(e):
                     raise ValueError(f"Memory with ID {entry.memory_id} already exists") from e
                 raise
 
+    async def create_memories(self, entries: List[MemoryEntry]) -> None:
+        """Store several memory entries in one transaction"""
+        if self._pool is None:
+            raise RuntimeError("PostgreSQL connection pool not initialized")
+
+        if not entries:
+            return
+
+        async with self._pool.acquire() as conn:
+            try:
+                async with conn.transaction():
+                    await conn.executemany(
+                        _POSTGRES_INSERT, [_postgres_params(entry) for entry in entries]
+                    )
+            except Exception as e:
+                if "duplicate key" in str(e):
+                    raise ValueError("A memory in the batch already exists") from e
+                raise
+
     async def get_memory(self, memory_id: str) -> Optional[MemoryEntry]:
         """Retrieve a memory entry by ID"""
         if self._pool is None:
@@ -979,18 +1395,118 @@ class PostgresMemoryStore(AbstractMemoryStore):
             for row in rows
         ]
 
-    async def expire_old_memories(self) -> int:
-        """Delete expired memory entries"""
+    async def search_memories_by_vector(
+        self,
+        embedding: List[float],
+        k: int = 10,
+        scope: Optional[MemoryScope] = None,
+        agent_slug: Optional[str] = None,
+        query: Optional[str] = None,
+        text_weight: float = 0.3,
+    ) -> List[Tuple[MemoryEntry, float]]:
+        """Cosine search via pgvector, optionally blended with pg_trgm word similarity"""
         if self._pool is None:
             raise RuntimeError("PostgreSQL connection pool not initialized")
 
-        async with self._pool.acquire() as conn:
-            result = await conn.execute(
-                "DELETE FROM memories WHERE expires_at IS NOT NULL AND expires_at <= NOW()"
+        if self.embedding_dim is not None and len(embedding) != self.embedding_dim:
+            raise ValueError(
+                f"Query embedding has {len(embedding)} dimensions, "
+                f"store is configured for {self.embedding_dim}"
             )
 
-        # Extract count from "DELETE N" result
-        return int(result.split()[-1])
+        # Must match the indexed expression for the planner to use the ANN index
+        vector_type = f"vector({int(self.embedding_dim)})" if self.embedding_dim else "vector"
+        distance = f"embedding::{vector_type} <=> $1::{vector_type}"
+
+        where_clauses = [
+            "embedding IS NOT NULL",
+            "(expires_at IS NULL OR expires_at > NOW())",
+        ]
+        params: List[Any] = [_vector_literal(embedding)]
+        param_idx = 2
+
+        if scope is not None:
+            where_clauses.append(f"scope = ${param_idx}")
+            params.append(scope.value)
+            param_idx += 1
+
+        if agent_slug is not None:
+            where_clauses.append(f"agent_slug = ${param_idx}")
+            params.append(agent_slug)
+            param_idx += 1
+
+        where_sql = " AND ".join(where_clauses)
+        # Hybrid search reranks a wider pool of nearest neighbours by text similarity
+        pool_size = k if query is None else max(4 * k, 40)
+        query_sql = f"""
+            SELECT *, 1 - ({distance}) AS score FROM memories
+            WHERE {where_sql}
+            ORDER BY {distance}
+            LIMIT ${param_idx}
+        """
+        params.append(pool_size)
+        param_idx += 1
+
+        if query is not None:
+            query_sql = f"""
+                SELECT *, (1 - ${param_idx + 1}::float8) * score
+                    + ${param_idx + 1}::float8 * word_similarity(${param_idx}, key || ' ' || value::text)
+                    AS hybrid_score
+                FROM ({query_sql}) AS candidates
+                ORDER BY hybrid_score DESC
+                LIMIT ${param_idx + 2}
+            """
+            params.extend([query, text_weight, k])
+
+        async with self._pool.acquire() as conn:
+            rows = await conn.fetch(query_sql, *params)
+
+        score_column = "score" if query is None else "hybrid_score"
+        return [(_record_to_entry(row), float(row[score_column])) for row in rows]
+
+    async def expire_old_memories(
+        self,
+        batch_size: int = DELETE_BATCH_SIZE,
+        max_batches: Optional[int] = None,
+    ) -> int:
+        """Delete expired memory entries in bounded batches"""
+        if self._pool is None:
+            raise RuntimeError("PostgreSQL connection pool not initialized")
+
+        return await self._delete_in_batches(
+            "expires_at IS NOT NULL AND expires_at <= NOW()", [], batch_size, max_batches
+        )
+
+    async def _delete_in_batches(
+        self,
+        where_sql: str,
+        params: List[Any],
+        batch_size: int,
+        max_batches: Optional[int] = None,
+    ) -> int:
+        """Delete matching rows a batch per statement"""
+        if self._pool is None:
+            raise RuntimeError("PostgreSQL connection pool not initialized")
+
+        query = f"""
+            DELETE FROM memories WHERE memory_id IN (
+                SELECT memory_id FROM memories WHERE {where_sql}
+                LIMIT ${len(params) + 1}
+                FOR UPDATE SKIP LOCKED
+            )
+        """
+        deleted = 0
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            async with self._pool.acquire() as conn:
+                result = await conn.execute(query, *params, batch_size)
+            batches += 1
+            # Extract count from "DELETE N" result
+            count = int(result.split()[-1])
+            deleted += count
+            if count < batch_size:
+                break
+        return deleted
 
     async def vacuum(
         self,
@@ -1011,19 +1527,14 @@ class PostgresMemoryStore(AbstractMemoryStore):
 
         where_sql = " AND ".join(where_clauses)
 
-        async with self._pool.acquire() as conn:
-            # Count entries
-            count_result = await conn.fetchval(
-                f"SELECT COUNT(*) FROM memories WHERE {where_sql}",
-                *params,
-            )
-
-            # Delete if not dry run
-            if not dry_run and count_result > 0:
-                await conn.execute(
-                    f"DELETE FROM memories WHERE {where_sql}",
+        if dry_run:
+            async with self._pool.acquire() as conn:
+                count_result = await conn.fetchval(
+                    f"SELECT COUNT(*) FROM memories WHERE {where_sql}",
                     *params,
                 )
+        else:
+            count_result = await self._delete_in_batches(where_sql, params, DELETE_BATCH_SIZE)
 
         return {
             "deleted_count": count_result if not dry_run else 0,
@@ -1031,3 +1542,4 @@ class PostgresMemoryStore(AbstractMemoryStore):
             "scope": scope.value if scope else "all",
             "older_than_days": older_than_days,
         }
+
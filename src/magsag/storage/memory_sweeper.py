@@ -0,0 +1,131 @@
+"""
+Scheduled expiry of memory entries.
+
+Expired memories are filtered out of reads but stay on disk until deleted.
+``MemoryExpirySweeper`` deletes them on a schedule, in bounded batches
+(``batch_size`` rows per statement, at most ``max_batches`` per sweep) so a
+backlog of expired rows never turns into one long table-locking DELETE.
+
+Sweeping stays off the agent run path: long-lived services ``start()`` a
+periodic task on their own loop (the API server does so in its lifespan
+when memory is enabled), and scripts can call ``sweep_once()`` directly.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import threading
+import time
+
+from magsag.observability.metrics import get_metrics_registry
+from magsag.observability.stages import stage
+from magsag.storage.memory_store import DELETE_BATCH_SIZE, AbstractMemoryStore
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SWEEP_INTERVAL_S = 300.0
+
+
+class MemoryExpirySweeper:
+    """Deletes expired memory entries in bounded batches at most once per interval."""
+
+    def __init__(
+        self,
+        store: AbstractMemoryStore,
+        interval_s: float = DEFAULT_SWEEP_INTERVAL_S,
+        batch_size: int = DELETE_BATCH_SIZE,
+        max_batches: int | None = 10,
+    ):
+        """
+        Initialize the sweeper.
+
+        Args:
+            store: Memory store to sweep
+            interval_s: Minimum seconds between sweeps
+            batch_size: Rows deleted per statement
+            max_batches: Statements per sweep (None sweeps until nothing is left);
+                the rest of a large backlog is left for the next sweep
+        """
+        if interval_s <= 0 or batch_size < 1:
+            raise ValueError("interval_s and batch_size must be positive")
+        self.store = store
+        self.interval_s = interval_s
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        self._lock = threading.Lock()
+        self._running = False
+        self._last_sweep: float | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._expired = get_metrics_registry().counter(
+            "magsag_memory_expired_total", "Expired memory entries deleted by the sweeper"
+        )
+
+    async def sweep_once(self) -> int:
+        """
+        Delete one bounded round of expired entries.
+
+        Returns:
+            Number of entries deleted
+        """
+        with self._lock:
+            self._running = True
+        try:
+            with stage("storage.memory_sweep", {"memory.batch_size": self.batch_size}):
+                deleted = await self.store.expire_old_memories(
+                    batch_size=self.batch_size, max_batches=self.max_batches
+                )
+        finally:
+            with self._lock:
+                self._running = False
+                self._last_sweep = time.monotonic()
+        if deleted:
+            self._expired.inc(deleted)
+            logger.info("Deleted %d expired memories", deleted)
+        return deleted
+
+    async def maybe_sweep(self) -> int:
+        """
+        Sweep if the interval has elapsed and no sweep is running.
+
+        Failures are logged, not raised, so callers can sweep opportunistically.
+
+        Returns:
+            Number of entries deleted (0 when the sweep was skipped)
+        """
+        with self._lock:
+            if self._running or (
+                self._last_sweep is not None
+                and time.monotonic() - self._last_sweep < self.interval_s
+            ):
+                return 0
+            self._running = True
+        try:
+            return await self.sweep_once()
+        except Exception as exc:  # noqa: BLE001 - sweeping is best effort
+            logger.warning("Memory expiry sweep failed: %s", exc)
+            return 0
+
+    def start(self) -> None:
+        """Sweep every ``interval_s`` on the running loop until ``stop()``."""
+        if self._task is not None and not self._task.done():
+            return
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Cancel the periodic task started with ``start()``."""
+        task, self._task = self._task, None
+        if task is None:
+            return
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+    async def _run(self) -> None:
+        while True:
+            await self.maybe_sweep()
+            await asyncio.sleep(self.interval_s)
+
+
+__all__ = ["DEFAULT_SWEEP_INTERVAL_S", "MemoryExpirySweeper"]
@@ -0,0 +1,157 @@
+"""
+Write-behind queue for memory entries.
+
+Entries are buffered and written in batches (one transaction per batch) so
+capturing a memory does not cost a database round trip on the caller's
+critical path. The buffer is bounded: once ``max_pending`` entries are
+waiting, writers flush inline (backpressure). Buffered entries stay
+visible through ``pending()`` until they are written (read-your-writes).
+
+The queue is not tied to one event loop. Agent runs each execute in their
+own loop (see ``AgentRunner._run_async_safely``), so background flushes are
+scheduled on the caller's loop and ``flush()`` must be awaited before that
+loop finishes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from collections import OrderedDict
+
+from magsag.core.memory import MemoryEntry, MemoryScope
+from magsag.observability.stages import stage
+from magsag.storage.memory_store import AbstractMemoryStore
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryWriteQueue:
+    """Batching write-behind buffer in front of a memory store."""
+
+    def __init__(
+        self,
+        store: AbstractMemoryStore,
+        batch_size: int = 64,
+        max_pending: int = 1024,
+    ):
+        """
+        Initialize the queue.
+
+        Args:
+            store: Memory store receiving the batched writes
+            batch_size: Entries per insert transaction; reaching it starts a
+                background flush
+            max_pending: Buffered entries before writers must flush inline
+        """
+        if batch_size < 1 or max_pending < batch_size:
+            raise ValueError("Require 1 <= batch_size <= max_pending")
+        self.store = store
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        self._pending: OrderedDict[str, MemoryEntry] = OrderedDict()
+        self._writing: set[str] = set()
+        self._tasks: set[asyncio.Task[int]] = set()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    async def put(self, entry: MemoryEntry) -> None:
+        """Buffer an entry for writing, flushing inline when the buffer is full."""
+        while True:
+            with self._lock:
+                if len(self._pending) < self.max_pending:
+                    self._pending[entry.memory_id] = entry
+                    ready = len(self._pending) - len(self._writing) >= self.batch_size
+                    break
+            # Backpressure: make room before accepting more entries
+            if not await self._write_pending():
+                # Everything buffered is being written by another loop
+                await asyncio.sleep(0.005)
+
+        if ready:
+            loop = asyncio.get_running_loop()
+            if not any(task.get_loop() is loop for task in self._tasks):
+                task = loop.create_task(self._write_pending())
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+    async def flush(self) -> int:
+        """
+        Write all buffered entries.
+
+        Waits for background flushes started on the current loop first.
+
+        Returns:
+            Number of entries written
+        """
+        loop = asyncio.get_running_loop()
+        tasks = [task for task in list(self._tasks) if task.get_loop() is loop]
+        written = 0
+        for result in await asyncio.gather(*tasks, return_exceptions=True):
+            if isinstance(result, int):
+                written += result
+        return written + await self._write_pending()
+
+    def pending(
+        self,
+        scope: MemoryScope | None = None,
+        agent_slug: str | None = None,
+        run_id: str | None = None,
+        key: str | None = None,
+        tags: list[str] | None = None,
+        include_expired: bool = False,
+    ) -> list[MemoryEntry]:
+        """Buffered (not yet written) entries matching the filters, newest first."""
+        with self._lock:
+            entries = list(self._pending.values())
+        matches = [
+            entry
+            for entry in entries
+            if (scope is None or entry.scope == scope)
+            and (agent_slug is None or entry.agent_slug == agent_slug)
+            and (run_id is None or entry.run_id == run_id)
+            and (key is None or entry.key == key)
+            and all(tag in entry.tags for tag in tags or [])
+            and (include_expired or not entry.is_expired())
+        ]
+        return sorted(matches, key=lambda entry: entry.created_at, reverse=True)
+
+    def discard(self, memory_id: str) -> bool:
+        """Drop a buffered entry that is not being written yet."""
+        with self._lock:
+            if memory_id in self._writing:
+                return False
+            return self._pending.pop(memory_id, None) is not None
+
+    async def _write_pending(self) -> int:
+        """Write buffered entries not already being written, batch by batch."""
+        written = 0
+        while True:
+            with self._lock:
+                batch = [
+                    entry
+                    for memory_id, entry in self._pending.items()
+                    if memory_id not in self._writing
+                ][: self.batch_size]
+                if not batch:
+                    return written
+                self._writing.update(entry.memory_id for entry in batch)
+
+            try:
+                with stage("storage.memory_write", {"memory.batch_size": len(batch)}):
+                    await self.store.create_memories(batch)
+                written += len(batch)
+            except Exception as exc:  # noqa: BLE001 - a failed batch must not fail the run
+                logger.warning("Failed to persist %d buffered memories: %s", len(batch), exc)
+            finally:
+                with self._lock:
+                    for entry in batch:
+                        self._pending.pop(entry.memory_id, None)
+                        self._writing.discard(entry.memory_id)
+
+
+__all__ = ["MemoryWriteQueue"]
@@ -8,7 +8,7 @@ for queryability, with flexible JSON payloads for agent-specific data.
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Literal
+from typing import Any, Dict, List, Optional, Literal, Tuple
 
 from pydantic import BaseModel, Field
 
@@ -204,3 +204,17 @@ class RunSnapshotRecord(BaseModel):
     state: Dict[str, Any] = Field(default_factory=dict, description="Serialized run state payload")
     metadata: Dict[str, Any] = Field(default_factory=dict, description="Additional metadata for the snapshot")
     created_at: datetime = Field(description="Timestamp when snapshot was created")
+
+
+class IdempotencyRecord(BaseModel):
+    """Cached HTTP response stored for an idempotency key."""
+
+    key: str = Field(description="Scoped idempotency key (method:path:key)")
+    request_hash: str = Field(description="SHA-256 hash of the original request body")
+    status_code: int = Field(description="HTTP status code of the original response")
+    headers: List[Tuple[bytes, bytes]] = Field(
+        default_factory=list,
+        description="Raw response headers, preserving multi-value headers",
+    )
+    body: bytes = Field(default=b"", description="Response body bytes")
+    expires_at: datetime = Field(description="Timestamp after which the record is ignored")
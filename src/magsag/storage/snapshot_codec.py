@@ -0,0 +1,143 @@
+"""
+Compact encoding and state deltas for durable run snapshots.
+
+Payloads are msgpack packed and zstd compressed when both packages are
+installed (``pip install 'magsag[snapshot]'``), otherwise JSON compressed
+with zlib. Every payload starts with a magic and a codec byte, so files
+written with either codec stay readable as long as the codec is available.
+
+Deltas are computed against the previous snapshot's state: changed or
+added keys are stored whole, removed keys by name, and nested dicts
+recursively.
+"""
+
+from __future__ import annotations
+
+import json
+import zlib
+from typing import Any
+
+try:
+    import msgpack
+    import zstandard
+except ImportError:  # pragma: no cover - depends on installed extras
+    msgpack = None
+    zstandard = None
+
+MAGIC = b"MGSN"
+CODEC_JSON_ZLIB = 1
+CODEC_MSGPACK_ZSTD = 2
+
+_ZSTD_LEVEL = 3
+_ZLIB_LEVEL = 6
+
+
+def default_codec() -> int:
+    """Best codec available in this environment."""
+    return CODEC_MSGPACK_ZSTD if msgpack is not None else CODEC_JSON_ZLIB
+
+
+def encode_payload(value: Any, codec: int | None = None) -> bytes:
+    """
+    Encode a JSON-compatible value.
+
+    Args:
+        value: Dicts, lists, strings, numbers, booleans and None
+        codec: Codec to use (defaults to ``default_codec()``)
+
+    Raises:
+        ImportError: If msgpack+zstd is requested but not installed
+    """
+    codec = default_codec() if codec is None else codec
+    header = MAGIC + bytes([codec])
+    if codec == CODEC_MSGPACK_ZSTD:
+        _require_msgpack()
+        packed = msgpack.packb(value, use_bin_type=True)
+        compressed: bytes = zstandard.ZstdCompressor(level=_ZSTD_LEVEL).compress(packed)
+        return header + compressed
+    if codec == CODEC_JSON_ZLIB:
+        packed = json.dumps(value, separators=(",", ":")).encode("utf-8")
+        return header + zlib.compress(packed, _ZLIB_LEVEL)
+    raise ValueError(f"Unknown snapshot codec {codec}")
+
+
+def decode_payload(data: bytes) -> Any:
+    """
+    Decode a payload written by ``encode_payload``.
+
+    Raises:
+        ValueError: If the data is not a snapshot payload
+        ImportError: If it was written with msgpack+zstd and that is not installed
+    """
+    if len(data) <= len(MAGIC) or not data.startswith(MAGIC):
+        raise ValueError("Not a snapshot payload")
+    codec = data[len(MAGIC)]
+    body = data[len(MAGIC) + 1 :]
+    if codec == CODEC_MSGPACK_ZSTD:
+        _require_msgpack()
+        return msgpack.unpackb(zstandard.ZstdDecompressor().decompress(body), raw=False)
+    if codec == CODEC_JSON_ZLIB:
+        return json.loads(zlib.decompress(body))
+    raise ValueError(f"Unknown snapshot codec {codec}")
+
+
+def diff_state(base: dict[str, Any], state: dict[str, Any]) -> dict[str, Any]:
+    """
+    Delta turning ``base`` into ``state``.
+
+    Returns:
+        ``{"set": {...}, "unset": [...], "nested": {key: delta}}`` with empty
+        parts omitted (an empty dict when nothing changed)
+    """
+    delta: dict[str, Any] = {}
+    changed: dict[str, Any] = {}
+    nested: dict[str, Any] = {}
+    for key, value in state.items():
+        if key not in base:
+            changed[key] = value
+            continue
+        old = base[key]
+        if isinstance(old, dict) and isinstance(value, dict):
+            inner = diff_state(old, value)
+            if inner:
+                nested[key] = inner
+        elif type(old) is not type(value) or old != value:
+            changed[key] = value
+    removed = [key for key in base if key not in state]
+    if changed:
+        delta["set"] = changed
+    if removed:
+        delta["unset"] = removed
+    if nested:
+        delta["nested"] = nested
+    return delta
+
+
+def apply_delta(base: dict[str, Any], delta: dict[str, Any]) -> dict[str, Any]:
+    """Return ``base`` with ``delta`` applied; ``base`` is not modified."""
+    state = dict(base)
+    for key in delta.get("unset", ()):
+        state.pop(key, None)
+    state.update(delta.get("set", {}))
+    for key, inner in delta.get("nested", {}).items():
+        state[key] = apply_delta(state.get(key, {}), inner)
+    return state
+
+
+def _require_msgpack() -> None:
+    if msgpack is None:
+        raise ImportError(
+            "msgpack+zstd snapshots require msgpack and zstandard. "
+            "Install with: pip install 'magsag[snapshot]'"
+        )
+
+
+__all__ = [
+    "CODEC_JSON_ZLIB",
+    "CODEC_MSGPACK_ZSTD",
+    "apply_delta",
+    "decode_payload",
+    "default_codec",
+    "diff_state",
+    "encode_payload",
+]
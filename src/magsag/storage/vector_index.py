@@ -0,0 +1,137 @@
+"""In-memory embedding matrix for brute-force cosine search.
+
+``SQLiteMemoryStore`` keeps one ``VectorIndex`` per scope/agent filter it has
+been searched with. Rows are L2-normalised float32 vectors, so a search is a
+single matrix-vector product; writes update loaded indexes in place.
+Requires NumPy (``pip install magsag[cache]``).
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import threading
+from collections.abc import Mapping, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_NO_EXPIRY = math.inf
+
+
+def normalize(vector: Sequence[float] | np.ndarray) -> np.ndarray | None:
+    """Return ``vector`` as a unit-length float32 array, or None if it is all zeros."""
+    array = np.asarray(vector, dtype=np.float32).reshape(-1)
+    norm = float(np.linalg.norm(array))
+    if norm == 0.0 or not math.isfinite(norm):
+        return None
+    return array / norm
+
+
+class VectorIndex:
+    """Growable matrix of normalised embeddings keyed by memory ID."""
+
+    def __init__(self, dim: int, capacity: int = 64) -> None:
+        self.dim = dim
+        self._lock = threading.Lock()
+        self._matrix = np.zeros((capacity, dim), dtype=np.float32)
+        self._expires = np.full(capacity, _NO_EXPIRY)
+        self._ids: list[str] = []
+        self._positions: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, memory_id: object) -> bool:
+        return memory_id in self._positions
+
+    def upsert(
+        self, memory_id: str, embedding: Sequence[float], expires_at: float | None = None
+    ) -> None:
+        """Add or replace a row; embeddings of another dimension are skipped."""
+        vector = normalize(embedding)
+        if vector is None or vector.shape[0] != self.dim:
+            logger.warning(
+                "Skipping embedding of memory %s: expected %d non-zero dimensions",
+                memory_id,
+                self.dim,
+            )
+            self.remove(memory_id)
+            return
+        with self._lock:
+            position = self._positions.get(memory_id)
+            if position is None:
+                position = len(self._ids)
+                if position == self._matrix.shape[0]:
+                    self._grow()
+                self._ids.append(memory_id)
+                self._positions[memory_id] = position
+            self._matrix[position] = vector
+            self._expires[position] = _NO_EXPIRY if expires_at is None else expires_at
+
+    def remove(self, memory_id: str) -> None:
+        with self._lock:
+            position = self._positions.pop(memory_id, None)
+            if position is None:
+                return
+            # Move the last row into the hole to keep the matrix dense
+            last = len(self._ids) - 1
+            moved = self._ids.pop()
+            if position != last:
+                self._ids[position] = moved
+                self._positions[moved] = position
+                self._matrix[position] = self._matrix[last]
+                self._expires[position] = self._expires[last]
+
+    def search(
+        self,
+        embedding: Sequence[float],
+        k: int,
+        now: float,
+        text_scores: Mapping[str, float] | None = None,
+        text_weight: float = 0.0,
+    ) -> list[tuple[str, float]]:
+        """Return up to ``k`` live ``(memory_id, score)`` pairs, best first.
+
+        The score is the cosine similarity, blended with ``text_scores``
+        (0..1 per memory ID, missing IDs count as 0) when ``text_weight`` > 0.
+
+        Raises:
+            ValueError: If the query dimension does not match the index
+        """
+        query = normalize(embedding)
+        if query is not None and query.shape[0] != self.dim:
+            raise ValueError(
+                f"Query embedding has {query.shape[0]} dimensions, index has {self.dim}"
+            )
+        with self._lock:
+            size = len(self._ids)
+            if query is None or size == 0 or k <= 0:
+                return []
+            scores = self._matrix[:size] @ query
+            if text_weight:
+                text = np.zeros(size, dtype=np.float32)
+                for memory_id, score in (text_scores or {}).items():
+                    position = self._positions.get(memory_id)
+                    if position is not None:
+                        text[position] = score
+                scores = (1.0 - text_weight) * scores + text_weight * text
+            scores[self._expires[:size] <= now] = -np.inf
+            ids = list(self._ids)
+
+        top = min(k, size)
+        candidates = np.argpartition(-scores, top - 1)[:top]
+        ranked = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [(ids[i], float(scores[i])) for i in ranked if np.isfinite(scores[i])]
+
+    def _grow(self) -> None:
+        capacity = self._matrix.shape[0] * 2
+        matrix = np.zeros((capacity, self.dim), dtype=np.float32)
+        matrix[: len(self._ids)] = self._matrix[: len(self._ids)]
+        expires = np.full(capacity, _NO_EXPIRY)
+        expires[: len(self._ids)] = self._expires[: len(self._ids)]
+        self._matrix, self._expires = matrix, expires
+
+
+__all__ = ["VectorIndex", "normalize"]
@@ -38,6 +38,14 @@ class WorktreeSettings:
     root: Path
     max_concurrency: int
     ttl_spec: str
+    pool_size: int = 0
+    pool_base: str = "HEAD"
+    list_cache_ttl: float = 2.0
+
+    @property
+    def pool_dir(self) -> Path:
+        """Directory holding idle pre-created worktrees."""
+        return self.root / ".pool"
 
 
 @lru_cache
@@ -57,7 +65,28 @@ def get_worktree_settings() -> WorktreeSettings:
 
     ttl_spec = _get_env("MAGSAG_WT_TTL", "14d") or "14d"
 
-    return WorktreeSettings(root=root, max_concurrency=max_concurrency, ttl_spec=ttl_spec)
+    pool_size_raw = _get_env("MAGSAG_WT_POOL_SIZE", "0") or "0"
+    try:
+        pool_size = max(0, int(pool_size_raw))
+    except ValueError as exc:
+        raise ValueError(f"Invalid MAGSAG_WT_POOL_SIZE value: {pool_size_raw!r}") from exc
+
+    pool_base = _get_env("MAGSAG_WT_POOL_BASE", "HEAD") or "HEAD"
+
+    list_cache_ttl_raw = _get_env("MAGSAG_WT_LIST_CACHE_TTL", "2") or "2"
+    try:
+        list_cache_ttl = max(0.0, float(list_cache_ttl_raw))
+    except ValueError as exc:
+        raise ValueError(f"Invalid MAGSAG_WT_LIST_CACHE_TTL value: {list_cache_ttl_raw!r}") from exc
+
+    return WorktreeSettings(
+        root=root,
+        max_concurrency=max_concurrency,
+        ttl_spec=ttl_spec,
+        pool_size=pool_size,
+        pool_base=pool_base,
+        list_cache_ttl=list_cache_ttl,
+    )
 
 
 def ensure_within_root(path: Path, root: Path | None = None) -> Path:
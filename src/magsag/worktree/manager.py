@@ -32,6 +32,7 @@ from .metadata import (
     write_metadata,
 )
 from .naming import branch_name, directory_name, sanitize_segment
+from .pool import WorktreePool
 from .types import WorktreeInfo
 from .events import publish_event
 
@@ -193,6 +194,15 @@ class WorktreeRecord:
         return data
 
 
+@dataclass(slots=True)
+class _ListingCache:
+    """Worktree records with the admin-directory state they were read from."""
+
+    records: list[WorktreeRecord]
+    fingerprint: tuple[object, ...]
+    loaded_at: float
+
+
 class WorktreeManager:
     """Encapsulates Git worktree lifecycle management."""
 
@@ -204,12 +214,32 @@ class WorktreeManager:
     ):
         self.settings = settings or get_worktree_settings()
         self.repo_root = repo_root or find_project_root()
+        self.pool = WorktreePool(self.settings, self.repo_root)
+        self._listing: _ListingCache | None = None
+        self._git_common_dir: Path | None = None
 
     # ------------------------------------------------------------------
     # Listing helpers
 
-    def list_records(self) -> list[WorktreeRecord]:
-        """Return a list of worktree records including the primary checkout."""
+    def list_records(self, *, refresh: bool = False) -> list[WorktreeRecord]:
+        """
+        Return a list of worktree records including the primary checkout.
+
+        Listings are cached for ``settings.list_cache_ttl`` seconds. The cache
+        is dropped by every mutation made through this manager and whenever
+        Git's worktree admin files change, so worktrees added or removed by
+        other processes are picked up immediately.
+        """
+        fingerprint = self._admin_fingerprint()
+        cached = self._listing
+        if (
+            not refresh
+            and cached is not None
+            and cached.fingerprint == fingerprint
+            and perf_counter() - cached.loaded_at < self.settings.list_cache_ttl
+        ):
+            return list(cached.records)
+
         with trace_span(
             "git.worktree.list",
             {
@@ -231,7 +261,13 @@ class WorktreeManager:
             except FileNotFoundError:
                 meta = None
             records.append(WorktreeRecord(info=info, metadata=meta))
-        return records
+        if self.settings.list_cache_ttl > 0:
+            self._listing = _ListingCache(records, fingerprint, perf_counter())
+        return list(records)
+
+    def invalidate_listing(self) -> None:
+        """Drop the cached worktree listing."""
+        self._listing = None
 
     def _filter_managed(self, records: list[WorktreeRecord]) -> list[WorktreeRecord]:
         """Filter records that live under the managed worktree root."""
@@ -241,6 +277,8 @@ class WorktreeManager:
                 record.info.path.resolve().relative_to(self.settings.root)
             except ValueError:
                 continue
+            if self.pool.contains(record.info.path):
+                continue
             managed.append(record)
         return managed
 
@@ -262,7 +300,13 @@ class WorktreeManager:
         lock_reason: str | None = None,
         auto_lock: bool = False,
     ) -> WorktreeRecord:
-        """Create a new worktree following MAGSAG naming conventions."""
+        """
+        Create a new worktree following MAGSAG naming conventions.
+
+        When the worktree pool is enabled, an idle pre-created worktree is
+        moved into place and checked out at ``base`` instead of running
+        ``git worktree add``.
+        """
         self._enforce_concurrency_limit()
         if detach and _is_protected_base(base):
             raise WorktreeForbiddenError(
@@ -281,6 +325,7 @@ class WorktreeManager:
             branch = branch_name(run_id, task)
             self._ensure_branch_available(branch)
 
+        use_pool = self.pool.enabled and not no_checkout
         args: list[str] = ["worktree", "add"]
         if detach:
             args.append("--detach")
@@ -317,8 +362,12 @@ class WorktreeManager:
                 "worktree.short_sha": metadata.short_sha,
             },
         ) as span:
-            git_run(args, cwd=self.repo_root)
+            pooled = use_pool and self._create_from_pool(worktree_path, base=base, branch=branch)
+            span.set_attribute("worktree.pooled", pooled)
+            if not pooled:
+                git_run(args, cwd=self.repo_root)
             write_metadata(worktree_path, metadata)
+            self.invalidate_listing()
             records = self.list_records()
             record = self._record_for_path(worktree_path, records=records)
             span.set_attribute("worktree.id", record.info.path.name)
@@ -331,6 +380,7 @@ class WorktreeManager:
                 record=record,
                 locked=True,
             )
+            self.invalidate_listing()
             records = self.list_records()
             record = self._record_for_path(worktree_path, records=records)
 
@@ -354,12 +404,18 @@ class WorktreeManager:
     # Mutating operations
 
     def remove(self, run_id: str, *, force: bool = False) -> None:
-        """Remove a worktree identified by run ID."""
+        """
+        Remove a worktree identified by run ID.
+
+        With the pool enabled and below its size, an unlocked worktree is
+        reset, cleaned and returned to the pool rather than deleted.
+        """
         record = self._resolve_run_id(run_id)
         if record is None:
             raise WorktreeNotFoundError(f"No worktree found for run_id={run_id}")
         payload = record.to_dict()
         payload["force"] = force
+        payload["recycled"] = False
 
         if force and not force_removal_allowed():
             raise WorktreeForbiddenError(
@@ -404,7 +460,12 @@ class WorktreeManager:
                     span.set_attribute("worktree.task", record.info.task_slug)
             if record.info.head:
                 span.set_attribute("worktree.head", record.info.head)
-            git_run(args, cwd=self.repo_root)
+            recycled = self._release_to_pool(record)
+            span.set_attribute("worktree.recycled", recycled)
+            if not recycled:
+                git_run(args, cwd=self.repo_root)
+            self.invalidate_listing()
+        payload["recycled"] = recycled
         duration_ms = (perf_counter() - start) * 1000
         records = self.list_records()
         _record_remove_duration(
@@ -426,6 +487,7 @@ class WorktreeManager:
         """Lock a worktree to prevent garbage collection."""
         record = self._resolve_or_raise(run_id)
         self._lock_path(record.info.path, reason=reason, record=record, locked=True)
+        self.invalidate_listing()
         records = self.list_records()
         updated = self._record_for_path(record.info.path, records=records)
         publish_event("worktree.lock", updated.to_dict())
@@ -454,6 +516,7 @@ class WorktreeManager:
                     span.set_attribute("worktree.task", record.info.task_slug)
             args = ["worktree", "unlock", str(record.info.path)]
             git_run(args, cwd=self.repo_root)
+        self.invalidate_listing()
         records = self.list_records()
         updated = self._record_for_path(record.info.path, records=records)
         publish_event("worktree.unlock", updated.to_dict())
@@ -477,6 +540,7 @@ class WorktreeManager:
         ) as span:
             span.set_attribute("worktree.before_count", before)
             git_run(["worktree", "prune", f"--expire={ttl}"], cwd=self.repo_root)
+            self.invalidate_listing()
             after_records = self.list_records()
             managed_after = self._filter_managed(after_records)
             after = len(managed_after)
@@ -504,6 +568,7 @@ class WorktreeManager:
             },
         ):
             git_run(["worktree", "repair"], cwd=self.repo_root)
+        self.invalidate_listing()
         publish_event(
             "worktree.repair",
             {
@@ -512,9 +577,86 @@ class WorktreeManager:
             },
         )
 
+    def warm_pool(self, size: int | None = None) -> int:
+        """
+        Pre-create idle worktrees until the pool holds ``size`` of them.
+
+        Args:
+            size: Target idle count (defaults to ``settings.pool_size``)
+
+        Returns:
+            Number of worktrees created
+        """
+        try:
+            return self.pool.warm(lambda: self.list_records(refresh=True), size=size)
+        finally:
+            self.invalidate_listing()
+
+    def pool_records(self) -> list[WorktreeRecord]:
+        """Return the idle worktrees currently held by the pool."""
+        return self.pool.idle_slots(self.list_records())
+
     # ------------------------------------------------------------------
     # Internal helpers
 
+    def _create_from_pool(self, path: Path, *, base: str, branch: str | None) -> bool:
+        if not self.pool.claim(path, self.list_records()):
+            return False
+        self.invalidate_listing()
+        try:
+            self.pool.checkout(path, base=base, branch=branch)
+        except GitCommandError:
+            git_run(["worktree", "remove", "--force", str(path)], cwd=self.repo_root)
+            raise
+        return True
+
+    def _release_to_pool(self, record: WorktreeRecord) -> bool:
+        if not self.pool.enabled or record.info.locked:
+            return False
+        if len(self.pool_records()) >= self.settings.pool_size:
+            return False
+        return self.pool.recycle(record.info.path)
+
+    def _common_dir(self) -> Path:
+        if self._git_common_dir is None:
+            dot_git = self.repo_root / ".git"
+            if dot_git.is_dir():
+                self._git_common_dir = dot_git
+            else:
+                result = git_run(
+                    ["rev-parse", "--path-format=absolute", "--git-common-dir"],
+                    cwd=self.repo_root,
+                )
+                self._git_common_dir = Path(
+                    (result.stdout or b"").decode("utf-8", errors="replace").strip()
+                )
+        return self._git_common_dir
+
+    def _admin_fingerprint(self) -> tuple[object, ...]:
+        """Cheap stat-based summary of Git's worktree admin files."""
+        if self.settings.list_cache_ttl <= 0:
+            return ()
+        common = self._common_dir()
+        stamps: list[object] = []
+        for path in (common / "HEAD", common / "worktrees"):
+            try:
+                stamps.append(path.stat().st_mtime_ns)
+            except OSError:
+                stamps.append(None)
+        try:
+            entries = sorted(os.scandir(common / "worktrees"), key=lambda e: e.name)
+        except OSError:
+            entries = []
+        for entry in entries:
+            stamps.append(entry.name)
+            admin = Path(entry.path)
+            for item in (admin, admin / "gitdir", admin / "locked"):
+                try:
+                    stamps.append(item.stat().st_mtime_ns)
+                except OSError:
+                    stamps.append(None)
+        return tuple(stamps)
+
     def _enforce_concurrency_limit(self) -> None:
         active = sum(1 for record in self.managed_records() if record.info.path.exists())
         if active >= self.settings.max_concurrency:
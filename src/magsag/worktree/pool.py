@@ -0,0 +1,152 @@
+"""Pool of pre-created detached worktrees for fast provisioning."""
+
+from __future__ import annotations
+
+import uuid
+from collections.abc import Callable
+from pathlib import Path
+from threading import Lock
+from typing import TYPE_CHECKING
+
+from magsag.observability.tracing import trace_span
+
+from .config import WorktreeSettings
+from .exceptions import GitCommandError, WorktreeError
+from .git import run as git_run
+
+if TYPE_CHECKING:
+    from .manager import WorktreeRecord
+
+SLOT_PREFIX = "slot-"
+
+# Serialises pool top-ups so concurrent requests do not overfill the pool
+_warm_lock = Lock()
+
+
+class WorktreePool:
+    """
+    Idle detached worktrees kept under ``<root>/.pool``.
+
+    Creating a worktree from the pool moves an idle slot into place and checks
+    out the requested base, which only touches files that differ. Released
+    worktrees are reset and cleaned back into the pool instead of being
+    removed. Slots are claimed with ``git worktree move``, so concurrent
+    processes never receive the same slot.
+    """
+
+    def __init__(self, settings: WorktreeSettings, repo_root: Path):
+        self.settings = settings
+        self.repo_root = repo_root
+
+    @property
+    def enabled(self) -> bool:
+        return self.settings.pool_size > 0
+
+    @property
+    def directory(self) -> Path:
+        return self.settings.pool_dir
+
+    def contains(self, path: Path) -> bool:
+        """Return True when ``path`` is a pool slot."""
+        return path.resolve().parent == self.directory.resolve()
+
+    def idle_slots(self, records: list[WorktreeRecord]) -> list[WorktreeRecord]:
+        """Return registered slots that still exist on disk."""
+        return [
+            record
+            for record in records
+            if self.contains(record.info.path)
+            and record.info.path.exists()
+            and not record.info.locked
+        ]
+
+    def claim(self, target: Path, records: list[WorktreeRecord]) -> bool:
+        """
+        Move an idle slot to ``target``.
+
+        Returns:
+            True if a slot was moved, False when the pool has none left
+        """
+        for record in self.idle_slots(records):
+            try:
+                git_run(
+                    ["worktree", "move", str(record.info.path), str(target)],
+                    cwd=self.repo_root,
+                )
+            except GitCommandError:
+                # Claimed by another process in the meantime (or not movable)
+                continue
+            return True
+        return False
+
+    def checkout(self, path: Path, *, base: str, branch: str | None) -> None:
+        """Point a claimed slot at ``base``, on a new ``branch`` unless detached."""
+        if branch:
+            args = ["checkout", "--no-track", "-b", branch, base]
+        else:
+            args = ["checkout", "--detach", base]
+        git_run(args, cwd=path)
+
+    def recycle(self, path: Path) -> bool:
+        """
+        Reset a released worktree and move it back into the pool.
+
+        Returns:
+            True if recycled, False if the worktree must be removed instead
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        slot = self.directory / f"{SLOT_PREFIX}{uuid.uuid4().hex[:12]}"
+        with trace_span(
+            "git.worktree.recycle",
+            {"worktree.path": str(path), "worktree.pool_slot": slot.name},
+        ):
+            try:
+                base_sha = self._resolve_base()
+                git_run(["checkout", "--force", "--detach", base_sha], cwd=path)
+                git_run(["clean", "-ffdx"], cwd=path)
+                git_run(["worktree", "move", str(path), str(slot)], cwd=self.repo_root)
+            except (GitCommandError, WorktreeError):
+                return False
+        return True
+
+    def warm(
+        self,
+        records: Callable[[], list[WorktreeRecord]],
+        size: int | None = None,
+    ) -> int:
+        """
+        Create detached slots at the pool base until ``size`` are idle.
+
+        ``records`` is called under the pool lock to count idle slots.
+
+        Returns:
+            Number of slots created
+        """
+        target = self.settings.pool_size if size is None else size
+        with _warm_lock:
+            missing = target - len(self.idle_slots(records()))
+            if missing <= 0:
+                return 0
+            self.directory.mkdir(parents=True, exist_ok=True)
+            base_sha = self._resolve_base()
+            with trace_span(
+                "git.worktree.pool.warm",
+                {
+                    "worktree.pool_base": self.settings.pool_base,
+                    "worktree.pool_missing": missing,
+                },
+            ):
+                for _ in range(missing):
+                    slot = self.directory / f"{SLOT_PREFIX}{uuid.uuid4().hex[:12]}"
+                    git_run(
+                        ["worktree", "add", "--detach", str(slot), base_sha],
+                        cwd=self.repo_root,
+                    )
+        return missing
+
+    def _resolve_base(self) -> str:
+        result = git_run(["rev-parse", "--verify", self.settings.pool_base], cwd=self.repo_root)
+        value = (result.stdout or b"").decode("utf-8", errors="replace").strip()
+        if not value:
+            raise WorktreeError(f"Unable to resolve pool base {self.settings.pool_base}")
+        return value
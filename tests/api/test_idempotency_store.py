@@ -0,0 +1,158 @@
+"""Tests for idempotency stores."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from typing import AsyncIterator
+
+import pytest
+import pytest_asyncio
+
+from magsag.api.middleware.idempotency import IdempotencyStore, StorageIdempotencyStore
+from magsag.storage.backends.sqlite import SQLiteStorageBackend
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_memory_store_expires_entries() -> None:
+    clock = FakeClock()
+    store = IdempotencyStore(ttl_seconds=10, clock=clock)
+    store.set("a", "h", b"body", 200, [])
+
+    clock.now += 5
+    assert store.get("a") == ("h", b"body", 200, [])
+
+    clock.now += 6
+    assert store.get("a") is None
+    assert len(store) == 0
+    assert store.size_bytes == 0
+
+
+def test_memory_store_cleanup_uses_expiry_order() -> None:
+    clock = FakeClock()
+    store = IdempotencyStore(ttl_seconds=10, clock=clock)
+    store.set("a", "h", b"1", 200, [])
+    clock.now += 5
+    store.set("b", "h", b"2", 200, [])
+    # Re-setting "a" extends its expiry; the stale heap entry must be ignored
+    store.set("a", "h", b"3", 200, [])
+
+    clock.now += 6
+    assert store.cleanup_expired() == 0
+    clock.now += 5
+    assert store.cleanup_expired() == 2
+    assert len(store) == 0
+
+
+def test_memory_store_evicts_least_recently_used() -> None:
+    store = IdempotencyStore(max_entries=2)
+    store.set("a", "h", b"1", 200, [])
+    store.set("b", "h", b"2", 200, [])
+    assert store.get("a") is not None
+
+    store.set("c", "h", b"3", 200, [])
+
+    assert store.get("b") is None
+    assert store.get("a") is not None
+    assert store.get("c") is not None
+
+
+def test_memory_store_respects_byte_budget() -> None:
+    store = IdempotencyStore(max_bytes=100)
+    store.set("a", "h", b"x" * 40, 200, [])
+    store.set("b", "h", b"x" * 40, 200, [])
+    store.set("c", "h", b"x" * 40, 200, [])
+
+    assert store.get("a") is None
+    assert store.size_bytes <= 100
+
+    store.set("huge", "h", b"x" * 200, 200, [])
+    assert store.get("huge") is None
+    assert store.get("c") is not None
+
+
+@pytest.mark.asyncio
+async def test_memory_store_locks_are_released() -> None:
+    store = IdempotencyStore()
+    order: list[str] = []
+
+    async def worker(name: str) -> None:
+        async with store.lock("k"):
+            order.append(f"{name}-start")
+            await asyncio.sleep(0.01)
+            order.append(f"{name}-end")
+
+    await asyncio.gather(worker("a"), worker("b"))
+
+    assert order in (
+        ["a-start", "a-end", "b-start", "b-end"],
+        ["b-start", "b-end", "a-start", "a-end"],
+    )
+    assert len(store._locks) == 0
+
+
+@pytest_asyncio.fixture
+async def backends(
+    tmp_path: Path,
+) -> AsyncIterator[tuple[SQLiteStorageBackend, SQLiteStorageBackend]]:
+    """Two backends on one database file, standing in for two API workers."""
+    db_path = tmp_path / "idempotency.db"
+    first = SQLiteStorageBackend(db_path=db_path, enable_fts=False)
+    second = SQLiteStorageBackend(db_path=db_path, enable_fts=False)
+    await first.initialize()
+    await second.initialize()
+    yield first, second
+    await first.close()
+    await second.close()
+
+
+@pytest.mark.asyncio
+async def test_storage_store_serialises_across_workers(
+    backends: tuple[SQLiteStorageBackend, SQLiteStorageBackend],
+) -> None:
+    first = StorageIdempotencyStore(storage=backends[0], poll_interval=0.01)
+    second = StorageIdempotencyStore(storage=backends[1], poll_interval=0.01)
+    executions = 0
+
+    async def handle(
+        store: StorageIdempotencyStore,
+    ) -> tuple[str, bytes, int, list[tuple[bytes, bytes]]]:
+        nonlocal executions
+        async with store.lock("POST:/runs:k"):
+            stored = await store.lookup("POST:/runs:k")
+            if stored is not None:
+                return stored
+            executions += 1
+            await asyncio.sleep(0.05)
+            await store.save("POST:/runs:k", "h", b"done", 200, [(b"x-a", b"1")])
+            return ("h", b"done", 200, [(b"x-a", b"1")])
+
+    results = await asyncio.gather(handle(first), handle(second), handle(first))
+
+    assert executions == 1
+    assert all(result == ("h", b"done", 200, [(b"x-a", b"1")]) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_storage_store_releases_unsaved_claim(
+    backends: tuple[SQLiteStorageBackend, SQLiteStorageBackend],
+) -> None:
+    first = StorageIdempotencyStore(storage=backends[0], poll_interval=0.01)
+    second = StorageIdempotencyStore(storage=backends[1], poll_interval=0.01)
+
+    async with first.lock("k"):
+        # Request failed: nothing saved
+        pass
+
+    async with second.lock("k"):
+        assert await second.lookup("k") is None
+        await second.save("k", "h", b"ok", 200, [])
+
+    assert await first.lookup("k") == ("h", b"ok", 200, [])
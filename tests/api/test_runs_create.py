@@ -1,9 +1,12 @@
 """Tests for POST /runs endpoint and idempotency middleware."""
 from __future__ import annotations
 import asyncio
-from typing import Any, Dict, Iterator
+import json
+from typing import Any, AsyncIterator, Dict, Iterator
 from unittest.mock import MagicMock, patch
 import pytest
+from fastapi import Request
+from fastapi.responses import StreamingResponse
 from fastapi.testclient import TestClient
 
 @pytest.fixture
@@ -287,15 +290,61 @@ class TestIdempotencyMiddleware:
                 response = await client.post('/test-cleanup', json={}, headers={'Idempotency-Key': f'cleanup-key-{i}'})
                 assert response.status_code == 200
         assert middleware_instance is not None
-        initial_lock_count = len(middleware_instance._locks)
-        assert initial_lock_count == 10, f'Expected 10 locks, got {initial_lock_count}'
+        assert len(test_store._locks) == 0, 'Per-key locks should be released after each request'
+        assert len(test_store) == 10
         for i in range(5):
             scoped_key = f'POST:/test-cleanup:cleanup-key-{i}'
-            if scoped_key in test_store._store:
-                del test_store._store[scoped_key]
-        await middleware_instance._cleanup_locks()
-        after_cleanup_count = len(middleware_instance._locks)
-        assert after_cleanup_count == 5, f'Expected 5 locks after cleanup, got {after_cleanup_count}'
+            test_store._remove(scoped_key)
+        assert len(test_store) == 5
+
+    @pytest.mark.asyncio
+    async def test_idempotency_key_released_before_background_tasks(self) -> None:
+        """Duplicates are replayed while the first request's background task still runs."""
+        from fastapi import FastAPI, Response
+        from httpx import ASGITransport, AsyncClient
+        from starlette.background import BackgroundTask
+
+        from magsag.api.middleware.idempotency import IdempotencyMiddleware, IdempotencyStore
+        store = IdempotencyStore(ttl_seconds=10)
+        finish_background = asyncio.Event()
+        test_app = FastAPI()
+        test_app.add_middleware(IdempotencyMiddleware, store=store)
+
+        @test_app.post('/slow-background')
+        async def test_endpoint() -> Response:
+            response = Response(content='{"status": "ok"}', media_type='application/json')
+            response.background = BackgroundTask(finish_background.wait)
+            return response
+        async with AsyncClient(transport=ASGITransport(app=test_app), base_url='http://test') as client:
+            first = asyncio.create_task(client.post('/slow-background', json={}, headers={'Idempotency-Key': 'bg-lock'}))
+            while len(store) == 0:
+                await asyncio.sleep(0.01)
+            second = await asyncio.wait_for(client.post('/slow-background', json={}, headers={'Idempotency-Key': 'bg-lock'}), timeout=5.0)
+            assert second.headers.get('X-Idempotency-Replay') == 'true'
+            assert not first.done()
+            finish_background.set()
+            assert (await first).status_code == 200
+        assert len(store._locks) == 0
+
+    @pytest.mark.asyncio
+    async def test_idempotency_client_disconnect_while_reading_body(self) -> None:
+        """A client that disconnects mid-body gets no response and the app is not called."""
+        from magsag.api.middleware.idempotency import IdempotencyMiddleware
+        called: list[bool] = []
+        sent: list[Any] = []
+
+        async def app(scope: Any, receive: Any, send: Any) -> None:
+            called.append(True)
+        messages = [{'type': 'http.request', 'body': b'{"a"', 'more_body': True}, {'type': 'http.disconnect'}]
+
+        async def receive() -> Any:
+            return messages.pop(0)
+
+        async def send(message: Any) -> None:
+            sent.append(message)
+        scope = {'type': 'http', 'method': 'POST', 'path': '/runs', 'headers': [(b'idempotency-key', b'gone')]}
+        await IdempotencyMiddleware(app)(scope, receive, send)
+        assert called == [] and sent == []
 
     def test_idempotency_preserves_multi_value_headers(self) -> None:
         """Test that multi-value headers like Set-Cookie are preserved in cached responses."""
@@ -366,6 +415,87 @@ class TestIdempotencyMiddleware:
         assert data_b2 == data_b1
         assert response_b2.headers.get('X-Idempotency-Replay') == 'true'
 
+    @pytest.mark.asyncio
+    async def test_unkeyed_requests_and_streams_pass_through(self) -> None:
+        """Bodies are not buffered without a key, and streamed responses are never cached."""
+        from fastapi import FastAPI
+        from httpx import ASGITransport, AsyncClient
+        from magsag.api.middleware import IdempotencyMiddleware
+        received: list[int] = []
+        calls: Dict[str, int] = {'count': 0}
+        test_app = FastAPI()
+        test_app.add_middleware(IdempotencyMiddleware)
+
+        @test_app.post('/upload')
+        async def upload(request: Request) -> dict[str, int]:
+            async for chunk in request.stream():
+                if chunk:
+                    received.append(len(chunk))
+            return {'chunks': len(received)}
+
+        @test_app.post('/stream')
+        async def stream() -> StreamingResponse:
+            calls['count'] += 1
+
+            async def lines() -> AsyncIterator[bytes]:
+                for n in range(3):
+                    yield f'{n}\n'.encode()
+            return StreamingResponse(lines(), media_type='application/x-ndjson')
+
+        async def body() -> AsyncIterator[bytes]:
+            for _ in range(3):
+                yield b'x' * 10
+        async with AsyncClient(transport=ASGITransport(app=test_app), base_url='http://test') as test_client:
+            response = await test_client.post('/upload', content=body(), headers={'Content-Type': 'application/octet-stream'})
+            assert response.json() == {'chunks': 3}
+            for _ in range(2):
+                response = await test_client.post('/stream', json={}, headers={'Idempotency-Key': 'stream-key'})
+                assert response.text == '0\n1\n2\n'
+                assert response.headers.get('X-Idempotency-Replay') is None
+        assert calls['count'] == 2
+
+class TestRequestSizeLimit:
+    """Tests for RequestSizeLimitMiddleware."""
+
+    @staticmethod
+    def _app() -> Any:
+        from fastapi import FastAPI
+        from magsag.api.middleware import IdempotencyMiddleware, RequestSizeLimitMiddleware
+        test_app = FastAPI()
+        test_app.add_middleware(IdempotencyMiddleware)
+        test_app.add_middleware(RequestSizeLimitMiddleware, max_bytes=16)
+
+        @test_app.post('/echo')
+        async def echo(request: Request) -> dict[str, int]:
+            return {'size': len(await request.body())}
+        return test_app
+
+    @pytest.mark.asyncio
+    async def test_streamed_body_over_limit_is_rejected(self) -> None:
+        """Bodies without Content-Length are counted while they stream in."""
+        from httpx import ASGITransport, AsyncClient
+
+        async def body() -> AsyncIterator[bytes]:
+            for _ in range(4):
+                yield b'x' * 8
+        async with AsyncClient(transport=ASGITransport(app=self._app()), base_url='http://test') as test_client:
+            small = await test_client.post('/echo', content=b'x' * 16)
+            assert small.json() == {'size': 16}
+            declared = await test_client.post('/echo', content=b'x' * 17)
+            assert declared.status_code == 413
+            assert declared.json()['code'] == 'invalid_payload'
+            streamed = await test_client.post('/echo', content=body())
+            assert streamed.status_code == 413
+            keyed = await test_client.post('/echo', content=body(), headers={'Idempotency-Key': 'big'})
+            assert keyed.status_code == 413
+            assert keyed.json() == {'code': 'invalid_payload', 'message': 'Request body too large'}
+
+    def test_invalid_content_length(self, client: TestClient) -> None:
+        """A malformed Content-Length header is rejected."""
+        response = client.post('/api/v1/runs', content=b'{}', headers={'Content-Length': 'abc', 'Content-Type': 'application/json'})
+        assert response.status_code == 400
+        assert response.json()['message'] == 'Invalid Content-Length header'
+
 class TestAuthenticationAndRateLimit:
     """Tests for authentication and rate limiting on POST /runs."""
 
@@ -379,3 +509,52 @@ class TestAuthenticationAndRateLimit:
         for _ in range(5):
             response = client.post('/api/v1/runs', json={'agent': 'test-agent', 'payload': {'input': 'test'}})
             assert response.status_code in [200, 429]
+
+class _FakeRunner:
+    """Runner stub whose invoke_mag fails for payloads marked 'fail'."""
+
+    def invoke_mag(self, slug: str, payload: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
+        context['run_id'] = f"mag-{payload['n']}"
+        if payload.get('fail'):
+            raise RuntimeError('boom')
+        return {'n': payload['n'], 'agent': slug}
+
+class TestBatchRunsEndpoint:
+    """Tests for POST /runs:batch endpoint."""
+
+    def test_batch_streams_results_in_order(self, client: TestClient) -> None:
+        """Results stream as NDJSON in input order, failures included."""
+        with patch('magsag.runners.agent_runner.get_runner', return_value=_FakeRunner()):
+            response = client.post('/api/v1/runs:batch', json={'agent': 'test-agent', 'concurrency': 3, 'items': [{'payload': {'n': n, 'fail': n == 2}, 'id': f'item-{n}'} for n in range(5)] + [{'agent': 'other-agent', 'payload': {'n': 5}}]})
+        assert response.status_code == 200
+        assert response.headers['content-type'].startswith('application/x-ndjson')
+        results = [json.loads(line) for line in response.text.splitlines()]
+        assert [r['index'] for r in results] == list(range(6))
+        assert [r['status'] for r in results] == ['completed', 'completed', 'failed', 'completed', 'completed', 'completed']
+        assert results[2]['error'] == 'RuntimeError: boom'
+        assert results[2]['run_id'] == 'mag-2'
+        assert results[0]['id'] == 'item-0'
+        assert results[5]['output'] == {'n': 5, 'agent': 'other-agent'}
+
+    def test_batch_item_without_agent(self, client: TestClient) -> None:
+        """Items need an agent of their own or a batch default."""
+        response = client.post('/api/v1/runs:batch', json={'items': [{'payload': {'n': 0}}]})
+        assert response.status_code == 400
+        assert response.json()['code'] == 'invalid_payload'
+
+    def test_batch_larger_than_rate_limit_is_paced(self, client: TestClient) -> None:
+        """Items are charged as they start, so a batch may cost more than one bucket."""
+        from magsag.api.config import Settings, get_settings
+        from magsag.api.rate_limit import RUN_COST, reset_rate_limiter
+        from magsag.api.server import app
+        reset_rate_limiter()
+        app.dependency_overrides[get_settings] = lambda: Settings(RATE_LIMIT_QPS=4 * RUN_COST)
+        try:
+            with patch('magsag.runners.agent_runner.get_runner', return_value=_FakeRunner()):
+                response = client.post('/api/v1/runs:batch', json={'agent': 'test-agent', 'items': [{'payload': {'n': n}} for n in range(6)]})
+        finally:
+            app.dependency_overrides.pop(get_settings, None)
+            reset_rate_limiter()
+        assert response.status_code == 200
+        results = [json.loads(line) for line in response.text.splitlines()]
+        assert [r['status'] for r in results] == ['completed'] * 6
@@ -0,0 +1,116 @@
+"""Tests for event-driven approval decisions."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from pathlib import Path
+from typing import AsyncIterator
+
+import pytest
+
+from magsag.governance.approval_events import ApprovalNotifier
+from magsag.governance.approval_gate import ApprovalGate
+from magsag.governance.permission_evaluator import PermissionEvaluator
+from magsag.storage.backends.sqlite import SQLiteStorageBackend
+
+
+@pytest.fixture
+def evaluator(tmp_path: Path) -> PermissionEvaluator:
+    policy_path = tmp_path / "tool_permissions.yaml"
+    policy_path.write_text("default_permission: REQUIRE_APPROVAL\n")
+    return PermissionEvaluator(policy_path=policy_path)
+
+
+async def test_notifier_wakes_subscriber() -> None:
+    notifier = ApprovalNotifier()
+
+    with notifier.subscribe("ticket-1") as subscription:
+        asyncio.get_running_loop().call_later(0.01, notifier.publish, "ticket-1", "approved")
+        notifier.publish("ticket-2", "denied")
+        assert await subscription.wait(timeout=1.0) == "approved"
+        assert await subscription.wait(timeout=0.01) is None
+
+    notifier.publish("ticket-1", "denied")
+    assert not notifier._subscribers
+
+
+async def test_wait_for_decision_does_not_wait_for_poll_interval(
+    evaluator: PermissionEvaluator,
+) -> None:
+    gate = ApprovalGate(permission_evaluator=evaluator, notifier=ApprovalNotifier())
+    ticket = await gate.create_ticket(
+        run_id="run-1",
+        agent_slug="agent",
+        tool_name="fs.write",
+        tool_args={"path": "/tmp/x"},
+    )
+
+    async def approve_later() -> None:
+        await asyncio.sleep(0.05)
+        await gate.approve_ticket(ticket.ticket_id, "admin")
+
+    approver = asyncio.create_task(approve_later())
+    start = time.perf_counter()
+    result = await gate.wait_for_decision(ticket, poll_interval_seconds=30.0)
+    await approver
+
+    assert result.status == "approved"
+    assert time.perf_counter() - start < 5.0
+
+
+@pytest.fixture
+async def shared_db(
+    tmp_path: Path,
+) -> AsyncIterator[tuple[SQLiteStorageBackend, SQLiteStorageBackend]]:
+    db_path = tmp_path / "approvals.db"
+    first = SQLiteStorageBackend(db_path=db_path)
+    second = SQLiteStorageBackend(db_path=db_path)
+    await first.initialize()
+    await second.initialize()
+    yield first, second
+    await first.close()
+    await second.close()
+
+
+async def test_decision_from_other_backend_wakes_waiter(
+    evaluator: PermissionEvaluator,
+    shared_db: tuple[SQLiteStorageBackend, SQLiteStorageBackend],
+) -> None:
+    """Two gates on one database stand in for two worker processes."""
+    store_a, store_b = shared_db
+    gate_a = ApprovalGate(
+        permission_evaluator=evaluator,
+        ticket_store=store_a,
+        notifier=ApprovalNotifier(poll_interval=0.02),
+    )
+    gate_b = ApprovalGate(
+        permission_evaluator=evaluator,
+        ticket_store=store_b,
+        notifier=ApprovalNotifier(poll_interval=0.02),
+    )
+
+    ticket = await gate_a.create_ticket(
+        run_id="run-1",
+        agent_slug="agent",
+        tool_name="fs.write",
+        tool_args={"path": "/tmp/x"},
+    )
+
+    async def approve_elsewhere() -> None:
+        await asyncio.sleep(0.05)
+        await gate_b.approve_ticket(ticket.ticket_id, "admin")
+
+    approver = asyncio.create_task(approve_elsewhere())
+    start = time.perf_counter()
+    result = await asyncio.wait_for(
+        gate_a.wait_for_decision(ticket, poll_interval_seconds=30.0), timeout=5.0
+    )
+    await approver
+
+    assert result.status == "approved"
+    assert result.resolved_by == "admin"
+    assert result.tool_args == {"path": "/tmp/x"}
+    assert time.perf_counter() - start < 5.0
+    # Watcher task stops once the last subscriber leaves
+    assert not gate_a.notifier._watchers
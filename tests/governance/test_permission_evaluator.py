@@ -0,0 +1,161 @@
+"""Tests for the compiled permission evaluator."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from magsag.core.permissions import ToolPermission
+from magsag.governance.permission_evaluator import (
+    PermissionEvaluator,
+    PermissionEvaluatorError,
+)
+
+POLICY = """
+default_permission: REQUIRE_APPROVAL
+
+tools:
+  "filesystem.read_file":
+    permission: ALWAYS
+
+categories:
+  read_only:
+    permission: ALWAYS
+    tools:
+      - "*.get_*"
+  destructive:
+    permission: NEVER
+    tools:
+      - "*.delete_*"
+
+dangerous_patterns:
+  - pattern: "*.delete_all_*"
+    permission: REQUIRE_APPROVAL
+
+context_rules:
+  - name: "tmp_writes"
+    condition:
+      tool: "filesystem.write_file"
+      args_match:
+        path: "/tmp/*"
+    permission: ALWAYS
+  - name: "small_inserts"
+    condition:
+      tool: "database.insert"
+      args_match:
+        row_count:
+          less_than: 10
+    permission: ALWAYS
+  - name: "readonly_user"
+    condition:
+      tool_pattern: "database.*"
+      context_match:
+        db_user: "*_readonly"
+    permission: ALWAYS
+  - name: "github_blocked"
+    condition:
+      tool_pattern: "github.*"
+    permission: NEVER
+
+environments:
+  development:
+    default_permission: ALWAYS
+    overrides:
+      "*.delete_*": REQUIRE_APPROVAL
+"""
+
+
+@pytest.fixture
+def policy_file(tmp_path: Path) -> Path:
+    path = tmp_path / "tool_permissions.yaml"
+    path.write_text(POLICY)
+    return path
+
+
+@pytest.fixture
+def evaluator(policy_file: Path) -> PermissionEvaluator:
+    return PermissionEvaluator(policy_path=policy_file, environment="production")
+
+
+def test_context_rule_args_glob(evaluator: PermissionEvaluator) -> None:
+    tool = "filesystem.write_file"
+    assert evaluator.evaluate(tool, {"tool_args": {"path": "/tmp/out"}}) == ToolPermission.ALWAYS
+    assert (
+        evaluator.evaluate(tool, {"tool_args": {"path": "/etc/passwd"}})
+        == ToolPermission.REQUIRE_APPROVAL
+    )
+    assert evaluator.evaluate(tool, {}) == ToolPermission.REQUIRE_APPROVAL
+
+
+def test_context_rule_numeric_comparison(evaluator: PermissionEvaluator) -> None:
+    tool = "database.insert"
+    assert evaluator.evaluate(tool, {"tool_args": {"row_count": 3}}) == ToolPermission.ALWAYS
+    assert (
+        evaluator.evaluate(tool, {"tool_args": {"row_count": 30}})
+        == ToolPermission.REQUIRE_APPROVAL
+    )
+    assert (
+        evaluator.evaluate(tool, {"tool_args": {"row_count": "3"}})
+        == ToolPermission.REQUIRE_APPROVAL
+    )
+
+
+def test_context_rule_context_match(evaluator: PermissionEvaluator) -> None:
+    assert evaluator.evaluate("database.insert", {"db_user": "app_readonly"}) == (
+        ToolPermission.ALWAYS
+    )
+    assert evaluator.evaluate("database.delete_rows", {"db_user": "app"}) == ToolPermission.NEVER
+
+
+def test_unconditional_pattern_rule(evaluator: PermissionEvaluator) -> None:
+    assert evaluator.evaluate("github.create_issue", {}) == ToolPermission.NEVER
+
+
+def test_precedence_dangerous_before_category(evaluator: PermissionEvaluator) -> None:
+    assert evaluator.evaluate("db.delete_all_rows", {}) == ToolPermission.REQUIRE_APPROVAL
+    assert evaluator.evaluate("db.delete_row", {}) == ToolPermission.NEVER
+    assert evaluator.evaluate("api.get_user", {}) == ToolPermission.ALWAYS
+
+
+def test_context_free_decisions_are_memoised(evaluator: PermissionEvaluator) -> None:
+    for _ in range(5):
+        assert evaluator.evaluate("api.get_user", {}) == ToolPermission.ALWAYS
+
+    info = evaluator.cache_info()
+    assert info.misses == 1
+    assert info.hits == 4
+
+
+def test_environment_change_resets_decisions(evaluator: PermissionEvaluator) -> None:
+    assert evaluator.evaluate("unknown.tool", {}) == ToolPermission.REQUIRE_APPROVAL
+
+    evaluator.environment = "development"
+
+    assert evaluator.evaluate("unknown.tool", {}) == ToolPermission.ALWAYS
+    assert evaluator.evaluate("db.delete_row", {}) == ToolPermission.REQUIRE_APPROVAL
+
+
+def test_compile_policy_after_mutation(evaluator: PermissionEvaluator) -> None:
+    assert evaluator.evaluate("custom.tool", {}) == ToolPermission.REQUIRE_APPROVAL
+
+    evaluator.policy["tools"]["custom.tool"] = {"permission": "NEVER"}
+    evaluator.compile_policy()
+
+    assert evaluator.evaluate("custom.tool", {}) == ToolPermission.NEVER
+
+
+def test_invalid_permission_rejected_at_compile(evaluator: PermissionEvaluator) -> None:
+    evaluator.policy["tools"]["custom.tool"] = {"permission": "SOMETIMES"}
+
+    with pytest.raises(PermissionEvaluatorError):
+        evaluator.compile_policy()
+
+
+def test_invalid_policy_file_falls_back_to_default(tmp_path: Path) -> None:
+    path = tmp_path / "bad.yaml"
+    path.write_text("default_permission: SOMETIMES\n")
+
+    evaluator = PermissionEvaluator(policy_path=path)
+
+    assert evaluator.evaluate("any.tool", {}) == ToolPermission.REQUIRE_APPROVAL
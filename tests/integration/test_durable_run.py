@@ -8,14 +8,16 @@ Tests the complete durable run lifecycle including:
 - Step-level idempotency
 """
 import asyncio
+import json
 import uuid
 from pathlib import Path
 from typing import Optional
 
 import pytest
 
-from magsag.runners.durable import DurableRunner, SnapshotStore
+from magsag.runners.durable import MANIFEST_NAME, DurableRunner, SnapshotStore
 from magsag.storage.backends.sqlite import SQLiteStorageBackend
+from magsag.storage.snapshot_codec import CODEC_JSON_ZLIB, CODEC_MSGPACK_ZSTD, apply_delta, decode_payload, diff_state, encode_payload
 
 @pytest.fixture
 def snapshot_store(tmp_path: Path) -> SnapshotStore:
@@ -106,6 +108,95 @@ class TestSnapshotStore:
         finally:
             await backend.close()
 
+def file_store(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, full_snapshot_every: int=3) -> SnapshotStore:
+    """Snapshot store forced onto the file-based fallback."""
+    store = SnapshotStore(snapshots_dir=tmp_path, full_snapshot_every=full_snapshot_every)
+
+    async def no_backend() -> bool:
+        return False
+    monkeypatch.setattr(store, '_ensure_backend', no_backend)
+    return store
+
+class TestFileSnapshots:
+    """Tests for compressed delta checkpoints in file-based storage."""
+
+    def test_state_deltas_round_trip(self) -> None:
+        base = {'counter': 1, 'flag': True, 'nested': {'a': [1, 2], 'b': 'x'}, 'gone': 1}
+        state = {'counter': 2, 'flag': 1, 'nested': {'a': [1, 2], 'c': None}, 'new': 'y'}
+        delta = diff_state(base, state)
+        assert delta == {'set': {'counter': 2, 'flag': 1, 'new': 'y'}, 'unset': ['gone'], 'nested': {'nested': {'set': {'c': None}, 'unset': ['b']}}}
+        assert apply_delta(base, delta) == state
+        assert base['nested'] == {'a': [1, 2], 'b': 'x'}
+        assert diff_state(state, state) == {}
+
+    def test_payload_codecs(self) -> None:
+        value = {'state': {'items': ['a'] * 100, 'n': 1.5}}
+        encoded = encode_payload(value, CODEC_JSON_ZLIB)
+        assert decode_payload(encoded) == value
+        assert len(encoded) < len(repr(value))
+        with pytest.raises(ValueError):
+            decode_payload(b'{"state": {}}')
+        pytest.importorskip('msgpack')
+        pytest.importorskip('zstandard')
+        assert decode_payload(encode_payload(value, CODEC_MSGPACK_ZSTD)) == value
+
+    @pytest.mark.asyncio
+    async def test_checkpoints_are_deltas_between_full_snapshots(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        store = file_store(tmp_path, monkeypatch)
+        large = {'blob': 'x' * 10000}
+        for i in range(5):
+            await store.save_snapshot(run_id='run-1', step_id=f'step-{i}', state={**large, 'counter': i})
+        run_dir = tmp_path / 'run-1'
+        kinds = [path.suffix for path in sorted(run_dir.glob('0*'))]
+        assert kinds == ['.full', '.delta', '.delta', '.full', '.delta']
+        assert (run_dir / '00000002.delta').stat().st_size < 200
+        assert len((run_dir / MANIFEST_NAME).read_text().splitlines()) == 5
+        reopened = file_store(tmp_path, monkeypatch)
+        latest = await reopened.get_latest_snapshot('run-1')
+        assert latest is not None
+        assert latest.step_id == 'step-4'
+        assert latest.state == {**large, 'counter': 4}
+        step = await reopened.get_snapshot_by_step('run-1', 'step-2')
+        assert step is not None
+        assert step.state == {**large, 'counter': 2}
+        assert await reopened.get_snapshot_by_step('run-1', 'missing') is None
+
+    @pytest.mark.asyncio
+    async def test_resaved_step_and_restart_resume(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        store = file_store(tmp_path, monkeypatch)
+        state: dict[str, object] = {'results': []}
+        for i in range(2):
+            state['results'] = [*state['results'], i]
+            await store.save_snapshot(run_id='run-2', step_id=f'step-{i}', state=state)
+        await store.save_snapshot(run_id='run-2', step_id='step-0', state={'results': ['retried']})
+        restarted = file_store(tmp_path, monkeypatch)
+        await restarted.save_snapshot(run_id='run-2', step_id='step-2', state={'results': ['retried', 2]})
+        runner = DurableRunner(snapshot_store=file_store(tmp_path, monkeypatch))
+        monkeypatch.setattr(runner, '_record_event', lambda **kwargs: asyncio.sleep(0))
+        assert await runner.resume('run-2') == {'results': ['retried', 2]}
+        assert await runner.resume('run-2', from_step='step-0') == {'results': ['retried']}
+        assert await runner.resume('run-2', from_step='step-1') == {'results': [0, 1]}
+
+    @pytest.mark.asyncio
+    async def test_stores_sharing_a_directory_see_each_others_checkpoints(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        writer, other = file_store(tmp_path, monkeypatch), file_store(tmp_path, monkeypatch)
+        await writer.save_snapshot(run_id='run-3', step_id='step-0', state={'n': 0})
+        latest = await other.get_latest_snapshot('run-3')
+        assert latest is not None and latest.step_id == 'step-0'
+        await writer.save_snapshot(run_id='run-3', step_id='step-1', state={'n': 1})
+        latest = await other.get_latest_snapshot('run-3')
+        assert latest is not None and latest.state == {'n': 1}
+
+        # Concurrent writers never reuse a checkpoint number
+        await asyncio.gather(*(store.save_snapshot(run_id='run-3', step_id=f'{name}-{i}', state={'by': name, 'n': i}) for i in range(10) for name, store in (('a', writer), ('b', other))))
+        manifest = [json.loads(line) for line in (tmp_path / 'run-3' / MANIFEST_NAME).read_text().splitlines()]
+        assert [entry['seq'] for entry in manifest] == list(range(22))
+        reader = file_store(tmp_path, monkeypatch)
+        for entry in manifest[2:]:
+            by, n = entry['step_id'].split('-')
+            snapshot = await reader.get_snapshot_by_step('run-3', entry['step_id'])
+            assert snapshot is not None and snapshot.state == {'by': by, 'n': int(n)}
+
 class TestDurableRunner:
     """Tests for DurableRunner."""
 
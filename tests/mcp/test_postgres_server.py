@@ -0,0 +1,268 @@
+"""Tests for PostgreSQL MCP server pooling, row limits, streaming and caching."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, ClassVar
+from unittest.mock import AsyncMock, patch
+
+import pytest
+import yaml
+
+from magsag.cassette import CASSETTE_FILE_NAME, Cassette, use_cassette
+from magsag.mcp import (
+    MCPRegistry,
+    MCPRuntime,
+    MCPRuntimeError,
+    MCPServer,
+    MCPServerConfig,
+    MCPServerError,
+)
+
+
+class FakeCursor:
+    def __init__(self, rows: list[dict[str, Any]], fetches: list[int]) -> None:
+        self._rows = rows
+        self._fetches = fetches
+        self._position = 0
+
+    async def fetch(self, n: int) -> list[dict[str, Any]]:
+        self._fetches.append(n)
+        batch = self._rows[self._position : self._position + n]
+        self._position += len(batch)
+        return batch
+
+
+class FakeConnection:
+    """Stand-in for an asyncpg connection serving ``rows`` through cursors."""
+
+    def __init__(self, rows: list[dict[str, Any]]) -> None:
+        self.rows = rows
+        self.queries: list[tuple[str, tuple[Any, ...]]] = []
+        self.fetches: list[int] = []
+        self.readonly: list[bool] = []
+
+    @asynccontextmanager
+    async def transaction(self, readonly: bool = False) -> AsyncIterator[None]:
+        self.readonly.append(readonly)
+        yield
+
+    async def cursor(self, sql: str, *params: Any) -> FakeCursor:
+        self.queries.append((sql, params))
+        return FakeCursor(self.rows, self.fetches)
+
+
+class FakeBatchConnection(FakeConnection):
+    """Adds asyncpg's pipelined ``fetchmany`` over per-level salary bands."""
+
+    bands: ClassVar[dict[str, list[dict[str, str]]]] = {
+        "Senior": [{"band": "S1"}, {"band": "S2"}],
+        "Staff": [{"band": "T1"}],
+    }
+
+    def __init__(self) -> None:
+        super().__init__([])
+        self.batches: list[tuple[str, list[list[Any]]]] = []
+
+    async def fetchmany(self, sql: str, args: list[list[Any]]) -> list[dict[str, Any]]:
+        self.batches.append((sql, args))
+        records = []
+        for *params, index, limit in args:
+            rows = self.bands.get(params[0], [])[:limit]
+            records.extend({"__magsag_set": index, **row} for row in rows)
+        return records
+
+
+class FakePool:
+    def __init__(self, conn: FakeConnection) -> None:
+        self.conn = conn
+        self.acquired = 0
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[FakeConnection]:
+        self.acquired += 1
+        yield self.conn
+
+    async def close(self) -> None:
+        pass
+
+
+def _config(**conn: Any) -> MCPServerConfig:
+    return MCPServerConfig(
+        server_id="pg-test",
+        type="postgres",
+        conn={"url_env": "PG_TEST_URL", **conn},
+    )
+
+
+async def _started_server(config: MCPServerConfig, rows: list[dict[str, Any]]) -> MCPServer:
+    server = MCPServer(config)
+    server._pg_pool = FakePool(FakeConnection(rows))
+    await server._discover_postgres_tools()
+    server._started = True
+    return server
+
+
+def _runtime(servers_dir: Path, server: MCPServer) -> MCPRuntime:
+    (servers_dir / "pg.yaml").write_text(yaml.safe_dump(server.config.model_dump()))
+    registry = MCPRegistry(servers_dir=servers_dir)
+    registry.discover_servers()
+    registry._servers[server.server_id] = server
+    return MCPRuntime(registry)
+
+
+def _rows(count: int) -> list[dict[str, Any]]:
+    return [{"id": index} for index in range(count)]
+
+
+@pytest.mark.asyncio
+async def test_query_caps_rows_and_stops_reading_the_cursor() -> None:
+    server = await _started_server(_config(max_rows=5, fetch_batch_size=4), _rows(100))
+    conn = server._pg_pool.conn
+
+    result = await server.execute_tool("query", {"sql": "SELECT id FROM t", "params": []})
+
+    assert result.success
+    assert result.output == {"rows": _rows(5), "count": 5, "truncated": True}
+    # One row past the limit is read to detect truncation, nothing more
+    assert conn.fetches == [4, 2]
+    assert conn.readonly == [True]
+
+    smaller = await server.execute_tool("query", {"sql": "SELECT id FROM t", "max_rows": 50})
+    assert smaller.output["count"] == 5
+
+    small = await server.execute_tool("query", {"sql": "SELECT id FROM t", "max_rows": 2})
+    assert small.output == {"rows": _rows(2), "count": 2, "truncated": True}
+
+
+@pytest.mark.asyncio
+async def test_result_cache_serves_identical_queries(monkeypatch: pytest.MonkeyPatch) -> None:
+    config = _config(result_cache={"ttl_s": 30, "max_entries": 2})
+    server = await _started_server(config, _rows(3))
+    conn = server._pg_pool.conn
+    sql = "SELECT band FROM salary_bands WHERE level = $1"
+
+    first = await server.execute_tool("query", {"sql": sql, "params": ["Staff"]})
+    first.output["rows"][0]["id"] = "mutated"
+    second = await server.execute_tool("query", {"sql": sql, "params": ["Staff"]})
+    other = await server.execute_tool("query", {"sql": sql, "params": ["Senior"]})
+
+    assert second.metadata["cached"] is True
+    assert second.output == {"rows": _rows(3), "count": 3, "truncated": False}
+    assert "cached" not in other.metadata
+    assert [params for _, params in conn.queries] == [("Staff",), ("Senior",)]
+    # Cache hits do not take a connection from the pool
+    assert server._pg_pool.acquired == 2
+
+    # Past the TTL the query runs again
+    monkeypatch.setattr("magsag.mcp.server.time.monotonic", lambda: 1e12)
+    await server.execute_tool("query", {"sql": sql, "params": ["Staff"]})
+    assert len(conn.queries) == 3
+
+
+@pytest.mark.asyncio
+async def test_query_many_runs_all_param_sets_in_one_round_trip(tmp_path: Path) -> None:
+    server = await _started_server(_config(max_rows=1, result_cache={"ttl_s": 30}), [])
+    conn = server._pg_pool.conn = FakeBatchConnection()
+    sql = "SELECT band FROM salary_bands WHERE level = $1;"
+    runtime = _runtime(tmp_path, server)
+    runtime.grant_permissions(["mcp:pg-test"])
+
+    result = await runtime.query_postgres_many(
+        "pg-test", sql, [["Staff"], ["Senior"], ["Junior"], ["Staff"]]
+    )
+
+    assert result.success, result.error
+    assert [r["rows"] for r in result.output["results"]] == [
+        [{"band": "T1"}],
+        [{"band": "S1"}],
+        [],
+        [{"band": "T1"}],
+    ]
+    assert [r["truncated"] for r in result.output["results"]] == [False, True, False, False]
+    ((wrapped, args),) = conn.batches
+    assert "FROM (SELECT band FROM salary_bands WHERE level = $1) AS q LIMIT $3::int" in wrapped
+    assert args[1] == ["Senior", 1, 2]
+
+    # Cached parameter sets are skipped; only the new one is queried
+    again = await runtime.query_postgres_many("pg-test", sql, [["Senior"], ["Principal"]])
+    assert again.metadata["cached_sets"] == 1
+    assert conn.batches[1][1] == [["Principal", 0, 2]]
+    assert again.output["results"][0]["rows"] == [{"band": "S1"}]
+
+    mismatched = await runtime.query_postgres_many("pg-test", sql, [["Lead"], ["Lead", 1]])
+    assert not mismatched.success
+
+
+@pytest.mark.asyncio
+async def test_stream_query_yields_all_rows_in_batches() -> None:
+    server = await _started_server(_config(max_rows=5, fetch_batch_size=4), _rows(10))
+
+    batches = [batch async for batch in server.stream_query("SELECT id FROM t")]
+
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+    assert [row for batch in batches for row in batch] == _rows(10)
+    with pytest.raises(MCPServerError, match="Only SELECT"):
+        async for _ in server.stream_query("DELETE FROM t"):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_runtime_stream_postgres_checks_permission(tmp_path: Path) -> None:
+    runtime = _runtime(tmp_path, await _started_server(_config(), _rows(3)))
+
+    with pytest.raises(MCPRuntimeError, match="Permission denied"):
+        async for _ in runtime.stream_postgres("pg-test", "SELECT 1"):
+            pass
+
+    runtime.grant_permissions(["mcp:pg-test"])
+    batches = [batch async for batch in runtime.stream_postgres("pg-test", "SELECT id FROM t")]
+    assert batches == [_rows(3)]
+
+    # The registry validates the permission against configured servers too
+    unconfigured = MCPRuntime(MCPRegistry(servers_dir=tmp_path / "none"))
+    unconfigured.grant_permissions(["mcp:pg-test"])
+    with pytest.raises(MCPRuntimeError, match="Missing required permissions"):
+        async for _ in unconfigured.stream_postgres("pg-test", "SELECT 1"):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_stream_postgres_replays_from_cassette(tmp_path: Path) -> None:
+    server = await _started_server(_config(fetch_batch_size=2), _rows(3))
+    runtime = _runtime(tmp_path, server)
+    runtime.grant_permissions(["mcp:pg-test"])
+
+    cassette = Cassette(tmp_path / CASSETTE_FILE_NAME)
+    with use_cassette(cassette):
+        recorded = [batch async for batch in runtime.stream_postgres("pg-test", "SELECT id")]
+    cassette.save()
+
+    # Replay needs neither a running server nor a database
+    replay_runtime = MCPRuntime(MCPRegistry(servers_dir=tmp_path))
+    replay_runtime._registry.discover_servers()
+    replay_runtime.grant_permissions(["mcp:pg-test"])
+    with use_cassette(Cassette(cassette.path, mode="replay")):
+        replayed = [batch async for batch in replay_runtime.stream_postgres("pg-test", "SELECT id")]
+    assert replayed == recorded == [_rows(2), _rows(3)[2:]]
+    assert replay_runtime._registry.list_running_servers() == []
+
+
+@pytest.mark.asyncio
+async def test_pool_settings_come_from_config(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("PG_TEST_URL", "postgresql://localhost/test")
+    fake_asyncpg = AsyncMock()
+    with (
+        patch("magsag.mcp.server.HAS_ASYNCPG", True),
+        patch("magsag.mcp.server.asyncpg", fake_asyncpg),
+    ):
+        server = MCPServer(_config(min_size=2, max_size=8, statement_cache_size=0))
+        await server.start()
+
+    kwargs = fake_asyncpg.create_pool.await_args.kwargs
+    assert (kwargs["min_size"], kwargs["max_size"], kwargs["statement_cache_size"]) == (2, 8, 0)
+
+    with pytest.raises(ValueError, match="min_size"):
+        _config(min_size=6, max_size=5).validate_type_fields()
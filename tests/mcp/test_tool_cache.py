@@ -0,0 +1,159 @@
+"""Tests for the shared MCP tool-result cache."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from typing import Any
+
+import pytest
+import yaml
+
+from magsag.mcp import MCPRegistry, MCPToolCache, MCPToolResult
+from magsag.mcp.client import AsyncMCPClient, TransportType
+from magsag.mcp.config import MCPToolCachePolicy
+
+
+class CountingTool:
+    """Async tool stub counting calls and optionally blocking until released."""
+
+    def __init__(self, result: Any = None, error: Exception | None = None) -> None:
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.release.set()
+        self._result = result
+        self._error = error
+
+    async def __call__(self) -> Any:
+        self.calls += 1
+        await self.release.wait()
+        if self._error is not None:
+            raise self._error
+        return self._result if self._result is not None else {"call": self.calls}
+
+
+def test_keys_keep_positional_order_and_ignore_dict_order() -> None:
+    key = MCPToolCache.key
+
+    assert key("ns", "pg", "query", {"sql": "q", "params": [1, 2]}) == key(
+        "ns", "pg", "query", {"params": [1, 2], "sql": "q"}
+    )
+    assert key("ns", "pg", "query", {"params": [1, 2]}) != key(
+        "ns", "pg", "query", {"params": [2, 1]}
+    )
+    assert key("ns", "pg", "query", {}) != key("ns", "pg", "list", {})
+    with pytest.raises(TypeError):
+        key("ns", "pg", "query", {"handle": object()})
+
+
+def test_lru_eviction_and_ttl(monkeypatch: pytest.MonkeyPatch) -> None:
+    cache = MCPToolCache(max_entries=2)
+    cache.put("a", 1, ttl_s=10)
+    cache.put("b", 2, ttl_s=10)
+    assert cache.get("a") == (True, 1)  # "b" is now least recently used
+    cache.put("c", 3, ttl_s=10)
+
+    assert cache.get("b") == (False, None)
+    assert len(cache) == 2
+
+    monkeypatch.setattr("magsag.mcp.cache.time.monotonic", lambda: 1e12)
+    assert cache.get("a") == (False, None)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_call() -> None:
+    cache = MCPToolCache()
+    tool = CountingTool()
+    tool.release.clear()
+
+    pending = [asyncio.create_task(cache.get_or_call("k", 30, tool)) for _ in range(5)]
+    await asyncio.sleep(0)
+    tool.release.set()
+    results = await asyncio.gather(*pending)
+
+    assert tool.calls == 1
+    assert [value for value, _ in results] == [{"call": 1}] * 5
+    assert sorted(cached for _, cached in results) == [False, True, True, True, True]
+    # Each caller owns its copy
+    results[1][0]["call"] = "mutated"
+    assert results[0][0] == {"call": 1}
+    assert await cache.get_or_call("k", 30, tool) == ({"call": 1}, True)
+
+
+@pytest.mark.asyncio
+async def test_errors_reach_all_waiters_and_are_not_cached() -> None:
+    cache = MCPToolCache()
+    tool = CountingTool(error=RuntimeError("boom"))
+    tool.release.clear()
+
+    pending = [asyncio.create_task(cache.get_or_call("k", 30, tool)) for _ in range(3)]
+    await asyncio.sleep(0)
+    tool.release.set()
+    outcomes = await asyncio.gather(*pending, return_exceptions=True)
+
+    assert tool.calls == 1
+    assert all(isinstance(outcome, RuntimeError) for outcome in outcomes)
+    assert cache.get("k") == (False, None)
+
+    rejected, _ = await cache.get_or_call(
+        "k", 30, CountingTool({"ok": False}), cacheable=lambda r: r["ok"]
+    )
+    assert rejected == {"ok": False}
+    assert cache.get("k") == (False, None)
+
+
+@pytest.mark.asyncio
+async def test_registry_serves_declared_tools_from_cache(tmp_path: Path) -> None:
+    config = {
+        "server_id": "fetch",
+        "type": "mcp",
+        "command": "fetch-server",
+        "tool_cache": {"get": {"ttl_s": 60}},
+    }
+    (tmp_path / "fetch.yaml").write_text(yaml.safe_dump(config))
+    registry = MCPRegistry(servers_dir=tmp_path, tool_cache=MCPToolCache())
+    registry.discover_servers()
+    calls: list[tuple[str, dict[str, Any]]] = []
+
+    async def execute(server_id: str, tool: str, arguments: dict[str, Any]) -> MCPToolResult:
+        calls.append((tool, arguments))
+        return MCPToolResult(success=tool != "fail", output={"url": arguments.get("url")})
+
+    registry._execute_tool = execute  # type: ignore[method-assign]
+
+    first = await registry.execute_tool("fetch", "get", {"url": "https://a"})
+    second = await registry.execute_tool("fetch", "get", {"url": "https://a"})
+    await registry.execute_tool("fetch", "get", {"url": "https://b"})
+    await registry.execute_tool("fetch", "post", {"url": "https://a"})
+    await registry.execute_tool("fetch", "post", {"url": "https://a"})
+
+    assert "cached" not in first.metadata
+    assert second.metadata["cached"] is True
+    assert second.output == first.output
+    assert [tool for tool, _ in calls] == ["get", "get", "post", "post"]
+
+
+@pytest.mark.asyncio
+async def test_client_invoke_uses_declared_tool_cache() -> None:
+    client = AsyncMCPClient(
+        server_name="fetch",
+        transport=TransportType.HTTP,
+        config={"url": "http://localhost"},
+        tool_cache={"get": MCPToolCachePolicy(ttl_s=60)},
+        result_cache=MCPToolCache(),
+    )
+    client._initialized = True
+    calls: list[str] = []
+
+    async def invoke(tool: str, args: dict[str, Any]) -> dict[str, Any]:
+        calls.append(tool)
+        return {"tool": tool, **args}
+
+    client._invoke_internal = invoke  # type: ignore[method-assign]
+
+    results = await asyncio.gather(*(client.invoke("get", {"id": 1}) for _ in range(3)))
+    await client.invoke("post", {"id": 1})
+    await client.invoke("post", {"id": 1})
+
+    assert results == [{"tool": "get", "id": 1}] * 3
+    assert calls == ["get", "post", "post"]
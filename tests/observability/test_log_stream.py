@@ -0,0 +1,105 @@
+"""Tests for push-based run log streaming."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from pathlib import Path
+
+import pytest
+
+from magsag.observability.log_stream import LogBus, follow_log, read_lines_from, tail_lines
+from magsag.observability.logger import ObservabilityLogger
+
+
+def _write(path: Path, text: str) -> None:
+    with open(path, "ab") as f:
+        f.write(text.encode("utf-8"))
+
+
+def test_tail_lines_reads_backwards_across_blocks(tmp_path: Path) -> None:
+    path = tmp_path / "logs.jsonl"
+    lines = [f"line-{i}-" + "x" * 500 for i in range(1000)]
+    _write(path, "\n".join(lines) + "\n")
+
+    tail, end = tail_lines(path, 3)
+
+    assert tail == lines[-3:]
+    assert end == path.stat().st_size
+
+
+def test_tail_lines_excludes_partial_line(tmp_path: Path) -> None:
+    path = tmp_path / "logs.jsonl"
+    _write(path, "a\nb\npartial")
+
+    tail, end = tail_lines(path, 5)
+
+    assert tail == ["a", "b"]
+    assert end == 4
+    assert read_lines_from(path, end) == ([], 4)
+
+    _write(path, "-done\n")
+    assert read_lines_from(path, end) == (["partial-done"], path.stat().st_size)
+
+
+def test_tail_lines_empty_file(tmp_path: Path) -> None:
+    path = tmp_path / "logs.jsonl"
+    path.touch()
+
+    assert tail_lines(path, 10) == ([], 0)
+
+
+async def _collect(stream: object, count: int) -> list[str]:
+    lines: list[str] = []
+    async for line in stream:  # type: ignore[attr-defined]
+        lines.append(line)
+        if len(lines) == count:
+            break
+    return lines
+
+
+@pytest.mark.asyncio
+async def test_follow_receives_logger_events_without_polling(tmp_path: Path) -> None:
+    logger = ObservabilityLogger("run-follow", base_dir=tmp_path)
+    logger.log("start", {"step": 0})
+    log_path = tmp_path / "run-follow" / "logs.jsonl"
+
+    # Poll interval far above the test timeout: lines must arrive via the bus
+    stream = follow_log(log_path, tail=1, poll_interval=60)
+    collector = asyncio.create_task(_collect(stream, 3))
+    await asyncio.sleep(0.05)
+
+    thread = threading.Thread(target=lambda: [logger.log("step", {"step": i}) for i in (1, 2)])
+    thread.start()
+    thread.join()
+
+    lines = await asyncio.wait_for(collector, timeout=5)
+    await stream.aclose()
+
+    assert [json.loads(line)["data"]["step"] for line in lines] == [0, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_follow_recovers_lines_from_other_writers(tmp_path: Path) -> None:
+    path = tmp_path / "logs.jsonl"
+    _write(path, "old\n")
+    bus = LogBus()
+
+    stream = follow_log(path, poll_interval=0.05, bus=bus)
+    collector = asyncio.create_task(_collect(stream, 3))
+    await asyncio.sleep(0.05)
+
+    # Written by "another process": no bus event
+    _write(path, "external-1\n")
+    await asyncio.sleep(0.1)
+    # A pushed line after a gap triggers a file read that fills it in
+    _write(path, "external-2\n")
+    size = path.stat().st_size
+    _write(path, "pushed\n")
+    bus.publish(str(path.resolve()), size, path.stat().st_size, "pushed")
+
+    lines = await asyncio.wait_for(collector, timeout=5)
+    await stream.aclose()
+
+    assert lines == ["external-1", "external-2", "pushed"]
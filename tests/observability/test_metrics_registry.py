@@ -0,0 +1,133 @@
+"""Tests for the in-process metrics registry and OpenMetrics exposition."""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from magsag.mcp.client import CircuitBreaker, CircuitBreakerConfig
+from magsag.observability.metrics import (
+    CONTENT_TYPE,
+    MetricsRegistry,
+    get_metrics_registry,
+)
+
+
+def test_render_counters_gauges_and_histograms() -> None:
+    registry = MetricsRegistry()
+    runs = registry.counter("demo_runs_total", "Runs by status", ["status"])
+    runs.labels("success").inc()
+    runs.labels(status="success").inc(2)
+    queue = registry.gauge("demo_queue_depth", "Queued items")
+    queue.inc(5)
+    queue.dec(2)
+    latency = registry.histogram("demo_latency_seconds", "Latency", ["stage"], buckets=[0.1, 1.0])
+    for value in (0.05, 0.5, 5.0):
+        latency.labels("execute").observe(value)
+
+    assert registry.counter("demo_runs_total", "Runs by status", ["status"]) is runs
+    with pytest.raises(ValueError):
+        registry.gauge("demo_runs_total", "Runs by status", ["status"])
+    with pytest.raises(ValueError):
+        runs.labels("success", "extra")
+
+    text = registry.render()
+    assert text.endswith("# EOF\n")
+    assert "# TYPE demo_runs counter" in text
+    assert 'demo_runs_total{status="success"} 3' in text
+    assert "demo_queue_depth 3" in text
+    assert 'demo_latency_seconds_bucket{stage="execute",le="0.1"} 1' in text
+    assert 'demo_latency_seconds_bucket{stage="execute",le="1.0"} 2' in text
+    assert 'demo_latency_seconds_bucket{stage="execute",le="+Inf"} 3' in text
+    assert 'demo_latency_seconds_count{stage="execute"} 3' in text
+    assert 'demo_latency_seconds_sum{stage="execute"} 5.55' in text
+
+
+def test_label_cardinality_is_bounded() -> None:
+    registry = MetricsRegistry()
+    requests = registry.counter("demo_requests_total", "Requests", ["agent"], max_label_sets=3)
+    for index in range(10):
+        requests.labels(f"agent-{index}").inc()
+
+    samples = dict(requests.samples())
+    assert len(samples) == 4
+    assert samples[("_overflow",)] == 7
+    assert requests.labels("agent-0") is not requests.labels("agent-9")
+
+
+def test_multiprocess_dir_aggregates_workers(tmp_path: Path) -> None:
+    worker = textwrap.dedent(
+        f"""
+        from magsag.observability.metrics import MetricsRegistry
+
+        registry = MetricsRegistry({str(tmp_path)!r})
+        registry.counter("demo_runs_total", "Runs", ["status"]).labels("success").inc(2)
+        registry.gauge("demo_inflight", "In flight").set(7)
+        registry.histogram("demo_latency_seconds", "Latency", buckets=[1.0]).observe(0.5)
+        """
+    )
+    subprocess.run([sys.executable, "-c", worker], check=True)
+
+    registry = MetricsRegistry(tmp_path)
+    try:
+        registry.counter("demo_runs_total", "Runs", ["status"]).labels("success").inc()
+        registry.gauge("demo_inflight", "In flight").set(3)
+        registry.histogram("demo_latency_seconds", "Latency", buckets=[1.0]).observe(2.0)
+        text = registry.render()
+    finally:
+        registry.close()
+
+    assert len(list(tmp_path.glob("metrics-*.json"))) == 2
+    assert 'demo_runs_total{status="success"} 3' in text
+    # Gauges of exited workers are dropped; counters and histograms persist
+    assert "demo_inflight 3" in text
+    assert 'demo_latency_seconds_bucket{le="1.0"} 1' in text
+    assert "demo_latency_seconds_count 2" in text
+
+
+def test_circuit_breaker_updates_metrics() -> None:
+    breaker = CircuitBreaker(
+        CircuitBreakerConfig(failure_threshold=1, timeout_seconds=60), name="metrics-test"
+    )
+    rejections = get_metrics_registry().get("magsag_mcp_circuit_rejections_total")
+    state = get_metrics_registry().get("magsag_mcp_circuit_state")
+    assert rejections is not None and state is not None
+    before = dict(rejections.samples()).get(("metrics-test",), 0)
+
+    breaker.record_failure()
+    assert not breaker.can_attempt()
+
+    assert dict(state.samples())[("metrics-test",)] == 2
+    assert dict(rejections.samples())[("metrics-test",)] == before + 1
+
+
+def test_metrics_endpoint_serves_openmetrics() -> None:
+    from magsag.api.server import app
+
+    client = TestClient(app)
+    client.post("/api/v1/runs", json={"agent": "metrics-demo"}, headers={"Idempotency-Key": "m1"})
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == CONTENT_TYPE
+    assert "# TYPE magsag_idempotency_requests counter" in response.text
+    assert response.text.endswith("# EOF\n")
+
+
+def test_metrics_endpoint_requires_api_key_when_configured() -> None:
+    from magsag.api.config import Settings, get_settings
+    from magsag.api.server import app
+
+    app.dependency_overrides[get_settings] = lambda: Settings(API_KEY="metrics-secret")
+    try:
+        client = TestClient(app)
+        assert client.get("/metrics").status_code == 401
+        response = client.get("/metrics", headers={"Authorization": "Bearer metrics-secret"})
+        assert response.status_code == 200
+    finally:
+        app.dependency_overrides.pop(get_settings, None)
@@ -0,0 +1,149 @@
+"""Tests for stage-level spans and latency histograms."""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from magsag.observability import cost_tracker
+from magsag.observability.stages import (
+    InMemorySpanExporter,
+    SpanContext,
+    StageTracer,
+    configure_stage_tracing,
+    current_stage,
+    get_stage_tracer,
+    inject_trace_context,
+    reset_stage_tracing,
+    stage,
+)
+from magsag.runners.agent_runner import AgentRunner
+
+
+@pytest.fixture
+def exporter() -> Iterator[InMemorySpanExporter]:
+    spans = InMemorySpanExporter()
+    configure_stage_tracing(sample_rate=1.0, exporters=[spans])
+    yield spans
+    reset_stage_tracing()
+
+
+def test_stages_nest_and_record_errors(exporter: InMemorySpanExporter) -> None:
+    with stage("agent.run", {"run_id": "mag-1"}, agent="demo-mag", provider="openai") as root:
+        with stage("agent.prepare"):
+            pass
+        with pytest.raises(ValueError), stage("skill.invoke", {"skill.id": "skill.demo"}):
+            raise ValueError("boom")
+        assert current_stage() is root
+    assert current_stage() is None
+
+    prepare, skill, run = exporter.spans
+    assert run.parent_span_id is None
+    assert {prepare.parent_span_id, skill.parent_span_id} == {run.span_id}
+    assert {span.trace_id for span in exporter.spans} == {run.trace_id}
+    assert (skill.agent, skill.provider) == ("demo-mag", "openai")
+    assert skill.status == "error"
+    assert skill.attributes == {"skill.id": "skill.demo", "error.type": "ValueError"}
+    assert run.to_dict()["attributes"] == {"run_id": "mag-1"}
+
+
+def test_head_sampling_is_decided_once_per_trace() -> None:
+    exporter = InMemorySpanExporter()
+    tracer = configure_stage_tracing(sample_rate=0.25, exporters=[exporter])
+    try:
+        for _ in range(400):
+            with stage("agent.run"), stage("agent.execute"):
+                pass
+        roots = exporter.find("agent.run")
+        assert 40 < len(roots) < 160
+        assert len(exporter.find("agent.execute")) == len(roots)
+        # Unsampled traces still feed the latency histograms
+        assert tracer.histogram.series()[("agent.run", "", "")].count == 400
+        assert all(tracer.should_sample(span.trace_id) for span in roots)
+        assert StageTracer(sample_rate=0.25, exporters=[exporter]).should_sample(roots[0].trace_id)
+    finally:
+        reset_stage_tracing()
+
+
+def test_disabled_tracing_returns_shared_noop() -> None:
+    tracer = configure_stage_tracing(sample_rate=0.0, metrics=False)
+    try:
+        with stage("agent.run", agent="demo") as first:
+            first.set_attribute("ignored", True)
+            assert current_stage() is None
+        assert stage("agent.execute") is first
+        assert not tracer.histogram.series()
+    finally:
+        reset_stage_tracing()
+
+
+def test_trace_context_crosses_threads_via_delegation_context(
+    exporter: InMemorySpanExporter,
+) -> None:
+    delegation_context: dict[str, object] = {"parent_run_id": "mag-1"}
+    with stage("agent.execute", agent="demo-mag") as parent:
+        inject_trace_context(delegation_context)
+
+    def sub_agent() -> None:
+        with stage(
+            "agent.run", agent="demo-sag", parent=SpanContext.from_mapping(delegation_context)
+        ):
+            pass
+
+    worker = threading.Thread(target=sub_agent)
+    worker.start()
+    worker.join()
+
+    child = exporter.find("agent.run")[0]
+    assert delegation_context["trace_sampled"] is True
+    assert (child.trace_id, child.parent_span_id) == (parent.trace_id, parent.span_id)
+    assert child.agent == "demo-sag"
+
+
+def test_histogram_quantiles() -> None:
+    tracer = StageTracer(metrics=True)
+    for value in [3.0] * 90 + [400.0] * 10:
+        tracer.histogram.observe("agent.execute", "demo", "openai", value)
+    tracer.histogram.observe("agent.execute", "other", "openai", 20000.0)
+
+    p50 = tracer.histogram.quantile(0.5, "agent.execute", agent="demo")
+    p99 = tracer.histogram.quantile(0.99, "agent.execute", agent="demo")
+    assert p50 is not None and 2.5 <= p50 <= 5.0
+    assert p99 is not None and 250.0 <= p99 <= 500.0
+    assert tracer.histogram.quantile(1.0, "agent.execute") == 30000.0
+    assert tracer.histogram.quantile(0.5, "agent.pre_eval") is None
+
+
+def test_runner_emits_stage_spans(
+    exporter: InMemorySpanExporter, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(cost_tracker, "_tracker", None)
+    runner = AgentRunner(base_dir=tmp_path)
+    payload = {"role": "Staff Engineer", "level": "Staff", "experience_years": 12}
+
+    context: dict[str, object] = {"request_id": "req-1"}
+    runner.invoke_mag("offer-orchestrator-mag", payload, context=context)
+
+    runs = {span.attributes["agent.kind"]: span for span in exporter.find("agent.run")}
+    mag, sag = runs["mag"], runs["sag"]
+    assert mag.parent_span_id is None
+    assert mag.attributes["run_id"] == context["run_id"]
+    assert sag.trace_id == mag.trace_id
+    mag_execute = next(
+        span for span in exporter.find("agent.execute") if span.agent == "offer-orchestrator-mag"
+    )
+    assert sag.parent_span_id == mag_execute.span_id
+    assert mag_execute.parent_span_id == mag.span_id
+
+    names = {span.name for span in exporter.spans}
+    assert {"agent.prepare", "agent.pre_eval", "agent.post_eval", "skill.invoke"} <= names
+    series = get_stage_tracer().histogram.series()
+    assert ("agent.run", "offer-orchestrator-mag", mag.provider or "") in series
+
+    if cost_tracker._tracker is not None:
+        cost_tracker._tracker.close()
+        cost_tracker._tracker = None
@@ -333,6 +333,33 @@ def test_provider_complete_with_tool_use(mock_client_class: Mock) -> None:
     assert tool_call["function"]["arguments"] == {"location": "San Francisco"}
 
 
+@patch("magsag.providers.anthropic.httpx.Client")
+def test_provider_generate_returns_llm_response(mock_client_class: Mock) -> None:
+    """Test that generate wraps complete in the BaseLLMProvider response shape."""
+    mock_response = Mock()
+    mock_response.json.return_value = {
+        "id": "msg_789",
+        "model": "claude-3-5-sonnet-20241022",
+        "content": [{"type": "text", "text": "Hi"}],
+        "stop_reason": "end_turn",
+        "usage": {"input_tokens": 7, "output_tokens": 2},
+    }
+    mock_response.raise_for_status = Mock()
+    mock_client = Mock()
+    mock_client.post.return_value = mock_response
+    mock_client_class.return_value = mock_client
+
+    provider = AnthropicProvider(api_key="test-key")
+    response = provider.generate("Hello", model="claude-3-5-sonnet-20241022", max_tokens=16)
+
+    payload = mock_client.post.call_args.kwargs["json"]
+    assert payload["messages"] == [{"role": "user", "content": "Hello"}]
+    assert payload["max_tokens"] == 16
+    assert response.content == "Hi"
+    assert (response.input_tokens, response.output_tokens) == (7, 2)
+    assert response.metadata["stop_reason"] == "end_turn"
+
+
 @patch("magsag.providers.anthropic.httpx.Client")
 def test_provider_complete_with_system(mock_client_class: Mock) -> None:
     """Test that system messages are properly converted to system parameter."""
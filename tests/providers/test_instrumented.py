@@ -0,0 +1,92 @@
+"""Tests for provider metrics and tracing."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from magsag.cassette import CASSETTE_FILE_NAME, Cassette, CassetteProvider, use_cassette
+from magsag.observability.metrics import get_metrics_registry
+from magsag.observability.stages import (
+    InMemorySpanExporter,
+    configure_stage_tracing,
+    reset_stage_tracing,
+)
+from magsag.providers import (
+    PROVIDER_BUILDERS,
+    InstrumentedProvider,
+    MockLLMProvider,
+    build_provider,
+)
+
+
+@pytest.fixture
+def exporter() -> Iterator[InMemorySpanExporter]:
+    spans = InMemorySpanExporter()
+    configure_stage_tracing(sample_rate=1.0, exporters=[spans])
+    yield spans
+    reset_stage_tracing()
+
+
+def _samples(name: str) -> dict[tuple[str, ...], float]:
+    metric = get_metrics_registry().get(name)
+    assert metric is not None
+    return dict(metric.samples())
+
+
+def test_generate_counts_requests_and_tokens(exporter: InMemorySpanExporter) -> None:
+    provider = InstrumentedProvider(MockLLMProvider(), name="mock")
+    response = provider.generate("hello", model="instrumented-mock")
+
+    requests = _samples("magsag_llm_requests_total")
+    tokens = _samples("magsag_llm_tokens_total")
+    assert requests[("instrumented-mock", "success")] == 1
+    assert tokens[("instrumented-mock", "input")] == response.input_tokens
+    assert tokens[("instrumented-mock", "output")] == response.output_tokens
+    (span,) = exporter.find("provider.generate")
+    assert span.attributes["llm.provider"] == "mock"
+    assert span.attributes["llm.output_tokens"] == response.output_tokens
+
+
+def test_generate_counts_errors(exporter: InMemorySpanExporter) -> None:
+    class FailingProvider(MockLLMProvider):
+        def generate(self, prompt: str, **kwargs: object) -> object:  # type: ignore[override]
+            raise TimeoutError("upstream timed out")
+
+    with pytest.raises(TimeoutError):
+        InstrumentedProvider(FailingProvider()).generate("hello", model="instrumented-error")
+
+    assert _samples("magsag_llm_requests_total")[("instrumented-error", "error")] == 1
+    (span,) = exporter.find("provider.generate")
+    assert span.status == "error"
+
+
+def test_replayed_calls_are_counted_without_tokens(
+    tmp_path: Path, exporter: InMemorySpanExporter
+) -> None:
+    cassette = Cassette(tmp_path / CASSETTE_FILE_NAME)
+    with use_cassette(cassette):
+        CassetteProvider(MockLLMProvider()).generate("hello", model="instrumented-replay")
+    cassette.save()
+
+    provider = InstrumentedProvider(CassetteProvider(None))
+    with use_cassette(Cassette(cassette.path, mode="replay")):
+        provider.generate("hello", model="instrumented-replay")
+
+    assert _samples("magsag_llm_requests_total")[("instrumented-replay", "replayed")] == 1
+    assert ("instrumented-replay", "input") not in _samples("magsag_llm_tokens_total")
+    (span,) = exporter.find("provider.generate")
+    assert span.attributes["llm.replayed"] is True
+
+
+def test_build_provider_covers_routing_providers() -> None:
+    for name in ("anthropic", "google", "local", "openai"):
+        assert name in PROVIDER_BUILDERS
+
+    # Construction is deferred, so missing credentials only fail on a live call
+    provider = build_provider("google", api_key="")
+    assert isinstance(provider, InstrumentedProvider)
+    with pytest.raises(ValueError, match="Unknown provider"):
+        build_provider("nope")
@@ -254,3 +254,74 @@ def test_routing_policy_priority_ordering(tmp_path: Path) -> None:
     assert policy.routes[0].task_type == "high"
     assert policy.routes[1].task_type == "mid"
     assert policy.routes[2].task_type == "low"
+
+
+def test_routing_policy_priority_beats_exact_match() -> None:
+    """Test that a higher-priority pattern wins over a lower-priority exact route."""
+    policy = RoutingPolicy(
+        name="order",
+        description="Order test",
+        routes=[
+            Route(task_type="task-*", provider="pattern", model="m", priority=100),
+            Route(task_type="task-a", provider="exact", model="m", priority=50),
+        ],
+    )
+
+    route = policy.get_route("task-a")
+    assert route is not None
+    assert route.provider == "pattern"
+
+
+def test_routing_policy_memoises_resolutions(temp_policy_yaml: Path) -> None:
+    """Test that repeated lookups reuse the resolved route."""
+    policy = RoutingPolicy.from_yaml(temp_policy_yaml)
+
+    assert policy.get_route("task-b") is policy.get_route("task-b")
+
+    overrides = {"model": "gpt-4o", "use_batch": True}
+    first = policy.get_route("task-b", overrides=overrides)
+    second = policy.get_route("task-b", overrides=dict(overrides))
+    assert first is second
+    assert first is not None
+    assert first.model == "gpt-4o"
+    assert first.metadata == {"temperature": 0.7}
+
+
+def test_routing_policy_unhashable_overrides(temp_policy_yaml: Path) -> None:
+    """Test overrides containing unhashable values bypass the merge cache."""
+    policy = RoutingPolicy.from_yaml(temp_policy_yaml)
+
+    route = policy.get_route("task-a", overrides={"metadata": {"max_tokens": 1}})
+
+    assert route is not None
+    assert route.metadata == {"max_tokens": 1}
+
+
+def test_routing_policy_recompiles_after_route_change(temp_policy_yaml: Path) -> None:
+    """Test that adding or replacing routes invalidates the compiled table."""
+    policy = RoutingPolicy.from_yaml(temp_policy_yaml)
+    route = policy.get_route("new-task")
+    assert route is not None
+    assert route.task_type == "*"
+
+    policy.routes.insert(0, Route(task_type="new-task", provider="p", model="m", priority=200))
+    route = policy.get_route("new-task")
+    assert route is not None
+    assert route.provider == "p"
+
+    policy.routes = []
+    assert policy.get_route("new-task") is None
+
+
+def test_routing_policy_from_yaml_text() -> None:
+    """Test loading a policy from YAML text."""
+    policy = RoutingPolicy.from_yaml_text(
+        "routes:\n  - task_type: '*'\n    provider: openai\n    model: gpt-4o\n",
+        default_name="inline",
+    )
+
+    assert policy.name == "inline"
+    assert len(policy.routes) == 1
+
+    with pytest.raises(ValueError):
+        RoutingPolicy.from_yaml_text("- not-a-mapping\n", default_name="bad")
@@ -3,7 +3,7 @@
 import pytest
 
 from magsag.routing.policy import Route, RoutingPolicy
-from magsag.routing.router import Plan, get_plan, load_policy
+from magsag.routing.router import Plan, get_plan, load_policy, reset_routing_cache
 
 
 @pytest.fixture
@@ -224,3 +224,41 @@ def test_get_plan_for_various_task_types(sample_policy: RoutingPolicy) -> None:
         else:
             assert plan.use_cache is expected_cache
             assert plan.structured_output is expected_structured
+
+
+def test_get_plan_environment_overrides(
+    sample_policy: RoutingPolicy, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test MAGSAG_PROVIDER / MAGSAG_MODEL are applied after a cache reset."""
+    monkeypatch.setenv("MAGSAG_PROVIDER", "openai")
+    monkeypatch.setenv("MAGSAG_MODEL", "gpt-4o")
+    reset_routing_cache()
+    try:
+        plan = get_plan("offer-orchestration", policy=sample_policy)
+        assert plan is not None
+        assert plan.provider == "openai"
+        assert plan.model == "gpt-4o"
+
+        plan = get_plan("offer-orchestration", overrides={"model": "o3"}, policy=sample_policy)
+        assert plan is not None
+        assert plan.provider == "openai"
+        assert plan.model == "o3"
+    finally:
+        monkeypatch.delenv("MAGSAG_PROVIDER")
+        monkeypatch.delenv("MAGSAG_MODEL")
+        reset_routing_cache()
+
+    plan = get_plan("offer-orchestration", policy=sample_policy)
+    assert plan is not None
+    assert plan.provider == "anthropic"
+
+
+def test_get_plan_metadata_not_shared(sample_policy: RoutingPolicy) -> None:
+    """Test that cached routes do not leak plan metadata mutations."""
+    plan = get_plan("offer.generate", policy=sample_policy)
+    assert plan is not None
+    plan.metadata["max_tokens"] = 1
+
+    plan = get_plan("offer.generate", policy=sample_policy)
+    assert plan is not None
+    assert plan.metadata["max_tokens"] == 4096
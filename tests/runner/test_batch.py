@@ -0,0 +1,126 @@
+"""Tests for bulk MAG execution."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Any
+
+from magsag.runners.batch import BatchItem, BatchResult, read_batch_lines, run_batch
+
+
+class _SlowRunner:
+    """Runner stub that finishes later items first and tracks concurrency."""
+
+    def __init__(self) -> None:
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def invoke_mag(
+        self, slug: str, payload: dict[str, Any], context: dict[str, Any]
+    ) -> dict[str, Any]:
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(0.01 * (5 - payload["n"] % 5))
+            if payload.get("fail"):
+                raise ValueError("bad input")
+            context["run_id"] = f"mag-{payload['n']}"
+            return {"slug": slug, "n": payload["n"]}
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+async def _collect(runner: _SlowRunner, lines: list[str], concurrency: int) -> list[BatchResult]:
+    items = read_batch_lines(lines, default_agent="default-mag")
+    return [result async for result in run_batch(runner, items, concurrency=concurrency)]  # type: ignore[arg-type]
+
+
+async def test_results_keep_input_order_with_bounded_concurrency() -> None:
+    """Later items may finish first, but results come back in input order."""
+    runner = _SlowRunner()
+    lines = [f'{{"payload": {{"n": {n}}}}}' for n in range(12)]
+    results = await _collect(runner, lines, concurrency=3)
+
+    assert [r.index for r in results] == list(range(12))
+    assert [r.output for r in results] == [{"slug": "default-mag", "n": n} for n in range(12)]
+    assert all(r.status == "completed" for r in results)
+    assert runner.peak <= 3
+
+
+async def test_before_item_runs_per_item_and_fails_only_that_item() -> None:
+    """The dispatch hook runs before each item; raising fails just that item."""
+    runner = _SlowRunner()
+    seen: list[int] = []
+
+    async def before_item(item: BatchItem) -> None:
+        seen.append(item.index)
+        if item.index == 1:
+            raise RuntimeError("no tokens")
+
+    items = read_batch_lines([f'{{"payload": {{"n": {n}}}}}' for n in range(3)], "default-mag")
+    results = [
+        result
+        async for result in run_batch(runner, items, concurrency=1, before_item=before_item)  # type: ignore[arg-type]
+    ]
+
+    assert seen == [0, 1, 2]
+    assert [r.status for r in results] == ["completed", "failed", "completed"]
+    assert results[1].error == "RuntimeError: no tokens"
+
+
+async def test_failures_are_reported_per_item() -> None:
+    """Invalid lines and failing runs do not abort the batch."""
+    lines = [
+        '{"agent": "a-mag", "payload": {"n": 0}, "id": "first"}',
+        "not json",
+        "",
+        '{"payload": {"n": 2, "fail": true}}',
+        '{"n": 3}',  # Bare payload for the default agent
+        "[1, 2]",
+    ]
+    results = await _collect(_SlowRunner(), lines, concurrency=2)
+
+    assert [(r.index, r.status) for r in results] == [
+        (0, "completed"),
+        (1, "failed"),
+        (2, "failed"),
+        (3, "completed"),
+        (4, "failed"),
+    ]
+    assert results[0].to_dict()["id"] == "first"
+    assert results[0].output == {"slug": "a-mag", "n": 0}
+    assert results[1].error is not None and results[1].error.startswith("Invalid JSON")
+    assert results[2].error == "ValueError: bad input"
+    assert results[3].output == {"slug": "default-mag", "n": 3}
+
+
+async def test_closing_early_does_not_wait_for_running_items() -> None:
+    """Closing the stream returns at once and starts no further items."""
+    release = threading.Event()
+    started: list[int] = []
+
+    class _BlockingRunner:
+        def invoke_mag(
+            self, slug: str, payload: dict[str, Any], context: dict[str, Any]
+        ) -> dict[str, Any]:
+            started.append(payload["n"])
+            if payload["n"] > 0:
+                release.wait(5)
+            return {"n": payload["n"]}
+
+    lines = [f'{{"payload": {{"n": {n}}}}}' for n in range(10)]
+    stream = run_batch(_BlockingRunner(), read_batch_lines(lines, "default-mag"), concurrency=2)  # type: ignore[arg-type]
+    first = await anext(stream)
+    assert first.output == {"n": 0}
+
+    began = time.perf_counter()
+    await stream.aclose()
+    assert time.perf_counter() - began < 1.0
+    release.set()
+    await asyncio.sleep(0.05)
+    assert len(started) <= 3
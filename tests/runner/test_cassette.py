@@ -0,0 +1,130 @@
+"""Tests for record-and-replay cassettes."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from magsag.cassette import (
+    CASSETTE_FILE_NAME,
+    Cassette,
+    CassetteMissError,
+    CassetteProvider,
+    find_run_cassette,
+    get_active_cassette,
+    use_cassette,
+)
+from magsag.mcp import MCPRegistry, MCPToolResult
+from magsag.observability import cost_tracker
+from magsag.providers import PROVIDER_BUILDERS
+from magsag.providers.mock import MockLLMProvider
+from magsag.runners.agent_runner import AgentRunner
+
+
+def test_provider_calls_replay_without_provider(tmp_path: Path) -> None:
+    """Recorded generate calls are served without the wrapped provider."""
+    path = tmp_path / CASSETTE_FILE_NAME
+    recorder = Cassette(path)
+    with use_cassette(recorder):
+        recorded = CassetteProvider(MockLLMProvider()).generate(
+            "offer for candidate", model="mock", response_format={"type": "json_object"}
+        )
+    assert len(recorder) == 1
+    recorder.save()
+
+    with use_cassette(Cassette(path, mode="replay")):
+        replayed = CassetteProvider(None).generate(
+            "offer for candidate", model="mock", response_format={"type": "json_object"}
+        )
+        with pytest.raises(CassetteMissError):
+            CassetteProvider(None).generate("another prompt", model="mock")
+    assert replayed.metadata.pop("replayed") is True
+    assert replayed == recorded
+    assert get_active_cassette() is None
+
+
+def test_identical_requests_replay_in_order(tmp_path: Path) -> None:
+    """Repeated requests get their responses in recording order, then the last."""
+    cassette = Cassette(tmp_path / CASSETTE_FILE_NAME)
+    for n in range(2):
+        cassette.record("llm.generate", {"prompt": "p", "opts": {"a": 1, "b": 2}}, n)
+    cassette.save()
+
+    replay = Cassette(cassette.path, mode="replay")
+    request = {"opts": {"b": 2, "a": 1}, "prompt": "p"}  # Key order does not matter
+    assert [replay.lookup("llm.generate", request) for _ in range(3)] == [0, 1, 1]
+    with pytest.raises(CassetteMissError):
+        replay.lookup("mcp.execute_tool", request)
+
+
+async def test_mcp_tool_calls_replay_without_servers(tmp_path: Path) -> None:
+    """MCP execute_tool results are recorded and replayed with no server running."""
+    registry = MCPRegistry(servers_dir=tmp_path / "servers")
+    server = MagicMock()
+    server.execute_tool = AsyncMock(
+        return_value=MCPToolResult(success=True, output={"rows": [1, 2]}, metadata={"ms": 3})
+    )
+    registry._servers["pg"] = server
+
+    cassette = Cassette(tmp_path / CASSETTE_FILE_NAME)
+    with use_cassette(cassette):
+        recorded = await registry.execute_tool("pg", "query", {"sql": "SELECT 1"})
+    cassette.save()
+
+    with use_cassette(Cassette(cassette.path, mode="replay")):
+        replayed = await MCPRegistry(servers_dir=tmp_path / "servers").execute_tool(
+            "pg", "query", {"sql": "SELECT 1"}
+        )
+    assert replayed == recorded
+    server.execute_tool.assert_awaited_once()
+
+
+def test_replay_context_selects_run_cassette(tmp_path: Path) -> None:
+    """create_replay_context switches the run to replay its cassette."""
+    from magsag.runner_determinism import create_replay_context
+
+    (tmp_path / "summary.json").write_text("{}")
+    assert find_run_cassette(tmp_path / "summary.json") is None
+    Cassette(tmp_path / CASSETTE_FILE_NAME).save()
+    cassette_path = find_run_cassette(tmp_path / "summary.json")
+    assert cassette_path == tmp_path / CASSETTE_FILE_NAME
+
+    context = create_replay_context({"seed": 1}, cassette_path=cassette_path)
+    assert context["cassette_mode"] == "replay"
+    assert context["cassette_path"] == str(cassette_path)
+    assert "cassette_mode" not in create_replay_context({"seed": 1})
+
+
+def test_agent_run_replays_provider_calls(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """A recorded run replays through runner-provided providers without building them."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(cost_tracker, "_tracker", None)
+
+    async def offer_agent(payload: dict[str, Any], *, runner: AgentRunner, **_: Any) -> Any:
+        response = runner.get_provider("mock").generate(
+            f"offer for {payload['role']}", model="mock", response_format={"type": "json_object"}
+        )
+        return {"offer": response.content, "replayed": response.metadata.get("replayed", False)}
+
+    def run(mode: str) -> dict[str, Any]:
+        runner = AgentRunner(base_dir=tmp_path)
+        monkeypatch.setattr(runner.registry, "resolve_entrypoint", lambda _: offer_agent)
+        context = {"cassette_mode": mode, "cassette_path": str(tmp_path / CASSETTE_FILE_NAME)}
+        return runner.invoke_mag("offer-orchestrator-mag", {"role": "Staff Engineer"}, context)
+
+    recorded = run("record")
+    assert recorded["replayed"] is False
+
+    def offline(**_: Any) -> MockLLMProvider:
+        raise AssertionError("replay must not construct the provider")
+
+    monkeypatch.setitem(PROVIDER_BUILDERS, "mock", offline)
+    replayed = run("replay")
+    assert replayed == {**recorded, "replayed": True}
+
+    if cost_tracker._tracker is not None:
+        cost_tracker._tracker.close()
+        cost_tracker._tracker = None
@@ -309,3 +309,59 @@ async def test_vacuum_month_boundary(storage: SQLiteStorageBackend) -> None:
     result = await storage.vacuum(hot_days=7, dry_run=True)
     assert result["dry_run"] is True
     assert "cutoff" in result
+
+
+@pytest.mark.asyncio
+async def test_idempotency_claim_complete_and_takeover(storage: SQLiteStorageBackend) -> None:
+    """Idempotency keys are claimed once, replayed, and reclaimable after expiry."""
+    from magsag.storage.models import IdempotencyRecord
+
+    now = datetime.now(timezone.utc)
+    lease = now + timedelta(minutes=5)
+
+    assert await storage.claim_idempotency_key("POST:/runs:k1", "owner-a", lease) == "claimed"
+    assert await storage.claim_idempotency_key("POST:/runs:k1", "owner-b", lease) == "pending"
+    assert await storage.get_idempotency_record("POST:/runs:k1") is None
+
+    await storage.complete_idempotency_key(
+        IdempotencyRecord(
+            key="POST:/runs:k1",
+            request_hash="abc",
+            status_code=201,
+            headers=[(b"set-cookie", b"a=1"), (b"set-cookie", b"b=2")],
+            body=b'{"ok": true}',
+            expires_at=now + timedelta(hours=1),
+        ),
+        "owner-a",
+    )
+    assert await storage.claim_idempotency_key("POST:/runs:k1", "owner-b", lease) == "completed"
+    record = await storage.get_idempotency_record("POST:/runs:k1")
+    assert record is not None
+    assert record.status_code == 201
+    assert record.headers == [(b"set-cookie", b"a=1"), (b"set-cookie", b"b=2")]
+    assert record.body == b'{"ok": true}'
+
+    # An expired lease can be taken over by another owner
+    assert await storage.claim_idempotency_key("k2", "owner-a", now - timedelta(seconds=1)) == (
+        "claimed"
+    )
+    assert await storage.claim_idempotency_key("k2", "owner-b", lease) == "claimed"
+    # Stale owner cannot release or complete the new claim
+    await storage.release_idempotency_key("k2", "owner-a")
+    assert await storage.claim_idempotency_key("k2", "owner-c", lease) == "pending"
+    await storage.release_idempotency_key("k2", "owner-b")
+    assert await storage.claim_idempotency_key("k2", "owner-c", lease) == "claimed"
+
+
+@pytest.mark.asyncio
+async def test_idempotency_purge_expired(storage: SQLiteStorageBackend) -> None:
+    """Expired idempotency keys are purged in bounded batches."""
+    past = datetime.now(timezone.utc) - timedelta(seconds=1)
+    for i in range(5):
+        await storage.claim_idempotency_key(f"old-{i}", "owner", past)
+    await storage.claim_idempotency_key("live", "owner", past + timedelta(hours=1))
+
+    assert await storage.purge_expired_idempotency_keys(limit=3) == 3
+    assert await storage.purge_expired_idempotency_keys(limit=3) == 2
+    assert await storage.purge_expired_idempotency_keys() == 0
+    assert await storage.claim_idempotency_key("live", "other", past) == "pending"
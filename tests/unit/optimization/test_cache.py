@@ -45,11 +45,19 @@ class TestCacheConfig:
         config = CacheConfig(
             backend=CacheBackend.FAISS,
             dimension=128,
-            faiss_index_type="HNSW",  # Not supported
+            faiss_index_type="LSH",  # Not supported
         )
         with pytest.raises(ValueError, match="Unsupported FAISS index type"):
             create_cache(config)
 
+    def test_pq_m_must_divide_dimension(self) -> None:
+        """IVFPQ splits vectors into faiss_pq_m equal sub-vectors."""
+        pytest.importorskip("faiss")
+
+        config = CacheConfig(dimension=100, faiss_index_type="IVFPQ", faiss_pq_m=64)
+        with pytest.raises(ValueError, match="faiss_pq_m"):
+            create_cache(config)
+
 
 class TestFAISSCache:
     """Test FAISS cache implementation."""
@@ -531,3 +539,330 @@ class TestIVFFlatTraining:
         query = np.random.rand(128).astype(np.float32)
         results = cache.search(query, k=5, threshold=0.0)
         assert len(results) <= 5
+
+
+class TestBatchOperations:
+    """Test batched insert and search."""
+
+    @pytest.fixture(params=["Flat", "IVFFlat"])
+    def cache(self, request: pytest.FixtureRequest) -> SemanticCache:
+        """Create a FAISS cache of each index type (IVFFlat stays untrained)."""
+        pytest.importorskip("faiss")
+        config = CacheConfig(
+            backend=CacheBackend.FAISS,
+            dimension=32,
+            faiss_index_type=request.param,
+            faiss_nlist=1000,
+        )
+        return create_cache(config)
+
+    def test_set_many_and_search_many(self, cache: SemanticCache) -> None:
+        """Each query finds its own entry; batched results match single searches."""
+        rng = np.random.default_rng(0)
+        embeddings = rng.random((50, 32), dtype=np.float32)
+        cache.set_many(
+            [f"key_{i}" for i in range(50)],
+            embeddings,
+            [{"index": i} for i in range(50)],
+        )
+        assert cache.size() == 50
+
+        batched = cache.search_many(embeddings[:10], k=3, threshold=0.0)
+        assert len(batched) == 10
+        for i, results in enumerate(batched):
+            assert results[0].value == {"index": i}
+            single = cache.search(embeddings[i], k=3, threshold=0.0)
+            assert [r.key for r in results] == [r.key for r in single]
+
+    def test_set_many_replaces_keys(self, cache: SemanticCache) -> None:
+        """Existing keys and keys repeated within a batch keep the last value."""
+        rng = np.random.default_rng(1)
+        cache.set_many(["a", "b"], rng.random((2, 32), dtype=np.float32), [{"v": 1}, {"v": 1}])
+
+        embeddings = rng.random((3, 32), dtype=np.float32)
+        cache.set_many(["a", "c", "a"], embeddings, [{"v": 2}, {"v": 2}, {"v": 3}])
+
+        assert cache.size() == 3
+        results = cache.search(embeddings[2], k=1, threshold=0.99)
+        assert results[0].key == "a"
+        assert results[0].value == {"v": 3}
+
+    def test_set_many_length_mismatch(self, cache: SemanticCache) -> None:
+        """Mismatched keys, embeddings and values raise ValueError."""
+        with pytest.raises(ValueError):
+            cache.set_many(["a"], np.zeros((2, 32), dtype=np.float32), [{}, {}])
+        with pytest.raises(ValueError, match="dimension"):
+            cache.set_many(["a"], np.zeros((1, 16), dtype=np.float32), [{}])
+
+
+class TestIVFRetraining:
+    """Test automatic IVF retraining."""
+
+    def test_retrains_when_corpus_grows(self) -> None:
+        """The index is retrained once the corpus outgrows its training set."""
+        pytest.importorskip("faiss")
+        from magsag.optimization.cache import FAISSCache
+
+        config = CacheConfig(
+            backend=CacheBackend.FAISS,
+            dimension=16,
+            faiss_index_type="IVFFlat",
+            faiss_nlist=4,
+            faiss_retrain_factor=2.0,
+        )
+        cache = create_cache(config)
+        assert isinstance(cache, FAISSCache)
+
+        rng = np.random.default_rng(2)
+        embeddings = rng.random((20, 16), dtype=np.float32)
+        cache.set_many([f"k{i}" for i in range(4)], embeddings[:4], [{"i": i} for i in range(4)])
+        assert cache._trained_size == 4
+
+        cache.set_many(
+            [f"k{i}" for i in range(4, 20)], embeddings[4:], [{"i": i} for i in range(4, 20)]
+        )
+        assert cache._trained_size == 20
+        assert cache.index.ntotal == 20
+        results = cache.search(embeddings[7], k=1, threshold=0.99)
+        assert results[0].value == {"i": 7}
+
+    @pytest.mark.parametrize("index_type", ["IVFSQ8", "IVFPQ"])
+    def test_lossy_indexes_retrain_on_raw_vectors(
+        self, index_type: str, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Quantized indexes are retrained on the inserted vectors, not reconstructions."""
+        pytest.importorskip("faiss")
+        from magsag.optimization.cache import FAISSCache
+
+        config = CacheConfig(
+            backend=CacheBackend.FAISS,
+            dimension=16,
+            faiss_index_type=index_type,
+            faiss_nlist=4,
+            faiss_pq_m=8,
+            faiss_pq_nbits=4,
+            faiss_retrain_factor=2.0,
+        )
+        cache = create_cache(config)
+        assert isinstance(cache, FAISSCache)
+        trained: list[np.ndarray] = []
+        train = cache._train
+
+        def spy(ids: np.ndarray, vectors: np.ndarray) -> None:
+            trained.append(vectors.copy())
+            train(ids, vectors)
+
+        monkeypatch.setattr(cache, "_train", spy)
+        embeddings = np.random.default_rng(3).standard_normal((64, 16)).astype(np.float32)
+        cache.set_many([f"k{i}" for i in range(16)], embeddings[:16], [{}] * 16)
+        cache.set("k0", embeddings[0], {})  # Replacing drops the old id
+        cache.set_many([f"k{i}" for i in range(16, 64)], embeddings[16:], [{}] * 48)
+
+        assert len(trained) == 2
+        order = [*range(1, 16), 0, *range(16, 64)]
+        expected = embeddings[order] / np.linalg.norm(embeddings[order], axis=1, keepdims=True)
+        np.testing.assert_allclose(trained[1], expected, rtol=1e-6)
+        assert cache._raw_vectors is not None and len(cache._raw_vectors) == 64
+
+
+class TestCapacityAndExpiry:
+    """Test eviction, TTL expiry and compaction."""
+
+    @staticmethod
+    def _cache(clock: list[float] | None = None, **overrides: object) -> SemanticCache:
+        pytest.importorskip("faiss")
+        from magsag.optimization.cache import FAISSCache
+
+        config = CacheConfig(backend=CacheBackend.FAISS, dimension=16, **overrides)
+        if clock is None:
+            return FAISSCache(config)
+        return FAISSCache(config, clock=lambda: clock[0])
+
+    def test_lru_evicts_least_recently_used(self) -> None:
+        """Searching an entry protects it from LRU eviction."""
+        cache = self._cache(max_entries=3)
+        embeddings = np.eye(16, dtype=np.float32)[:4]
+        cache.set_many(["a", "b", "c"], embeddings[:3], [{"k": k} for k in "abc"])
+
+        assert cache.search(embeddings[0], k=1, threshold=0.99)[0].key == "a"
+        cache.set("d", embeddings[3], {"k": "d"})
+
+        assert cache.size() == 3
+        assert cache.search(embeddings[1], k=1, threshold=0.99) == []
+        assert cache.search(embeddings[0], k=1, threshold=0.99)[0].key == "a"
+
+    def test_lfu_evicts_least_frequently_used(self) -> None:
+        """LFU keeps frequently hit entries even if they are older."""
+        cache = self._cache(max_entries=2, eviction_policy="lfu")
+        embeddings = np.eye(16, dtype=np.float32)[:3]
+        cache.set("a", embeddings[0], {"k": "a"})
+        cache.set("b", embeddings[1], {"k": "b"})
+        for _ in range(3):
+            cache.search(embeddings[0], k=1, threshold=0.99)
+        cache.search(embeddings[1], k=1, threshold=0.99)
+        cache.search(embeddings[1], k=1, threshold=0.99)
+
+        cache.set("c", embeddings[2], {"k": "c"})
+        cache.search(embeddings[2], k=1, threshold=0.99)
+        cache.set("d", np.ones(16, dtype=np.float32), {"k": "d"})
+
+        keys = {r.key for e in embeddings for r in cache.search(e, k=1, threshold=0.99)}
+        assert keys == {"a"}
+        assert cache.size() == 2
+
+    def test_max_bytes_budget(self) -> None:
+        """Entries are evicted to stay within the byte budget."""
+        from magsag.optimization.cache import CACHE_ENTRY_OVERHEAD_BYTES, FAISSCache
+
+        budget = 10 * (16 * 4 + CACHE_ENTRY_OVERHEAD_BYTES)
+        cache = self._cache(max_bytes=budget)
+        assert isinstance(cache, FAISSCache)
+        rng = np.random.default_rng(3)
+        cache.set_many(
+            [f"k{i:02d}" for i in range(50)],
+            rng.random((50, 16), dtype=np.float32),
+            [{"i": i} for i in range(50)],
+        )
+
+        assert 0 < cache.size() < 10
+        assert cache.size_bytes() <= budget
+
+    def test_entries_expire(self) -> None:
+        """Entries disappear once their TTL elapses."""
+        clock = [0.0]
+        cache = self._cache(clock)
+        embedding = np.eye(16, dtype=np.float32)[0]
+        cache.set("short", embedding, {"v": 1}, ttl_seconds=10)
+        cache.set("forever", np.eye(16, dtype=np.float32)[1], {"v": 2}, ttl_seconds=0)
+
+        clock[0] = 9.0
+        assert cache.search(embedding, k=1, threshold=0.99)[0].key == "short"
+        clock[0] = 10.0
+        assert cache.search(embedding, k=1, threshold=0.99) == []
+        assert cache.size() == 1
+
+    def test_ttl_defaults_to_cache_policy(self) -> None:
+        """Without an explicit TTL the cache policy decides."""
+        from magsag.cache.policy import get_cache_policy_config
+
+        policy = get_cache_policy_config()
+        clock = [0.0]
+        cache = self._cache(clock)
+        embeddings = np.eye(16, dtype=np.float32)[:2]
+        cache.set("sensitive", embeddings[0], {"v": 1}, sensitivity="sensitive")
+        cache.set("huge", embeddings[1], {"v": "x" * (policy.max_cacheable_length + 1)})
+        assert cache.size() == 1  # Too long to cache
+
+        clock[0] = float(policy.sensitive_ttl)
+        assert cache.purge_expired() == 1
+        assert cache.size() == 0
+
+    def test_compaction_removes_tombstones(self) -> None:
+        """Replaced entries are removed from the index once tombstones pile up."""
+        from magsag.optimization.cache import FAISSCache
+
+        cache = self._cache(compaction_ratio=0.5)
+        assert isinstance(cache, FAISSCache)
+        rng = np.random.default_rng(4)
+        embeddings = rng.random((20, 16), dtype=np.float32)
+        cache.set_many([f"k{i}" for i in range(20)], embeddings, [{"v": 1}] * 20)
+
+        cache.set_many([f"k{i}" for i in range(5)], embeddings[:5], [{"v": 2}] * 5)
+        assert cache.index.ntotal == 25  # Below the ratio: tombstones are kept
+        results = cache.search(embeddings[0], k=3, threshold=0.0)
+        assert [r.key for r in results][0] == "k0"
+        assert results[0].value == {"v": 2}
+        assert len({r.key for r in results}) == 3
+
+        cache.set_many([f"k{i}" for i in range(5, 11)], embeddings[5:11], [{"v": 2}] * 6)
+        assert cache.index.ntotal == 20
+        assert cache.compact() == 0
+
+    def test_embeddings_come_from_index(self) -> None:
+        """Returned embeddings are reconstructed from the index."""
+        cache = self._cache()
+        embedding = np.arange(1, 17, dtype=np.float32)
+        cache.set("a", embedding, {})
+        result = cache.search(embedding, k=1, threshold=0.99)[0]
+        np.testing.assert_allclose(result.embedding, embedding / np.linalg.norm(embedding))
+
+    def test_trained_ivf_replacements_resolve_to_right_keys(self) -> None:
+        """Replacing keys in a trained IVF index keeps ids and keys aligned."""
+        from magsag.optimization.cache import FAISSCache
+
+        cache = self._cache(faiss_index_type="IVFFlat", faiss_nlist=4, compaction_ratio=0.01)
+        assert isinstance(cache, FAISSCache)
+        rng = np.random.default_rng(5)
+        embeddings = rng.random((40, 16), dtype=np.float32)
+        cache.set_many([f"k{i}" for i in range(40)], embeddings, [{"i": i} for i in range(40)])
+        assert cache._trained
+        import faiss
+
+        faiss.extract_index_ivf(cache.index).nprobe = 4
+
+        replaced = rng.random((10, 16), dtype=np.float32)
+        for i in range(10):
+            cache.set(f"k{i}", replaced[i], {"i": i, "replaced": True})
+
+        for i in range(40):
+            query = replaced[i] if i < 10 else embeddings[i]
+            result = cache.search(query, k=1, threshold=0.99)[0]
+            assert result.key == f"k{i}"
+            assert result.value["i"] == i
+
+
+class TestIndexTypes:
+    """Test the compressed and graph FAISS index types."""
+
+    @staticmethod
+    def _cache(index_type: str, **overrides: object) -> SemanticCache:
+        pytest.importorskip("faiss")
+        from magsag.optimization.cache import FAISSCache
+
+        values: dict[str, object] = {
+            "dimension": 16,
+            "faiss_index_type": index_type,
+            "faiss_nlist": 4,
+            "faiss_nprobe": 4,
+            "faiss_pq_m": 8,
+            "faiss_pq_nbits": 4,
+        }
+        values.update(overrides)
+        return FAISSCache(CacheConfig(**values))  # type: ignore[arg-type]
+
+    @pytest.mark.parametrize("index_type", ["IVFPQ", "IVFSQ8", "HNSW"])
+    def test_nearest_neighbour(self, index_type: str) -> None:
+        """Each index type finds the stored vector closest to the query."""
+        cache = self._cache(index_type)
+        embeddings = np.random.default_rng(6).standard_normal((64, 16)).astype(np.float32)
+        cache.set_many([f"k{i}" for i in range(64)], embeddings, [{"i": i} for i in range(64)])
+        assert cache.size() == 64
+
+        results = cache.search_many(embeddings, k=1, threshold=0.5)
+        assert sum(r[0].key == f"k{i}" for i, r in enumerate(results) if r) >= 60
+
+    def test_hnsw_similarity_matches_cosine(self) -> None:
+        """HNSW L2 distances are reported as cosine distances."""
+        cache = self._cache("HNSW")
+        embeddings = np.eye(16, dtype=np.float32)[:2]
+        cache.set_many(["a", "b"], embeddings, [{}, {}])
+
+        query = embeddings[0] + embeddings[1] * 0.5
+        results = cache.search(query, k=2, threshold=0.0)
+        expected = 1.0 - query @ embeddings.T / np.linalg.norm(query)
+        np.testing.assert_allclose([r.distance for r in results], expected, atol=1e-5)
+
+    def test_hnsw_compaction_rebuilds_graph(self) -> None:
+        """Replaced HNSW vectors are dropped by rebuilding the graph."""
+        from magsag.optimization.cache import FAISSCache
+
+        cache = self._cache("HNSW", compaction_ratio=0.1)
+        assert isinstance(cache, FAISSCache)
+        embeddings = np.random.default_rng(7).standard_normal((20, 16)).astype(np.float32)
+        cache.set_many([f"k{i}" for i in range(20)], embeddings, [{"v": 1}] * 20)
+        cache.set_many([f"k{i}" for i in range(3)], -embeddings[:3], [{"v": 2}] * 3)
+
+        assert cache.index.ntotal == 20
+        assert not cache._tombstones
+        assert cache.search(-embeddings[0], k=1, threshold=0.99)[0].value == {"v": 2}
+        assert all(r.key != "k0" for r in cache.search(embeddings[0], k=3, threshold=0.99))
@@ -0,0 +1,184 @@
+"""Unit tests for persistent FAISS cache snapshots."""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("faiss")
+
+from magsag.optimization.cache import CacheConfig, FAISSCache
+
+
+def _config(path: Path, **overrides: object) -> CacheConfig:
+    values: dict[str, object] = {
+        "dimension": 16,
+        "faiss_nlist": 4,
+        "faiss_pq_m": 8,
+        "faiss_pq_nbits": 4,
+        "faiss_snapshot_dir": str(path),
+        "faiss_snapshot_interval": 0,
+    }
+    values.update(overrides)
+    return CacheConfig(**values)  # type: ignore[arg-type]
+
+
+def _fill(cache: FAISSCache, count: int = 40, seed: int = 0) -> np.ndarray:
+    embeddings = np.random.default_rng(seed).random((count, 16), dtype=np.float32)
+    cache.set_many([f"k{i}" for i in range(count)], embeddings, [{"i": i} for i in range(count)])
+    return embeddings
+
+
+@pytest.mark.parametrize("index_type", ["Flat", "IVFFlat", "IVFSQ8", "HNSW"])
+def test_snapshot_round_trip(tmp_path: Path, index_type: str) -> None:
+    """A restarted cache serves the snapshot memory-mapped plus the journal."""
+    config = _config(tmp_path, faiss_index_type=index_type)
+    writer = FAISSCache(config)
+    embeddings = _fill(writer)
+    assert writer.save_snapshot() == 1
+    writer.set("k0", embeddings[0] + 1.0, {"i": "replaced"})
+    writer.close()
+
+    restored = FAISSCache(config)
+    assert restored._base_index is not None
+    assert restored.size() == 40
+    assert restored.search(embeddings[7], k=1, threshold=0.99)[0].value == {"i": 7}
+    assert restored.search(embeddings[0] + 1.0, k=1, threshold=0.99)[0].value == {"i": "replaced"}
+    assert all(r.key != "k0" for r in restored.search(embeddings[0], k=3, threshold=0.999))
+
+
+def test_untrained_ivf_snapshot(tmp_path: Path) -> None:
+    """An IVF cache below nlist entries snapshots its training buffer."""
+    config = _config(tmp_path, faiss_index_type="IVFFlat", faiss_nlist=100)
+    writer = FAISSCache(config)
+    embeddings = _fill(writer, count=10)
+    writer.save_snapshot()
+    writer.close()
+
+    assert sorted(p.name for p in tmp_path.glob("buffer-*.npz")) == ["buffer-1.npz"]
+    restored = FAISSCache(config)
+    assert restored.size() == 10
+    assert restored.search(embeddings[3], k=1, threshold=0.99)[0].value == {"i": 3}
+
+
+def test_journal_replays_evictions(tmp_path: Path) -> None:
+    """Evictions are journaled, so a restart keeps the same entries."""
+    config = _config(tmp_path, max_entries=5)
+    writer = FAISSCache(config)
+    _fill(writer, count=8)
+    kept = set(writer._key_to_id)
+    writer.close()
+
+    restored = FAISSCache(config)
+    assert set(restored._key_to_id) == kept
+
+
+def test_expired_entries_are_not_restored(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """TTLs are persisted as wall-clock deadlines."""
+    config = _config(tmp_path)
+    writer = FAISSCache(config)
+    embeddings = np.eye(16, dtype=np.float32)[:2]
+    writer.set("short", embeddings[0], {}, ttl_seconds=10)
+    writer.save_snapshot()
+    writer.set("journaled", embeddings[1], {}, ttl_seconds=10)
+    writer.set("long", np.ones(16, dtype=np.float32), {}, ttl_seconds=3600)
+    writer.close()
+
+    real_time = time.time
+    monkeypatch.setattr(time, "time", lambda: real_time() + 60)
+    restored = FAISSCache(config)
+    assert set(restored._key_to_id) == {"long"}
+
+
+def test_automatic_snapshot_interval(tmp_path: Path) -> None:
+    """A snapshot is written once the journal reaches the interval."""
+    writer = FAISSCache(_config(tmp_path, faiss_snapshot_interval=30))
+    _fill(writer, count=20)
+    assert writer._generation == 0
+    _fill(writer, count=20, seed=1)
+    assert writer._generation == 1
+    assert list(tmp_path.glob("index-*.faiss")) == [tmp_path / "index-1.faiss"]
+
+
+def test_read_only_reader_refreshes(tmp_path: Path) -> None:
+    """Readers share the writer's snapshot and follow its journal."""
+    config = _config(tmp_path)
+    writer = FAISSCache(config)
+    embeddings = _fill(writer)
+    writer.save_snapshot()
+
+    reader = FAISSCache(config.model_copy(update={"faiss_snapshot_read_only": True}))
+    reader.set("local", np.ones(16, dtype=np.float32), {"v": "local"})
+    assert reader.size() == 41
+    with pytest.raises(RuntimeError, match="writable"):
+        reader.save_snapshot()
+
+    late = np.arange(16, dtype=np.float32)
+    writer.set("late", late, {"v": "late"})
+    assert reader.refresh()
+    assert reader.search(late, k=1, threshold=0.99)[0].key == "late"
+    assert reader.search(np.ones(16, dtype=np.float32), k=1, threshold=0.99)[0].key == "local"
+    assert not reader.refresh()
+
+    writer.set("k1", embeddings[1] + 1.0, {"i": "new"})
+    writer.save_snapshot()
+    assert reader.refresh()
+    assert reader._generation == 2
+    assert reader.size() == 41  # Local-only entry dropped with the old generation
+    assert reader.search(embeddings[1] + 1.0, k=1, threshold=0.99)[0].value == {"i": "new"}
+
+
+def test_reader_survives_generations_replaced_while_loading(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """The previous generation stays on disk; older ones are retried past."""
+    config = _config(tmp_path)
+    writer = FAISSCache(config)
+    embeddings = _fill(writer)
+    writer.save_snapshot()
+    stale = writer._store.read_state()  # type: ignore[union-attr]
+    writer.save_snapshot()
+    assert sorted(p.name for p in tmp_path.glob("index-*.faiss")) == [
+        "index-1.faiss",
+        "index-2.faiss",
+    ]
+    writer.save_snapshot()
+    assert sorted(p.name for p in tmp_path.glob("index-*.faiss")) == [
+        "index-2.faiss",
+        "index-3.faiss",
+    ]
+
+    reader = FAISSCache(config.model_copy(update={"faiss_snapshot_read_only": True}))
+    assert reader._store is not None
+    read_state = reader._store.read_state
+    states = iter([stale])  # Generation 1: its index is already unlinked
+    monkeypatch.setattr(
+        reader._store, "read_state", lambda *a, **kw: next(states, None) or read_state(*a, **kw)
+    )
+    reader._reset()
+    reader._load_latest_snapshot()
+
+    assert reader._generation == 3
+    assert reader.search(embeddings[3], k=1, threshold=0.99)[0].value == {"i": 3}
+
+
+def test_ivfpq_snapshot_delta_shares_codebooks(tmp_path: Path) -> None:
+    """Entries added after an IVFPQ snapshot are encoded like the base."""
+    config = _config(tmp_path, faiss_index_type="IVFPQ", faiss_nprobe=4)
+    writer = FAISSCache(config)
+    embeddings = np.random.default_rng(1).standard_normal((32, 16)).astype(np.float32)
+    writer.set_many([f"k{i}" for i in range(32)], embeddings, [{}] * 32)
+    writer.save_snapshot()
+    writer.set("copy", embeddings[5], {})
+
+    results = writer.search(embeddings[5], k=2, threshold=-1.0)
+    assert {r.key for r in results} == {"k5", "copy"}
+    assert results[0].distance == pytest.approx(results[1].distance, abs=1e-5)
+    writer.close()
+
+    restored = FAISSCache(config)
+    assert restored.size() == 33
+    assert restored._base_index is not None
@@ -254,6 +254,34 @@ class TestAgentRunner:
         assert "input" in keys
         assert "output" in keys
 
+    @pytest.mark.asyncio
+    async def test_session_memory_is_buffered_and_readable(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Captured session memories are visible before the buffered write lands."""
+        monkeypatch.chdir(tmp_path)
+        store = SQLiteMemoryStore(db_path=tmp_path / "memory.db", enable_fts=False)
+        await store.initialize()
+        try:
+            runner = AgentRunner(base_dir=tmp_path, enable_memory=True, memory_store=store)
+            for key in ("input", "output"):
+                await runner._capture_session_memory(
+                    agent_slug="alpha-sag", run_id="run-1", key=key, value={"k": key}
+                )
+
+            assert await store.list_memories(run_id="run-1") == []
+            loaded = await runner.load_memories(run_id="run-1")
+            assert [entry.key for entry in loaded] == ["output", "input"]
+
+            await runner._flush_memory_writes()
+            stored = await store.list_memories(run_id="run-1")
+            assert {entry.key for entry in stored} == {"input", "output"}
+            assert len(await runner.load_memories(run_id="run-1")) == 2
+        finally:
+            await store.close()
+
     @pytest.mark.asyncio
     async def test_runner_handoff_wrapper(
         self,
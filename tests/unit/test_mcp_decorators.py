@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from types import SimpleNamespace
 from typing import Any
 from unittest.mock import AsyncMock, MagicMock
@@ -14,6 +15,7 @@ from magsag.mcp.decorators import (
     _CLIENT_CACHE,
     _CLIENT_RETRY_OVERRIDES,
     _get_mcp_client,
+    mcp_cached,
     mcp_tool,
 )
 
@@ -216,3 +218,21 @@ async def test_mcp_tool_requires_gate_but_disabled(monkeypatch: pytest.MonkeyPat
         await git_status()
 
     client_mock.invoke.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_mcp_cached_shares_concurrent_calls_and_keeps_argument_order() -> None:
+    calls: list[tuple[int, int]] = []
+
+    @mcp_cached(ttl_seconds=60)
+    async def lookup(first: int, second: int) -> dict[str, int]:
+        calls.append((first, second))
+        await asyncio.sleep(0)
+        return {"sum": first + second}
+
+    results = await asyncio.gather(*(lookup(1, 2) for _ in range(3)))
+    await lookup(2, 1)
+    await lookup(1, 2)
+
+    assert results == [{"sum": 3}] * 3
+    assert calls == [(1, 2), (2, 1)]
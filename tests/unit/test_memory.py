@@ -2,10 +2,12 @@
 
 from __future__ import annotations
 
+import asyncio
 import tempfile
+from contextlib import asynccontextmanager
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, AsyncIterator
 
 import pytest
 
@@ -15,7 +17,9 @@ from magsag.core.memory import (
     apply_default_ttl,
     create_memory,
 )
-from magsag.storage.memory_store import SQLiteMemoryStore
+from magsag.storage.memory_store import PostgresMemoryStore, SQLiteMemoryStore
+from magsag.storage.memory_sweeper import MemoryExpirySweeper
+from magsag.storage.memory_writer import MemoryWriteQueue
 
 
 class TestMemoryEntry:
@@ -445,3 +449,346 @@ class TestSQLiteMemoryStore:
 
         # Verify new memory still exists
         assert await store.get_memory(new_entry.memory_id) is not None
+
+    async def test_expire_old_memories_in_bounded_batches(self, store: SQLiteMemoryStore) -> None:
+        """Expiry deletes at most batch_size * max_batches rows per call."""
+        for index in range(5):
+            entry = create_memory(
+                scope=MemoryScope.LONG_TERM,
+                agent_slug="test-agent",
+                key=f"expired_{index}",
+                value={"index": index},
+            )
+            entry.expires_at = datetime.now(UTC) - timedelta(seconds=1)
+            await store.create_memory(entry)
+
+        assert await store.expire_old_memories(batch_size=2, max_batches=2) == 4
+        assert await store.expire_old_memories(batch_size=2) == 1
+        assert await store.expire_old_memories() == 0
+
+    async def test_incremental_auto_vacuum_and_query_indexes(
+        self, store: SQLiteMemoryStore
+    ) -> None:
+        """Listing and expiry queries are served by the composite and partial indexes."""
+        assert store._conn is not None
+
+        def plan(sql: str, params: tuple[Any, ...]) -> str:
+            assert store._conn is not None
+            rows = store._conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+            return " ".join(row["detail"] for row in rows)
+
+        assert store._conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+        by_agent = plan(
+            "SELECT * FROM memories WHERE scope = ? AND agent_slug = ? "
+            "ORDER BY created_at DESC LIMIT 10",
+            ("long_term", "test-agent"),
+        )
+        assert "idx_memories_agent_scope_created" in by_agent
+        assert "TEMP B-TREE" not in by_agent
+        assert "idx_memories_run_created" in plan(
+            "SELECT * FROM memories WHERE run_id = ? ORDER BY created_at DESC", ("run-1",)
+        )
+        assert "idx_memories_expiring" in plan(
+            "SELECT rowid FROM memories WHERE expires_at IS NOT NULL AND expires_at <= ?",
+            ("2030-01-01",),
+        )
+
+    async def test_embeddings_stored_as_float32_blobs(self, store: SQLiteMemoryStore) -> None:
+        """Test embeddings round-trip through float32 BLOBs and legacy JSON."""
+        entry = create_memory(
+            scope=MemoryScope.LONG_TERM,
+            agent_slug="test-agent",
+            key="embedded",
+            value={"data": "vector"},
+        )
+        entry.embedding = [0.5, -1.0, 2.0]
+        await store.create_memory(entry)
+
+        assert store._conn is not None
+        raw = store._conn.execute(
+            "SELECT embedding FROM memories WHERE memory_id = ?", (entry.memory_id,)
+        ).fetchone()[0]
+        assert isinstance(raw, bytes) and len(raw) == 12
+
+        store._conn.execute(
+            "UPDATE memories SET embedding = ? WHERE memory_id = ?",
+            ("[0.25, 0.75]", entry.memory_id),
+        )
+        legacy = await store.get_memory(entry.memory_id)
+        assert legacy is not None
+        assert legacy.embedding == [0.25, 0.75]
+
+    async def test_search_memories_by_vector(self, store: SQLiteMemoryStore) -> None:
+        """Test cosine search follows writes, filters and expiry."""
+
+        async def add(key: str, embedding: list[float], agent: str = "test-agent") -> MemoryEntry:
+            entry = create_memory(
+                scope=MemoryScope.LONG_TERM, agent_slug=agent, key=key, value={"note": key}
+            )
+            entry.embedding = embedding
+            await store.create_memory(entry)
+            return entry
+
+        north = await add("north", [0.0, 1.0])
+        east = await add("east", [1.0, 0.0])
+        await add("other-agent", [0.0, 1.0], agent="other-agent")
+
+        results = await store.search_memories_by_vector([0.1, 1.0], k=2, agent_slug="test-agent")
+        assert [entry.key for entry, _ in results] == ["north", "east"]
+        assert results[0][1] == pytest.approx(0.995, abs=1e-3)
+
+        # Writes after the index is loaded are applied incrementally
+        await add("north-east", [1.0, 1.0])
+        east.embedding = [-1.0, 0.0]
+        await store.update_memory(east)
+        await store.delete_memory(north.memory_id)
+        results = await store.search_memories_by_vector([0.1, 1.0], k=5, agent_slug="test-agent")
+        assert [entry.key for entry, _ in results] == ["north-east", "east"]
+
+        expired = await add("expired", [0.0, 1.0])
+        expired.expires_at = datetime.now(UTC) - timedelta(seconds=1)
+        await store.update_memory(expired)
+        results = await store.search_memories_by_vector([0.0, 1.0], k=1, agent_slug="test-agent")
+        assert results[0][0].key == "north-east"
+
+        with pytest.raises(ValueError, match="dimensions"):
+            await store.search_memories_by_vector([1.0, 0.0, 0.0], agent_slug="test-agent")
+
+    async def test_hybrid_vector_search_blends_fts_rank(self, store: SQLiteMemoryStore) -> None:
+        """Test hybrid search lifts full-text matches over slightly closer vectors."""
+        for key, embedding in (("deploy_checklist", [1.0, 0.2]), ("lunch_order", [1.0, 0.0])):
+            entry = create_memory(
+                scope=MemoryScope.LONG_TERM,
+                agent_slug="test-agent",
+                key=key,
+                value={"text": key.replace("_", " ")},
+            )
+            entry.embedding = embedding
+            await store.create_memory(entry)
+
+        vector_only = await store.search_memories_by_vector([1.0, 0.0], k=2)
+        hybrid = await store.search_memories_by_vector([1.0, 0.0], k=2, query="deploy")
+
+        assert vector_only[0][0].key == "lunch_order"
+        assert hybrid[0][0].key == "deploy_checklist"
+
+
+class TestPostgresMemoryStoreVectorSearch:
+    """Test pgvector query construction for vector search."""
+
+    class _Conn:
+        def __init__(self) -> None:
+            self.calls: list[tuple[str, tuple[Any, ...]]] = []
+
+        async def fetch(self, sql: str, *params: Any) -> list[dict[str, Any]]:
+            self.calls.append((sql, params))
+            return [
+                {
+                    "memory_id": "m1",
+                    "scope": "long_term",
+                    "agent_slug": "test-agent",
+                    "run_id": None,
+                    "key": "k",
+                    "value": "{}",
+                    "created_at": datetime.now(UTC),
+                    "updated_at": datetime.now(UTC),
+                    "expires_at": None,
+                    "pii_tags": [],
+                    "retention_policy": None,
+                    "embedding": "[1,0]",
+                    "tags": [],
+                    "metadata": "{}",
+                    "score": 0.9,
+                    "hybrid_score": 0.8,
+                }
+            ]
+
+    @staticmethod
+    def _store(conn: Any) -> PostgresMemoryStore:
+        @asynccontextmanager
+        async def acquire() -> AsyncIterator[Any]:
+            yield conn
+
+        store = PostgresMemoryStore("postgresql://localhost/test", embedding_dim=2)
+        store._pool = type("Pool", (), {"acquire": staticmethod(acquire)})()
+        return store
+
+    async def test_orders_by_indexed_expression(self) -> None:
+        conn = self._Conn()
+        store = self._store(conn)
+
+        results = await store.search_memories_by_vector(
+            [1.0, 0.0], k=3, scope=MemoryScope.LONG_TERM
+        )
+        hybrid = await store.search_memories_by_vector([1.0, 0.0], k=3, query="deploy")
+
+        (sql, params), (hybrid_sql, hybrid_params) = conn.calls
+        assert "ORDER BY embedding::vector(2) <=> $1::vector(2)" in sql
+        assert params == ("[1.0,0.0]", "long_term", 3)
+        assert "word_similarity($3, key || ' ' || value::text)" in hybrid_sql
+        assert hybrid_params == ("[1.0,0.0]", 40, "deploy", 0.3, 3)
+        assert results[0][0].embedding == [1, 0] and results[0][1] == 0.9
+        assert hybrid[0][1] == 0.8
+
+        with pytest.raises(ValueError, match="dimensions"):
+            await store.search_memories_by_vector([1.0, 0.0, 0.0])
+
+
+class TestMemoryWriteQueue:
+    """Test the write-behind queue for memory entries."""
+
+    @pytest.fixture
+    async def store(self) -> AsyncGenerator[SQLiteMemoryStore, None]:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = SQLiteMemoryStore(db_path=Path(tmpdir) / "queue.db")
+            await store.initialize()
+            yield store
+            await store.close()
+
+    @staticmethod
+    def _session(key: str, run_id: str = "run-1") -> MemoryEntry:
+        return create_memory(
+            scope=MemoryScope.SESSION,
+            agent_slug="test-agent",
+            run_id=run_id,
+            key=key,
+            value={"key": key},
+            tags=["sag"],
+        )
+
+    async def test_batches_writes_and_reads_pending(
+        self, store: SQLiteMemoryStore, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        batches: list[int] = []
+        create_memories = store.create_memories
+
+        async def spy(entries: list[MemoryEntry]) -> None:
+            batches.append(len(entries))
+            await create_memories(entries)
+
+        monkeypatch.setattr(store, "create_memories", spy)
+        queue = MemoryWriteQueue(store, batch_size=10, max_pending=20)
+
+        for index in range(3):
+            await queue.put(self._session(f"step-{index}"))
+
+        assert batches == []
+        assert [e.key for e in queue.pending(run_id="run-1", tags=["sag"])] == [
+            "step-2",
+            "step-1",
+            "step-0",
+        ]
+        assert queue.pending(run_id="run-2") == []
+
+        assert await queue.flush() == 3
+        assert batches == [3]
+        assert len(queue) == 0
+        stored = await store.list_memories(scope=MemoryScope.SESSION, run_id="run-1")
+        assert len(stored) == 3
+
+    async def test_background_flush_and_backpressure(
+        self, store: SQLiteMemoryStore, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        batches: list[int] = []
+        create_memories = store.create_memories
+
+        async def spy(entries: list[MemoryEntry]) -> None:
+            batches.append(len(entries))
+            await create_memories(entries)
+
+        monkeypatch.setattr(store, "create_memories", spy)
+        queue = MemoryWriteQueue(store, batch_size=2, max_pending=3)
+
+        for index in range(7):
+            await queue.put(self._session(f"step-{index}"))
+            assert len(queue) <= 3
+        await queue.flush()
+
+        assert sum(batches) == 7
+        assert max(batches) <= 2
+        assert len(await store.list_memories(run_id="run-1", limit=10)) == 7
+
+    async def test_failed_batches_are_dropped_and_logged(
+        self, store: SQLiteMemoryStore, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        queue = MemoryWriteQueue(store)
+        entry = self._session("duplicate")
+        await store.create_memory(entry)
+
+        await queue.put(entry)
+        assert await queue.flush() == 0
+
+        assert len(queue) == 0
+        assert "Failed to persist 1 buffered memories" in caplog.text
+
+
+class TestMemoryExpirySweeper:
+    """Test the scheduled expiry sweeper."""
+
+    @pytest.fixture
+    async def store(self) -> AsyncGenerator[SQLiteMemoryStore, None]:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = SQLiteMemoryStore(db_path=Path(tmpdir) / "sweep.db")
+            await store.initialize()
+            yield store
+            await store.close()
+
+    @staticmethod
+    async def _expired(store: SQLiteMemoryStore, count: int) -> None:
+        for index in range(count):
+            entry = create_memory(
+                scope=MemoryScope.LONG_TERM,
+                agent_slug="test-agent",
+                key=f"expired_{index}",
+                value={"index": index},
+            )
+            entry.expires_at = datetime.now(UTC) - timedelta(seconds=1)
+            await store.create_memory(entry)
+
+    async def test_sweeps_bounded_batches_once_per_interval(
+        self, store: SQLiteMemoryStore, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        await self._expired(store, 5)
+        sweeper = MemoryExpirySweeper(store, interval_s=60, batch_size=2, max_batches=2)
+        clock = [1000.0]
+        monkeypatch.setattr("magsag.storage.memory_sweeper.time.monotonic", lambda: clock[0])
+
+        assert await sweeper.maybe_sweep() == 4
+        assert await sweeper.maybe_sweep() == 0  # Interval not elapsed
+
+        clock[0] += 60
+        assert await sweeper.maybe_sweep() == 1
+        assert await store.list_memories(include_expired=True) == []
+
+    async def test_failed_sweeps_are_logged(
+        self, store: SQLiteMemoryStore, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        sweeper = MemoryExpirySweeper(store)
+        await store.close()
+
+        assert await sweeper.maybe_sweep() == 0
+        assert "Memory expiry sweep failed" in caplog.text
+
+    async def test_api_server_sweeps_in_the_background(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        from magsag.api import server
+        from magsag.api.config import Settings
+
+        settings = Settings(
+            MEMORY_ENABLED=True,
+            MEMORY_SWEEP_INTERVAL_S=0.01,
+            STORAGE_DB_PATH=str(tmp_path / "storage.db"),
+        )
+        monkeypatch.setattr(server, "get_settings", lambda: settings)
+        store = SQLiteMemoryStore(db_path=tmp_path / "memory.db")
+        await store.initialize()
+        await self._expired(store, 3)
+
+        async with server.lifespan(server.app):
+            for _ in range(100):
+                if not await store.list_memories(include_expired=True):
+                    break
+                await asyncio.sleep(0.01)
+        assert await store.list_memories(include_expired=True) == []
+        await store.close()
@@ -0,0 +1,139 @@
+"""Tests for moderation result caching and request coalescing."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+import pytest
+
+from magsag.moderation import ModerationConfig, ModerationError, ModerationService
+
+CATEGORIES = ["harassment", "hate", "self-harm", "sexual", "violence"]
+
+
+class _StubModerationEndpoint:
+    """Local /v1/moderations server flagging texts that contain 'attack'."""
+
+    def __init__(self) -> None:
+        self.requests: list[list[str]] = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                inputs = body["input"] if isinstance(body["input"], list) else [body["input"]]
+                stub.requests.append(inputs)
+                time.sleep(0.02)  # Simulated API latency
+                payload = {
+                    "id": "modr-stub",
+                    "model": body["model"],
+                    "results": [stub.result(text) for text in inputs],
+                }
+                data = json.dumps(payload).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}/v1"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    @staticmethod
+    def result(text: str) -> dict[str, Any]:
+        flagged = "attack" in text
+        return {
+            "flagged": flagged,
+            "categories": {cat: flagged and cat == "violence" for cat in CATEGORIES},
+            "category_scores": {
+                cat: 0.9 if flagged and cat == "violence" else 0.01 for cat in CATEGORIES
+            },
+            "category_applied_input_types": {cat: ["text"] for cat in CATEGORIES},
+        }
+
+    @property
+    def texts_sent(self) -> int:
+        return sum(len(batch) for batch in self.requests)
+
+
+@pytest.fixture
+def endpoint() -> Iterator[_StubModerationEndpoint]:
+    stub = _StubModerationEndpoint()
+    yield stub
+    stub.server.shutdown()
+
+
+@pytest.fixture
+def service(endpoint: _StubModerationEndpoint) -> Iterator[ModerationService]:
+    config = ModerationConfig(
+        api_key="test-key",
+        base_url=endpoint.base_url,
+        batch_max_size=8,
+        batch_max_wait_ms=20,
+    )
+    moderation = ModerationService(config)
+    yield moderation
+    moderation.close()
+
+
+def test_results_are_cached_by_content(
+    service: ModerationService, endpoint: _StubModerationEndpoint
+) -> None:
+    first = service.moderate("a templated prompt")
+    again = service.moderate("a templated prompt")
+    assert len(endpoint.requests) == 1
+    assert not again.flagged
+    assert again.metadata["cached"] is True
+    assert "cached" not in first.metadata
+
+    with pytest.raises(ModerationError):
+        service.moderate_output("plan the attack")
+    results = service.batch_moderate(
+        ["a templated prompt", "fresh text", "plan the attack", "fresh text"]
+    )
+    assert [r.flagged for r in results] == [False, False, True, False]
+    assert endpoint.requests[-1] == ["fresh text"]
+
+
+async def test_concurrent_requests_are_coalesced(
+    service: ModerationService, endpoint: _StubModerationEndpoint
+) -> None:
+    texts = [f"message {i % 6}" for i in range(30)] + ["attack at dawn"]
+
+    results = await asyncio.gather(*(service.amoderate(text) for text in texts))
+
+    assert [r.flagged for r in results] == [False] * 30 + [True]
+    assert endpoint.texts_sent == 7  # Identical texts share one request
+    assert len(endpoint.requests) <= 2
+    with pytest.raises(ModerationError):
+        await service.amoderate_input("attack at dawn")
+    assert endpoint.texts_sent == 7
+
+
+def test_batcher_coalesces_across_threads(
+    service: ModerationService, endpoint: _StubModerationEndpoint
+) -> None:
+    results: list[bool] = []
+
+    def worker(n: int) -> None:
+        results.append(service.batcher.moderate(f"run {n} output").flagged)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [False] * 8
+    assert endpoint.texts_sent == 8
+    assert len(endpoint.requests) < 8
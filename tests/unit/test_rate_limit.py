@@ -3,10 +3,22 @@
 from __future__ import annotations
 
 import time
+from pathlib import Path
 
 import pytest
+from fastapi import Request
 
-from magsag.api.rate_limit import InMemoryRateLimiter
+from magsag.api.rate_limit import (
+    UNLIMITED_QPS,
+    InMemoryRateLimiter,
+    SQLiteRateLimiter,
+    charge_rate_limit,
+    get_rate_limiter,
+    quota_for_key,
+    rate_limit,
+    rate_limit_dependency,
+    reset_rate_limiter,
+)
 
 
 def test_in_memory_rate_limiter_allows_requests_within_limit() -> None:
@@ -103,3 +115,209 @@ def test_rate_limiter_error_message() -> None:
     assert isinstance(detail, dict)
     assert detail["code"] == "rate_limit_exceeded"
     assert "2 requests per second" in detail["message"]
+
+
+def test_in_memory_rate_limiter_weighted_cost() -> None:
+    """Test that expensive requests consume several tokens."""
+    from fastapi import HTTPException
+
+    limiter = InMemoryRateLimiter(qps=10)
+
+    limiter.check_rate_limit("test-key", cost=5)
+    limiter.check_rate_limit("test-key", cost=5)
+
+    with pytest.raises(HTTPException):
+        limiter.check_rate_limit("test-key", cost=1)
+
+
+def test_in_memory_rate_limiter_per_key_qps() -> None:
+    """Test that a per-key limit overrides the default."""
+    from fastapi import HTTPException
+
+    limiter = InMemoryRateLimiter(qps=1)
+
+    for _ in range(3):
+        limiter.check_rate_limit("vip", qps=3)
+
+    with pytest.raises(HTTPException) as exc_info:
+        limiter.check_rate_limit("vip", qps=3)
+    assert "3 requests per second" in str(exc_info.value.detail)
+
+
+def test_in_memory_rate_limiter_evicts_idle_buckets(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that idle buckets are dropped on the next sweep of their shard."""
+    now = [100.0]
+    monkeypatch.setattr("magsag.api.rate_limit.time.monotonic", lambda: now[0])
+    limiter = InMemoryRateLimiter(qps=2, shards=1, idle_seconds=10)
+
+    for i in range(50):
+        limiter.check_rate_limit(f"client-{i}")
+    assert len(limiter) == 50
+
+    now[0] += 11
+    limiter.check_rate_limit("client-new")
+    assert len(limiter) == 1
+
+
+def test_sqlite_rate_limiter_shared_between_instances(tmp_path: Path) -> None:
+    """Test that limiters on one database file share buckets, like separate workers."""
+    from fastapi import HTTPException
+
+    db_path = tmp_path / "rate_limit.db"
+    worker_a = SQLiteRateLimiter(qps=4, db_path=db_path)
+    worker_b = SQLiteRateLimiter(qps=4, db_path=db_path)
+
+    try:
+        worker_a.check_rate_limit("test-key", cost=2)
+        worker_b.check_rate_limit("test-key")
+        worker_a.check_rate_limit("test-key")
+
+        with pytest.raises(HTTPException) as exc_info:
+            worker_b.check_rate_limit("test-key")
+        assert exc_info.value.status_code == 429
+
+        # Other keys are unaffected
+        worker_b.check_rate_limit("other-key")
+
+        time.sleep(0.3)
+        worker_a.check_rate_limit("test-key")
+    finally:
+        worker_a.close()
+        worker_b.close()
+
+
+def test_sqlite_rate_limiter_fails_open_quickly_when_locked(tmp_path: Path) -> None:
+    """Test that a write lock held by another worker does not stall the check."""
+    import sqlite3
+
+    db_path = tmp_path / "rate_limit.db"
+    limiter = SQLiteRateLimiter(qps=1, db_path=db_path)
+    holder = sqlite3.connect(db_path, isolation_level=None)
+
+    try:
+        limiter.check_rate_limit("test-key")
+        holder.execute("BEGIN IMMEDIATE")
+
+        started = time.monotonic()
+        # Over budget, but the locked database fails open instead of raising 429
+        limiter.check_rate_limit("test-key")
+        assert time.monotonic() - started < 0.5
+    finally:
+        holder.close()
+        limiter.close()
+
+
+def test_rate_limit_dependency_checks_sqlite_off_the_event_loop(tmp_path: Path) -> None:
+    """Test that blocking limiter backends run in a worker thread."""
+    import threading
+
+    from fastapi import Depends, FastAPI
+    from fastapi.testclient import TestClient
+
+    from magsag.api.config import Settings, get_settings
+
+    reset_rate_limiter()
+    settings = Settings(
+        RATE_LIMIT_QPS=5,
+        RATE_LIMIT_BACKEND="sqlite",
+        RATE_LIMIT_DB_PATH=str(tmp_path / "rate_limit.db"),
+    )
+    app = FastAPI()
+    app.dependency_overrides[get_settings] = lambda: settings
+    threads: dict[str, int] = {}
+
+    @app.get("/ping", dependencies=[Depends(rate_limit_dependency)])
+    async def ping() -> dict[str, str]:
+        threads["loop"] = threading.get_ident()
+        return {"status": "ok"}
+
+    limiter = get_rate_limiter(settings)
+    assert isinstance(limiter, SQLiteRateLimiter)
+    check = limiter.check_rate_limit
+
+    def recording_check(key: str, cost: int = 1, qps: int | None = None) -> None:
+        threads["check"] = threading.get_ident()
+        check(key, cost=cost, qps=qps)
+
+    limiter.check_rate_limit = recording_check  # type: ignore[method-assign]
+
+    try:
+        assert TestClient(app).get("/ping").status_code == 200
+        assert threads["check"] != threads["loop"]
+    finally:
+        reset_rate_limiter()
+
+
+def test_quota_for_key_reads_rate_limit_scopes(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that per-key quotas come from rate_limit:* scopes."""
+    scopes = {
+        "gold": ["runs:read", "rate_limit:50"],
+        "internal": ["rate_limit:unlimited"],
+        "plain": ["runs:read"],
+    }
+    monkeypatch.setattr("magsag.api.rate_limit.get_scopes_for_key", lambda key: scopes[key])
+    quota_for_key.cache_clear()
+
+    try:
+        assert quota_for_key("gold") == 50
+        assert quota_for_key("internal") == UNLIMITED_QPS
+        assert quota_for_key("plain") is None
+    finally:
+        quota_for_key.cache_clear()
+
+
+def test_rate_limit_dependency_charges_route_cost(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that routes created with rate_limit(cost) spend more of the budget."""
+    from fastapi import Depends, FastAPI
+    from fastapi.testclient import TestClient
+
+    from magsag.api.config import Settings, get_settings
+
+    reset_rate_limiter()
+    app = FastAPI()
+    app.dependency_overrides[get_settings] = lambda: Settings(RATE_LIMIT_QPS=6)
+
+    @app.post("/runs", dependencies=[Depends(rate_limit(5))])
+    async def create() -> dict[str, str]:
+        return {"status": "ok"}
+
+    @app.get("/runs/{run_id}", dependencies=[Depends(rate_limit_dependency)])
+    async def read(run_id: str) -> dict[str, str]:
+        return {"run_id": run_id}
+
+    client = TestClient(app)
+    try:
+        assert client.post("/runs").status_code == 200
+        assert client.get("/runs/1").status_code == 200
+        assert client.post("/runs").status_code == 429
+    finally:
+        reset_rate_limiter()
+
+
+def test_charge_rate_limit_waits_for_tokens() -> None:
+    """Test that handler-computed charges can wait for the bucket to refill."""
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from magsag.api.config import Settings
+
+    reset_rate_limiter()
+    settings = Settings(RATE_LIMIT_QPS=10)
+    app = FastAPI()
+
+    @app.post("/charge/{wait}")
+    async def charge(wait: float, request: Request) -> dict[str, float]:
+        await charge_rate_limit(request, settings, 5, wait_seconds=wait)
+        return {"wait": wait}
+
+    client = TestClient(app)
+    try:
+        assert client.post("/charge/0").status_code == 200
+        assert client.post("/charge/0").status_code == 200
+        assert client.post("/charge/0").status_code == 429
+
+        started = time.monotonic()
+        assert client.post("/charge/5").status_code == 200
+        assert time.monotonic() - started < 2
+    finally:
+        reset_rate_limiter()
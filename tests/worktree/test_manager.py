@@ -6,6 +6,7 @@ from pathlib import Path
 
 import pytest
 
+import magsag.worktree.manager as manager_module
 from magsag.worktree import (
     WorktreeConflictError,
     WorktreeForbiddenError,
@@ -217,3 +218,77 @@ def test_create_supports_detach_and_no_checkout(
     finally:
         monkeypatch.setenv("MAGSAG_WT_ALLOW_FORCE", "1")
         manager.remove("run-detach", force=True)
+
+
+@pytest.fixture
+def pooled_manager(manager: WorktreeManager) -> WorktreeManager:
+    settings = WorktreeSettings(
+        root=manager.settings.root,
+        max_concurrency=4,
+        ttl_spec="7d",
+        pool_size=2,
+        pool_base="base",
+    )
+    return WorktreeManager(settings=settings, repo_root=manager.repo_root)
+
+
+def test_pool_reuses_and_recycles_worktrees(
+    pooled_manager: WorktreeManager, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    assert pooled_manager.warm_pool() == 2
+    assert pooled_manager.warm_pool() == 0
+    assert pooled_manager.managed_records() == []
+    slots = {record.info.path for record in pooled_manager.pool_records()}
+
+    git_calls: list[list[str]] = []
+    real_run = manager_module.git_run
+
+    def _spy(args: list[str], **kwargs: object) -> object:
+        git_calls.append(list(args))
+        return real_run(args, **kwargs)  # type: ignore[arg-type]
+
+    monkeypatch.setattr(manager_module, "git_run", _spy)
+    record = pooled_manager.create(run_id="run-pool", task="demo", base="base")
+    assert ["worktree", "add"] not in [call[:2] for call in git_calls]
+    assert record.info.branch_short == branch_name("run-pool", "demo")
+    assert (record.info.path / "README.md").read_text(encoding="utf-8") == "hello\n"
+    assert len(pooled_manager.pool_records()) == 1
+    assert [r.info.path for r in pooled_manager.managed_records()] == [record.info.path]
+
+    (record.info.path / "scratch.txt").write_text("left behind\n", encoding="utf-8")
+    monkeypatch.setenv("MAGSAG_WT_ALLOW_FORCE", "1")
+    pooled_manager.remove("run-pool", force=True)
+    assert not record.info.path.exists()
+    recycled = pooled_manager.pool_records()
+    assert len(recycled) == 2
+    returned = ({r.info.path for r in recycled} - slots).pop()
+    assert not (returned / "scratch.txt").exists()
+    assert pooled_manager.managed_records() == []
+
+
+def test_listing_is_cached_until_mutation(
+    manager: WorktreeManager, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    list_calls = 0
+    real_run = manager_module.git_run
+
+    def _spy(args: list[str], **kwargs: object) -> object:
+        nonlocal list_calls
+        if list(args[:2]) == ["worktree", "list"]:
+            list_calls += 1
+        return real_run(args, **kwargs)  # type: ignore[arg-type]
+
+    monkeypatch.setattr(manager_module, "git_run", _spy)
+    manager.list_records()
+    manager.managed_records()
+    assert list_calls == 1
+
+    # A worktree added behind the manager's back is picked up immediately
+    _run_git(manager.repo_root, "worktree", "add", "--detach", str(manager.settings.root / "ext"))
+    assert len(manager.managed_records()) == 1
+    assert list_calls == 2
+
+    manager.create(run_id="run-cache", task="demo", base="base", detach=True)
+    calls_after_create = list_calls
+    assert len(manager.managed_records()) == 2
+    assert list_calls == calls_after_create